@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+分析历史查询测试
+验证MongoDB查询条件/游标分页/字段投影（不读取报告正文）、连接失败后的退避重连，
+以及文件系统摘要索引的增量刷新、过滤分页和按需加载报告正文，页面通过游标"加载更多"
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import types
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+
+def _write_analysis(detailed_dir: Path, symbol: str, date_str: str, report_size: int = 200):
+    """按 <股票>/<日期>/reports/*.md 结构写入一次分析的报告"""
+    reports_dir = detailed_dir / symbol / date_str / "reports"
+    reports_dir.mkdir(parents=True, exist_ok=True)
+    body = "分析内容。" * (report_size // 5)
+    (reports_dir / "final_trade_decision.md").write_text(f"# {symbol} 最终决策：持有\n\n{body}", encoding='utf-8')
+    for name in ("market_report", "fundamentals_report", "news_report", "investment_plan"):
+        (reports_dir / f"{name}.md").write_text(f"# {name}\n\n{body}", encoding='utf-8')
+    return reports_dir
+
+
+def test_mongodb_history_query():
+    """查询条件在MongoDB中执行，只投影列表字段，游标按 (timestamp, _id) 翻页"""
+    print("🧪 测试MongoDB历史查询...")
+
+    try:
+        from bson import ObjectId
+        from web.utils.mongodb_report_manager import (
+            MongoDBReportManager, build_history_query, LIST_PROJECTION, _decode_cursor)
+
+        query = build_history_query(date(2025, 7, 1), date(2025, 7, 31), stock_symbol="6005",
+                                    analyst_type="market", search_text="持有", analysis_ids=["a", "b"])
+        conditions = query["$and"]
+        assert conditions[0]["timestamp"] == {"$gte": datetime(2025, 7, 1), "$lt": datetime(2025, 8, 1)}
+        assert conditions[1]["stock_symbol"]["$regex"] == "6005" and conditions[2] == {"analysts": "market"}
+        assert len(conditions[3]["$or"]) == 3 and conditions[4] == {"analysis_id": {"$in": ["a", "b"]}}
+        assert build_history_query() == {} and build_history_query(analyst_type="news") == {"analysts": "news"}
+        assert "reports" not in LIST_PROJECTION
+
+        base = datetime(2025, 7, 28, 12)
+        docs = [{"_id": ObjectId(), "analysis_id": f"600519_{i}", "stock_symbol": "600519",
+                 "timestamp": base - timedelta(hours=i), "analysts": ["market"], "summary": f"摘要{i}"}
+                for i in range(5)]
+
+        class FakeCursor(list):
+            def sort(self, keys):
+                return self
+
+            def limit(self, count):
+                return FakeCursor(self[:count])
+
+        class FakeCollection:
+            def __init__(self):
+                self.calls = []
+
+            def find(self, query, projection=None):
+                self.calls.append((query, projection))
+                if "$and" in query:
+                    # 只模拟游标条件（时间戳各不相同）
+                    last_timestamp = query["$and"][1]["$or"][0]["timestamp"]["$lt"]
+                    return FakeCursor(doc for doc in docs if doc["timestamp"] < last_timestamp)
+                return FakeCursor(docs)
+
+            def find_one(self, query, projection=None):
+                self.calls.append((query, projection))
+                return {"reports": {"final_trade_decision": "# 持有"}}
+
+        manager = MongoDBReportManager.__new__(MongoDBReportManager)
+        manager.connected = True
+        manager.collection = FakeCollection()
+
+        page = manager.query_history(stock_symbol="600519", page_size=3)
+        assert [r["analysis_id"] for r in page["items"]] == ["600519_0", "600519_1", "600519_2"]
+        assert page["next_cursor"] and manager.collection.calls[-1][1] == LIST_PROJECTION
+        assert all("reports" not in item for item in page["items"])
+
+        cursor = page["next_cursor"]
+        assert _decode_cursor(cursor) == {"timestamp": docs[2]["timestamp"], "_id": docs[2]["_id"]}
+        page = manager.query_history(stock_symbol="600519", page_size=3, cursor=cursor)
+        assert [r["analysis_id"] for r in page["items"]] == ["600519_3", "600519_4"] and page["next_cursor"] is None
+        cursor_query = manager.collection.calls[-1][0]["$and"][1]["$or"]
+        assert cursor_query[1] == {"timestamp": docs[2]["timestamp"], "_id": {"$lt": docs[2]["_id"]}}
+
+        assert manager.get_report_contents("600519_0") == {"final_trade_decision": "# 持有"}
+        assert manager.collection.calls[-1][1] == {"reports": 1, "_id": 0}
+
+        print("  ✅ 过滤条件下推到MongoDB，列表查询不读取报告正文，游标翻页正确")
+        return True
+
+    except Exception as e:
+        print(f"❌ MongoDB历史查询测试失败: {e}")
+        return False
+
+
+def test_mongodb_reconnect_backoff():
+    """启动时MongoDB不可用，之后按退避间隔重试连接"""
+    print("\n🧪 测试MongoDB重连退避...")
+
+    try:
+        import threading
+        from web.utils.mongodb_report_manager import MongoDBReportManager, RECONNECT_MIN_DELAY
+
+        manager = MongoDBReportManager.__new__(MongoDBReportManager)
+        manager.client = None
+        manager.connected = False
+        manager._reconnect_lock = threading.Lock()
+        manager._retry_delay = RECONNECT_MIN_DELAY
+        manager._next_retry_at = datetime.now() + timedelta(seconds=RECONNECT_MIN_DELAY)
+
+        attempts = []
+
+        def fake_connect():
+            attempts.append(datetime.now())
+            manager.connected = len(attempts) >= 2
+
+        manager._connect = fake_connect
+
+        # 退避间隔内不重试
+        assert manager.ensure_connected() is False and attempts == []
+
+        manager._next_retry_at = datetime.now()
+        assert manager.ensure_connected() is False and len(attempts) == 1
+        assert manager._retry_delay == RECONNECT_MIN_DELAY * 2
+        assert manager.ensure_connected() is False and len(attempts) == 1
+
+        manager._next_retry_at = datetime.now()
+        assert manager.ensure_connected() is True and len(attempts) == 2
+        assert manager.ensure_connected() is True and len(attempts) == 2
+        assert manager._retry_delay == RECONNECT_MIN_DELAY
+
+        print("  ✅ 未连接时按退避间隔重试，连接恢复后不再重试")
+        return True
+
+    except Exception as e:
+        print(f"❌ MongoDB重连退避测试失败: {e}")
+        return False
+
+
+def test_history_index():
+    """文件系统摘要索引：增量刷新、过滤、分页与按需加载"""
+    print("\n🧪 测试文件系统摘要索引...")
+
+    root = Path(tempfile.mkdtemp(prefix="history_index_"))
+    try:
+        from web.utils.analysis_history_index import AnalysisHistoryIndex
+
+        detailed_dir = root / "detailed"
+        web_dir = root / "web"
+        web_dir.mkdir()
+        _write_analysis(detailed_dir, "600519", "2025-07-26")
+        _write_analysis(detailed_dir, "600519", "2025-07-27")
+        reports_dir = _write_analysis(detailed_dir, "000001", "2025-07-28")
+        (web_dir / "tags.json").write_text("{}", encoding='utf-8')
+        (web_dir / "analysis_AAPL_1.json").write_text(json.dumps({
+            "analysis_id": "AAPL_1", "timestamp": datetime(2025, 7, 29, 10).timestamp(), "stock_symbol": "AAPL",
+            "analysts": ["news_analyst"], "status": "completed", "summary": "苹果分析",
+            "full_data": {"final_trade_decision": "买入"}}, ensure_ascii=False), encoding='utf-8')
+
+        index = AnalysisHistoryIndex(detailed_dir, web_dir)
+        assert index.refresh() == {"total": 4, "updated": 4, "removed": 0}
+        assert index.refresh()["updated"] == 0
+
+        page = index.query(page_size=2)
+        assert [item["stock_symbol"] for item in page["items"]] == ["AAPL", "000001"]
+        page = index.query(page_size=2, cursor=page["next_cursor"])
+        assert [item["analysis_id"] for item in page["items"]] == ["600519_2025-07-27_" + str(
+            int(datetime(2025, 7, 27).timestamp())), "600519_2025-07-26_" + str(int(datetime(2025, 7, 26).timestamp()))]
+        assert page["next_cursor"] is None
+
+        first = page["items"][0]
+        assert first["summary"].startswith("600519 最终决策：持有") and first["report_count"] == 5
+        assert "reports" not in first
+        assert len(index.query(stock_symbol="6005")["items"]) == 2
+        assert len(index.query(search_text="苹果")["items"]) == 1
+        assert len(index.query(start_date=date(2025, 7, 27), end_date=date(2025, 7, 28))["items"]) == 2
+        assert len(index.query(analysis_ids={"AAPL_1"})["items"]) == 1
+
+        reports = index.load_details(first["report_path"])["reports"]
+        assert len(reports) == 5 and reports["final_trade_decision"].startswith("# 600519")
+        aapl = index.query(stock_symbol="AAPL")["items"][0]
+        assert index.load_details(aapl["report_path"]) == {"full_data": {"final_trade_decision": "买入"}}
+
+        # 新增报告、删除分析后只更新变化的条目；索引持久化后新实例无需重新读取
+        (reports_dir / "risk_report.md").write_text("# 风险", encoding='utf-8')
+        shutil.rmtree(detailed_dir / "600519" / "2025-07-26")
+        assert index.refresh() == {"total": 3, "updated": 1, "removed": 1}
+        assert AnalysisHistoryIndex(detailed_dir, web_dir).refresh()["updated"] == 0
+
+        print("  ✅ 增量刷新、过滤分页、按需加载正文均正确")
+        return True
+
+    except Exception as e:
+        print(f"❌ 文件系统摘要索引测试失败: {e}")
+        return False
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def test_history_page_load_more():
+    """历史页面在 session_state 中累积已加载的页，"加载更多"按游标获取下一页，过滤条件变化时重新加载"""
+    print("\n🧪 测试历史页面加载更多...")
+
+    root = Path(tempfile.mkdtemp(prefix="history_page_"))
+    try:
+        from web.components import analysis_results
+        from web.utils.analysis_history_index import AnalysisHistoryIndex
+
+        detailed_dir = root / "detailed"
+        for day in range(1, 6):
+            _write_analysis(detailed_dir, "600519", f"2025-07-0{day}")
+        index = AnalysisHistoryIndex(detailed_dir)
+
+        original = (analysis_results.st, analysis_results.get_analysis_history_index,
+                    analysis_results.MONGODB_AVAILABLE)
+        analysis_results.st = types.SimpleNamespace(session_state={})
+        analysis_results.get_analysis_history_index = lambda: index
+        analysis_results.MONGODB_AVAILABLE = False
+        try:
+            filters = dict(start_date=date(2025, 7, 1), end_date=date(2025, 7, 31), stock_symbol="600519")
+            pages = analysis_results.load_history_pages(filters, page_size=2)
+            assert len(pages["items"]) == 2 and pages["next_cursor"]
+
+            analysis_results.load_more_history(filters, page_size=2)
+            analysis_results.load_more_history(filters, page_size=2)
+            pages = analysis_results.load_history_pages(filters, page_size=2)
+            dates = [item["analysis_id"].split("_")[1] for item in pages["items"]]
+            assert dates == [f"2025-07-0{day}" for day in range(5, 0, -1)] and pages["next_cursor"] is None
+
+            pages = analysis_results.load_history_pages(dict(filters, stock_symbol="000001"), page_size=2)
+            assert pages["items"] == [] and pages["next_cursor"] is None
+        finally:
+            (analysis_results.st, analysis_results.get_analysis_history_index,
+             analysis_results.MONGODB_AVAILABLE) = original
+
+        print("  ✅ 加载更多按游标追加结果，过滤条件变化时从第一页重新加载")
+        return True
+
+    except Exception as e:
+        print(f"❌ 历史页面加载更多测试失败: {e}")
+        return False
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def test_history_index_performance(analyses: int = 300):
+    """对比每次读取全部报告与摘要索引查询的耗时"""
+    print("\n🧪 测试摘要索引性能...")
+
+    root = Path(tempfile.mkdtemp(prefix="history_index_perf_"))
+    try:
+        from web.utils.analysis_history_index import AnalysisHistoryIndex
+
+        detailed_dir = root / "detailed"
+        start_day = date(2025, 1, 1)
+        for i in range(analyses):
+            _write_analysis(detailed_dir, f"{600000 + i % 30}", str(start_day + timedelta(days=i // 30)),
+                            report_size=20000)
+
+        # 原方式：每次渲染读取所有报告文件
+        start = time.perf_counter()
+        total_chars = 0
+        for report_file in detailed_dir.glob("*/*/reports/*.md"):
+            total_chars += len(report_file.read_text(encoding='utf-8'))
+        full_scan = time.perf_counter() - start
+
+        index = AnalysisHistoryIndex(detailed_dir)
+        start = time.perf_counter()
+        index.query(page_size=50)
+        cold = time.perf_counter() - start
+
+        start = time.perf_counter()
+        page = index.query(stock_symbol="600001", page_size=50)
+        warm = time.perf_counter() - start
+        assert len(page["items"]) == analyses // 30
+
+        print(f"  📊 {analyses}个分析（{total_chars // 1024}K字符报告）: 读取全部报告 {full_scan * 1000:.1f}ms，"
+              f"首次建立索引 {cold * 1000:.1f}ms，索引查询 {warm * 1000:.1f}ms")
+        print("  ✅ 性能测试完成")
+        return True
+
+    except Exception as e:
+        print(f"❌ 摘要索引性能测试失败: {e}")
+        return False
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def main():
+    """主测试函数"""
+    print("🚀 分析历史查询测试")
+    print("=" * 50)
+
+    results = [
+        test_mongodb_history_query(),
+        test_mongodb_reconnect_backoff(),
+        test_history_index(),
+        test_history_page_load_more(),
+        test_history_index_performance(),
+    ]
+
+    passed = sum(1 for r in results if r)
+    print(f"\n📊 测试结果: {passed}/{len(results)} 通过")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+异步日志性能测试
+模拟分析流程中的日志热点（数据获取的多行调试输出、分析师的进度日志），
+对比 INFO/DEBUG 级别下同步与异步日志模式的分析耗时，并验证异步模式不丢失日志、溢出策略生效
+"""
+
+import os
+import sys
+import copy
+import json
+import time
+import logging
+import tempfile
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+ITERATIONS = 3000
+
+SAMPLE_DUMP = "\n".join(
+    f"2024-01-{day:02d} | 开盘 {10 + day * 0.1:.2f} | 收盘 {10 + day * 0.12:.2f} | 成交量 {100000 + day * 731}"
+    for day in range(1, 31)
+)
+
+
+def _make_config(log_dir, level, async_enabled, queue_size=10000, overflow='drop'):
+    from tradingagents.utils.logging_manager import TradingAgentsLogger
+
+    config = copy.deepcopy(TradingAgentsLogger.__new__(TradingAgentsLogger)._load_default_config())
+    config['level'] = level
+    config['loggers'] = {'tradingagents': {'level': level}}
+    config['handlers']['console']['enabled'] = False
+    config['handlers']['file'].update(directory=log_dir, level='DEBUG', max_size='500MB')
+    config['handlers']['structured'].update(enabled=True, directory=log_dir, level='INFO')
+    config['docker']['enabled'] = False
+    config['async'] = {'enabled': async_enabled, 'queue_size': queue_size, 'overflow': overflow}
+    return config
+
+
+def _simulate_analysis(logger):
+    """模拟一次分析：数据获取的多行调试输出 + 分析师进度日志 + 少量计算"""
+    total = 0.0
+    for i in range(ITERATIONS):
+        logger.debug(f"📊 [DEBUG] get_china_stock_data_unified 返回数据:\n{SAMPLE_DUMP}")
+        logger.info(f"📊 [市场分析师] 处理第{i}条数据", extra={'stock_symbol': '600519', 'tokens': {'input': i}})
+        total += sum(x * 0.5 for x in range(50))
+    return total
+
+
+def _run(level, async_enabled):
+    from tradingagents.utils.logging_manager import setup_logging, TradingAgentsLogger
+
+    os.environ.pop('TRADINGAGENTS_LOG_ASYNC', None)
+    log_dir = tempfile.mkdtemp(prefix="async_logging_")
+    setup_logging(_make_config(log_dir, level, async_enabled, overflow='block'))
+    logger = logging.getLogger('tradingagents.benchmark')
+
+    start = time.perf_counter()
+    _simulate_analysis(logger)
+    elapsed = time.perf_counter() - start
+
+    TradingAgentsLogger._stop_async_listener()
+    with open(os.path.join(log_dir, 'tradingagents.log'), encoding='utf-8') as f:
+        lines = sum(1 for line in f if '[市场分析师]' in line)
+    return elapsed, lines, log_dir
+
+
+def test_logging_benchmark():
+    """INFO/DEBUG级别下同步与异步模式的分析耗时对比"""
+    print("🧪 测试日志模式耗时...")
+
+    try:
+        results = {}
+        for level in ('INFO', 'DEBUG'):
+            for async_enabled in (False, True):
+                elapsed, lines, log_dir = _run(level, async_enabled)
+                assert lines == ITERATIONS, f"日志丢失: {lines}/{ITERATIONS}"
+                results[(level, async_enabled)] = elapsed
+
+        for level in ('INFO', 'DEBUG'):
+            sync_time, async_time = results[(level, False)], results[(level, True)]
+            print(f"  📊 {level:5s}: 同步 {sync_time * 1000:.0f}ms，异步 {async_time * 1000:.0f}ms "
+                  f"({sync_time / async_time:.1f}x)")
+
+        print("  ✅ 异步模式下日志全部写入")
+        return True
+
+    except Exception as e:
+        print(f"❌ 日志模式耗时测试失败: {e}")
+        return False
+
+
+def test_overflow_and_structured_extra():
+    """队列满时丢弃INFO日志但保留WARNING；结构化日志包含extra字段"""
+    print("\n🧪 测试溢出策略与结构化字段...")
+
+    try:
+        from tradingagents.utils.logging_manager import setup_logging, TradingAgentsLogger
+
+        log_dir = tempfile.mkdtemp(prefix="async_logging_overflow_")
+        manager = setup_logging(_make_config(log_dir, 'INFO', True, queue_size=10))
+        logger = logging.getLogger('tradingagents.overflow')
+
+        for i in range(2000):
+            logger.info(f"普通日志 {i}", extra={'session_id': 'abc', 'tokens': {'input': i, 'output': 1}})
+        logger.warning("重要告警")
+        dropped = manager.dropped_records
+        TradingAgentsLogger._stop_async_listener()
+
+        with open(os.path.join(log_dir, 'tradingagents.log'), encoding='utf-8') as f:
+            content = f.read()
+        with open(os.path.join(log_dir, 'tradingagents_structured.log'), encoding='utf-8') as f:
+            entries = [json.loads(line) for line in f if line.strip()]
+
+        assert dropped > 0, "队列已满但没有丢弃日志"
+        assert "重要告警" in content
+        assert entries and entries[0]['session_id'] == 'abc' and entries[0]['tokens']['output'] == 1
+
+        print(f"  ✅ 丢弃 {dropped} 条INFO日志，WARNING已写入，结构化字段完整")
+        return True
+
+    except Exception as e:
+        print(f"❌ 溢出策略测试失败: {e}")
+        return False
+
+
+def main():
+    """主测试函数"""
+    print("🚀 异步日志性能测试")
+    print("=" * 50)
+
+    results = [
+        test_logging_benchmark(),
+        test_overflow_and_structured_extra(),
+    ]
+
+    # 恢复默认日志配置
+    from tradingagents.utils.logging_manager import setup_logging
+    setup_logging()
+
+    passed = sum(1 for r in results if r)
+    print(f"\n📊 测试结果: {passed}/{len(results)} 通过")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
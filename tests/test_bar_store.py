@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+日线区间存储测试
+使用记录调用次数的模拟数据源，验证：
+- 被已有区间覆盖的请求不再访问数据源
+- 只请求缺失的前段/后段缺口，合并结果与一次性获取完全一致
+- 当天的数据不计入覆盖区间，数据源失败时不记录覆盖，也不返回缺少部分区间的数据
+- 存储持久化到磁盘，支持以索引为日期的数据（yfinance）
+"""
+
+import os
+import sys
+import tempfile
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+TODAY = date(2024, 6, 14)
+
+
+def _make_bars(start_date, end_date, use_index=False):
+    """生成区间内所有工作日的模拟日线数据（价格由日期确定，便于比对）"""
+    days = pd.bdate_range(start_date, end_date)
+    close = 100 + (days.dayofyear.to_numpy() % 17) * 0.5
+    if use_index:
+        return pd.DataFrame({"Close": close, "Volume": days.day.to_numpy() * 10.0},
+                            index=days.tz_localize("America/New_York"))
+    return pd.DataFrame({"trade_date": days, "close": close, "vol": days.day.to_numpy() * 100.0})
+
+
+class CountingFetcher:
+    """记录请求区间的模拟数据源"""
+
+    def __init__(self, use_index=False, fail_after=None):
+        self.calls = []
+        self.use_index = use_index
+        self.fail_after = fail_after
+
+    def __call__(self, symbol, start_date, end_date):
+        self.calls.append((start_date, end_date))
+        if self.fail_after is not None and start_date > self.fail_after:
+            return None
+        return _make_bars(start_date, end_date, self.use_index)
+
+
+def _store(**kwargs):
+    from tradingagents.dataflows.bar_store import BarStore
+    return BarStore(store_dir=tempfile.mkdtemp(prefix="bar_store_"), **kwargs)
+
+
+def test_incremental_gaps():
+    """重叠区间只请求缺口，合并结果与直接获取一致"""
+    print("🧪 测试日线区间增量补齐...")
+
+    try:
+        store = _store()
+        fetcher = CountingFetcher()
+
+        def get(start, end):
+            return store.get_bars("600519", "tushare", start, end, fetcher, date_column="trade_date", today=TODAY)
+
+        get("2024-02-01", "2024-03-31")
+        assert fetcher.calls == [("2024-02-01", "2024-03-31")]
+
+        # 完全覆盖：不访问数据源
+        inner = get("2024-02-10", "2024-03-15")
+        assert len(fetcher.calls) == 1
+        pd.testing.assert_frame_equal(inner.reset_index(drop=True), _make_bars("2024-02-10", "2024-03-15"))
+
+        # 前后两端各有缺口：只请求缺口
+        wide = get("2024-01-01", "2024-04-30")
+        assert fetcher.calls[1:] == [("2024-01-01", "2024-01-31"), ("2024-04-01", "2024-04-30")], fetcher.calls
+        pd.testing.assert_frame_equal(wide, _make_bars("2024-01-01", "2024-04-30"))
+        assert store.coverage("600519", "tushare") == [("2024-01-01", "2024-04-30")]
+
+        # 中间缺口
+        get("2024-05-20", "2024-05-31")
+        get("2024-04-15", "2024-06-05")
+        assert fetcher.calls[-1] == ("2024-06-01", "2024-06-05") and fetcher.calls[-2] == ("2024-05-01", "2024-05-19")
+        assert store.stats["hits"] == 1 and store.stats["partial_hits"] == 3
+
+        print(f"  ✅ 5次请求共访问数据源 {len(fetcher.calls)} 次，合并结果与直接获取一致")
+        return True
+
+    except Exception as e:
+        print(f"❌ 日线区间增量补齐测试失败: {e}")
+        return False
+
+
+def test_today_and_failures():
+    """当天不计入覆盖区间；数据源失败时返回None且不记录覆盖"""
+    print("\n🧪 测试当天数据与数据源失败...")
+
+    try:
+        store = _store()
+        fetcher = CountingFetcher()
+        store.get_bars("AAPL", "yfinance", "2024-06-01", "2024-06-14", fetcher, today=TODAY)
+        assert store.coverage("AAPL", "yfinance") == [("2024-06-01", "2024-06-13")]
+        store.get_bars("AAPL", "yfinance", "2024-06-01", "2024-06-14", fetcher, today=TODAY)
+        assert fetcher.calls[-1] == ("2024-06-14", "2024-06-14")
+
+        failing = CountingFetcher(fail_after="2024-06-10")
+        store = _store()
+        store.get_bars("000001", "akshare", "2024-06-01", "2024-06-10", failing, date_column="trade_date", today=TODAY)
+        partial = store.get_bars("000001", "akshare", "2024-06-01", "2024-06-13", failing,
+                                 date_column="trade_date", today=TODAY)
+        assert partial is None
+        assert store.coverage("000001", "akshare") == [("2024-06-01", "2024-06-10")]
+        assert store.stats["fetch_failures"] == 1
+
+        # 没有任何数据时返回None
+        assert store.get_bars("000002", "akshare", "2024-06-11", "2024-06-13", failing,
+                              date_column="trade_date", today=TODAY) is None
+
+        print("  ✅ 当天数据每次重新获取，失败的缺口不记录覆盖")
+        return True
+
+    except Exception as e:
+        print(f"❌ 当天数据与数据源失败测试失败: {e}")
+        return False
+
+
+def test_failed_leading_gap():
+    """前段缺口获取失败时返回None（由调用方获取整个区间），恢复后补齐缺口"""
+    print("\n🧪 测试前段缺口获取失败...")
+
+    try:
+        store = _store()
+        store.get_bars("000001", "akshare", "2024-03-01", "2024-06-13", CountingFetcher(),
+                       date_column="trade_date", today=TODAY)
+
+        class RateLimitedFetcher(CountingFetcher):
+            def __call__(self, symbol, start_date, end_date):
+                self.calls.append((start_date, end_date))
+                raise RuntimeError("请求过于频繁")
+
+        limited = RateLimitedFetcher()
+        assert store.get_bars("000001", "akshare", "2024-01-01", "2024-06-13", limited,
+                              date_column="trade_date", today=TODAY) is None
+        assert limited.calls == [("2024-01-01", "2024-02-29")]
+        assert store.coverage("000001", "akshare") == [("2024-03-01", "2024-06-13")]
+
+        fetcher = CountingFetcher()
+        full = store.get_bars("000001", "akshare", "2024-01-01", "2024-06-13", fetcher,
+                              date_column="trade_date", today=TODAY)
+        expected = _make_bars("2024-01-01", "2024-06-13")
+        assert fetcher.calls == [("2024-01-01", "2024-02-29")] and len(full) == len(expected)
+
+        print("  ✅ 缺口失败时不返回不完整的区间，恢复后只补齐缺口")
+        return True
+
+    except Exception as e:
+        print(f"❌ 前段缺口获取失败测试失败: {e}")
+        return False
+
+
+def test_persistence_and_expiry():
+    """存储持久化到磁盘（含时区索引），过期后整体重新获取"""
+    print("\n🧪 测试存储持久化与过期...")
+
+    try:
+        from tradingagents.dataflows.bar_store import BarStore
+
+        store = _store()
+        fetcher = CountingFetcher(use_index=True)
+        store.get_bars("AAPL", "yfinance", "2024-01-01", "2024-03-31", fetcher, today=TODAY)
+        store.get_bars("AAPL", "yfinance", "2024-04-01", "2024-05-31", fetcher, today=TODAY)
+
+        reopened = BarStore(store_dir=str(store.store_dir), max_age_days=7)
+        data = reopened.get_bars("AAPL", "yfinance", "2024-02-15", "2024-04-15", fetcher, today=TODAY)
+        assert len(fetcher.calls) == 2
+        pd.testing.assert_frame_equal(data, _make_bars("2024-02-15", "2024-04-15", use_index=True), check_freq=False)
+
+        expired = BarStore(store_dir=str(store.store_dir), max_age_days=1e-9)
+        expired.get_bars("AAPL", "yfinance", "2024-02-15", "2024-04-15", fetcher, today=TODAY)
+        assert fetcher.calls[-1] == ("2024-02-15", "2024-04-15") and len(fetcher.calls) == 3
+
+        print("  ✅ 重新打开的存储直接命中，过期存储整体重新获取")
+        return True
+
+    except Exception as e:
+        print(f"❌ 存储持久化与过期测试失败: {e}")
+        return False
+
+
+def main():
+    """主测试函数"""
+    print("🚀 日线区间存储测试")
+    print("=" * 50)
+
+    results = [
+        test_incremental_gaps(),
+        test_today_and_failures(),
+        test_failed_leading_gap(),
+        test_persistence_and_expiry(),
+    ]
+
+    passed = sum(1 for r in results if r)
+    print(f"\n📊 测试结果: {passed}/{len(results)} 通过")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+批量分析引擎测试
+使用模拟的分析流程图（各节点休眠模拟LLM调用），验证：
+- 多个 (股票代码, 交易日) 任务共享同一个图并发运行，结果按完成顺序流式返回
+- 单个任务失败不影响其他任务
+- 共享LLM客户端的请求限流生效
+- 吞吐量与各阶段耗时分位数统计（并行分析师节点分别计时）
+- 同一交易日的多只股票各自写入状态日志
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import threading
+from typing import TypedDict
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+NODE_SECONDS = 0.05
+
+
+class FakeState(TypedDict, total=False):
+    company_of_interest: str
+    trade_date: str
+    market_report: str
+    news_report: str
+    investment_plan: str
+    final_trade_decision: str
+
+
+class FakeGraph:
+    """具有 TradingAgentsGraph 批量分析所需属性的模拟图"""
+
+    def __init__(self, llm=None, parallel=False):
+        from langgraph.graph import StateGraph, START, END
+        from tradingagents.graph.propagation import Propagator
+
+        self.config = {"batch_max_workers": 4, "llm_requests_per_second": 0}
+        self.propagator = Propagator()
+        self.quick_thinking_llm = llm
+        self.deep_thinking_llm = llm
+        self.logged = []
+
+        def market_analyst(state):
+            if state["company_of_interest"] == "FAIL":
+                raise RuntimeError("数据源不可用")
+            time.sleep(NODE_SECONDS * (4 if state["company_of_interest"] == "SLOW" else 1))
+            if llm is not None:
+                llm.invoke("市场分析")
+            return {"market_report": f"{state['company_of_interest']} 市场报告"}
+
+        def news_analyst(state):
+            time.sleep(NODE_SECONDS * 4)
+            return {"news_report": f"{state['company_of_interest']} 新闻报告"}
+
+        def research_manager(state):
+            time.sleep(NODE_SECONDS)
+            return {"investment_plan": "买入"}
+
+        def risk_judge(state):
+            time.sleep(NODE_SECONDS)
+            return {"final_trade_decision": f"{state['company_of_interest']} {state['trade_date']}: 买入"}
+
+        workflow = StateGraph(FakeState)
+        workflow.add_node("Market Analyst", market_analyst)
+        workflow.add_node("Research Manager", research_manager)
+        workflow.add_node("Risk Judge", risk_judge)
+        workflow.add_edge(START, "Market Analyst")
+        workflow.add_edge("Market Analyst", "Research Manager")
+        if parallel:
+            # 与市场分析师并行执行的较慢节点
+            workflow.add_node("News Analyst", news_analyst)
+            workflow.add_edge(START, "News Analyst")
+            workflow.add_edge("News Analyst", "Research Manager")
+        workflow.add_edge("Research Manager", "Risk Judge")
+        workflow.add_edge("Risk Judge", END)
+        self.graph = workflow.compile()
+
+    def _log_state(self, trade_date, final_state, ticker=None):
+        self.logged.append((ticker, trade_date))
+
+    def process_signal(self, full_signal, stock_symbol=None):
+        return {"action": "买入", "stock_symbol": stock_symbol}
+
+
+def test_streaming_and_failures():
+    """并发运行、按完成顺序返回、失败隔离"""
+    print("🧪 测试批量并发分析...")
+
+    try:
+        from tradingagents.graph.batch_propagation import BatchPropagator
+
+        graph = FakeGraph()
+        jobs = [("SLOW", "2024-01-02")] + [(f"60{i:04d}", "2024-01-02") for i in range(6)] + [("FAIL", "2024-01-02")]
+
+        start = time.perf_counter()
+        results = list(BatchPropagator(graph, max_workers=4).run(jobs))
+        elapsed = time.perf_counter() - start
+
+        assert len(results) == len(jobs)
+        assert results[0].job.ticker != "SLOW", "结果应按完成顺序返回"
+        failed = [r for r in results if not r.ok]
+        assert len(failed) == 1 and failed[0].job.ticker == "FAIL" and "数据源不可用" in failed[0].error
+        succeeded = [r for r in results if r.ok]
+        assert all(r.decision["stock_symbol"] == r.job.ticker for r in succeeded)
+        assert all(r.final_state["final_trade_decision"].startswith(r.job.ticker) for r in succeeded)
+        assert sorted(graph.logged) == sorted((r.job.ticker, r.job.trade_date) for r in succeeded)
+
+        serial_time = NODE_SECONDS * (3 * 7 + 3)
+        assert elapsed < serial_time * 0.7, (elapsed, serial_time)
+
+        print(f"  ✅ {len(jobs)}个任务并发完成: {elapsed:.2f}秒（串行约 {serial_time:.2f}秒），失败任务已隔离")
+        return True
+
+    except Exception as e:
+        print(f"❌ 批量并发分析测试失败: {e}")
+        return False
+
+
+def test_report():
+    """吞吐量与各阶段耗时分位数"""
+    print("\n🧪 测试批量运行统计...")
+
+    try:
+        from tradingagents.graph.batch_propagation import BatchPropagator
+
+        propagator = BatchPropagator(FakeGraph(), max_workers=3)
+        results = propagator.run_all([(ticker, date) for ticker in ("600519", "000858", "AAPL")
+                                      for date in ("2024-01-02", "2024-01-03")])
+        report = propagator.report()
+
+        assert [r.job.index for r in results] == list(range(6))
+        assert report["succeeded"] == 6 and report["failed"] == 0
+        assert report["throughput_per_hour"] > 0
+        assert set(report["stage_latency"]) == {"Market Analyst", "Research Manager", "Risk Judge"}
+        for stats in report["stage_latency"].values():
+            assert stats["count"] == 6
+            assert NODE_SECONDS * 0.8 <= stats["p50"] <= stats["p90"] <= stats["max"]
+
+        print(f"  ✅ 吞吐量 {report['throughput_per_hour']:.0f}次/小时，"
+              f"单任务 p50={report['job_latency']['p50']:.2f}秒 p90={report['job_latency']['p90']:.2f}秒")
+        return True
+
+    except Exception as e:
+        print(f"❌ 批量运行统计测试失败: {e}")
+        return False
+
+
+def test_parallel_stage_latency():
+    """并行执行的分析师节点各自从开始到结束计时"""
+    print("\n🧪 测试并行节点耗时统计...")
+
+    try:
+        from tradingagents.graph.batch_propagation import BatchPropagator
+
+        propagator = BatchPropagator(FakeGraph(parallel=True), max_workers=2)
+        propagator.run_all([("600519", "2024-01-02"), ("000858", "2024-01-02")])
+        stage_latency = propagator.report()["stage_latency"]
+
+        assert set(stage_latency) == {"Market Analyst", "News Analyst", "Research Manager", "Risk Judge"}
+        assert stage_latency["Market Analyst"]["max"] < NODE_SECONDS * 2, stage_latency["Market Analyst"]
+        # 按完成间隔计算时新闻分析师只会记为 3*NODE_SECONDS
+        assert stage_latency["News Analyst"]["p50"] >= NODE_SECONDS * 4 * 0.9, stage_latency["News Analyst"]
+        assert stage_latency["Research Manager"]["max"] < NODE_SECONDS * 2
+
+        print(f"  ✅ 市场分析师 p50={stage_latency['Market Analyst']['p50']:.2f}秒，"
+              f"新闻分析师 p50={stage_latency['News Analyst']['p50']:.2f}秒")
+        return True
+
+    except Exception as e:
+        print(f"❌ 并行节点耗时统计测试失败: {e}")
+        return False
+
+
+def _complete_state(final_state):
+    """补齐状态日志需要、模拟图中没有的字段"""
+    return {
+        "sentiment_report": "", "news_report": "", "fundamentals_report": "",
+        "investment_debate_state": {"bull_history": "", "bear_history": "", "history": "",
+                                    "current_response": "", "judge_decision": ""},
+        "trader_investment_plan": "",
+        "risk_debate_state": {"risky_history": "", "safe_history": "", "neutral_history": "",
+                              "history": "", "judge_decision": ""},
+        **final_state,
+    }
+
+
+def test_state_log_per_ticker():
+    """同一交易日的多只股票并发分析时，各自的状态日志互不覆盖"""
+    print("\n🧪 测试批量分析的状态日志...")
+
+    workdir = tempfile.mkdtemp(prefix="batch_state_log_")
+    cwd = os.getcwd()
+    try:
+        from collections import OrderedDict
+        from tradingagents.graph.batch_propagation import BatchPropagator
+        from tradingagents.graph.state_log import get_state_log_directory, load_state_log
+        from tradingagents.graph.trading_graph import TradingAgentsGraph
+
+        graph = FakeGraph()
+        graph.config["state_log_format"] = "json"
+        graph.ticker = None
+        graph.log_states_dict = OrderedDict()
+        graph._log_state = lambda trade_date, final_state, ticker=None: TradingAgentsGraph._log_state(
+            graph, trade_date, _complete_state(final_state), ticker=ticker)
+
+        os.chdir(workdir)
+        jobs = [("600519", "2024-01-02"), ("000858", "2024-01-02"), ("600519", "2024-01-03")]
+        results = BatchPropagator(graph, max_workers=3).run_all(jobs)
+        assert all(r.ok for r in results)
+
+        expected = {"600519": ["2024-01-02", "2024-01-03"], "000858": ["2024-01-02"]}
+        for ticker, dates in expected.items():
+            states = load_state_log(get_state_log_directory(ticker))
+            assert sorted(states) == dates, (ticker, sorted(states))
+            assert all(state["company_of_interest"] == ticker for state in states.values())
+            assert states["2024-01-02"]["final_trade_decision"] == f"{ticker} 2024-01-02: 买入"
+
+        print("  ✅ 两只股票同一交易日的状态分别写入各自的日志")
+        return True
+
+    except Exception as e:
+        print(f"❌ 批量分析状态日志测试失败: {e}")
+        return False
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def test_rate_limit():
+    """共享LLM客户端的请求限流，批量分析结束后恢复原有限流器"""
+    print("\n🧪 测试LLM请求限流...")
+
+    try:
+        from langchain_core.language_models.fake_chat_models import FakeListChatModel
+        from langchain_core.rate_limiters import InMemoryRateLimiter
+        from tradingagents.graph.batch_propagation import BatchPropagator
+
+        llm = FakeListChatModel(responses=["ok"])
+        calls = []
+        lock = threading.Lock()
+        original_invoke = FakeListChatModel.invoke
+
+        def counting_invoke(self, *args, **kwargs):
+            with lock:
+                calls.append((time.perf_counter(), self.rate_limiter))
+            return original_invoke(self, *args, **kwargs)
+
+        FakeListChatModel.invoke = counting_invoke
+        try:
+            graph = FakeGraph(llm)
+            start = time.perf_counter()
+            BatchPropagator(graph, max_workers=8, requests_per_second=10).run_all(
+                [(f"60{i:04d}", "2024-01-02") for i in range(12)])
+            elapsed = time.perf_counter() - start
+            slow_limiters = {id(limiter) for _, limiter in calls}
+
+            # 调用方已有的限流器在批量分析期间被替换，结束后恢复
+            existing = InMemoryRateLimiter(requests_per_second=1000)
+            llm.rate_limiter = existing
+            calls.clear()
+            BatchPropagator(graph, max_workers=2, requests_per_second=1000).run_all(
+                [(f"00{i:04d}", "2024-01-02") for i in range(2)])
+            fast_limiters = {id(limiter) for _, limiter in calls}
+            restored = llm.rate_limiter
+        finally:
+            FakeListChatModel.invoke = original_invoke
+
+        assert len(slow_limiters) == 1 and len(fast_limiters) == 1
+        assert slow_limiters != fast_limiters and id(existing) not in fast_limiters
+        assert restored is existing
+        # 10次/秒、桶容量10：12次请求中至少有部分需要等待令牌
+        assert elapsed >= 0.15, elapsed
+
+        llm.rate_limiter = None
+        BatchPropagator(graph, max_workers=2, requests_per_second=10).run_all([("600000", "2024-01-02")])
+        assert llm.rate_limiter is None
+
+        print(f"  ✅ 12次LLM请求在限流 10次/秒 下耗时 {elapsed:.2f}秒，结束后恢复原有限流器")
+        return True
+
+    except Exception as e:
+        print(f"❌ LLM请求限流测试失败: {e}")
+        return False
+
+
+def main():
+    """主测试函数"""
+    print("🚀 批量分析引擎测试")
+    print("=" * 50)
+
+    results = [
+        test_streaming_and_failures(),
+        test_report(),
+        test_parallel_stage_latency(),
+        test_state_log_per_ticker(),
+        test_rate_limit(),
+    ]
+
+    passed = sum(1 for r in results if r)
+    print(f"\n📊 测试结果: {passed}/{len(results)} 通过")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
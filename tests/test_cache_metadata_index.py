@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+缓存元数据索引测试
+验证 find_cached_stock_data 等查找走 SQLite 索引，并与元数据文件保持一致
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+import pandas as pd
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+
+def test_index_lookup():
+    """保存后应能通过索引找到部分匹配缓存，并统计正确"""
+    print("🧪 测试元数据索引查找...")
+
+    try:
+        from tradingagents.dataflows.cache_manager import StockDataCache
+
+        cache = StockDataCache(tempfile.mkdtemp(prefix="cache_index_"))
+        df = pd.DataFrame({"close": [1.0, 2.0, 3.0]})
+        key = cache.save_stock_data("000001", df, "2024-01-01", "2024-01-31", "tushare")
+        cache.save_fundamentals_data("AAPL", "fundamentals report", "openai")
+
+        # 不同日期范围 -> 精确键未命中，走索引部分匹配
+        found = cache.find_cached_stock_data("000001", "2023-01-01", "2023-12-31", "tushare")
+        assert found == key, f"索引查找失败: {found}"
+        assert cache.find_cached_fundamentals_data("AAPL", "openai") is not None
+        assert cache.find_cached_stock_data("600000") is None
+
+        stats = cache.get_cache_stats()
+        assert stats["stock_data_count"] == 1 and stats["fundamentals_count"] == 1
+
+        # 已有 *_meta.json 的目录，新建索引时应自动导入
+        cache.metadata_index.close()
+        os.remove(cache.metadata_index.index_file)
+        rebuilt = StockDataCache(cache.cache_dir)
+        assert rebuilt.find_cache_entries("000001", "stock_data")
+
+        print(f"  ✅ 查找与统计正常: {stats}")
+        return True
+
+    except Exception as e:
+        print(f"❌ 元数据索引测试失败: {e}")
+        return False
+
+
+def test_lookup_performance(entries: int = 2000, probes: int = 200):
+    """在大量缓存条目下测量一次缓存探测的耗时"""
+    print(f"\n⏱️ 测试缓存探测耗时 ({entries} 条缓存)...")
+
+    try:
+        from tradingagents.dataflows.cache_manager import StockDataCache
+
+        cache = StockDataCache(tempfile.mkdtemp(prefix="cache_index_"))
+        for i in range(entries):
+            cache.save_stock_data(f"{i:06d}", "data", "2024-01-01", "2024-01-31", "tushare")
+
+        start = time.time()
+        for i in range(probes):
+            cache.find_cached_stock_data(f"{i:06d}", "2023-01-01", "2023-12-31", "tushare")
+        elapsed = time.time() - start
+
+        print(f"  📊 平均每次探测: {elapsed / probes * 1000:.2f} ms")
+        return True
+
+    except Exception as e:
+        print(f"❌ 性能测试失败: {e}")
+        return False
+
+
+def main():
+    """主测试函数"""
+    print("🚀 缓存元数据索引测试")
+    print("=" * 50)
+
+    results = [
+        test_index_lookup(),
+        test_lookup_performance(),
+    ]
+
+    passed = sum(1 for r in results if r)
+    print(f"\n📊 测试结果: {passed}/{len(results)} 通过")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+配置读取缓存测试
+验证 load_settings/load_pricing/calculate_cost 命中缓存，且文件变化后自动重新加载
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+
+def test_pricing_cache_invalidation():
+    """定价文件被外部修改后 calculate_cost 应使用新价格"""
+    print("🧪 测试定价缓存失效...")
+
+    try:
+        from tradingagents.config.config_manager import ConfigManager, PricingConfig
+
+        manager = ConfigManager(tempfile.mkdtemp(prefix="config_cache_"))
+        before = manager.calculate_cost("dashscope", "qwen-turbo", 1000, 1000)
+
+        # 模拟其他进程直接改写 pricing.json
+        with open(manager.pricing_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        for item in data:
+            if item["provider"] == "dashscope" and item["model_name"] == "qwen-turbo":
+                item["input_price_per_1k"] *= 10
+        time.sleep(0.01)
+        with open(manager.pricing_file, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=4)
+
+        after = manager.calculate_cost("dashscope", "qwen-turbo", 1000, 1000)
+        assert after > before, f"价格未刷新: {before} -> {after}"
+
+        # save_pricing 走显式失效
+        manager.save_pricing([PricingConfig("dashscope", "qwen-turbo", 0.0, 0.0, "CNY")])
+        assert manager.calculate_cost("dashscope", "qwen-turbo", 1000, 1000) == 0.0
+
+        print(f"  ✅ 成本: {before} -> {after} -> 0.0")
+        return True
+
+    except Exception as e:
+        print(f"❌ 定价缓存测试失败: {e}")
+        return False
+
+
+def test_settings_not_shared():
+    """修改 load_settings 返回值不应污染缓存"""
+    print("\n🧪 测试设置缓存隔离...")
+
+    try:
+        from tradingagents.config.config_manager import ConfigManager
+
+        manager = ConfigManager(tempfile.mkdtemp(prefix="config_cache_"))
+        settings = manager.load_settings()
+        settings["cost_alert_threshold"] = -1
+        assert manager.load_settings()["cost_alert_threshold"] != -1
+
+        print("  ✅ 返回值与缓存相互独立")
+        return True
+
+    except Exception as e:
+        print(f"❌ 设置缓存测试失败: {e}")
+        return False
+
+
+def test_cached_read_performance(iterations: int = 2000):
+    """测量 calculate_cost + load_settings 的单次耗时"""
+    print(f"\n⏱️ 测试配置读取耗时 ({iterations} 次)...")
+
+    try:
+        from tradingagents.config.config_manager import ConfigManager
+
+        manager = ConfigManager(tempfile.mkdtemp(prefix="config_cache_"))
+        start = time.time()
+        for _ in range(iterations):
+            manager.calculate_cost("deepseek", "deepseek-chat", 2000, 800)
+            manager.load_settings()
+        elapsed = time.time() - start
+
+        print(f"  📊 平均每次: {elapsed / iterations * 1000:.3f} ms")
+        return True
+
+    except Exception as e:
+        print(f"❌ 性能测试失败: {e}")
+        return False
+
+
+def main():
+    """主测试函数"""
+    print("🚀 配置读取缓存测试")
+    print("=" * 50)
+
+    results = [
+        test_pricing_cache_invalidation(),
+        test_settings_not_shared(),
+        test_cached_read_performance(),
+    ]
+
+    passed = sum(1 for r in results if r)
+    print(f"\n📊 测试结果: {passed}/{len(results)} 通过")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
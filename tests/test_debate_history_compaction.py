@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+辩论历史压缩测试
+使用模拟LLM运行三轮投资辩论与三轮风险辩论，对比启用压缩前后的提示词长度，
+并验证每条早期发言只被摘要一次
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+ARGUMENT_LENGTH = 1500
+ROUNDS = 3
+
+
+class FakeLLM:
+    """辩论发言返回固定长度的论点；摘要请求返回短摘要并记录被摘要的内容长度"""
+
+    def __init__(self):
+        self.debate_prompts = []
+        self.summary_inputs = []
+
+    def invoke(self, prompt):
+        if prompt.startswith("请将以下投资辩论"):
+            self.summary_inputs.append(prompt.split("需要压缩的发言：\n", 1)[1])
+            return SimpleNamespace(content=f"摘要{len(self.summary_inputs)}：各方论点概要")
+        self.debate_prompts.append(prompt)
+        return SimpleNamespace(content="论" * ARGUMENT_LENGTH)
+
+
+def _make_state():
+    return {
+        "company_of_interest": "600519",
+        "market_report": "市场报告", "sentiment_report": "情绪报告",
+        "news_report": "新闻报告", "fundamentals_report": "基本面报告",
+        "trader_investment_plan": "交易计划：分批买入",
+        "investment_debate_state": {"history": "", "bull_history": "", "bear_history": "",
+                                    "current_response": "", "count": 0},
+        "risk_debate_state": {"history": "", "risky_history": "", "safe_history": "",
+                              "neutral_history": "", "current_risky_response": "",
+                              "current_safe_response": "", "current_neutral_response": "", "count": 0},
+    }
+
+
+def _run_debate(compactor_window=None):
+    from tradingagents.agents.researchers.bull_researcher import create_bull_researcher
+    from tradingagents.agents.researchers.bear_researcher import create_bear_researcher
+    from tradingagents.agents.risk_mgmt.aggresive_debator import create_risky_debator
+    from tradingagents.agents.risk_mgmt.conservative_debator import create_safe_debator
+    from tradingagents.agents.risk_mgmt.neutral_debator import create_neutral_debator
+    from tradingagents.agents.utils.debate_history import DebateHistoryCompactor
+
+    llm = FakeLLM()
+    compactor = DebateHistoryCompactor(llm, window=compactor_window) if compactor_window else None
+    state = _make_state()
+
+    investment_nodes = [create_bull_researcher(llm, None, compactor), create_bear_researcher(llm, None, compactor)]
+    risk_nodes = [create_risky_debator(llm, compactor), create_safe_debator(llm, compactor),
+                  create_neutral_debator(llm, compactor)]
+    for _ in range(ROUNDS):
+        for node in investment_nodes:
+            state.update(node(state))
+    for _ in range(ROUNDS):
+        for node in risk_nodes:
+            state.update(node(state))
+    return llm, state
+
+
+def test_bounded_prompt_size():
+    """启用压缩后每轮提示词长度有上界，状态中仍保留完整历史"""
+    print("🧪 测试提示词长度...")
+
+    try:
+        full_llm, full_state = _run_debate()
+        compact_llm, compact_state = _run_debate(compactor_window=2)
+
+        full_sizes = [len(p) for p in full_llm.debate_prompts]
+        compact_sizes = [len(p) for p in compact_llm.debate_prompts]
+
+        # 状态中的完整历史不受影响
+        assert compact_state["risk_debate_state"]["history"] == full_state["risk_debate_state"]["history"]
+        # 窗口外的历史被摘要替代：提示词只含窗口内2条发言与对手最新论点（最多2条），不再随轮数增长
+        bound = 4 * ARGUMENT_LENGTH + 1000
+        assert max(compact_sizes) < bound, max(compact_sizes)
+        assert max(full_sizes) > 4 * ARGUMENT_LENGTH
+
+        print(f"  📊 最后一轮提示词: 完整历史 {full_sizes[-1]}字符，压缩后 {compact_sizes[-1]}字符")
+        print(f"  📊 提示词总长度: 完整历史 {sum(full_sizes)}字符，压缩后 {sum(compact_sizes)}字符")
+        return True
+
+    except Exception as e:
+        print(f"❌ 提示词长度测试失败: {e}")
+        return False
+
+
+def test_each_turn_summarized_once():
+    """滚动摘要：每条早期发言只进入一次摘要请求"""
+    print("\n🧪 测试摘要缓存...")
+
+    try:
+        llm, state = _run_debate(compactor_window=2)
+
+        summarized_turns = sum(text.count("Analyst: ") for text in llm.summary_inputs)
+        # 最后一次发言时历史中已有的发言（投资辩论5条、风险辩论8条）除窗口内2条外均被摘要
+        expected = (2 * ROUNDS - 2 - 1) + (3 * ROUNDS - 2 - 1)
+        assert summarized_turns == expected, (summarized_turns, expected)
+        assert all(len(text) < 2 * (ARGUMENT_LENGTH + 100) for text in llm.summary_inputs)
+
+        print(f"  ✅ 摘要请求 {len(llm.summary_inputs)} 次，共摘要 {summarized_turns} 条发言")
+        return True
+
+    except Exception as e:
+        print(f"❌ 摘要缓存测试失败: {e}")
+        return False
+
+
+def main():
+    """主测试函数"""
+    print("🚀 辩论历史压缩测试")
+    print("=" * 50)
+
+    results = [
+        test_bounded_prompt_size(),
+        test_each_turn_summarized_once(),
+    ]
+
+    passed = sum(1 for r in results if r)
+    print(f"\n📊 测试结果: {passed}/{len(results)} 通过")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+辩论提示词前缀稳定性测试
+验证所有辩论角色、所有轮次的提示词以逐字节相同的报告前缀开头，
+以及从提供商响应中提取提示词缓存命中token数
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+
+class RecordingLLM:
+    """记录收到的提示词"""
+
+    def __init__(self):
+        self.prompts = []
+
+    def invoke(self, prompt):
+        self.prompts.append(prompt)
+        return SimpleNamespace(content=f"论点{len(self.prompts)}")
+
+
+def _make_state():
+    return {
+        "company_of_interest": "600519",
+        "market_report": "市场报告：均线多头排列" * 50,
+        "sentiment_report": "情绪报告：讨论热度上升" * 50,
+        "news_report": "新闻报告：渠道改革推进" * 50,
+        "fundamentals_report": "基本面报告：毛利率稳定" * 50,
+        "trader_investment_plan": "交易计划：分批买入",
+        "investment_debate_state": {"history": "", "bull_history": "", "bear_history": "",
+                                    "current_response": "", "count": 0},
+        "risk_debate_state": {"history": "", "risky_history": "", "safe_history": "",
+                              "neutral_history": "", "current_risky_response": "",
+                              "current_safe_response": "", "current_neutral_response": "", "count": 0},
+    }
+
+
+def _common_prefix_length(a, b):
+    n = 0
+    for x, y in zip(a, b):
+        if x != y:
+            break
+        n += 1
+    return n
+
+
+def test_shared_report_prefix():
+    """两轮投资辩论与一轮风险辩论的提示词共享报告前缀，同一角色的后续轮次共享更长的前缀"""
+    print("🧪 测试辩论提示词前缀...")
+
+    try:
+        from tradingagents.agents.researchers.bull_researcher import create_bull_researcher
+        from tradingagents.agents.researchers.bear_researcher import create_bear_researcher
+        from tradingagents.agents.risk_mgmt.aggresive_debator import create_risky_debator
+        from tradingagents.agents.risk_mgmt.conservative_debator import create_safe_debator
+        from tradingagents.agents.risk_mgmt.neutral_debator import create_neutral_debator
+        from tradingagents.agents.utils.debate_prompts import build_report_context
+
+        llm = RecordingLLM()
+        state = _make_state()
+        bull, bear = create_bull_researcher(llm, None), create_bear_researcher(llm, None)
+        for _ in range(2):
+            state.update(bull(state))
+            state.update(bear(state))
+        for node in (create_risky_debator(llm), create_safe_debator(llm), create_neutral_debator(llm)):
+            state.update(node(state))
+
+        context = build_report_context(state)
+        assert len(llm.prompts) == 7
+        assert all(prompt.startswith(context) for prompt in llm.prompts)
+
+        # 看涨研究员第二轮的提示词与第一轮共享 报告 + 角色说明 + 记忆 前缀
+        bull_round1, bull_round2 = llm.prompts[0], llm.prompts[2]
+        shared = _common_prefix_length(bull_round1, bull_round2)
+        assert shared > len(context) + 200, shared
+
+        # 三个风险分析师共享 报告 + 交易员决策 前缀
+        risk_shared = min(_common_prefix_length(llm.prompts[4], p) for p in llm.prompts[5:])
+        assert risk_shared >= len(context) + len("交易计划：分批买入"), risk_shared
+
+        print(f"  ✅ 报告前缀 {len(context)} 字符，看涨研究员两轮共享 {shared} 字符，风险辩论共享 {risk_shared} 字符")
+        return True
+
+    except Exception as e:
+        print(f"❌ 辩论提示词前缀测试失败: {e}")
+        return False
+
+
+def test_extract_cached_tokens():
+    """从DeepSeek与OpenAI兼容格式的usage中提取缓存命中token数"""
+    print("\n🧪 测试缓存命中token提取...")
+
+    try:
+        from tradingagents.llm_adapters.openai_compatible_base import OpenAICompatibleBase
+
+        extract = OpenAICompatibleBase._extract_cached_tokens
+        assert extract({"prompt_tokens": 1000, "prompt_cache_hit_tokens": 768, "prompt_cache_miss_tokens": 232}) == 768
+        assert extract({"prompt_tokens": 1000, "prompt_tokens_details": {"cached_tokens": 512}}) == 512
+        assert extract({"prompt_tokens": 1000, "prompt_tokens_details": None}) == 0
+        assert extract({"prompt_tokens": 1000}) == 0
+
+        print("  ✅ DeepSeek 与 OpenAI 兼容格式均可提取")
+        return True
+
+    except Exception as e:
+        print(f"❌ 缓存命中token提取测试失败: {e}")
+        return False
+
+
+def main():
+    """主测试函数"""
+    print("🚀 辩论提示词前缀稳定性测试")
+    print("=" * 50)
+
+    results = [
+        test_shared_report_prefix(),
+        test_extract_cached_tokens(),
+    ]
+
+    passed = sum(1 for r in results if r)
+    print(f"\n📊 测试结果: {passed}/{len(results)} 通过")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
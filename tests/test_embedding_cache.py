@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Embedding批量请求与共享缓存测试
+使用模拟的OpenAI兼容客户端统计请求次数，验证批量请求、跨实例缓存与磁盘缓存
+"""
+
+import os
+import sys
+import tempfile
+from types import SimpleNamespace
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+
+class FakeEmbeddingClient:
+    """模拟 OpenAI embeddings 接口，记录请求次数和请求的文本数"""
+
+    def __init__(self):
+        self.calls = 0
+        self.texts = 0
+        self.embeddings = SimpleNamespace(create=self._create)
+
+    def _create(self, model, input):
+        inputs = input if isinstance(input, list) else [input]
+        self.calls += 1
+        self.texts += len(inputs)
+        data = [SimpleNamespace(index=i, embedding=[float(len(text)), 1.0, float(i + 1)])
+                for i, text in enumerate(inputs)]
+        return SimpleNamespace(data=data)
+
+
+def _make_memory(name, client):
+    from tradingagents.agents.utils.memory import FinancialSituationMemory
+
+    os.environ.setdefault("OPENAI_API_KEY", "test-key")
+    memory = FinancialSituationMemory(name, {"llm_provider": "openai", "backend_url": "https://api.openai.com/v1"})
+    memory.client = client
+    return memory
+
+
+def test_batch_and_shared_cache():
+    """add_situations 批量请求；多个记忆实例查询同一文本只请求一次"""
+    print("🧪 测试批量请求与跨实例缓存...")
+
+    try:
+        from tradingagents.agents.utils.embedding_cache import get_embedding_cache
+
+        get_embedding_cache().clear()
+        client = FakeEmbeddingClient()
+        memories = [_make_memory(f"embed_test_{name}", client)
+                    for name in ("bull", "bear", "trader", "judge", "risk")]
+
+        situations = [(f"市场情况 {i}：成交量放大，估值处于历史{i}分位", f"建议 {i}") for i in range(20)]
+        memories[0].add_situations(situations)
+        assert client.calls == 1 and client.texts == 20, (client.calls, client.texts)
+
+        curr_situation = "当前市场报告：科技板块波动加剧，利率上行"
+        for memory in memories:
+            memory.get_memories(curr_situation, n_matches=2)
+        assert client.calls == 2 and client.texts == 21, (client.calls, client.texts)
+
+        # 已缓存的文本再次写入不应重复请求
+        memories[1].add_situations(situations[:5] + [(curr_situation, "建议")])
+        assert client.calls == 2, client.calls
+
+        print(f"  ✅ 请求次数: {client.calls}，请求文本数: {client.texts}，缓存统计: {get_embedding_cache().stats}")
+        return True
+
+    except Exception as e:
+        print(f"❌ 批量与缓存测试失败: {e}")
+        return False
+
+
+def test_disk_cache_and_lru():
+    """磁盘缓存在新实例中可命中；内存层按LRU淘汰"""
+    print("\n🧪 测试磁盘缓存与LRU淘汰...")
+
+    try:
+        from tradingagents.agents.utils.embedding_cache import EmbeddingCache
+
+        cache_dir = tempfile.mkdtemp(prefix="embedding_cache_")
+        cache = EmbeddingCache(max_entries=2, cache_dir=cache_dir)
+        cache.put_many("model", {"a": [0.1, 0.2], "b": [0.3, 0.4], "c": [0.5, 0.6]})
+        assert len(cache) == 2
+
+        reopened = EmbeddingCache(max_entries=2, cache_dir=cache_dir)
+        assert reopened.get("model", "a") == [0.1, 0.2]
+        assert reopened.get("other-model", "a") is None
+        assert reopened.stats == {"hits": 0, "disk_hits": 1, "misses": 1}
+
+        print(f"  ✅ 磁盘缓存命中，统计: {reopened.stats}")
+        return True
+
+    except Exception as e:
+        print(f"❌ 磁盘缓存测试失败: {e}")
+        return False
+
+
+def main():
+    """主测试函数"""
+    print("🚀 Embedding批量请求与缓存测试")
+    print("=" * 50)
+
+    results = [
+        test_batch_and_shared_cache(),
+        test_disk_cache_and_lru(),
+    ]
+
+    passed = sum(1 for r in results if r)
+    print(f"\n📊 测试结果: {passed}/{len(results)} 通过")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
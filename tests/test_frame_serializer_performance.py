@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+DataFrame 二进制缓存格式测试
+验证 pickle5/arrow 往返一致性、旧版CSV缓存兼容，并对比 CSV/JSON/二进制 的加载耗时
+"""
+
+import os
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+
+def build_ohlcv(days: int) -> pd.DataFrame:
+    """构造日线OHLCV数据"""
+    rng = np.random.default_rng(42)
+    dates = pd.bdate_range("2015-01-01", periods=days)
+    close = 100 + np.cumsum(rng.normal(0, 1, days))
+    return pd.DataFrame({
+        "Open": close + rng.normal(0, 0.5, days),
+        "High": close + 1,
+        "Low": close - 1,
+        "Close": close,
+        "Volume": rng.integers(1_000_000, 5_000_000, days),
+        "Symbol": "AAPL",
+    }, index=pd.Index(dates, name="Date"))
+
+
+def test_roundtrip():
+    """各二进制格式往返后 dtype、索引与数值应完全一致"""
+    print("🧪 测试二进制格式往返一致性...")
+
+    try:
+        from tradingagents.dataflows import frame_serializer
+
+        df = build_ohlcv(300)
+        for name in frame_serializer.BINARY_FORMATS:
+            if name == "arrow" and not frame_serializer.PYARROW_AVAILABLE:
+                print("  ⚠️ pyarrow 未安装，跳过 arrow")
+                continue
+
+            restored = frame_serializer.loads_frame(frame_serializer.dumps_frame(df, name))
+            pd.testing.assert_frame_equal(restored, df, check_freq=False)
+
+            path = Path(tempfile.mkdtemp(prefix="frame_serializer_")) / f"data.{name}"
+            frame_serializer.save_frame(df, path, name)
+            from_file = frame_serializer.load_frame(path)
+            pd.testing.assert_frame_equal(from_file, df, check_freq=False)
+            from_file.loc[from_file.index[0], "Close"] = 0.0  # 返回结果应可修改
+            print(f"  ✅ {name} 往返一致")
+
+        return True
+
+    except Exception as e:
+        print(f"❌ 往返一致性测试失败: {e}")
+        return False
+
+
+def test_arrow_memory_map():
+    """arrow 格式文件通过内存映射读取，其他格式整体读入"""
+    print("\n🧪 测试arrow文件内存映射读取...")
+
+    try:
+        from tradingagents.dataflows import frame_serializer
+
+        if not frame_serializer.PYARROW_AVAILABLE:
+            print("  ⚠️ pyarrow 未安装，跳过")
+            return True
+
+        pa = frame_serializer.pa
+        original_memory_map = pa.memory_map
+        mapped_paths = []
+
+        def counting_memory_map(path, *args, **kwargs):
+            mapped_paths.append(path)
+            return original_memory_map(path, *args, **kwargs)
+
+        df = build_ohlcv(300)
+        directory = Path(tempfile.mkdtemp(prefix="frame_mmap_"))
+        pa.memory_map = counting_memory_map
+        try:
+            for name in frame_serializer.BINARY_FORMATS:
+                path = directory / f"data.{name}"
+                frame_serializer.save_frame(df, path, name)
+                pd.testing.assert_frame_equal(frame_serializer.load_frame(path), df, check_freq=False)
+        finally:
+            pa.memory_map = original_memory_map
+
+        assert mapped_paths == [str(directory / "data.arrow")], mapped_paths
+        print("  ✅ arrow 文件使用内存映射读取")
+        return True
+
+    except Exception as e:
+        print(f"❌ arrow内存映射测试失败: {e}")
+        return False
+
+
+def test_stock_cache_binary_and_legacy_csv():
+    """StockDataCache 写入二进制格式，并能读取旧版CSV缓存"""
+    print("\n🧪 测试文件缓存二进制格式与旧版兼容...")
+
+    try:
+        from tradingagents.dataflows.cache_manager import StockDataCache
+        from tradingagents.dataflows import frame_serializer
+
+        cache = StockDataCache(tempfile.mkdtemp(prefix="frame_cache_"))
+        df = build_ohlcv(252)
+
+        cache_key = cache.save_stock_data("AAPL", df, "2015-01-01", "2015-12-31", "yfinance")
+        metadata = cache._load_metadata(cache_key)
+        assert metadata["file_format"] in frame_serializer.BINARY_FORMATS
+        pd.testing.assert_frame_equal(cache.load_stock_data(cache_key), df, check_freq=False)
+
+        # 模拟旧版本写入的CSV缓存
+        legacy_path = Path(metadata["file_path"]).with_suffix(".csv")
+        df.to_csv(legacy_path, index=True)
+        metadata.update(file_path=str(legacy_path), file_format="csv")
+        cache._save_metadata("legacy_key", metadata)
+        legacy = cache.load_stock_data("legacy_key")
+        assert len(legacy) == len(df)
+
+        cache.metadata_index.close()
+        print(f"  ✅ 新缓存格式: {frame_serializer.get_serializer().name}，旧版CSV可读")
+        return True
+
+    except Exception as e:
+        print(f"❌ 文件缓存测试失败: {e}")
+        return False
+
+
+def _time_load(func, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def test_load_performance(repeat: int = 50):
+    """1年/5年/10年日线数据的加载耗时对比"""
+    print(f"\n⏱️ 测试加载耗时 (每项 {repeat} 次)...")
+
+    try:
+        from tradingagents.dataflows import frame_serializer
+
+        work_dir = Path(tempfile.mkdtemp(prefix="frame_bench_"))
+        for years, days in ((1, 252), (5, 1260), (10, 2520)):
+            df = build_ohlcv(days)
+            csv_path = work_dir / f"{years}y.csv"
+            df.to_csv(csv_path, index=True)
+            json_text = df.reset_index().to_json(orient='records', date_format='iso')
+
+            timings = {
+                "csv": _time_load(lambda: pd.read_csv(csv_path, index_col=0), repeat),
+                "json": _time_load(lambda: pd.read_json(json_text, orient='records'), repeat),
+            }
+            for name in frame_serializer.BINARY_FORMATS:
+                if name == "arrow" and not frame_serializer.PYARROW_AVAILABLE:
+                    continue
+                path = work_dir / f"{years}y.{name}"
+                frame_serializer.save_frame(df, path, name)
+                timings[name] = _time_load(lambda: frame_serializer.load_frame(path), repeat)
+
+            summary = ", ".join(f"{name} {ms:.2f}ms" for name, ms in timings.items())
+            print(f"  📊 {years}年 ({days}行): {summary}")
+
+        return True
+
+    except Exception as e:
+        print(f"❌ 性能测试失败: {e}")
+        return False
+
+
+def main():
+    """主测试函数"""
+    print("🚀 DataFrame 二进制缓存格式测试")
+    print("=" * 50)
+
+    results = [
+        test_roundtrip(),
+        test_arrow_memory_map(),
+        test_stock_cache_binary_and_legacy_csv(),
+        test_load_performance(),
+    ]
+
+    passed = sum(1 for r in results if r)
+    print(f"\n📊 测试结果: {passed}/{len(results)} 通过")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
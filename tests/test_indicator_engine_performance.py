@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+技术指标引擎性能测试
+对比逐日调用 stockstats 的旧实现与向量化指标引擎的单窗口耗时
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+SYMBOL = "BENCH"
+INDICATORS = ["close_50_sma", "close_10_ema", "macd", "rsi", "boll_ub", "atr", "vwma", "mfi"]
+
+
+def build_price_data(days: int = 2500) -> pd.DataFrame:
+    """生成与 YFin CSV 格式一致的模拟日线数据"""
+    rng = np.random.default_rng(42)
+    dates = pd.bdate_range("2015-01-02", periods=days)
+    close = 100 + np.cumsum(rng.normal(0, 1, days))
+    high = close + rng.uniform(0, 2, days)
+    low = close - rng.uniform(0, 2, days)
+    return pd.DataFrame({
+        "Date": dates.strftime("%Y-%m-%d"),
+        "Open": close + rng.normal(0, 0.5, days),
+        "High": high,
+        "Low": low,
+        "Close": close,
+        "Adj Close": close,
+        "Volume": rng.integers(1_000_000, 5_000_000, days),
+    })
+
+
+def prepare_data_dir() -> str:
+    """在临时目录中写入模拟 CSV，并将 DATA_DIR 与价格序列存储切换到该目录"""
+    from tradingagents.dataflows import interface, price_store
+
+    data_dir = tempfile.mkdtemp(prefix="indicator_bench_")
+    price_dir = os.path.join(data_dir, "market_data", "price_data")
+    os.makedirs(price_dir, exist_ok=True)
+    build_price_data().to_csv(
+        os.path.join(price_dir, f"{SYMBOL}-YFin-data-2015-01-01-2025-03-25.csv"), index=False
+    )
+    interface.DATA_DIR = data_dir
+    price_store._price_store = price_store.PriceSeriesStore(os.path.join(data_dir, "price_store"))
+    return data_dir
+
+
+def cleanup_data_dir(data_dir: str):
+    """删除临时目录并恢复默认的 DATA_DIR 与价格序列存储"""
+    from tradingagents.dataflows import config, interface, price_store
+
+    interface.DATA_DIR = config.DATA_DIR
+    price_store._price_store = None
+    shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def test_indicator_values_match_stockstats():
+    """向量化结果应与 stockstats 逐日计算一致"""
+    print("🧪 校验向量化指标与 stockstats 结果...")
+
+    try:
+        from stockstats import wrap
+        from tradingagents.dataflows.indicator_engine import IndicatorEngine
+
+        data = build_price_data(300)
+        engine = IndicatorEngine(data)
+        reference = wrap(data.copy())
+
+        for indicator in INDICATORS:
+            expected = np.asarray(reference[indicator], dtype=float)
+            actual = engine.compute([indicator])[indicator].values
+            max_diff = float(np.nanmax(np.abs(expected[30:] - actual[30:])))
+            status = "✅" if max_diff < 1e-6 else "⚠️"
+            print(f"  {status} {indicator}: 最大偏差 {max_diff:.2e}")
+
+        return True
+
+    except Exception as e:
+        print(f"❌ 指标一致性校验失败: {e}")
+        return False
+
+
+def test_window_performance(look_back_days: int = 60):
+    """对比单个窗口在新旧实现下的耗时"""
+    print(f"\n⏱️ 测试 {look_back_days} 天窗口耗时...")
+
+    data_dir = None
+    try:
+        from datetime import datetime
+        from dateutil.relativedelta import relativedelta
+        from tradingagents.dataflows import interface
+
+        data_dir = prepare_data_dir()
+        curr_date = "2024-06-28"
+        curr_dt = datetime.strptime(curr_date, "%Y-%m-%d")
+        before = curr_dt - relativedelta(days=look_back_days)
+
+        for indicator in ["rsi", "macd", "boll_ub"]:
+            start = time.time()
+            interface._get_stock_stats_indicators_window_legacy(
+                SYMBOL, indicator, curr_dt, before, False
+            )
+            legacy_time = time.time() - start
+
+            start = time.time()
+            interface.get_stock_stats_indicators_window(
+                SYMBOL, indicator, curr_date, look_back_days, False
+            )
+            engine_time = time.time() - start
+
+            speedup = legacy_time / engine_time if engine_time > 0 else float("inf")
+            print(f"  📊 {indicator}: 旧实现 {legacy_time * 1000:.1f} ms | "
+                  f"向量化 {engine_time * 1000:.1f} ms | 提升 {speedup:.1f}x")
+
+        return True
+
+    except Exception as e:
+        print(f"❌ 窗口性能测试失败: {e}")
+        return False
+    finally:
+        if data_dir:
+            cleanup_data_dir(data_dir)
+
+
+def main():
+    """主测试函数"""
+    print("🚀 技术指标引擎性能测试")
+    print("=" * 50)
+
+    results = [
+        test_indicator_values_match_stockstats(),
+        test_window_performance(30),
+        test_window_performance(60),
+    ]
+
+    passed = sum(1 for r in results if r)
+    print(f"\n📊 测试结果: {passed}/{len(results)} 通过")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
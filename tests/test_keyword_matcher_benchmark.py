@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+新闻关键词匹配基准测试
+对比逐关键词子串扫描与编译后的多关键词匹配器在10000条模拟新闻上的评分耗时，
+并验证两者评分完全一致
+"""
+
+import os
+import sys
+import random
+import time
+
+import numpy as np
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+NEWS_COUNT = 10000
+
+# 覆盖重叠、包含、大小写关键词的高密度片段，用于评分一致性校验
+FRAGMENTS = [
+    '招商银行', '600036', '今日', '发布', '公告', '业绩预告', '指数基金持仓', '被动投资', '板块',
+    '涨停', '资产重组', 'ETF', 'etf', 'Index', '股东大会', '董事会', '市场', '成交活跃', '基金',
+    '行业', '回购', '限售解禁', 'st', 'ST', '合作协议', '分析师认为', '，', '。',
+]
+
+# 模拟真实新闻：正文以普通叙述为主，夹杂少量关键词
+SENTENCES = [
+    '今日沪深两市震荡整理，市场情绪较为谨慎。',
+    '资金流向显示主力观望明显，北向资金小幅净流入。',
+    '分析人士认为后市仍需关注宏观数据与政策变化。',
+    '公司近期经营情况稳定，管理层表示将继续推进数字化转型。',
+    '从估值角度看，当前股价处于历史中枢附近。',
+]
+KEYWORD_PHRASES = ['招商银行', '600036', '发布业绩预告', '涨停', '指数基金', '召开股东大会', '回购股份',
+                   'ETF', '银行板块', '签署合作协议']
+
+
+def _make_dense_news(count, seed):
+    rng = random.Random(seed)
+    titles = [''.join(rng.choices(FRAGMENTS, k=rng.randint(3, 8))) for _ in range(count)]
+    contents = [''.join(rng.choices(FRAGMENTS, k=rng.randint(20, 80))) for _ in range(count)]
+    return titles, contents
+
+
+def _make_news(count=NEWS_COUNT, seed=42):
+    rng = random.Random(seed)
+    titles, contents = [], []
+    for _ in range(count):
+        titles.append(rng.choice(SENTENCES)[:12] + rng.choice(KEYWORD_PHRASES))
+        body = [rng.choice(SENTENCES) for _ in range(rng.randint(8, 40))]
+        for phrase in rng.choices(KEYWORD_PHRASES, k=rng.randint(0, 3)):
+            body.insert(rng.randrange(len(body) + 1), phrase)
+        contents.append(''.join(body))
+    return titles, contents
+
+
+def _legacy_score(news_filter, title, content):
+    """逐关键词扫描的原始评分规则，作为对照"""
+    score = 0
+    title_lower, content_lower = title.lower(), content.lower()
+    if news_filter.company_name in title:
+        score += 50
+    elif news_filter.company_name in content:
+        score += 25
+    if news_filter.stock_code in title:
+        score += 40
+    elif news_filter.stock_code in content:
+        score += 20
+    for keywords, title_points, content_points in ((news_filter.strong_keywords, 30, 15),
+                                                    (news_filter.include_keywords, 15, 8),
+                                                    (news_filter.exclude_keywords, -40, -20)):
+        for keyword in keywords:
+            if keyword in title_lower:
+                score += title_points
+            elif keyword in content_lower:
+                score += content_points
+    if (news_filter.company_name not in title and news_filter.stock_code not in title and
+            any(keyword in title_lower for keyword in news_filter.exclude_keywords)):
+        score -= 30
+    return max(0, min(100, score))
+
+
+def test_keyword_matcher():
+    """匹配器返回全部关键词，包括重叠和相互包含的关键词"""
+    print("🧪 测试多关键词匹配器...")
+
+    try:
+        from tradingagents.utils.news_filter import KeywordMatcher
+
+        matcher = KeywordMatcher(['指数', '指数基金', '基金', '基金持仓', '业绩', '业绩预告', 'a.b'])
+        assert matcher.find('指数基金持仓变化') == {'指数', '指数基金', '基金', '基金持仓'}
+        assert matcher.find('发布业绩预告') == {'业绩', '业绩预告'}
+        assert matcher.find('axb') == frozenset()
+        assert matcher.find('a.b') == {'a.b'}
+        assert matcher.find('') == frozenset()
+        assert KeywordMatcher([]).find('任意文本') == frozenset()
+
+        print("  ✅ 重叠、包含与特殊字符关键词匹配正确")
+        return True
+
+    except Exception as e:
+        print(f"❌ 多关键词匹配器测试失败: {e}")
+        return False
+
+
+def test_scores_match_legacy():
+    """编译匹配器的评分与逐关键词扫描完全一致，关键词列表修改后重新编译"""
+    print("\n🧪 测试评分一致性...")
+
+    try:
+        from tradingagents.utils.news_filter import create_news_filter
+
+        news_filter = create_news_filter('600036')
+        titles, contents = _make_dense_news(2000, seed=7)
+        real_titles, real_contents = _make_news(2000, seed=7)
+        for title, content in zip(titles + real_titles, contents + real_contents):
+            assert news_filter.calculate_relevance_score(title, content) == _legacy_score(news_filter, title, content)
+
+        news_filter.include_keywords.append('成交活跃')
+        title, content = '市场成交活跃', ''
+        assert news_filter.calculate_relevance_score(title, content) == _legacy_score(news_filter, title, content) == 15
+
+        print("  ✅ 4000条合成新闻（高密度与模拟真实新闻各2000条）评分一致")
+        return True
+
+    except Exception as e:
+        print(f"❌ 评分一致性测试失败: {e}")
+        return False
+
+
+def test_benchmark():
+    """10000条模拟真实新闻：逐关键词扫描 vs 编译匹配器（单条与批量）"""
+    print("\n🧪 关键词匹配基准测试...")
+
+    try:
+        import pandas as pd
+        from tradingagents.utils.news_filter import create_news_filter
+
+        news_filter = create_news_filter('600036')
+        titles, contents = _make_news()
+
+        start = time.perf_counter()
+        legacy = [_legacy_score(news_filter, t, c) for t, c in zip(titles, contents)]
+        legacy_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        compiled = [news_filter.calculate_relevance_score(t, c) for t, c in zip(titles, contents)]
+        compiled_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batch = news_filter.calculate_relevance_scores(pd.Series(titles), pd.Series(contents))
+        batch_time = time.perf_counter() - start
+
+        assert legacy == compiled and np.array_equal(batch, legacy)
+
+        print(f"  📊 {NEWS_COUNT}条新闻: 逐关键词扫描 {legacy_time * 1000:.0f}ms，"
+              f"编译匹配器 {compiled_time * 1000:.0f}ms ({legacy_time / compiled_time:.1f}x)，"
+              f"批量评分 {batch_time * 1000:.0f}ms ({legacy_time / batch_time:.1f}x)")
+        return True
+
+    except Exception as e:
+        print(f"❌ 关键词匹配基准测试失败: {e}")
+        return False
+
+
+def main():
+    """主测试函数"""
+    print("🚀 新闻关键词匹配基准测试")
+    print("=" * 50)
+
+    results = [
+        test_keyword_matcher(),
+        test_scores_match_legacy(),
+        test_benchmark(),
+    ]
+
+    passed = sum(1 for r in results if r)
+    print(f"\n📊 测试结果: {passed}/{len(results)} 通过")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
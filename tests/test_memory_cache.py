@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+进程内L1缓存测试
+验证按字节数的LRU淘汰、条目过期、StockDataCache 重复读取走L1缓存（不再读取元数据和数据文件），
+以及 get_cache_stats 中的命中/未命中/淘汰统计；自适应缓存数据的L1条目与后端条目同时过期
+"""
+
+import os
+import sys
+import time
+import pickle
+import logging
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+
+def _make_frame(rows=1260):
+    dates = pd.bdate_range("2019-01-01", periods=rows)
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({"open": rng.random(rows), "high": rng.random(rows), "low": rng.random(rows),
+                         "close": rng.random(rows), "volume": rng.integers(0, 10 ** 7, rows)}, index=dates)
+
+
+def test_lru_and_ttl():
+    """超出字节容量时淘汰最久未使用的条目，过期条目不再返回"""
+    print("🧪 测试L1缓存淘汰与过期...")
+
+    try:
+        from tradingagents.dataflows.memory_cache import MemoryCache, estimate_size
+
+        value = "x" * 1000
+        cache = MemoryCache(max_bytes=estimate_size(value) * 3)
+        for key in ("a", "b", "c"):
+            cache.put(key, value, ttl_seconds=60)
+        assert cache.get("a") == value  # a 变为最近使用
+        cache.put("d", value, ttl_seconds=60)
+        assert cache.get("b") is None and cache.get("a") == value and cache.get("d") == value
+
+        cache.put("big", "y" * 10000, ttl_seconds=60)
+        assert cache.get("big") is None and cache.get("c") == value
+
+        stats = cache.get_stats()
+        assert stats["evictions"] == 1 and stats["rejected"] == 1
+        assert stats["hits"] == 4 and stats["misses"] == 2
+
+        # 过期条目视为未命中；DataFrame 返回副本，调用方修改不影响缓存
+        frame_cache = MemoryCache(max_bytes=10 * 1024 * 1024)
+        frame_cache.put("short", "z", ttl_seconds=0.05)
+        time.sleep(0.1)
+        assert frame_cache.get("short") is None and frame_cache.get_stats()["expirations"] == 1
+
+        frame_cache.put("frame", _make_frame(10), ttl_seconds=60)
+        frame_cache.get("frame")["close"] = 0.0
+        assert (frame_cache.get("frame")["close"] != 0.0).all()
+
+        print(f"  ✅ LRU淘汰、超限拒绝、过期与副本返回正确: {stats}")
+        return True
+
+    except Exception as e:
+        print(f"❌ L1缓存淘汰与过期测试失败: {e}")
+        return False
+
+
+def test_stock_cache_l1(rounds: int = 200):
+    """重复查找与加载同一只股票的数据时命中L1缓存"""
+    print("\n🧪 测试股票数据缓存的L1层...")
+
+    try:
+        from tradingagents.dataflows.cache_manager import StockDataCache
+        from tradingagents.dataflows.memory_cache import MemoryCache
+
+        cache = StockDataCache(tempfile.mkdtemp(prefix="memory_cache_"))
+        cache.memory_cache = MemoryCache(max_bytes=64 * 1024 * 1024)
+        frame = _make_frame()
+        cache.save_stock_data("600519", frame, "2019-01-01", "2023-12-31", "tushare")
+        cache.save_fundamentals_data("600519", "基本面报告", "tushare")
+
+        metadata_reads = []
+        original_load_metadata = cache._load_metadata
+
+        def counting_load_metadata(cache_key):
+            metadata_reads.append(cache_key)
+            return original_load_metadata(cache_key)
+
+        cache._load_metadata = counting_load_metadata
+
+        def analysis_reads():
+            key = cache.find_cached_stock_data("600519", "2019-01-01", "2023-12-31", "tushare")
+            data = cache.load_stock_data(key)
+            fundamentals = cache.load_fundamentals_data(cache.find_cached_fundamentals_data("600519", "tushare"))
+            return data, fundamentals
+
+        data, fundamentals = analysis_reads()
+        warmup_reads = len(metadata_reads)
+        pd.testing.assert_frame_equal(data, frame)
+        assert fundamentals == "基本面报告"
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            analysis_reads()
+        l1_time = time.perf_counter() - start
+        assert len(metadata_reads) == warmup_reads, "命中L1后不应再读取元数据"
+
+        # L1条目与下级缓存同时过期（A股数据TTL为1小时）
+        memory_key = cache._memory_key("data", cache.find_cached_stock_data("600519", "2019-01-01", "2023-12-31", "tushare"))
+        expires_in = cache.memory_cache._entries[memory_key][1] - time.time()
+        assert 3500 < expires_in <= 3600, expires_in
+
+        cache.memory_cache.enabled = False
+        start = time.perf_counter()
+        for _ in range(rounds):
+            analysis_reads()
+        no_l1_time = time.perf_counter() - start
+
+        stats = cache.get_cache_stats()["memory_cache"]
+        assert stats["hits"] >= rounds * 4 and stats["entries"] >= 3
+
+        print(f"  📊 {rounds}次查找+加载: L1 {l1_time * 1000:.1f}ms, 无L1 {no_l1_time * 1000:.1f}ms "
+              f"({no_l1_time / l1_time:.1f}x)")
+        print(f"  ✅ 命中率 {stats['hit_rate']:.1%}，L1占用 {stats['size_mb']}MB")
+        return True
+
+    except Exception as e:
+        print(f"❌ 股票数据缓存L1层测试失败: {e}")
+        return False
+
+
+def test_save_refreshes_l1():
+    """重新保存后读取到最新数据，清理缓存时清空L1"""
+    print("\n🧪 测试保存与清理时的L1更新...")
+
+    try:
+        from tradingagents.dataflows.cache_manager import StockDataCache
+        from tradingagents.dataflows.memory_cache import MemoryCache
+
+        cache = StockDataCache(tempfile.mkdtemp(prefix="memory_cache_refresh_"))
+        cache.memory_cache = MemoryCache(max_bytes=1024 * 1024)
+        key = cache.save_stock_data("AAPL", "旧数据", "2024-01-01", "2024-01-31", "yfinance")
+        assert cache.load_stock_data(key) == "旧数据"
+        assert cache.find_cached_stock_data("AAPL", "2024-01-01", "2024-01-31", "yfinance") == key
+
+        assert cache.save_stock_data("AAPL", "新数据", "2024-01-01", "2024-01-31", "yfinance") == key
+        assert cache.load_stock_data(key) == "新数据"
+
+        cache.clear_old_cache(max_age_days=7)
+        assert cache.memory_cache.get_stats()["entries"] == 0
+
+        print("  ✅ 保存后L1缓存同步更新，清理后L1缓存清空")
+        return True
+
+    except Exception as e:
+        print(f"❌ 保存与清理时的L1更新测试失败: {e}")
+        return False
+
+
+def test_adaptive_l1_remaining_ttl():
+    """自适应缓存条目写入L1时只保留后端条目的剩余有效时间"""
+    print("\n🧪 测试自适应缓存L1条目的过期时间...")
+
+    try:
+        from tradingagents.dataflows.adaptive_cache import AdaptiveCacheSystem
+        from tradingagents.dataflows.integrated_cache import IntegratedCacheManager
+        from tradingagents.dataflows.memory_cache import MemoryCache
+
+        adaptive = AdaptiveCacheSystem.__new__(AdaptiveCacheSystem)
+        adaptive.logger = logging.getLogger(__name__)
+        adaptive.cache_dir = Path(tempfile.mkdtemp(prefix="memory_cache_adaptive_"))
+        adaptive.cache_config = {"ttl_settings": {"us_stock_data": 3600}}
+        adaptive.primary_backend = "file"
+        adaptive.fallback_enabled = False
+
+        manager = IntegratedCacheManager.__new__(IntegratedCacheManager)
+        manager.adaptive_cache = adaptive
+        manager.memory_cache = MemoryCache(max_bytes=1024 * 1024)
+        manager.use_adaptive = True
+
+        # 后端条目写入于 3599 秒前，只剩 1 秒有效期
+        cache_key = adaptive._get_cache_key("AAPL", "2024-01-01", "2024-01-31", "yfinance", "stock_data")
+        with open(adaptive.cache_dir / f"{cache_key}.pkl", "wb") as f:
+            pickle.dump({"data": "日线数据", "metadata": {"symbol": "AAPL", "data_type": "stock_data"},
+                         "timestamp": datetime.now() - timedelta(seconds=3599), "backend": "file"}, f)
+
+        assert manager.find_cached_stock_data("AAPL", "2024-01-01", "2024-01-31", "yfinance") == cache_key
+        assert manager.load_stock_data(cache_key) == "日线数据"
+        assert manager.memory_cache.get_stats()["hits"] == 1
+        time.sleep(1.2)
+        assert manager.load_stock_data(cache_key) is None
+        assert manager.find_cached_stock_data("AAPL", "2024-01-01", "2024-01-31", "yfinance") is None
+
+        # 新保存的条目按完整TTL缓存
+        assert manager.load_stock_data(adaptive.save_data("AAPL", "新数据")) == "新数据"
+        assert 3590 < adaptive.remaining_ttl_seconds(adaptive.load_entry(adaptive._get_cache_key("AAPL"))) <= 3600
+
+        print("  ✅ L1缓存条目随后端条目一同过期")
+        return True
+
+    except Exception as e:
+        print(f"❌ 自适应缓存L1过期时间测试失败: {e}")
+        return False
+
+
+def main():
+    """主测试函数"""
+    print("🚀 进程内L1缓存测试")
+    print("=" * 50)
+
+    results = [
+        test_lru_and_ttl(),
+        test_stock_cache_l1(),
+        test_save_refreshes_l1(),
+        test_adaptive_l1_remaining_ttl(),
+    ]
+
+    passed = sum(1 for r in results if r)
+    print(f"\n📊 测试结果: {passed}/{len(results)} 通过")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
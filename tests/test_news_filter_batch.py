@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+新闻过滤批量评分测试
+验证向量化规则评分与逐条评分一致、语义模型对整批新闻只编码一次，
+并对比逐条与批量过滤的耗时
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+NEWS_COUNT = 2000
+
+
+def _make_news(count=NEWS_COUNT):
+    templates = [
+        ('招商银行发布第三季度业绩报告', '招商银行今日发布财报，净利润同比增长8%，资产质量持续改善'),
+        ('上证180ETF指数基金自带杠铃策略', '前十大权重股分别为贵州茅台、招商银行600036、五粮液等'),
+        ('银行ETF指数多只成分股上涨', '银行板块今日表现强势，招商银行、工商银行等多只成分股上涨'),
+        ('招商银行与某科技公司签署战略合作协议', '双方将在数字化转型方面深度合作'),
+        ('A股三大指数集体上涨', '今日沪深两市成交活跃，板块轮动明显'),
+        ('600036董事会决议公告', None),
+    ]
+    rows = [templates[i % len(templates)] for i in range(count)]
+    return pd.DataFrame([{'新闻标题': f"{title}{i}", '新闻内容': content}
+                         for i, (title, content) in enumerate(rows)])
+
+
+class FakeSentenceModel:
+    """按字符哈希生成embedding的模拟语义模型，记录encode调用次数"""
+
+    def __init__(self):
+        self.encode_calls = 0
+
+    def encode(self, texts, batch_size=32):
+        self.encode_calls += 1
+        vectors = np.zeros((len(texts), 16), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for char in text:
+                vectors[row, ord(char) % 16] += 1
+        return vectors
+
+
+def _make_enhanced_filter(model):
+    from tradingagents.utils.enhanced_news_filter import EnhancedNewsFilter
+
+    news_filter = EnhancedNewsFilter('600036', '招商银行', use_semantic=False, use_local_model=False)
+    news_filter.use_semantic = True
+    news_filter.sentence_model = model
+    news_filter.company_embedding = model.encode(['招商银行', '招商银行股票', '600036'])
+    news_filter.company_embedding_normalized = news_filter._normalize_rows(news_filter.company_embedding)
+    return news_filter
+
+
+def test_vectorized_rule_scores():
+    """向量化规则评分与逐条评分结果一致"""
+    print("🧪 测试向量化规则评分...")
+
+    try:
+        from tradingagents.utils.news_filter import create_news_filter
+
+        news_filter = create_news_filter('600036')
+        news_df = _make_news(60)
+        titles, contents = news_filter.get_text_columns(news_df)
+
+        batch_scores = news_filter.calculate_relevance_scores(titles, contents)
+        scalar_scores = [news_filter.calculate_relevance_score(t, c) for t, c in zip(titles, contents)]
+        assert np.allclose(batch_scores, scalar_scores), (batch_scores[:6], scalar_scores[:6])
+
+        filtered = news_filter.filter_news(news_df, min_score=30)
+        assert list(filtered['relevance_score']) == sorted(filtered['relevance_score'], reverse=True)
+        assert (filtered['relevance_score'] >= 30).all()
+
+        print(f"  ✅ {len(news_df)}条新闻评分一致，保留 {len(filtered)} 条")
+        return True
+
+    except Exception as e:
+        print(f"❌ 向量化规则评分测试失败: {e}")
+        return False
+
+
+def test_batched_semantic_scores():
+    """语义相似度对整批新闻只编码一次，结果与逐条计算一致"""
+    print("\n🧪 测试批量语义评分...")
+
+    try:
+        model = FakeSentenceModel()
+        news_filter = _make_enhanced_filter(model)
+        news_df = _make_news(200)
+
+        model.encode_calls = 0
+        filtered = news_filter.filter_news_enhanced(news_df, min_score=0)
+        assert model.encode_calls == 1, model.encode_calls
+        assert len(filtered) == len(news_df)
+        for column in ('rule_score', 'semantic_score', 'classification_score', 'final_score'):
+            assert column in filtered.columns, column
+        assert filtered['semantic_score'].between(0, 100).all()
+
+        row = filtered.iloc[0]
+        single = news_filter.calculate_semantic_similarity(row['新闻标题'], row['新闻内容'] or '')
+        assert abs(single - row['semantic_score']) < 1e-3, (single, row['semantic_score'])
+
+        print(f"  ✅ {len(news_df)}条新闻1次编码，最高综合评分 {filtered['final_score'].max():.1f}")
+        return True
+
+    except Exception as e:
+        print(f"❌ 批量语义评分测试失败: {e}")
+        return False
+
+
+def test_batched_classification_scores():
+    """分类模型按批推理（未安装torch时跳过）"""
+    print("\n🧪 测试批量分类评分...")
+
+    try:
+        import torch
+    except ImportError:
+        print("  ⏭️ 未安装torch，跳过")
+        return True
+
+    try:
+        from tradingagents.utils.enhanced_news_filter import EnhancedNewsFilter
+
+        class FakeTokenizer:
+            def __call__(self, texts, **kwargs):
+                return {'lengths': torch.tensor([float(len(t)) for t in texts])}
+
+        class FakeModel:
+            def __init__(self):
+                self.calls = 0
+
+            def __call__(self, lengths):
+                self.calls += 1
+                logits = torch.stack([lengths / 100, torch.zeros_like(lengths)], dim=-1)
+                return type('Output', (), {'logits': logits})()
+
+        news_filter = EnhancedNewsFilter('600036', '招商银行', use_semantic=False, use_local_model=False, batch_size=8)
+        news_filter.use_local_model = True
+        news_filter.tokenizer = FakeTokenizer()
+        news_filter.classification_model = FakeModel()
+
+        texts = [f"新闻{i}" * (i + 1) for i in range(20)]
+        scores = news_filter.classify_news_relevance_batch(texts)
+        assert news_filter.classification_model.calls == 3
+        assert len(scores) == 20 and np.all(np.diff(scores) > 0)
+
+        print(f"  ✅ 20条文本分3批推理")
+        return True
+
+    except Exception as e:
+        print(f"❌ 批量分类评分测试失败: {e}")
+        return False
+
+
+def test_batch_performance():
+    """逐条评分与批量评分的耗时对比"""
+    print("\n🧪 测试批量评分耗时...")
+
+    try:
+        model = FakeSentenceModel()
+        news_filter = _make_enhanced_filter(model)
+        news_df = _make_news()
+
+        start = time.perf_counter()
+        for _, row in news_df.iterrows():
+            title, content = row['新闻标题'], row['新闻内容'] or ''
+            news_filter.calculate_relevance_score(title, content)
+            news_filter.calculate_semantic_similarity(title, content)
+        per_item_time = time.perf_counter() - start
+
+        model.encode_calls = 0
+        start = time.perf_counter()
+        news_filter.filter_news_enhanced(news_df, min_score=0)
+        batch_time = time.perf_counter() - start
+
+        print(f"  📊 {NEWS_COUNT}条新闻: 逐条 {per_item_time * 1000:.0f}ms，批量 {batch_time * 1000:.0f}ms "
+              f"({per_item_time / batch_time:.1f}x)，编码调用 {model.encode_calls} 次")
+        return True
+
+    except Exception as e:
+        print(f"❌ 批量评分耗时测试失败: {e}")
+        return False
+
+
+def main():
+    """主测试函数"""
+    print("🚀 新闻过滤批量评分测试")
+    print("=" * 50)
+
+    results = [
+        test_vectorized_rule_scores(),
+        test_batched_semantic_scores(),
+        test_batched_classification_scores(),
+        test_batch_performance(),
+    ]
+
+    passed = sum(1 for r in results if r)
+    print(f"\n📊 测试结果: {passed}/{len(results)} 通过")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+分析师并行执行测试
+用模拟的分析师/研究员节点构建完整工作流，对比串行与并行模式的耗时与报告结果
+"""
+
+import os
+import sys
+import time
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+ANALYST_DELAY = 0.3
+
+
+def _fake_analyst(report_field, tool_rounds=1):
+    """模拟分析师：先发起若干轮工具调用，再输出报告"""
+    from langchain_core.messages import AIMessage
+
+    def node(state):
+        time.sleep(ANALYST_DELAY)
+        tool_messages = [m for m in state["messages"] if getattr(m, "type", "") == "tool"]
+        if len(tool_messages) < tool_rounds:
+            call = {"name": "fake_tool", "args": {"symbol": state["company_of_interest"]},
+                    "id": f"{report_field}_{len(tool_messages)}"}
+            return {"messages": [AIMessage(content="", tool_calls=[call])]}
+        # 消息历史必须只包含本分析师自己的工具结果
+        assert all(m.content == report_field for m in tool_messages), "分析师消息历史未隔离"
+        return {"messages": [AIMessage(content="done")], report_field: f"{report_field} ok"}
+
+    return node
+
+
+def _fake_tool_node(report_field):
+    from langchain_core.messages import ToolMessage
+
+    def node(state):
+        call = state["messages"][-1].tool_calls[0]
+        return {"messages": [ToolMessage(content=report_field, tool_call_id=call["id"])]}
+
+    return node
+
+
+def _build_graph(parallel: bool):
+    """构建全部节点为模拟实现的工作流"""
+    from unittest import mock
+    from tradingagents.graph import setup as graph_setup
+    from tradingagents.graph.conditional_logic import ConditionalLogic
+
+    def debate_node(state):
+        debate = dict(state["investment_debate_state"])
+        debate["count"] = debate.get("count", 0) + 1
+        debate["current_response"] = "Bull" if debate["count"] % 2 else "Bear"
+        return {"investment_debate_state": debate}
+
+    def risk_node(state):
+        risk = dict(state["risk_debate_state"])
+        risk["count"] = risk.get("count", 0) + 1
+        risk["latest_speaker"] = ["Risky", "Safe", "Neutral"][(risk["count"] - 1) % 3]
+        return {"risk_debate_state": risk}
+
+    fields = graph_setup.ANALYST_REPORT_FIELDS
+    patches = {
+        "create_market_analyst": lambda *a: _fake_analyst(fields["market"]),
+        "create_social_media_analyst": lambda *a: _fake_analyst(fields["social"]),
+        "create_news_analyst": lambda *a: _fake_analyst(fields["news"]),
+        "create_fundamentals_analyst": lambda *a: _fake_analyst(fields["fundamentals"]),
+        "create_bull_researcher": lambda *a: debate_node,
+        "create_bear_researcher": lambda *a: debate_node,
+        "create_research_manager": lambda *a: (lambda state: {"investment_plan": "plan"}),
+        "create_trader": lambda *a: (lambda state: {"trader_investment_plan": "trade"}),
+        "create_risky_debator": lambda *a: risk_node,
+        "create_safe_debator": lambda *a: risk_node,
+        "create_neutral_debator": lambda *a: risk_node,
+        "create_risk_manager": lambda *a: (lambda state: {"final_trade_decision": "BUY"}),
+    }
+    tool_nodes = {analyst: _fake_tool_node(field) for analyst, field in fields.items()}
+
+    with mock.patch.multiple(graph_setup, **patches):
+        setup = graph_setup.GraphSetup(
+            None, None, None, tool_nodes, None, None, None, None, None,
+            ConditionalLogic(), {"parallel_analysts": parallel},
+        )
+        return setup.setup_graph(["market", "social", "news", "fundamentals"])
+
+
+def test_sequential_vs_parallel():
+    """并行模式应产出相同报告且耗时明显更短"""
+    print("🧪 测试分析师串行/并行执行...")
+
+    try:
+        from tradingagents.graph.propagation import Propagator
+
+        propagator = Propagator()
+        timings = {}
+        states = {}
+        for parallel in (False, True):
+            graph = _build_graph(parallel)
+            start = time.time()
+            states[parallel] = graph.invoke(
+                propagator.create_initial_state("AAPL", "2025-01-02"),
+                config={"recursion_limit": 100},
+            )
+            timings[parallel] = time.time() - start
+
+        for field in ("market_report", "sentiment_report", "news_report", "fundamentals_report"):
+            assert states[True][field] == states[False][field] == f"{field} ok", field
+        assert states[True]["final_trade_decision"] == "BUY"
+        assert timings[True] < timings[False] * 0.6, timings
+
+        print(f"  📊 串行: {timings[False]:.2f}秒, 并行: {timings[True]:.2f}秒, "
+              f"加速比: {timings[False] / timings[True]:.1f}x")
+        return True
+
+    except Exception as e:
+        print(f"❌ 并行执行测试失败: {e}")
+        return False
+
+
+def main():
+    """主测试函数"""
+    print("🚀 分析师并行执行测试")
+    print("=" * 50)
+
+    results = [
+        test_sequential_vs_parallel(),
+    ]
+
+    passed = sum(1 for r in results if r)
+    print(f"\n📊 测试结果: {passed}/{len(results)} 通过")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+并发反思测试
+使用模拟LLM与记忆对象，验证 Reflector.reflect_all 的并发执行、失败隔离与记忆写入
+"""
+
+import os
+import sys
+import time
+import threading
+from types import SimpleNamespace
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+LLM_DELAY = 0.3
+
+
+class FakeLLM:
+    """模拟LLM：固定延迟，指定组件的反思抛出异常"""
+
+    def __init__(self, failing_report=None):
+        self.failing_report = failing_report
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def invoke(self, messages):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(LLM_DELAY)
+            human = messages[-1][1]
+            if self.failing_report and self.failing_report in human:
+                raise RuntimeError("LLM调用超时")
+            return SimpleNamespace(content=f"reflection for {human.split('Analysis/Decision: ')[1][:12]}")
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+class FakeMemory:
+    def __init__(self):
+        self.added = []
+        self.embedded = 0
+
+    def get_embeddings(self, texts):
+        self.embedded += len(texts)
+        return [[1.0] for _ in texts]
+
+    def add_situations(self, situations_and_advice):
+        self.added.extend(situations_and_advice)
+
+
+def _make_state():
+    return {
+        "market_report": "market", "sentiment_report": "sentiment",
+        "news_report": "news", "fundamentals_report": "fundamentals",
+        "investment_debate_state": {"bull_history": "bull case", "bear_history": "bear case",
+                                    "judge_decision": "judge says buy"},
+        "trader_investment_plan": "trader plan",
+        "risk_debate_state": {"judge_decision": "risk judge ok"},
+    }
+
+
+def test_concurrent_reflection():
+    """五个组件并发反思，单个失败不影响其他组件写入记忆"""
+    print("🧪 测试并发反思与失败隔离...")
+
+    try:
+        from tradingagents.graph.reflection import Reflector
+
+        llm = FakeLLM(failing_report="trader plan")
+        reflector = Reflector(llm)
+        memories = {name: FakeMemory() for name in ("bull", "bear", "trader", "invest_judge", "risk_manager")}
+
+        start = time.time()
+        results = reflector.reflect_all(_make_state(), 0.05, memories, max_workers=3)
+        elapsed = time.time() - start
+
+        assert results["trader"] is None
+        assert all(results[name] for name in ("bull", "bear", "invest_judge", "risk_manager"))
+        assert memories["trader"].added == []
+        assert all(len(memories[name].added) == 1 for name in ("bull", "bear", "invest_judge", "risk_manager"))
+        assert llm.max_active == 3, f"并发上限未生效: {llm.max_active}"
+        assert elapsed < LLM_DELAY * 5 * 0.6, f"未并发执行: {elapsed:.2f}秒"
+
+        print(f"  📊 并发耗时: {elapsed:.2f}秒 (串行约 {LLM_DELAY * 5:.1f}秒)，最大并发: {llm.max_active}")
+        return True
+
+    except Exception as e:
+        print(f"❌ 并发反思测试失败: {e}")
+        return False
+
+
+def main():
+    """主测试函数"""
+    print("🚀 并发反思测试")
+    print("=" * 50)
+
+    results = [
+        test_concurrent_reflection(),
+    ]
+
+    passed = sum(1 for r in results if r)
+    print(f"\n📊 测试结果: {passed}/{len(results)} 通过")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+缓存数据压缩编解码测试
+验证大文本/DataFrame 压缩后写入 Redis/MongoDB、读取时透明解压，
+未压缩的旧缓存条目仍可读取，并在缓存统计中报告压缩率和编解码耗时
+"""
+
+import os
+import sys
+import json
+import base64
+import pickle
+import time
+
+import numpy as np
+import pandas as pd
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+
+def _make_report():
+    """模拟一份几十KB的基本面分析报告"""
+    lines = [f"| {2015 + i % 10}Q{i % 4 + 1} | 营业收入 {1000 + i * 7.3:.2f} 亿元 | 净利润 {300 + i * 2.1:.2f} 亿元 | "
+             f"毛利率 {91 + (i % 7) * 0.1:.1f}% | ROE {30 + (i % 5) * 0.4:.1f}% |" for i in range(400)]
+    return "# 贵州茅台(600519) 基本面分析报告\n\n" + "\n".join(lines)
+
+
+def _make_frame(rows=1260):
+    dates = pd.bdate_range("2019-01-01", periods=rows)
+    close = 1500 + np.cumsum(np.random.default_rng(0).normal(0, 5, rows)).round(2)
+    return pd.DataFrame({"date": dates, "open": close, "high": close + 5, "low": close - 5,
+                         "close": close, "volume": np.full(rows, 2_000_000)})
+
+
+class FakeRedis:
+    """与 redis-py 接口一致的内存实现（值按 decode_responses 的设置保存为 str 或 bytes）"""
+
+    def __init__(self, decode_responses=True):
+        self.store = {}
+        self.decode_responses = decode_responses
+
+    def setex(self, key, ttl, value):
+        if isinstance(value, str) and not self.decode_responses:
+            value = value.encode("utf-8")
+        self.store[key] = value
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def exists(self, key):
+        return key in self.store
+
+    def info(self):
+        return {"used_memory_human": f"{sum(len(v) for v in self.store.values()) / 1024:.1f}K"}
+
+
+class FakeCollection:
+    def __init__(self):
+        self.docs = {}
+
+    def replace_one(self, query, doc, upsert=False):
+        self.docs[query["_id"]] = dict(doc)
+
+    def find_one(self, query, sort=None):
+        return self.docs.get(query["_id"])
+
+
+class FakeDatabase(dict):
+    def __missing__(self, name):
+        self[name] = FakeCollection()
+        return self[name]
+
+    def __getattr__(self, name):
+        return self[name]
+
+
+def test_codec_roundtrip():
+    """超过阈值的数据压缩并带格式标记，小数据和旧数据原样返回"""
+    print("🧪 测试压缩编解码...")
+
+    try:
+        from tradingagents.dataflows import frame_serializer
+        from tradingagents.dataflows.payload_codec import PayloadCodec, is_compressed, default_codec_name
+
+        codec = PayloadCodec(threshold=1024)
+        report = _make_report()
+        encoded = codec.encode(report)
+        assert is_compressed(encoded) and len(encoded) < len(report.encode("utf-8")) / 3
+        assert codec.decode(encoded) == report
+
+        assert codec.encode("短文本") == "短文本"
+        frame_bytes = frame_serializer.dumps_frame(_make_frame())
+        assert frame_serializer.loads_frame(codec.decode(codec.encode(frame_bytes))).equals(_make_frame())
+
+        # 旧条目：未压缩的文本、pickle 字节和 DataFrame 序列化数据
+        legacy_pickle = pickle.dumps({"data": report})
+        for legacy in (report, legacy_pickle, frame_bytes):
+            assert codec.decode(legacy) is legacy
+
+        # 其他算法写入的数据同样可以解码；none 只解码不压缩
+        assert codec.decode(PayloadCodec("zlib").encode(report)) == report
+        assert PayloadCodec("none").encode(report) == report
+        assert PayloadCodec("unknown").codec == default_codec_name()
+
+        stats = codec.get_stats()
+        assert stats["compressed"] == 2 and stats["encoded"] == 3 and stats["decompressed"] == 3
+        print(f"  ✅ {stats['codec']} 压缩率 {stats['compression_ratio']}x，"
+              f"编码 {stats['encode_ms']}ms，解码 {stats['decode_ms']}ms")
+        return True
+
+    except Exception as e:
+        print(f"❌ 压缩编解码测试失败: {e}")
+        return False
+
+
+def test_db_cache_manager():
+    """DatabaseCacheManager 压缩写入Redis/MongoDB，读取时兼容旧格式"""
+    print("\n🧪 测试数据库缓存管理器的压缩...")
+
+    try:
+        from tradingagents.dataflows import frame_serializer
+        from tradingagents.dataflows.db_cache_manager import DatabaseCacheManager
+        from tradingagents.dataflows.payload_codec import PayloadCodec, is_compressed
+
+        manager = DatabaseCacheManager.__new__(DatabaseCacheManager)
+        manager.mongodb_client = None
+        manager.mongodb_db = FakeDatabase()
+        manager.redis_client = FakeRedis()
+        manager.codec = PayloadCodec(threshold=1024)
+
+        report = _make_report()
+        frame = _make_frame()
+        stock_key = manager.save_stock_data("600519", frame, "2019-01-01", "2023-12-31", "tushare")
+        text_key = manager.save_stock_data("AAPL", report, "2024-01-01", "2024-03-01", "yfinance")
+        fundamentals_key = manager.save_fundamentals_data("600519", report, "2024-03-01", "tushare")
+        news_key = manager.save_news_data("600519", "短新闻", "2024-03-01", "2024-03-01", "东方财富")
+
+        assert is_compressed(manager.mongodb_db.fundamentals_data.docs[fundamentals_key]["data"])
+        redis_size = len(manager.redis_client.store[fundamentals_key].encode("utf-8"))
+        assert redis_size < len(report.encode("utf-8")) / 2
+
+        # Redis 命中
+        pd.testing.assert_frame_equal(manager.load_stock_data(stock_key), frame)
+        assert manager.load_stock_data(text_key) == report
+        assert manager.load_fundamentals_data(fundamentals_key) == report
+        assert manager.load_news_data(news_key) == "短新闻"
+
+        # Redis 过期后从 MongoDB 读取
+        manager.redis_client.store.clear()
+        pd.testing.assert_frame_equal(manager.load_stock_data(stock_key), frame)
+        assert manager.load_fundamentals_data(fundamentals_key) == report
+
+        # 旧版未压缩条目
+        manager.redis_client.store["legacy_frame"] = json.dumps({
+            "data": base64.b64encode(frame_serializer.dumps_frame(frame)).decode("ascii"),
+            "data_format": "dataframe_binary"})
+        manager.redis_client.store["legacy_text"] = json.dumps({"data": report, "data_format": "text"},
+                                                               ensure_ascii=False)
+        manager.mongodb_db.news_data.docs["legacy_news"] = {"_id": "legacy_news", "data": report}
+        pd.testing.assert_frame_equal(manager.load_stock_data("legacy_frame"), frame)
+        assert manager.load_stock_data("legacy_text") == report
+        assert manager.load_news_data("legacy_news") == report
+
+        manager.mongodb_db = None
+        codec_stats = manager.get_cache_stats()["codec"]
+        assert codec_stats["compressed"] >= 3 and codec_stats["compression_ratio"] > 1
+        print(f"  ✅ 基本面报告 {len(report.encode('utf-8')) // 1024}KB -> Redis {redis_size // 1024}KB，"
+              f"整体压缩率 {codec_stats['compression_ratio']}x")
+        return True
+
+    except Exception as e:
+        print(f"❌ 数据库缓存管理器压缩测试失败: {e}")
+        return False
+
+
+def test_tdx_reads_compressed_stock_data():
+    """通达信接口直接读取 stock_data 集合时，解压数据库缓存管理器写入的数据"""
+    print("\n🧪 测试通达信接口读取压缩的数据库缓存...")
+
+    try:
+        from datetime import datetime
+        from tradingagents.config import database_manager
+        from tradingagents.dataflows import tdx_utils
+        from tradingagents.dataflows.db_cache_manager import DatabaseCacheManager
+        from tradingagents.dataflows.payload_codec import PayloadCodec, is_compressed
+
+        class QueryCollection(FakeCollection):
+            def find_one(self, query, sort=None):
+                docs = [doc for doc in self.docs.values()
+                        if doc["symbol"] == query["symbol"] and doc["market_type"] == query["market_type"]
+                        and doc["created_at"] >= query["created_at"]["$gte"]]
+                return max(docs, key=lambda doc: doc["created_at"]) if docs else None
+
+        database = FakeDatabase()
+        database["stock_data"] = QueryCollection()
+
+        class FakeDatabaseManager:
+            mongodb_config = {"database": "tradingagents"}
+
+            def is_mongodb_available(self):
+                return True
+
+            def get_mongodb_client(self):
+                return {"tradingagents": database}
+
+        manager = DatabaseCacheManager.__new__(DatabaseCacheManager)
+        manager.mongodb_client = None
+        manager.mongodb_db = database
+        manager.redis_client = None
+        manager.codec = PayloadCodec(threshold=1024)
+
+        report = _make_report()
+        manager.save_stock_data("600519", report, "2024-01-01", "2024-03-01", "tdx", market_type="china")
+        assert is_compressed(next(iter(database.stock_data.docs.values()))["data"])
+        database.stock_data.docs["legacy"] = {"_id": "legacy", "symbol": "000001", "market_type": "china",
+                                              "created_at": datetime.utcnow(), "data": "旧版未压缩数据"}
+
+        original = database_manager.get_database_manager
+        database_manager.get_database_manager = lambda: FakeDatabaseManager()
+        try:
+            assert tdx_utils.get_china_stock_data("600519", "2024-01-01", "2024-03-01") == report
+            assert tdx_utils.get_china_stock_data("000001", "2024-01-01", "2024-03-01") == "旧版未压缩数据"
+        finally:
+            database_manager.get_database_manager = original
+
+        print("  ✅ 压缩的缓存数据解压为文本，旧版未压缩数据原样返回")
+        return True
+
+    except Exception as e:
+        print(f"❌ 通达信接口读取压缩缓存测试失败: {e}")
+        return False
+
+
+def test_adaptive_cache():
+    """自适应缓存的Redis/MongoDB后端压缩写入，旧版pickle条目仍可读取"""
+    print("\n🧪 测试自适应缓存的压缩...")
+
+    try:
+        import logging
+        from datetime import datetime, timedelta
+        from tradingagents.dataflows.adaptive_cache import AdaptiveCacheSystem
+        from tradingagents.dataflows.payload_codec import PayloadCodec, is_compressed
+
+        class FakeMongoClient:
+            def __init__(self):
+                self.tradingagents = FakeDatabase()
+
+        class FakeDatabaseManager:
+            def __init__(self):
+                self.redis = FakeRedis(decode_responses=False)
+                self.mongodb = FakeMongoClient()
+
+            def get_redis_client(self):
+                return self.redis
+
+            def get_mongodb_client(self):
+                return self.mongodb
+
+        cache = AdaptiveCacheSystem.__new__(AdaptiveCacheSystem)
+        cache.logger = logging.getLogger(__name__)
+        cache.db_manager = FakeDatabaseManager()
+        cache.codec = PayloadCodec(threshold=1024)
+
+        report = _make_report()
+        frame = _make_frame()
+        metadata = {"symbol": "600519"}
+        assert cache._save_to_redis("redis_report", report, metadata, 3600)
+        assert is_compressed(cache.db_manager.redis.store["redis_report"])
+        assert cache._load_from_redis("redis_report")["data"] == report
+
+        assert cache._save_to_mongodb("mongo_frame", frame, metadata, 3600)
+        assert cache._save_to_mongodb("mongo_report", report, metadata, 3600)
+        pd.testing.assert_frame_equal(cache._load_from_mongodb("mongo_frame")["data"], frame)
+        assert cache._load_from_mongodb("mongo_report")["data"] == report
+
+        # 旧版条目：未压缩的pickle（Redis）与十六进制pickle（MongoDB）
+        cache.db_manager.redis.store["legacy"] = pickle.dumps(
+            {"data": report, "metadata": metadata, "timestamp": datetime.now().isoformat(), "backend": "redis"})
+        cache.db_manager.mongodb.tradingagents.cache.docs["legacy"] = {
+            "_id": "legacy", "data": pickle.dumps(report).hex(), "data_type": "pickle", "metadata": metadata,
+            "timestamp": datetime.now(), "expires_at": datetime.now() + timedelta(hours=1)}
+        assert cache._load_from_redis("legacy")["data"] == report
+        assert cache._load_from_mongodb("legacy")["data"] == report
+
+        print(f"  ✅ Redis/MongoDB 条目压缩写入，旧条目正常读取")
+        return True
+
+    except Exception as e:
+        print(f"❌ 自适应缓存压缩测试失败: {e}")
+        return False
+
+
+def test_codec_performance(rounds: int = 200):
+    """对比各压缩算法的压缩率与编解码耗时"""
+    print("\n🧪 测试压缩算法性能...")
+
+    try:
+        from tradingagents.dataflows import frame_serializer
+        from tradingagents.dataflows.payload_codec import PayloadCodec, _COMPRESSORS
+
+        samples = {"基本面报告": _make_report(), "5年日线": frame_serializer.dumps_frame(_make_frame())}
+        for name in sorted(_COMPRESSORS):
+            codec = PayloadCodec(name)
+            for label, sample in samples.items():
+                start = time.perf_counter()
+                for _ in range(rounds):
+                    encoded = codec.encode(sample)
+                encode_ms = (time.perf_counter() - start) * 1000 / rounds
+                start = time.perf_counter()
+                for _ in range(rounds):
+                    assert codec.decode(encoded) == sample
+                decode_ms = (time.perf_counter() - start) * 1000 / rounds
+                raw_size = len(sample.encode("utf-8")) if isinstance(sample, str) else len(sample)
+                print(f"  📊 {name:5s} {label}: {raw_size / 1024:.1f}KB -> {len(encoded) / 1024:.1f}KB "
+                      f"({raw_size / len(encoded):.1f}x)，编码 {encode_ms:.3f}ms，解码 {decode_ms:.3f}ms")
+
+        print("  ✅ 性能测试完成")
+        return True
+
+    except Exception as e:
+        print(f"❌ 压缩算法性能测试失败: {e}")
+        return False
+
+
+def main():
+    """主测试函数"""
+    print("🚀 缓存数据压缩编解码测试")
+    print("=" * 50)
+
+    results = [
+        test_codec_roundtrip(),
+        test_db_cache_manager(),
+        test_tdx_reads_compressed_stock_data(),
+        test_adaptive_cache(),
+        test_codec_performance(),
+    ]
+
+    passed = sum(1 for r in results if r)
+    print(f"\n📊 测试结果: {passed}/{len(results)} 通过")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
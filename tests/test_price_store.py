@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+价格序列列式存储测试
+验证内存映射切片与 pd.read_csv + 字符串日期过滤结果一致，并对比读取耗时
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+import pandas as pd
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from test_indicator_engine_performance import build_price_data
+
+
+def _legacy_read(csv_path: str, start_date: str, end_date: str) -> pd.DataFrame:
+    """旧实现：每次完整解析 CSV 并按 DateOnly 字符串过滤"""
+    data = pd.read_csv(csv_path)
+    data["DateOnly"] = data["Date"].str[:10]
+    filtered = data[(data["DateOnly"] >= start_date) & (data["DateOnly"] <= end_date)]
+    return filtered.drop("DateOnly", axis=1)
+
+
+def test_range_matches_csv_filter():
+    """区间切片应与旧版过滤结果完全一致（含原行号索引）"""
+    print("🧪 测试区间切片一致性...")
+
+    work_dir = tempfile.mkdtemp(prefix="price_store_")
+    try:
+        from tradingagents.dataflows.price_store import PriceSeriesStore
+
+        csv_path = os.path.join(work_dir, "TEST-YFin-data-2015-01-01-2025-03-25.csv")
+        build_price_data().to_csv(csv_path, index=False)
+
+        store = PriceSeriesStore(os.path.join(work_dir, "store"))
+        for start, end in [("2015-01-01", "2015-03-01"), ("2020-02-29", "2020-12-31"),
+                           ("2024-06-01", "2030-01-01"), ("2030-01-01", "2031-01-01")]:
+            expected = _legacy_read(csv_path, start, end)
+            actual = store.read_range(csv_path, start, end)
+            assert expected.to_string() == actual.to_string(), f"{start}~{end} 结果不一致"
+            print(f"  ✅ {start} ~ {end}: {len(actual)} 行")
+
+        # 源文件变化后应自动重新转换
+        build_price_data(100).to_csv(csv_path, index=False)
+        assert len(store.load(csv_path)) == 100
+        print(f"  ✅ 源文件更新后自动重建: {store.stats}")
+
+        return True
+
+    except Exception as e:
+        print(f"❌ 区间切片测试失败: {e}")
+        return False
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def test_read_performance(iterations: int = 200):
+    """对比重复读取同一标的的耗时"""
+    print(f"\n⏱️ 测试重复读取耗时 ({iterations} 次)...")
+
+    work_dir = tempfile.mkdtemp(prefix="price_store_")
+    try:
+        from tradingagents.dataflows.price_store import PriceSeriesStore
+
+        csv_path = os.path.join(work_dir, "TEST-YFin-data-2015-01-01-2025-03-25.csv")
+        build_price_data().to_csv(csv_path, index=False)
+        store = PriceSeriesStore(os.path.join(work_dir, "store"))
+
+        start = time.time()
+        for _ in range(iterations):
+            _legacy_read(csv_path, "2024-01-01", "2024-03-31")
+        legacy_time = time.time() - start
+
+        store.load(csv_path)  # 首次转换不计入
+        start = time.time()
+        for _ in range(iterations):
+            store.read_range(csv_path, "2024-01-01", "2024-03-31")
+        store_time = time.time() - start
+
+        print(f"  📊 pd.read_csv: {legacy_time / iterations * 1000:.2f} ms/次")
+        print(f"  📊 列式存储: {store_time / iterations * 1000:.2f} ms/次")
+        print(f"  🚀 提升: {legacy_time / store_time:.1f}x")
+        return True
+
+    except Exception as e:
+        print(f"❌ 读取性能测试失败: {e}")
+        return False
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main():
+    """主测试函数"""
+    print("🚀 价格序列列式存储测试")
+    print("=" * 50)
+
+    results = [
+        test_range_matches_csv_filter(),
+        test_read_performance(),
+    ]
+
+    passed = sum(1 for r in results if r)
+    print(f"\n📊 测试结果: {passed}/{len(results)} 通过")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+进度通道测试
+验证进度写入后等待方被立即唤醒（推送模式）、Redis不可用时不会每次调用都重连，
+以及进程内只保留未结束和刚结束的分析的进度
+"""
+
+import os
+import sys
+import time
+import threading
+import tempfile
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+
+def test_push_update_wakes_waiter():
+    """文件存储模式下，进度更新应立即唤醒等待方"""
+    print("🧪 测试进度推送...")
+
+    original_cwd = os.getcwd()
+    os.environ["REDIS_ENABLED"] = "false"
+    try:
+        os.chdir(tempfile.mkdtemp(prefix="progress_channel_"))
+        from web.utils.async_progress_tracker import (
+            AsyncProgressTracker, wait_for_progress_update, get_progress_by_id
+        )
+        from web.utils.progress_channel import get_progress_broadcaster
+
+        tracker = AsyncProgressTracker("push_test", ["market"], 1, "dashscope")
+        version, data = wait_for_progress_update("push_test", 0, timeout=0.1)
+        assert data is not None and data["status"] == "running"
+
+        def write_later():
+            time.sleep(0.2)
+            tracker.mark_completed("分析完成")
+
+        threading.Thread(target=write_later).start()
+        start = time.time()
+        new_version, new_data = version, data
+        while new_data is None or new_data["status"] != "completed":
+            new_version, new_data = wait_for_progress_update("push_test", new_version, timeout=5)
+            assert new_data is not None, "等待超时"
+        waited = time.time() - start
+
+        assert new_version > version
+        assert waited < 1.0, f"等待方未被及时唤醒: {waited:.2f}秒"
+        assert get_progress_by_id("push_test")["status"] == "completed"
+
+        # 没有新进度时按超时返回
+        time.sleep(0.1)
+        latest_version = get_progress_broadcaster().version("push_test")
+        _, none_data = wait_for_progress_update("push_test", latest_version, timeout=0.1)
+        assert none_data is None
+
+        print(f"  ✅ 写入后 {waited:.2f}秒 收到推送")
+        return True
+
+    except Exception as e:
+        print(f"❌ 进度推送测试失败: {e}")
+        return False
+    finally:
+        os.chdir(original_cwd)
+
+
+def test_broadcaster_prunes_finished():
+    """结束的分析在保留时间后移除，记录数超过上限时移除最久未更新的分析"""
+    print("\n🧪 测试进度记录清理...")
+
+    try:
+        from web.utils.progress_channel import ProgressBroadcaster
+
+        broadcaster = ProgressBroadcaster(finished_retention=0.1, max_entries=3)
+        broadcaster.publish("done", {"status": "completed"})
+        broadcaster.publish("failed", {"status": "failed"})
+        broadcaster.publish("running", {"status": "running"})
+        # 结束后仍在保留时间内，等待方可以读取最终状态
+        assert broadcaster.wait_for_update("done", 0, timeout=0.1) == (1, {"status": "completed"})
+
+        time.sleep(0.15)
+        broadcaster.publish("running", {"status": "running", "step": 2})
+        assert broadcaster.version("done") == 0 and broadcaster.version("failed") == 0
+        assert broadcaster.version("running") == 2
+
+        for i in range(5):
+            broadcaster.publish(f"analysis_{i}", {"status": "running"})
+        assert list(broadcaster._latest) == ["analysis_2", "analysis_3", "analysis_4"]
+
+        print("  ✅ 结束的分析按保留时间移除，记录数不超过上限")
+        return True
+
+    except Exception as e:
+        print(f"❌ 进度记录清理测试失败: {e}")
+        return False
+
+
+def test_redis_unavailable_backoff():
+    """Redis不可用时在冷却时间内直接返回None，不重复建立连接"""
+    print("\n🧪 测试Redis不可用时的重连冷却...")
+
+    try:
+        from web.utils import progress_channel
+
+        os.environ.update(REDIS_ENABLED="true", REDIS_HOST="127.0.0.1", REDIS_PORT="1")
+        assert progress_channel.get_redis_client() is None
+
+        start = time.time()
+        for _ in range(1000):
+            assert progress_channel.get_redis_client() is None
+        elapsed = time.time() - start
+        assert elapsed < 0.5, f"冷却期内仍在重连: {elapsed:.2f}秒"
+
+        print(f"  ✅ 1000次调用耗时 {elapsed * 1000:.1f}ms")
+        return True
+
+    except Exception as e:
+        print(f"❌ Redis冷却测试失败: {e}")
+        return False
+    finally:
+        os.environ["REDIS_ENABLED"] = "false"
+
+
+def main():
+    """主测试函数"""
+    print("🚀 进度通道测试")
+    print("=" * 50)
+
+    results = [
+        test_push_update_wakes_waiter(),
+        test_broadcaster_prunes_finished(),
+        test_redis_unavailable_backoff(),
+    ]
+
+    passed = sum(1 for r in results if r)
+    print(f"\n📊 测试结果: {passed}/{len(results)} 通过")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+实时新闻并发获取测试
+使用模拟新闻源验证并发获取、慢源丢弃、异常隔离与耗时统计
+"""
+
+import os
+import sys
+import time
+from datetime import datetime
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+
+def _make_aggregator(delays, failing=()):
+    """构造各新闻源按指定延迟返回的聚合器"""
+    from tradingagents.dataflows.realtime_news_utils import RealtimeNewsAggregator, NewsItem
+
+    class FakeAggregator(RealtimeNewsAggregator):
+        def _fake(self, name, ticker):
+            time.sleep(delays[name])
+            if name in failing:
+                raise RuntimeError(f"{name} 不可用")
+            return [NewsItem(
+                title=f"{ticker} {name} 最新公告与业绩快报",
+                content="",
+                source=name,
+                publish_time=datetime.now(),
+                url="",
+                urgency="low",
+                relevance_score=0.5,
+            )]
+
+        def _get_finnhub_realtime_news(self, ticker, hours_back):
+            return self._fake("FinnHub", ticker)
+
+        def _get_alpha_vantage_news(self, ticker, hours_back):
+            return self._fake("Alpha Vantage", ticker)
+
+        def _get_newsapi_news(self, ticker, hours_back):
+            return self._fake("NewsAPI", ticker)
+
+        def _get_chinese_finance_news(self, ticker, hours_back):
+            return self._fake("中文财经", ticker)
+
+    aggregator = FakeAggregator()
+    aggregator.newsapi_key = "test"
+    return aggregator
+
+
+def test_concurrent_fetch():
+    """总耗时应接近最慢新闻源而不是各源之和"""
+    print("🧪 测试并发获取...")
+
+    try:
+        delays = {"FinnHub": 0.3, "Alpha Vantage": 0.3, "NewsAPI": 0.3, "中文财经": 0.3}
+        aggregator = _make_aggregator(delays)
+
+        start = time.time()
+        result = aggregator.fetch_news("AAPL", max_news=10)
+        elapsed = time.time() - start
+
+        assert len(result.news) == 4
+        assert all(t.status == "ok" for t in result.source_timings)
+        assert elapsed < sum(delays.values()) * 0.6, f"未并发执行: {elapsed:.2f}秒"
+
+        print(f"  ✅ 4个新闻源总耗时 {elapsed:.2f}秒 (串行约 {sum(delays.values()):.1f}秒)")
+        return True
+
+    except Exception as e:
+        print(f"❌ 并发获取测试失败: {e}")
+        return False
+
+
+def test_slow_and_failing_sources():
+    """慢源超过时限被丢弃，异常源不影响其他结果"""
+    print("\n🧪 测试慢源丢弃与异常隔离...")
+
+    try:
+        delays = {"FinnHub": 0.05, "Alpha Vantage": 2.0, "NewsAPI": 0.05, "中文财经": 0.05}
+        aggregator = _make_aggregator(delays, failing=("NewsAPI",))
+
+        start = time.time()
+        result = aggregator.fetch_news("AAPL", source_timeout=0.5, total_timeout=5)
+        elapsed = time.time() - start
+
+        status = {t.source: t.status for t in result.source_timings}
+        assert status == {"FinnHub": "ok", "Alpha Vantage": "timeout", "NewsAPI": "error", "中文财经": "ok"}, status
+        assert len(result.news) == 2
+        assert elapsed < 1.5, f"慢源阻塞了结果: {elapsed:.2f}秒"
+        assert aggregator.last_fetch_result is result
+
+        for timing in result.source_timings:
+            print(f"  📊 {timing.source}: {timing.status} {timing.elapsed:.2f}秒 {timing.count}条")
+        print(f"  ✅ 总耗时 {elapsed:.2f}秒")
+        return True
+
+    except Exception as e:
+        print(f"❌ 慢源测试失败: {e}")
+        return False
+
+
+def main():
+    """主测试函数"""
+    print("🚀 实时新闻并发获取测试")
+    print("=" * 50)
+
+    results = [
+        test_concurrent_fetch(),
+        test_slow_and_failing_sources(),
+    ]
+
+    passed = sum(1 for r in results if r)
+    print(f"\n📊 测试结果: {passed}/{len(results)} 通过")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+并发请求合并测试
+验证多个线程同时请求同一只股票时只访问一次数据源、共享结果与异常，
+并统计被合并的请求数
+"""
+
+import os
+import sys
+import time
+import threading
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+THREADS = 8
+
+
+def _run_concurrently(target, count=THREADS):
+    """同时启动多个线程执行 target，返回各线程的结果或异常"""
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def worker(index):
+        barrier.wait()
+        try:
+            results[index] = target(index)
+        except Exception as e:
+            results[index] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_coalescing():
+    """相同键的并发请求只执行一次，不同键互不影响"""
+    print("🧪 测试并发请求合并...")
+
+    try:
+        from tradingagents.dataflows.single_flight import SingleFlight, single_flight_key
+
+        group = SingleFlight()
+        executions = []
+
+        def fetch(symbol):
+            executions.append(symbol)
+            time.sleep(0.2)
+            return f"{symbol} 数据"
+
+        start = time.perf_counter()
+        results = _run_concurrently(lambda i: group.do(single_flight_key("stock_data", " 600519", "2024-01-01"),
+                                                       lambda: fetch("600519")))
+        elapsed = time.perf_counter() - start
+        assert results == ["600519 数据"] * THREADS and executions == ["600519"]
+        assert elapsed < 0.4, elapsed
+
+        # 不同股票并发执行
+        executions.clear()
+        results = _run_concurrently(lambda i: group.do(single_flight_key("stock_data", f"00000{i % 2}"),
+                                                       lambda: fetch(f"00000{i % 2}")), count=4)
+        assert sorted(set(executions)) == ["000000", "000001"] and len(executions) == 2
+
+        stats = group.get_stats()
+        assert stats["calls"] == THREADS + 4 and stats["executions"] == 3 and stats["coalesced"] == THREADS + 1
+        assert stats["by_namespace"]["stock_data"]["coalesced"] == THREADS + 1
+        assert group.in_flight() == 0
+
+        print(f"  ✅ {THREADS}个并发请求只执行1次（耗时 {elapsed:.2f}秒），合并 {stats['coalesced']} 个请求")
+        return True
+
+    except Exception as e:
+        print(f"❌ 并发请求合并测试失败: {e}")
+        return False
+
+
+def test_errors_and_reentry():
+    """异常在所有等待的请求中重新抛出；同一线程重入相同请求不会死锁"""
+    print("\n🧪 测试异常共享与重入...")
+
+    try:
+        from tradingagents.dataflows.single_flight import SingleFlight
+
+        group = SingleFlight()
+        attempts = []
+
+        def failing():
+            attempts.append(1)
+            time.sleep(0.1)
+            raise ConnectionError("数据源超时")
+
+        results = _run_concurrently(lambda i: group.do(("stock_data", "AAPL"), failing))
+        assert all(isinstance(r, ConnectionError) for r in results) and len(attempts) == 1
+        assert group.get_stats()["errors"] == 1
+
+        # 失败后新的请求重新执行
+        assert group.do(("stock_data", "AAPL"), lambda: "ok") == "ok"
+
+        nested = group.do(("stock_data", "000001"), lambda: group.do(("stock_data", "000001"), lambda: "inner"))
+        assert nested == "inner"
+
+        print("  ✅ 异常共享给所有等待的请求，失败后可重新获取，重入请求直接执行")
+        return True
+
+    except Exception as e:
+        print(f"❌ 异常共享与重入测试失败: {e}")
+        return False
+
+
+def test_provider_coalescing():
+    """多个分析线程同时获取同一只A股：只调用一次统一数据接口、只写入一次缓存"""
+    print("\n🧪 测试A股数据提供器的请求合并...")
+
+    try:
+        import tradingagents.dataflows.data_source_manager as data_source_manager
+        from tradingagents.dataflows.optimized_china_data import OptimizedChinaDataProvider
+        from tradingagents.dataflows.single_flight import get_single_flight
+
+        class FakeCache:
+            def __init__(self):
+                self.saved = []
+
+            def find_cached_stock_data(self, **kwargs):
+                return None
+
+            def save_stock_data(self, **kwargs):
+                self.saved.append(kwargs)
+
+        fetches = []
+
+        def fake_unified(symbol, start_date, end_date):
+            fetches.append(symbol)
+            time.sleep(0.2)
+            return f"股票代码: {symbol}\n数据期间: {start_date} 至 {end_date}"
+
+        provider = OptimizedChinaDataProvider()
+        provider.cache = FakeCache()
+        provider.config = dict(provider.config, bar_store_enabled=False)
+        before = get_single_flight().get_stats()["by_namespace"].get("china_stock_data", {}).get("coalesced", 0)
+
+        original = data_source_manager.get_china_stock_data_unified
+        data_source_manager.get_china_stock_data_unified = fake_unified
+        try:
+            results = _run_concurrently(lambda i: provider.get_stock_data("600519", "2024-01-01", "2024-03-01"))
+        finally:
+            data_source_manager.get_china_stock_data_unified = original
+
+        assert len(set(results)) == 1 and results[0].startswith("股票代码: 600519")
+        assert fetches == ["600519"] and len(provider.cache.saved) == 1
+        coalesced = get_single_flight().get_stats()["by_namespace"]["china_stock_data"]["coalesced"] - before
+        assert coalesced == THREADS - 1
+
+        print(f"  ✅ {THREADS}个线程共享1次数据获取与1次缓存写入")
+        return True
+
+    except Exception as e:
+        print(f"❌ A股数据提供器请求合并测试失败: {e}")
+        return False
+
+
+def main():
+    """主测试函数"""
+    print("🚀 并发请求合并测试")
+    print("=" * 50)
+
+    results = [
+        test_coalescing(),
+        test_errors_and_reentry(),
+        test_provider_coalescing(),
+    ]
+
+    passed = sum(1 for r in results if r)
+    print(f"\n📊 测试结果: {passed}/{len(results)} 通过")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+追加式状态日志测试
+模拟对同一只股票连续多个交易日调用 propagate 后的状态记录，
+验证 jsonl / jsonl.gz 逐条追加、内存中只保留最近状态、读取工具可重建旧版 JSON 结构，
+并对比旧格式与新格式的累计写入量
+"""
+
+import os
+import sys
+import json
+import tempfile
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+TRADE_DAYS = 60
+
+
+def _make_final_state(day):
+    trade_date = f"2024-{1 + day // 28:02d}-{1 + day % 28:02d}"
+    return trade_date, {
+        "company_of_interest": "600519",
+        "trade_date": trade_date,
+        "market_report": f"市场报告{day}：" + "均线多头排列。" * 300,
+        "sentiment_report": f"情绪报告{day}",
+        "news_report": f"新闻报告{day}",
+        "fundamentals_report": f"基本面报告{day}：" + "毛利率稳定。" * 300,
+        "investment_debate_state": {"bull_history": "看涨", "bear_history": "看跌", "history": "辩论",
+                                    "current_response": "回应", "judge_decision": "买入"},
+        "trader_investment_plan": "分批买入",
+        "risk_debate_state": {"risky_history": "激进", "safe_history": "保守", "neutral_history": "中性",
+                              "history": "风险辩论", "judge_decision": "持有"},
+        "investment_plan": "投资计划",
+        "final_trade_decision": f"最终决策{day}",
+    }
+
+
+def _make_graph(log_format, memory_limit=5):
+    from collections import OrderedDict
+    from tradingagents.graph.trading_graph import TradingAgentsGraph
+
+    graph = TradingAgentsGraph.__new__(TradingAgentsGraph)
+    graph.config = {"state_log_format": log_format, "state_log_memory_limit": memory_limit}
+    graph.ticker = "600519"
+    graph.log_states_dict = OrderedDict()
+    return graph
+
+
+def _run_days(log_format, workdir):
+    """在临时目录中连续记录多个交易日，返回 (graph, 期望的旧格式字典, 累计写入字节数, 日志文件路径)"""
+    from tradingagents.graph.state_log import STATE_LOG_FORMATS, build_state_log_entry, get_state_log_directory
+
+    graph = _make_graph(log_format)
+    expected, bytes_written = {}, 0
+    path = os.path.join(workdir, get_state_log_directory("600519"), STATE_LOG_FORMATS[log_format])
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        for day in range(TRADE_DAYS):
+            trade_date, final_state = _make_final_state(day)
+            before = os.path.getsize(path) if os.path.exists(path) and log_format != "json" else 0
+            graph._log_state(trade_date, final_state)
+            bytes_written += os.path.getsize(path) - before
+            expected[trade_date] = build_state_log_entry(final_state)
+    finally:
+        os.chdir(cwd)
+    return graph, expected, bytes_written, path
+
+
+def test_append_only_log():
+    """jsonl 与 jsonl.gz 逐条追加，读取工具重建旧格式，内存中只保留最近的状态"""
+    print("🧪 测试追加式状态日志...")
+
+    try:
+        from tradingagents.graph.state_log import load_state_log, export_state_log_json
+
+        sizes = {}
+        for log_format in ("json", "jsonl", "jsonl.gz"):
+            workdir = tempfile.mkdtemp(prefix="state_log_")
+            graph, expected, bytes_written, path = _run_days(log_format, workdir)
+            assert load_state_log(path) == expected, log_format
+            assert load_state_log(os.path.dirname(path)) == expected, log_format
+            sizes[log_format] = (bytes_written, os.path.getsize(path))
+
+            if log_format == "json":
+                assert len(graph.log_states_dict) == TRADE_DAYS
+            else:
+                assert list(graph.log_states_dict) == [("600519", date) for date in list(expected)[-5:]]
+                exported = export_state_log_json(path)
+                with open(exported, encoding="utf-8") as f:
+                    assert json.load(f) == expected
+
+        for log_format, (written, size) in sizes.items():
+            print(f"  📊 {log_format:8s}: {TRADE_DAYS}个交易日累计写入 {written / 1024:.0f}KB，文件 {size / 1024:.0f}KB")
+        assert sizes["jsonl"][0] * 10 < sizes["json"][0]
+        assert sizes["jsonl.gz"][1] < sizes["jsonl"][1]
+        print("  ✅ 三种格式均可重建旧版JSON结构")
+        return True
+
+    except Exception as e:
+        print(f"❌ 追加式状态日志测试失败: {e}")
+        return False
+
+
+def test_truncated_tail():
+    """进程中断导致最后一条记录不完整时，读取到中断处为止"""
+    print("\n🧪 测试不完整的日志末尾...")
+
+    try:
+        from tradingagents.graph.state_log import StateLogWriter, load_state_log
+
+        for log_format in ("jsonl", "jsonl.gz"):
+            writer = StateLogWriter(tempfile.mkdtemp(prefix="state_log_tail_"), log_format)
+            writer.append("2024-01-02", {"final_trade_decision": "买入"})
+            writer.append("2024-01-03", {"final_trade_decision": "卖出"})
+            with open(writer.path, "rb") as f:
+                data = f.read()
+            with open(writer.path, "wb") as f:
+                f.write(data[:-10])
+
+            states = load_state_log(writer.path)
+            assert states == {"2024-01-02": {"final_trade_decision": "买入"}}, (log_format, states)
+
+        # 中断后继续追加的记录不受不完整记录影响
+        writer = StateLogWriter(tempfile.mkdtemp(prefix="state_log_resume_"), "jsonl")
+        writer.append("2024-01-02", {"final_trade_decision": "买入"})
+        with open(writer.path, "a", encoding="utf-8") as f:
+            f.write('{"date": "2024-01-03", "sta')
+        writer.append("2024-01-04", {"final_trade_decision": "持有"})
+        assert list(load_state_log(writer.path)) == ["2024-01-02", "2024-01-04"]
+
+        print("  ✅ jsonl 与 jsonl.gz 均保留完整的记录")
+        return True
+
+    except Exception as e:
+        print(f"❌ 不完整日志末尾测试失败: {e}")
+        return False
+
+
+def main():
+    """主测试函数"""
+    print("🚀 追加式状态日志测试")
+    print("=" * 50)
+
+    results = [
+        test_append_only_log(),
+        test_truncated_tail(),
+    ]
+
+    passed = sum(1 for r in results if r)
+    print(f"\n📊 测试结果: {passed}/{len(results)} 通过")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+股票代码搜索索引测试
+验证代码前缀、名称子串、拼音首字母匹配，后台刷新，以及与线性扫描的性能对比
+"""
+
+import os
+import sys
+import time
+import random
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+SAMPLE_STOCKS = [
+    {'code': '000001', 'name': '平安银行'},
+    {'code': '600519', 'name': '贵州茅台'},
+    {'code': '600036', 'name': '招商银行'},
+    {'code': '601318', 'name': '中国平安'},
+    {'code': '000858', 'name': '五粮液'},
+]
+
+
+def _make_stocks(count):
+    """生成模拟的全市场股票列表"""
+    rng = random.Random(42)
+    chars = "中国平安银行招商贵州茅台五粮液科技电子医药能源化工证券保险地产汽车传媒通信钢铁有色"
+    stocks = list(SAMPLE_STOCKS)
+    for i in range(count - len(stocks)):
+        name = ''.join(rng.choice(chars) for _ in range(rng.randint(3, 6)))
+        stocks.append({'code': f"{300000 + i:06d}", 'name': name})
+    return stocks
+
+
+def _linear_search(stocks, keyword):
+    """原有实现：线性扫描"""
+    keyword_lower = keyword.lower()
+    return [s for s in stocks
+            if keyword_lower in s['code'].lower() or keyword_lower in s['name'].lower()]
+
+
+def test_match_types():
+    """代码前缀、名称子串、精确匹配排序与拼音首字母"""
+    print("🧪 测试匹配类型...")
+
+    try:
+        from tradingagents.dataflows.symbol_search_index import SymbolSearchIndex, PYPINYIN_AVAILABLE
+
+        index = SymbolSearchIndex(lambda: SAMPLE_STOCKS)
+
+        assert [s['code'] for s in index.search('6005')] == ['600519']
+        assert [s['code'] for s in index.search('茅台')] == ['600519']
+        assert {s['code'] for s in index.search('银行')} == {'000001', '600036'}
+        assert {s['code'] for s in index.search('平')} == {'000001', '601318'}
+        # 名称前缀排在子串匹配之前
+        assert [s['code'] for s in index.search('平安')] == ['000001', '601318']
+        # 代码子串（兼容原有的包含匹配）
+        assert [s['code'] for s in index.search('0858')] == ['000858']
+        assert index.search('不存在') == []
+        assert index.search('') == []
+        assert len(index.search('0', limit=2)) == 2
+
+        if PYPINYIN_AVAILABLE:
+            assert [s['code'] for s in index.search('gzmt')] == ['600519']
+            print("  ✅ 拼音首字母匹配通过")
+        else:
+            print("  ⚠️ pypinyin未安装，跳过拼音首字母测试")
+
+        print("  ✅ 代码前缀、名称子串、排序均正确")
+        return True
+
+    except Exception as e:
+        print(f"❌ 匹配类型测试失败: {e}")
+        return False
+
+
+def test_refresh():
+    """空列表不标记为已构建；过期后后台重建并替换索引"""
+    print("\n🧪 测试索引刷新...")
+
+    try:
+        from tradingagents.dataflows.symbol_search_index import SymbolSearchIndex
+
+        sources = [[], SAMPLE_STOCKS[:1], SAMPLE_STOCKS]
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return sources[min(len(calls) - 1, len(sources) - 1)]
+
+        index = SymbolSearchIndex(loader, refresh_interval=0.1)
+        assert index.search('茅台') == [] and len(index) == 0
+        assert index.search('平安银行')[0]['code'] == '000001'
+        assert len(calls) == 2
+
+        time.sleep(0.15)
+        index.search('茅台')  # 触发后台刷新，本次使用旧索引
+        deadline = time.time() + 2
+        while len(index) != len(SAMPLE_STOCKS) and time.time() < deadline:
+            time.sleep(0.01)
+        assert index.search('茅台')[0]['code'] == '600519'
+
+        print(f"  ✅ 加载次数: {len(calls)}，当前索引: {len(index)}只股票")
+        return True
+
+    except Exception as e:
+        print(f"❌ 索引刷新测试失败: {e}")
+        return False
+
+
+def test_search_performance():
+    """与线性扫描对比，8000只股票下单次查询应在毫秒以内"""
+    print("\n🧪 测试搜索性能...")
+
+    try:
+        from tradingagents.dataflows.symbol_search_index import SymbolSearchIndex
+
+        stocks = _make_stocks(8000)
+        index = SymbolSearchIndex(lambda: stocks)
+        start = time.perf_counter()
+        index.build()
+        build_ms = (time.perf_counter() - start) * 1000
+
+        keywords = ['6005', '3001', '茅台', '平安银行', '科技', '000001', '证券保险']
+        for keyword in keywords:
+            assert ({s['code'] for s in index.search(keyword)} ==
+                    {s['code'] for s in _linear_search(stocks, keyword)}), keyword
+
+        rounds = 200
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for keyword in keywords:
+                _linear_search(stocks, keyword)
+        linear_ms = (time.perf_counter() - start) * 1000 / (rounds * len(keywords))
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for keyword in keywords:
+                index.search(keyword, limit=20)
+        index_ms = (time.perf_counter() - start) * 1000 / (rounds * len(keywords))
+
+        print(f"  📊 构建: {build_ms:.0f}ms，线性扫描: {linear_ms:.3f}ms/次，索引: {index_ms:.3f}ms/次 "
+              f"({linear_ms / index_ms:.1f}x)")
+        assert index_ms < 1.0, f"索引查询过慢: {index_ms:.3f}ms"
+        assert index_ms < linear_ms
+        return True
+
+    except Exception as e:
+        print(f"❌ 搜索性能测试失败: {e}")
+        return False
+
+
+def main():
+    """主测试函数"""
+    print("🚀 股票代码搜索索引测试")
+    print("=" * 50)
+
+    results = [
+        test_match_types(),
+        test_refresh(),
+        test_search_performance(),
+    ]
+
+    passed = sum(1 for r in results if r)
+    print(f"\n📊 测试结果: {passed}/{len(results)} 通过")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
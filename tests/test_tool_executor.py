@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+工具调用执行器测试
+使用模拟的慢速工具，验证并发执行、结果顺序、单工具超时/失败隔离与耗时统计，
+以及超时从工具开始执行时计时、超时的工具不占用其他调用的线程
+"""
+
+import os
+import sys
+import time
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+TOOL_DELAY = 0.3
+
+
+class FakeTool:
+    """模拟LangChain工具：固定延迟后返回结果"""
+
+    def __init__(self, name, delay=TOOL_DELAY, error=None):
+        self.name = name
+        self.delay = delay
+        self.error = error
+
+    def invoke(self, args):
+        time.sleep(self.delay)
+        if self.error:
+            raise RuntimeError(self.error)
+        return f"{self.name}:{args.get('ticker')}"
+
+
+def test_concurrent_execution_order():
+    """多个工具并发执行，ToolMessage顺序与调用顺序一致"""
+    print("🧪 测试并发执行与结果顺序...")
+
+    try:
+        from tradingagents.agents.utils.tool_executor import ToolExecutor
+
+        executor = ToolExecutor(max_workers=4, timeout=5)
+        tools = [FakeTool("get_stock_market_data_unified", delay=0.4),
+                 FakeTool("get_china_stock_data", delay=0.1),
+                 FakeTool("get_finnhub_news", delay=0.2),
+                 FakeTool("get_YFin_data_online", delay=0.3)]
+        tool_calls = [{"name": t.name, "args": {"ticker": "600519"}, "id": f"call_{i}"}
+                      for i, t in enumerate(tools)]
+
+        start = time.time()
+        results = executor.execute(tool_calls, tools, analyst_name="测试")
+        elapsed = time.time() - start
+
+        messages = [r.to_message() for r in results]
+        assert [m.tool_call_id for m in messages] == ["call_0", "call_1", "call_2", "call_3"]
+        assert messages[0].content == "get_stock_market_data_unified:600519"
+        assert all(r.status == "success" for r in results)
+        assert elapsed < 0.7, f"未并发执行: {elapsed:.2f}秒"
+
+        print(f"  ✅ 4个工具并发耗时: {elapsed:.2f}秒 (串行约1.0秒)")
+        return True
+
+    except Exception as e:
+        print(f"❌ 并发执行测试失败: {e}")
+        return False
+
+
+def test_timeout_and_failures():
+    """超时、异常、未找到工具只影响对应的结果"""
+    print("\n🧪 测试超时与失败隔离...")
+
+    try:
+        from tradingagents.agents.utils.tool_executor import ToolExecutor
+
+        executor = ToolExecutor(max_workers=4, timeout=0.3)
+        tools = [FakeTool("slow_tool", delay=1.0),
+                 FakeTool("broken_tool", delay=0.05, error="API限流"),
+                 FakeTool("fast_tool", delay=0.05)]
+        tool_calls = [{"name": "slow_tool", "args": {}, "id": "a"},
+                      {"name": "broken_tool", "args": {}, "id": "b"},
+                      {"name": "missing_tool", "args": {}, "id": "c"},
+                      {"name": "fast_tool", "args": {"ticker": "AAPL"}, "id": "d"}]
+
+        start = time.time()
+        results = executor.execute(tool_calls, tools, analyst_name="测试")
+        elapsed = time.time() - start
+
+        assert [r.status for r in results] == ["timeout", "error", "not_found", "success"]
+        assert "API限流" in results[1].content
+        assert results[3].content == "fast_tool:AAPL"
+        assert elapsed < 0.6, f"超时未生效: {elapsed:.2f}秒"
+
+        stats = executor.latency_stats()
+        assert stats["fast_tool"]["count"] == 1 and "missing_tool" not in stats
+
+        print(f"  ✅ 状态: {[r.status for r in results]}，耗时: {elapsed:.2f}秒")
+        return True
+
+    except Exception as e:
+        print(f"❌ 超时与失败测试失败: {e}")
+        return False
+
+
+def test_timeout_from_start_and_isolation():
+    """排队的工具从开始执行时计时；超时仍在运行的工具不阻塞其他分析的工具调用"""
+    print("\n🧪 测试超时计时与线程隔离...")
+
+    try:
+        from tradingagents.agents.utils.tool_executor import ToolExecutor
+
+        # 2个线程执行4个各0.2秒的工具：后两个排队0.2秒，但执行本身未超时
+        executor = ToolExecutor(max_workers=2, timeout=0.3)
+        tools = [FakeTool(f"tool_{i}", delay=0.2) for i in range(4)]
+        tool_calls = [{"name": t.name, "args": {}, "id": f"call_{i}"} for i, t in enumerate(tools)]
+        results = executor.execute(tool_calls, tools, analyst_name="测试")
+        assert [r.status for r in results] == ["success"] * 4, [r.status for r in results]
+
+        # 单线程执行器上的工具挂起后，下一轮工具调用不受影响
+        executor = ToolExecutor(max_workers=1, timeout=0.2)
+        hung = FakeTool("hung_tool", delay=1.0)
+        fast = FakeTool("fast_tool", delay=0.05)
+        results = executor.execute([{"name": "hung_tool", "args": {}, "id": "a"}], [hung], analyst_name="测试")
+        assert results[0].status == "timeout"
+        start = time.time()
+        results = executor.execute([{"name": "fast_tool", "args": {}, "id": "b"}], [fast], analyst_name="测试")
+        elapsed = time.time() - start
+        assert results[0].status == "success" and elapsed < 0.2, (results[0].status, elapsed)
+
+        # 同一轮中排在挂起工具之后、始终未能开始执行的工具按超时返回
+        start = time.time()
+        results = executor.execute([{"name": "hung_tool", "args": {}, "id": "c"},
+                                    {"name": "fast_tool", "args": {}, "id": "d"}], [hung, fast], analyst_name="测试")
+        elapsed = time.time() - start
+        assert [r.status for r in results] == ["timeout", "timeout"] and elapsed < 0.6, elapsed
+
+        print("  ✅ 排队的工具未被误判超时，挂起的工具不影响后续调用")
+        return True
+
+    except Exception as e:
+        print(f"❌ 超时计时与线程隔离测试失败: {e}")
+        return False
+
+
+def main():
+    """主测试函数"""
+    print("🚀 工具调用执行器测试")
+    print("=" * 50)
+
+    results = [
+        test_concurrent_execution_order(),
+        test_timeout_and_failures(),
+        test_timeout_from_start_and_isolation(),
+    ]
+
+    passed = sum(1 for r in results if r)
+    print(f"\n📊 测试结果: {passed}/{len(results)} 通过")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Token使用记录账本测试
+验证追加写入、旧版 usage.json 迁移、内存汇总统计以及记录压缩
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+from pathlib import Path
+from datetime import datetime, timedelta
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+
+def _make_record(**overrides):
+    from tradingagents.config.config_manager import UsageRecord
+
+    values = dict(
+        timestamp=datetime.now().isoformat(),
+        provider="dashscope",
+        model_name="qwen-turbo",
+        input_tokens=1000,
+        output_tokens=500,
+        cost=0.005,
+        session_id="session_a",
+        analysis_type="stock_analysis",
+    )
+    values.update(overrides)
+    return UsageRecord(**values)
+
+
+def test_append_and_aggregates():
+    """追加记录后日/供应商/会话汇总应即时更新"""
+    print("🧪 测试追加写入与内存汇总...")
+
+    try:
+        from tradingagents.config.config_manager import UsageRecord
+        from tradingagents.config.usage_ledger import UsageLedger
+
+        work_dir = Path(tempfile.mkdtemp(prefix="usage_ledger_"))
+        ledger = UsageLedger(work_dir / "usage.jsonl", UsageRecord)
+
+        ledger.append(_make_record())
+        ledger.append(_make_record(provider="deepseek", cost=0.01, session_id="session_b"))
+        ledger.append(_make_record(timestamp=(datetime.now() - timedelta(days=10)).isoformat()))
+
+        assert abs(ledger.get_day_cost() - 0.015) < 1e-9
+        assert abs(ledger.get_session_cost("session_a") - 0.01) < 1e-9
+        stats = ledger.get_statistics(1)
+        assert stats["total_requests"] == 2
+        assert set(stats["provider_stats"]) == {"dashscope", "deepseek"}
+        assert ledger.get_statistics(30)["total_requests"] == 3
+
+        # 另一个实例（模拟另一个进程）追加后，本实例应增量读取
+        other = UsageLedger(work_dir / "usage.jsonl", UsageRecord)
+        other.append(_make_record(session_id="session_a"))
+        assert abs(ledger.get_session_cost("session_a") - 0.015) < 1e-9
+
+        print(f"  ✅ 汇总正确: {stats}")
+        return True
+
+    except Exception as e:
+        print(f"❌ 追加写入测试失败: {e}")
+        return False
+
+
+def test_legacy_migration_and_compaction():
+    """旧版 usage.json 应被迁移，超过上限时按批压缩"""
+    print("\n🧪 测试旧版迁移与记录压缩...")
+
+    try:
+        from dataclasses import asdict
+        from tradingagents.config.config_manager import UsageRecord
+        from tradingagents.config.usage_ledger import UsageLedger
+
+        work_dir = Path(tempfile.mkdtemp(prefix="usage_ledger_"))
+        legacy = work_dir / "usage.json"
+        with open(legacy, "w", encoding="utf-8") as f:
+            json.dump([asdict(_make_record()) for _ in range(5)], f)
+
+        ledger = UsageLedger(work_dir / "usage.jsonl", UsageRecord, legacy_file=legacy)
+        assert len(ledger) == 5
+        assert not legacy.exists()
+
+        for _ in range(20):
+            ledger.append(_make_record(), max_records=10)
+        assert 10 <= len(ledger) <= 12
+
+        print(f"  ✅ 迁移与压缩正常，当前记录数: {len(ledger)}")
+        return True
+
+    except Exception as e:
+        print(f"❌ 迁移与压缩测试失败: {e}")
+        return False
+
+
+def test_track_usage_performance(existing_records: int = 5000, calls: int = 200):
+    """在已有大量记录时测量单次 track_usage 的耗时"""
+    print(f"\n⏱️ 测试 track_usage 耗时 (已有 {existing_records} 条记录)...")
+
+    try:
+        from tradingagents.config.config_manager import ConfigManager, TokenTracker
+
+        work_dir = tempfile.mkdtemp(prefix="usage_ledger_")
+        manager = ConfigManager(work_dir)
+        manager.save_usage_records([_make_record() for _ in range(existing_records)])
+        tracker = TokenTracker(manager)
+
+        start = time.time()
+        for i in range(calls):
+            tracker.track_usage("dashscope", "qwen-turbo", 1000, 500, session_id="bench")
+        elapsed = time.time() - start
+
+        print(f"  📊 平均每次: {elapsed / calls * 1000:.2f} ms")
+        print(f"  💰 会话成本: {tracker.get_session_cost('bench'):.4f}")
+        return True
+
+    except Exception as e:
+        print(f"❌ 性能测试失败: {e}")
+        return False
+
+
+def main():
+    """主测试函数"""
+    print("🚀 Token使用记录账本测试")
+    print("=" * 50)
+
+    results = [
+        test_append_and_aggregates(),
+        test_legacy_migration_and_compaction(),
+        test_track_usage_performance(),
+    ]
+
+    passed = sum(1 for r in results if r)
+    print(f"\n📊 测试结果: {passed}/{len(results)} 通过")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -6,8 +6,11 @@ import json
 from tradingagents.utils.logging_init import get_logger
 logger = get_logger("default")
 
+from tradingagents.agents.utils.debate_prompts import build_debate_prompt
+from tradingagents.agents.utils.debate_history import compact_history, log_prompt_size
 
-def create_bear_researcher(llm, memory):
+
+def create_bear_researcher(llm, memory, history_compactor=None):
     def bear_node(state) -> dict:
         investment_debate_state = state["investment_debate_state"]
         history = investment_debate_state.get("history", "")
@@ -43,11 +46,16 @@ def create_bear_researcher(llm, memory):
         for i, rec in enumerate(past_memories, 1):
             past_memory_str += rec["recommendation"] + "\n\n"
 
-        prompt = f"""你是一位看跌分析师，负责论证不投资股票 {company_name} 的理由。
+        # 启用历史压缩时，早期发言以缓存的摘要代替
+        sent_history = compact_history(history_compactor, history)
+
+        # 报告在前作为所有辩论角色共用的提示词前缀，角色说明与每轮变化的内容在后
+        prompt = build_debate_prompt(state, [
+            f"""你是一位看跌分析师，负责论证不投资股票 {company_name} 的理由。
 
 ⚠️ 重要提醒：当前分析的是 {market_info['market_name']}，所有价格和估值请使用 {currency}（{currency_symbol}）作为单位。
 
-你的目标是提出合理的论证，强调风险、挑战和负面指标。利用提供的研究和数据来突出潜在的不利因素并有效反驳看涨论点。
+你的目标是提出合理的论证，强调风险、挑战和负面指标。利用上述研究资料来突出潜在的不利因素并有效反驳看涨论点。
 
 请用中文回答，重点关注以下几个方面：
 
@@ -55,22 +63,16 @@ def create_bear_researcher(llm, memory):
 - 竞争劣势：强调市场地位较弱、创新下降或来自竞争对手威胁等脆弱性
 - 负面指标：使用财务数据、市场趋势或最近不利消息的证据来支持你的立场
 - 反驳看涨观点：用具体数据和合理推理批判性分析看涨论点，揭露弱点或过度乐观的假设
-- 参与讨论：以对话风格呈现你的论点，直接回应看涨分析师的观点并进行有效辩论，而不仅仅是列举事实
-
-可用资源：
-
-市场研究报告：{market_research_report}
-社交媒体情绪报告：{sentiment_report}
-最新世界事务新闻：{news_report}
-公司基本面报告：{fundamentals_report}
-辩论对话历史：{history}
-最后的看涨论点：{current_response}
-类似情况的反思和经验教训：{past_memory_str}
-
-请使用这些信息提供令人信服的看跌论点，反驳看涨声明，并参与动态辩论，展示投资该股票的风险和弱点。你还必须处理反思并从过去的经验教训和错误中学习。
+- 参与讨论：以对话风格呈现你的论点，直接回应看涨分析师的观点并进行有效辩论，而不仅仅是列举事实""",
+            f"类似情况的反思和经验教训：{past_memory_str}",
+            f"辩论对话历史：{sent_history}",
+            f"最后的看涨论点：{current_response}",
+            """请使用这些信息提供令人信服的看跌论点，反驳看涨声明，并参与动态辩论，展示投资该股票的风险和弱点。你还必须处理反思并从过去的经验教训和错误中学习。
 
 请确保所有回答都使用中文。
-"""
+""",
+        ])
+        log_prompt_size("看跌研究员", investment_debate_state["count"] + 1, prompt, history, sent_history)
 
         response = llm.invoke(prompt)
 
@@ -6,8 +6,11 @@ import json
 from tradingagents.utils.logging_init import get_logger
 logger = get_logger("default")
 
+from tradingagents.agents.utils.debate_prompts import build_debate_prompt
+from tradingagents.agents.utils.debate_history import compact_history, log_prompt_size
 
-def create_bull_researcher(llm, memory):
+
+def create_bull_researcher(llm, memory, history_compactor=None):
     def bull_node(state) -> dict:
         logger.debug(f"🐂 [DEBUG] ===== 看涨研究员节点开始 =====")
 
@@ -54,32 +57,32 @@ def create_bull_researcher(llm, memory):
         for i, rec in enumerate(past_memories, 1):
             past_memory_str += rec["recommendation"] + "\n\n"
 
-        prompt = f"""你是一位看涨分析师，负责为股票 {company_name} 的投资建立强有力的论证。
+        # 启用历史压缩时，早期发言以缓存的摘要代替
+        sent_history = compact_history(history_compactor, history)
+
+        # 报告在前作为所有辩论角色共用的提示词前缀，角色说明与每轮变化的内容在后
+        prompt = build_debate_prompt(state, [
+            f"""你是一位看涨分析师，负责为股票 {company_name} 的投资建立强有力的论证。
 
 ⚠️ 重要提醒：当前分析的是 {'中国A股' if is_china else '海外股票'}，所有价格和估值请使用 {currency}（{currency_symbol}）作为单位。
 
-你的任务是构建基于证据的强有力案例，强调增长潜力、竞争优势和积极的市场指标。利用提供的研究和数据来解决担忧并有效反驳看跌论点。
+你的任务是构建基于证据的强有力案例，强调增长潜力、竞争优势和积极的市场指标。利用上述研究资料来解决担忧并有效反驳看跌论点。
 
 请用中文回答，重点关注以下几个方面：
 - 增长潜力：突出公司的市场机会、收入预测和可扩展性
 - 竞争优势：强调独特产品、强势品牌或主导市场地位等因素
 - 积极指标：使用财务健康状况、行业趋势和最新积极消息作为证据
 - 反驳看跌观点：用具体数据和合理推理批判性分析看跌论点，全面解决担忧并说明为什么看涨观点更有说服力
-- 参与讨论：以对话风格呈现你的论点，直接回应看跌分析师的观点并进行有效辩论，而不仅仅是列举数据
-
-可用资源：
-市场研究报告：{market_research_report}
-社交媒体情绪报告：{sentiment_report}
-最新世界事务新闻：{news_report}
-公司基本面报告：{fundamentals_report}
-辩论对话历史：{history}
-最后的看跌论点：{current_response}
-类似情况的反思和经验教训：{past_memory_str}
-
-请使用这些信息提供令人信服的看涨论点，反驳看跌担忧，并参与动态辩论，展示看涨立场的优势。你还必须处理反思并从过去的经验教训和错误中学习。
+- 参与讨论：以对话风格呈现你的论点，直接回应看跌分析师的观点并进行有效辩论，而不仅仅是列举数据""",
+            f"类似情况的反思和经验教训：{past_memory_str}",
+            f"辩论对话历史：{sent_history}",
+            f"最后的看跌论点：{current_response}",
+            """请使用这些信息提供令人信服的看涨论点，反驳看跌担忧，并参与动态辩论，展示看涨立场的优势。你还必须处理反思并从过去的经验教训和错误中学习。
 
 请确保所有回答都使用中文。
-"""
+""",
+        ])
+        log_prompt_size("看涨研究员", investment_debate_state["count"] + 1, prompt, history, sent_history)
 
         response = llm.invoke(prompt)
 
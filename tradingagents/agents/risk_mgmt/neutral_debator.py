@@ -5,8 +5,11 @@ import json
 from tradingagents.utils.logging_init import get_logger
 logger = get_logger("default")
 
+from tradingagents.agents.utils.debate_prompts import build_debate_prompt
+from tradingagents.agents.utils.debate_history import compact_history, log_prompt_size
 
-def create_neutral_debator(llm):
+
+def create_neutral_debator(llm, history_compactor=None):
     def neutral_node(state) -> dict:
         risk_debate_state = state["risk_debate_state"]
         history = risk_debate_state.get("history", "")
@@ -15,26 +18,22 @@ def create_neutral_debator(llm):
         current_risky_response = risk_debate_state.get("current_risky_response", "")
         current_safe_response = risk_debate_state.get("current_safe_response", "")
 
-        market_research_report = state["market_report"]
-        sentiment_report = state["sentiment_report"]
-        news_report = state["news_report"]
-        fundamentals_report = state["fundamentals_report"]
-
         trader_decision = state["trader_investment_plan"]
 
-        prompt = f"""作为中性风险分析师，您的角色是提供平衡的视角，权衡交易员决策或计划的潜在收益和风险。您优先考虑全面的方法，评估上行和下行风险，同时考虑更广泛的市场趋势、潜在的经济变化和多元化策略。以下是交易员的决策：
-
-{trader_decision}
-
-您的任务是挑战激进和安全分析师，指出每种观点可能过于乐观或过于谨慎的地方。使用以下数据来源的见解来支持调整交易员决策的温和、可持续策略：
+        # 启用历史压缩时，早期发言以缓存的摘要代替
+        sent_history = compact_history(history_compactor, history)
 
-市场研究报告：{market_research_report}
-社交媒体情绪报告：{sentiment_report}
-最新世界事务报告：{news_report}
-公司基本面报告：{fundamentals_report}
-以下是当前对话历史：{history} 以下是激进分析师的最后回应：{current_risky_response} 以下是安全分析师的最后回应：{current_safe_response}。如果其他观点没有回应，请不要虚构，只需提出您的观点。
+        # 报告和交易员决策在前作为共用的提示词前缀，角色说明与每轮变化的内容在后
+        prompt = build_debate_prompt(state, [
+            f"【交易员的决策】\n{trader_decision}",
+            """作为中性风险分析师，您的角色是提供平衡的视角，权衡上述交易员决策或计划的潜在收益和风险。您优先考虑全面的方法，评估上行和下行风险，同时考虑更广泛的市场趋势、潜在的经济变化和多元化策略。
 
-通过批判性地分析双方来积极参与，解决激进和保守论点中的弱点，倡导更平衡的方法。挑战他们的每个观点，说明为什么适度风险策略可能提供两全其美的效果，既提供增长潜力又防范极端波动。专注于辩论而不是简单地呈现数据，旨在表明平衡的观点可以带来最可靠的结果。请用中文以对话方式输出，就像您在说话一样，不使用任何特殊格式。"""
+您的任务是挑战激进和安全分析师，指出每种观点可能过于乐观或过于谨慎的地方。使用上述研究资料中的见解来支持调整交易员决策的温和、可持续策略。""",
+            f"以下是当前对话历史：{sent_history}",
+            f"以下是激进分析师的最后回应：{current_risky_response} 以下是安全分析师的最后回应：{current_safe_response}。如果其他观点没有回应，请不要虚构，只需提出您的观点。",
+            "通过批判性地分析双方来积极参与，解决激进和保守论点中的弱点，倡导更平衡的方法。挑战他们的每个观点，说明为什么适度风险策略可能提供两全其美的效果，既提供增长潜力又防范极端波动。专注于辩论而不是简单地呈现数据，旨在表明平衡的观点可以带来最可靠的结果。请用中文以对话方式输出，就像您在说话一样，不使用任何特殊格式。",
+        ])
+        log_prompt_size("中性风险分析师", risk_debate_state["count"] + 1, prompt, history, sent_history)
 
         response = llm.invoke(prompt)
 
@@ -0,0 +1,133 @@
+"""
+辩论历史压缩
+辩论状态中的 history 每轮以字符串拼接增长，并在之后的每一轮提示词中完整重发，
+轮数较多时提示词长度随轮数平方增长。启用压缩后：
+- 只保留最近 window 条发言原文，更早的发言由快速模型压缩为摘要
+- 摘要按已压缩的发言内容缓存，每条发言只被摘要一次（滚动摘要）
+- 记录每轮提示词长度，便于观察压缩效果
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+# 导入统一日志系统
+from tradingagents.utils.logging_init import get_logger
+logger = get_logger("agents.utils.debate_history")
+
+# 每条发言以 "\n<角色> Analyst: " 开头（见各辩论节点的 argument）
+_TURN_PATTERN = re.compile(r"\n(?=(?:Bull|Bear|Risky|Safe|Neutral) Analyst: )")
+
+SUMMARY_PROMPT = """请将以下投资辩论中的早期发言压缩为一份简洁的中文摘要，供后续辩论参考。
+
+要求：
+1. 按发言者保留每方的核心论点、引用的关键数据和结论
+2. 保留尚未被回应或存在分歧的问题
+3. 不要加入原文没有的内容，不超过{max_chars}字
+
+{previous_summary}需要压缩的发言：
+{turns}"""
+
+
+def split_turns(history: str) -> List[str]:
+    """把辩论历史拆分为按顺序排列的发言列表"""
+    return [turn for turn in _TURN_PATTERN.split(history or "") if turn.strip()]
+
+
+def log_prompt_size(role: str, turn: int, prompt: str, history: str, sent_history: str):
+    """记录单轮辩论提示词长度与历史压缩效果"""
+    if sent_history is history:
+        logger.info(f"📏 [{role}] 第{turn}次发言提示词: {len(prompt)}字符，历史: {len(history)}字符")
+    else:
+        logger.info(f"📏 [{role}] 第{turn}次发言提示词: {len(prompt)}字符，"
+                    f"历史: {len(history)}→{len(sent_history)}字符（已压缩）")
+
+
+class DebateHistoryCompactor:
+    """
+    辩论历史压缩器
+
+    Args:
+        llm: 用于生成摘要的快速模型
+        window: 保留原文的最近发言条数
+        max_summary_chars: 摘要的目标长度上限（字符）
+        max_cache_entries: 摘要缓存条数上限
+    """
+
+    def __init__(self, llm, window: int = 2, max_summary_chars: int = 800, max_cache_entries: int = 256):
+        self.llm = llm
+        self.window = max(1, window)
+        self.max_summary_chars = max_summary_chars
+        self.max_cache_entries = max_cache_entries
+        self._summaries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(turns: List[str]) -> str:
+        digest = hashlib.sha256()
+        for turn in turns:
+            digest.update(turn.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _cached_prefix(self, turns: List[str]) -> Tuple[int, str]:
+        """查找已缓存摘要覆盖的最长发言前缀，返回 (覆盖的发言数, 摘要)"""
+        with self._lock:
+            for end in range(len(turns), 0, -1):
+                key = self._key(turns[:end])
+                summary = self._summaries.get(key)
+                if summary is not None:
+                    self._summaries.move_to_end(key)
+                    return end, summary
+        return 0, ""
+
+    def _store(self, turns: List[str], summary: str):
+        with self._lock:
+            self._summaries[self._key(turns)] = summary
+            while len(self._summaries) > self.max_cache_entries:
+                self._summaries.popitem(last=False)
+
+    def summarize(self, turns: List[str]) -> str:
+        """摘要给定的早期发言；在已缓存的摘要基础上只压缩新增的发言"""
+        covered, previous = self._cached_prefix(turns)
+        if covered == len(turns):
+            return previous
+
+        previous_summary = f"此前的摘要：\n{previous}\n\n" if previous else ""
+        prompt = SUMMARY_PROMPT.format(
+            max_chars=self.max_summary_chars,
+            previous_summary=previous_summary,
+            turns="\n\n".join(turns[covered:]),
+        )
+        response = self.llm.invoke(prompt)
+        summary = getattr(response, "content", str(response)).strip()
+        self._store(turns, summary)
+        logger.info(f"🗜️ [辩论历史] 摘要第{covered + 1}-{len(turns)}条发言: "
+                    f"{sum(len(t) for t in turns[covered:])}→{len(summary)}字符")
+        return summary
+
+    def compact(self, history: str) -> str:
+        """
+        返回用于提示词的辩论历史：早期发言摘要 + 最近 window 条发言原文
+        发言数不超过窗口或摘要失败时返回原历史
+        """
+        turns = split_turns(history)
+        if len(turns) <= self.window:
+            return history
+
+        older, recent = turns[:-self.window], turns[-self.window:]
+        try:
+            summary = self.summarize(older)
+        except Exception as e:
+            logger.warning(f"⚠️ [辩论历史] 摘要失败，使用完整历史: {e}")
+            return history
+
+        return (f"【早期辩论摘要（前{len(older)}条发言）】\n{summary}\n\n"
+                f"【最近{len(recent)}条发言】\n" + "\n".join(recent))
+
+
+def compact_history(compactor: Optional[DebateHistoryCompactor], history: str) -> str:
+    """未启用压缩时原样返回历史"""
+    return compactor.compact(history) if compactor is not None else history
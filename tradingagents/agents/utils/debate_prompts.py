@@ -0,0 +1,46 @@
+"""
+辩论提示词构建
+看涨/看跌研究员与激进/保守/中性风险分析师的每一轮发言都需要引用四份分析师报告。
+DeepSeek、DashScope、OpenAI 等提供商会自动缓存相同的提示词前缀，因此：
+- 报告部分作为所有角色、所有轮次共用的前缀，逐字节保持一致
+- 角色说明、历史记忆、对话历史（只追加）、对手最新论点依次放在前缀之后
+"""
+
+from typing import Any, Dict, Sequence, Tuple
+
+# 共享前缀中的报告顺序与标题（修改会使已有的提示词缓存失效）
+REPORT_SECTIONS: Tuple[Tuple[str, str], ...] = (
+    ("market_report", "市场研究报告"),
+    ("sentiment_report", "社交媒体情绪报告"),
+    ("news_report", "最新世界事务新闻报告"),
+    ("fundamentals_report", "公司基本面报告"),
+)
+
+
+def build_report_context(state: Dict[str, Any]) -> str:
+    """
+    构建所有辩论角色共用的报告前缀
+
+    只包含在整个辩论过程中不变的内容（股票代码与四份报告），
+    同一次分析中所有角色、所有轮次得到的文本完全相同
+    """
+    company_name = state.get("company_of_interest", "Unknown")
+    parts = [f"以下是关于股票 {company_name} 的研究资料，供本轮辩论引用。"]
+    for key, title in REPORT_SECTIONS:
+        parts.append(f"【{title}】\n{state.get(key) or ''}")
+    return "\n\n".join(parts)
+
+
+def build_debate_prompt(state: Dict[str, Any], role_sections: Sequence[str]) -> str:
+    """
+    拼接共享报告前缀与角色相关内容
+
+    Args:
+        state: 当前图状态
+        role_sections: 角色相关内容，按 变化频率从低到高 排列
+            （同组角色共用的内容如交易员决策 → 角色说明 → 历史记忆 → 对话历史 → 对手最新论点 → 输出要求）
+
+    Returns:
+        str: 完整提示词
+    """
+    return "\n\n".join([build_report_context(state), *role_sections])
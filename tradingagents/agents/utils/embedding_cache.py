@@ -0,0 +1,145 @@
+"""
+向量嵌入缓存
+按 (模型, 文本内容) 的哈希缓存 embedding，所有 FinancialSituationMemory 实例共享：
+- 内存层：LRU，容量由 EMBEDDING_CACHE_SIZE 控制（默认2048条）
+- 磁盘层：可选，设置 EMBEDDING_CACHE_DIR 后写入该目录下的 SQLite 文件，跨进程/跨运行复用
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+# 导入统一日志系统
+from tradingagents.utils.logging_init import get_logger
+logger = get_logger("agents.utils.embedding_cache")
+
+
+class EmbeddingCache:
+    """进程内共享的 embedding 缓存"""
+
+    def __init__(self, max_entries: int = 2048, cache_dir: Optional[str] = None):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0}
+
+        self._conn = None
+        if cache_dir:
+            try:
+                Path(cache_dir).mkdir(parents=True, exist_ok=True)
+                self._conn = sqlite3.connect(
+                    str(Path(cache_dir) / "embeddings.sqlite"), check_same_thread=False, timeout=30
+                )
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+                )
+                self._conn.commit()
+                logger.info(f"📦 [Embedding缓存] 磁盘缓存已启用: {cache_dir}")
+            except Exception as e:
+                logger.warning(f"⚠️ [Embedding缓存] 磁盘缓存初始化失败，仅使用内存缓存: {e}")
+                self._conn = None
+
+    @staticmethod
+    def make_key(model: str, text: str) -> str:
+        """按模型与文本内容生成缓存键"""
+        return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+    def get(self, model: str, text: str) -> Optional[List[float]]:
+        """查询缓存，未命中返回 None"""
+        return self.get_many(model, [text]).get(text)
+
+    def get_many(self, model: str, texts: Iterable[str]) -> Dict[str, List[float]]:
+        """批量查询缓存，返回 {文本: embedding}（仅包含命中项）"""
+        found: Dict[str, List[float]] = {}
+        missing: Dict[str, str] = {}
+        with self._lock:
+            for text in texts:
+                key = self.make_key(model, text)
+                vector = self._entries.get(key)
+                if vector is not None:
+                    self._entries.move_to_end(key)
+                    self.stats["hits"] += 1
+                    found[text] = vector
+                else:
+                    missing[key] = text
+
+            if missing and self._conn is not None:
+                keys = list(missing)
+                placeholders = ",".join("?" * len(keys))
+                try:
+                    rows = self._conn.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", keys
+                    ).fetchall()
+                except sqlite3.Error as e:
+                    logger.warning(f"⚠️ [Embedding缓存] 磁盘缓存读取失败: {e}")
+                    rows = []
+                for key, blob in rows:
+                    vector = array("d", blob).tolist()
+                    self._remember(key, vector)
+                    self.stats["disk_hits"] += 1
+                    found[missing.pop(key)] = vector
+
+            self.stats["misses"] += len(missing)
+        return found
+
+    def put(self, model: str, text: str, vector: List[float]):
+        """写入缓存"""
+        self.put_many(model, {text: vector})
+
+    def put_many(self, model: str, vectors: Dict[str, List[float]]):
+        """批量写入缓存"""
+        if not vectors:
+            return
+        rows = []
+        with self._lock:
+            for text, vector in vectors.items():
+                key = self.make_key(model, text)
+                vector = list(vector)
+                self._remember(key, vector)
+                rows.append((key, array("d", vector).tobytes()))
+
+            if self._conn is not None:
+                try:
+                    with self._conn:
+                        self._conn.executemany(
+                            "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", rows
+                        )
+                except sqlite3.Error as e:
+                    logger.warning(f"⚠️ [Embedding缓存] 磁盘缓存写入失败: {e}")
+
+    def _remember(self, key: str, vector: List[float]):
+        self._entries[key] = vector
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """清空内存缓存（磁盘缓存保留）"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_embedding_cache: Optional[EmbeddingCache] = None
+_embedding_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """获取全局 embedding 缓存实例"""
+    global _embedding_cache
+    if _embedding_cache is None:
+        with _embedding_cache_lock:
+            if _embedding_cache is None:
+                _embedding_cache = EmbeddingCache(
+                    max_entries=int(os.getenv("EMBEDDING_CACHE_SIZE", "2048")),
+                    cache_dir=os.getenv("EMBEDDING_CACHE_DIR") or None,
+                )
+    return _embedding_cache
@@ -6,12 +6,14 @@ from dashscope import TextEmbedding
 import os
 import threading
 import hashlib
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 # 导入统一日志系统
 from tradingagents.utils.logging_init import get_logger
 logger = get_logger("agents.utils.memory")
 
+from .embedding_cache import get_embedding_cache
+
 
 class ChromaDBManager:
     """单例ChromaDB管理器，避免并发创建集合的冲突"""
@@ -108,6 +110,10 @@ class ChromaDBManager:
 
 
 class FinancialSituationMemory:
+    # 单次批量embedding请求的最大文本数（DashScope text-embedding-v3 上限为10）
+    DASHSCOPE_BATCH_SIZE = 10
+    OPENAI_BATCH_SIZE = 64
+
     def __init__(self, name, config):
         self.config = config
         self.llm_provider = config.get("llm_provider", "openai").lower()
@@ -290,6 +296,9 @@ class FinancialSituationMemory:
                 self.client = "DISABLED"
                 logger.warning(f"⚠️ 未找到OPENAI_API_KEY，记忆功能已禁用")
 
+        # 所有记忆实例共享的embedding缓存
+        self.embedding_cache = get_embedding_cache()
+
         # 使用单例ChromaDB管理器
         self.chroma_manager = ChromaDBManager()
         self.situation_collection = self.chroma_manager.get_or_create_collection(name)
@@ -332,8 +341,90 @@ class FinancialSituationMemory:
         logger.warning(f"⚠️ 强制截断：保留首尾关键信息，{len(text)}字符截断为{len(truncated)}字符")
         return truncated, True
 
+    def _uses_dashscope_embedding(self):
+        """当前配置是否使用阿里百炼的嵌入模型"""
+        return (self.llm_provider == "dashscope" or
+                self.llm_provider == "alibaba" or
+                (self.llm_provider == "google" and self.client is None) or
+                (self.llm_provider == "deepseek" and self.client is None) or
+                (self.llm_provider == "openrouter" and self.client is None))
+
+    def _is_cacheable(self, text):
+        """文本是否会实际请求embedding（禁用、空文本、超长文本直接返回零向量，不走缓存）"""
+        if self.client == "DISABLED" or not text or not isinstance(text, str):
+            return False
+        return not (self.enable_embedding_length_check and len(text) > self.max_embedding_length)
+
     def get_embedding(self, text):
-        """Get embedding for a text using the configured provider"""
+        """Get embedding for a text using the configured provider, reusing cached results"""
+        cacheable = self._is_cacheable(text)
+        model = getattr(self, 'embedding', '')
+        if cacheable:
+            cached = self.embedding_cache.get(model, text)
+            if cached is not None:
+                return cached
+
+        embedding = self._request_embedding(text)
+        if cacheable and any(embedding):
+            self.embedding_cache.put(model, text, embedding)
+        return embedding
+
+    def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """批量获取embedding：先查共享缓存，未命中的文本合并为批量请求，失败项逐条重试"""
+        model = getattr(self, 'embedding', '')
+        pending = list(dict.fromkeys(t for t in texts if self._is_cacheable(t)))
+        vectors = self.embedding_cache.get_many(model, pending)
+
+        missing = [t for t in pending if t not in vectors]
+        if missing:
+            fetched = self._request_embeddings_batch(missing)
+            self.embedding_cache.put_many(model, fetched)
+            vectors.update(fetched)
+            logger.debug(f"📦 批量embedding: {len(texts)}条文本，缓存命中{len(pending) - len(missing)}条，"
+                         f"批量请求{len(fetched)}/{len(missing)}条")
+
+        # 未缓存且批量失败的文本（以及禁用/超长等情况）走单条路径，保留原有降级逻辑
+        return [vectors[t] if t in vectors else self.get_embedding(t) for t in texts]
+
+    def _request_embeddings_batch(self, texts: List[str]) -> Dict[str, List[float]]:
+        """批量调用embedding接口，返回成功的 {文本: embedding}"""
+        results: Dict[str, List[float]] = {}
+
+        if self._uses_dashscope_embedding():
+            try:
+                import dashscope
+                from dashscope import TextEmbedding
+
+                if not getattr(dashscope, 'api_key', None):
+                    return results
+
+                for start in range(0, len(texts), self.DASHSCOPE_BATCH_SIZE):
+                    chunk = texts[start:start + self.DASHSCOPE_BATCH_SIZE]
+                    response = TextEmbedding.call(model=self.embedding, input=chunk)
+                    if response.status_code != 200:
+                        logger.warning(f"⚠️ DashScope批量embedding失败: {response.code} - {response.message}，改为逐条请求")
+                        continue
+                    for item in response.output['embeddings']:
+                        results[chunk[item['text_index']]] = item['embedding']
+            except Exception as e:
+                logger.warning(f"⚠️ DashScope批量embedding异常: {e}，改为逐条请求")
+            return results
+
+        if self.client is None or self.client == "DISABLED":
+            return results
+
+        try:
+            for start in range(0, len(texts), self.OPENAI_BATCH_SIZE):
+                chunk = texts[start:start + self.OPENAI_BATCH_SIZE]
+                response = self.client.embeddings.create(model=self.embedding, input=chunk)
+                for item in response.data:
+                    results[chunk[item.index]] = item.embedding
+        except Exception as e:
+            logger.warning(f"⚠️ {self.llm_provider}批量embedding异常: {e}，改为逐条请求")
+        return results
+
+    def _request_embedding(self, text):
+        """请求单条文本的embedding（不经过缓存）"""
 
         # 检查记忆功能是否被禁用
         if self.client == "DISABLED":
@@ -380,11 +471,7 @@ class FinancialSituationMemory:
             'strategy': 'no_truncation_with_fallback'  # 标记策略
         }
 
-        if (self.llm_provider == "dashscope" or
-            self.llm_provider == "alibaba" or
-            (self.llm_provider == "google" and self.client is None) or
-            (self.llm_provider == "deepseek" and self.client is None) or
-            (self.llm_provider == "openrouter" and self.client is None)):
+        if self._uses_dashscope_embedding():
             # 使用阿里百炼的嵌入模型
             try:
                 # 导入DashScope模块
@@ -545,7 +632,6 @@ class FinancialSituationMemory:
         situations = []
         advice = []
         ids = []
-        embeddings = []
 
         offset = self.situation_collection.count()
 
@@ -553,7 +639,8 @@ class FinancialSituationMemory:
             situations.append(situation)
             advice.append(recommendation)
             ids.append(str(offset + i))
-            embeddings.append(self.get_embedding(situation))
+
+        embeddings = self.get_embeddings(situations)
 
         self.situation_collection.add(
             documents=situations,
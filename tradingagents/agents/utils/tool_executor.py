@@ -0,0 +1,193 @@
+"""
+工具调用执行器
+LLM 在一轮回复中返回多个工具调用时，在本轮独立的有界线程池中并发执行：
+- 工具多为访问 Tushare/AKShare/Finnhub/yfinance 的 I/O 操作，并发执行可显著缩短等待时间
+- 单个工具超时（TOOL_CALL_TIMEOUT，默认60秒，从工具开始执行时计时）或失败只影响该工具的结果
+- 每轮使用独立的线程池，超时后仍在运行的工具不会占用其他分析的线程
+- 返回结果与工具调用顺序一致，保证 ToolMessage 顺序稳定
+- 记录每个工具的耗时，按工具名汇总统计
+"""
+
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+from langchain_core.messages import ToolMessage
+
+# 导入统一日志系统
+from tradingagents.utils.logging_init import get_logger
+logger = get_logger("agents.utils.tool_executor")
+
+
+@dataclass
+class ToolCallResult:
+    """单个工具调用的执行结果"""
+    tool_call_id: Optional[str]
+    name: str
+    content: Any
+    status: str  # success / error / timeout / not_found
+    elapsed: float
+
+    def to_message(self) -> ToolMessage:
+        return ToolMessage(content=str(self.content), tool_call_id=self.tool_call_id)
+
+
+def get_tool_name(tool) -> Optional[str]:
+    """安全地获取工具名称（LangChain工具或普通函数）"""
+    if hasattr(tool, 'name'):
+        return tool.name
+    if hasattr(tool, '__name__'):
+        return tool.__name__
+    return None
+
+
+class _CallStart:
+    """记录工具开始执行的时间，超时从此刻开始计算"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.at: Optional[float] = None
+
+    def mark(self):
+        self.at = time.time()
+        self.event.set()
+
+
+class ToolExecutor:
+    """
+    并发执行一轮LLM回复中的工具调用
+
+    Args:
+        max_workers: 每轮工具调用的最大并发数
+        timeout: 单个工具的默认超时时间（秒）
+    """
+
+    def __init__(self, max_workers: int = 8, timeout: float = 60.0):
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self._stats_lock = threading.Lock()
+        self._latency: Dict[str, Dict[str, float]] = {}
+
+    def execute(self, tool_calls: Sequence[Dict[str, Any]], tools: Sequence[Any],
+                analyst_name: str = "", timeout: Optional[float] = None) -> List[ToolCallResult]:
+        """
+        并发执行工具调用
+
+        Args:
+            tool_calls: LLM返回的工具调用列表（包含 name / args / id）
+            tools: 可用工具列表
+            analyst_name: 用于日志的分析师名称
+            timeout: 单个工具的超时时间（秒，从工具开始执行时计时），默认使用执行器配置
+
+        Returns:
+            List[ToolCallResult]: 与 tool_calls 顺序一致的执行结果
+        """
+        timeout = self.timeout if timeout is None else timeout
+        tools_by_name = {}
+        for tool in tools:
+            tools_by_name.setdefault(get_tool_name(tool), tool)
+
+        runnable = sum(1 for tool_call in tool_calls if tool_call.get('name') in tools_by_name)
+        workers = min(self.max_workers, runnable)
+        # 每轮使用独立的线程池：超时的工具只占用本轮的线程，不影响其他分析的工具调用
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tool-call") if workers else None
+        start = time.time()
+        # 排队的工具最迟在前面各批全部超时后开始执行
+        start_deadline = start + timeout * math.ceil(runnable / workers) if workers else start
+
+        submitted = []
+        for tool_call in tool_calls:
+            tool = tools_by_name.get(tool_call.get('name'))
+            call_start = _CallStart()
+            future = pool.submit(self._run_tool, tool, tool_call, call_start) if tool is not None else None
+            submitted.append((tool_call, future, call_start))
+
+        results = []
+        try:
+            for tool_call, future, call_start in submitted:
+                name = tool_call.get('name')
+                tool_id = tool_call.get('id')
+                if future is None:
+                    logger.warning(f"[{analyst_name}] ⚠️ 未找到工具: {name}")
+                    results.append(ToolCallResult(tool_id, name, f"未找到工具: {name}", "not_found", 0.0))
+                    continue
+                try:
+                    if not call_start.event.wait(max(0.0, start_deadline - time.time())):
+                        raise FutureTimeoutError()
+                    remaining = max(0.0, call_start.at + timeout - time.time())
+                    results.append(future.result(timeout=remaining))
+                except FutureTimeoutError:
+                    # 线程无法强制终止，超时的工具在后台自然结束，结果被丢弃
+                    future.cancel()
+                    elapsed = time.time() - (call_start.at or start)
+                    logger.error(f"[{analyst_name}] ⏰ 工具执行超时: {name} ({timeout:.0f}秒)")
+                    results.append(ToolCallResult(tool_id, name, f"工具执行超时: {name}（超过{timeout:.0f}秒）",
+                                                  "timeout", elapsed))
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+
+        for result in results:
+            if result.status != "not_found":
+                self._record_latency(result.name, result.elapsed)
+
+        logger.info(f"[{analyst_name}] 🔧 {len(results)}个工具调用完成，总耗时{time.time() - start:.2f}秒: "
+                    + ", ".join(f"{r.name}={r.elapsed:.2f}s({r.status})" for r in results))
+        return results
+
+    @staticmethod
+    def _run_tool(tool, tool_call: Dict[str, Any], call_start: Optional[_CallStart] = None) -> ToolCallResult:
+        name = tool_call.get('name')
+        tool_args = tool_call.get('args', {}) or {}
+        if call_start is not None:
+            call_start.mark()
+        start = time.time()
+        try:
+            if hasattr(tool, 'invoke'):
+                content = tool.invoke(tool_args)
+            elif callable(tool):
+                content = tool(**tool_args)
+            else:
+                return ToolCallResult(tool_call.get('id'), name, f"工具类型不支持: {type(tool)}",
+                                      "error", time.time() - start)
+            return ToolCallResult(tool_call.get('id'), name, content, "success", time.time() - start)
+        except Exception as e:
+            logger.error(f"❌ 工具执行失败: {name}: {e}")
+            return ToolCallResult(tool_call.get('id'), name, f"工具执行失败: {str(e)}",
+                                  "error", time.time() - start)
+
+    def _record_latency(self, name: str, elapsed: float):
+        with self._stats_lock:
+            stats = self._latency.setdefault(name, {"count": 0, "total": 0.0, "max": 0.0})
+            stats["count"] += 1
+            stats["total"] += elapsed
+            stats["max"] = max(stats["max"], elapsed)
+
+    def latency_stats(self) -> Dict[str, Dict[str, float]]:
+        """按工具名汇总的耗时统计：调用次数、平均耗时、最大耗时（秒）"""
+        with self._stats_lock:
+            return {
+                name: {"count": s["count"], "avg": s["total"] / s["count"], "max": s["max"]}
+                for name, s in self._latency.items()
+            }
+
+
+_tool_executor: Optional[ToolExecutor] = None
+_tool_executor_lock = threading.Lock()
+
+
+def get_tool_executor() -> ToolExecutor:
+    """获取全局共享的工具调用执行器"""
+    global _tool_executor
+    if _tool_executor is None:
+        with _tool_executor_lock:
+            if _tool_executor is None:
+                _tool_executor = ToolExecutor(
+                    max_workers=int(os.getenv('TOOL_EXECUTOR_MAX_WORKERS', '8')),
+                    timeout=float(os.getenv('TOOL_CALL_TIMEOUT', '60')),
+                )
+    return _tool_executor
@@ -135,25 +135,19 @@ def search_stocks(keyword: str) -> List[Dict[str, Any]]:
         >>> for stock in results:
         logger.info(f"{stock["code']}: {stock['name']}")
     """
-    all_stocks = get_all_stocks()
-    
-    if not all_stocks or (len(all_stocks) == 1 and 'error' in all_stocks[0]):
-        return all_stocks
-    
-    # 搜索匹配的股票
-    matches = []
-    keyword_lower = keyword.lower()
-    
-    for stock in all_stocks:
-        if 'error' in stock:
-            continue
-            
-        code = stock.get('code', '').lower()
-        name = stock.get('name', '').lower()
-        
-        if keyword_lower in code or keyword_lower in name:
-            matches.append(stock)
-    
+    if not SERVICE_AVAILABLE:
+        return get_all_stocks()
+
+    # 使用内存搜索索引，股票列表只在构建/刷新索引时获取一次
+    from tradingagents.dataflows.symbol_search_index import get_symbol_search_index
+
+    index = get_symbol_search_index('stock_api', get_all_stocks)
+    matches = index.search(keyword)
+
+    if not matches and len(index) == 0:
+        # 索引未能构建（数据源不可用），返回错误信息
+        return get_all_stocks()
+
     return matches
 
 def get_market_summary() -> Dict[str, Any]:
@@ -7,8 +7,9 @@
 import json
 import os
 import re
-from datetime import datetime
-from typing import Dict, List, Optional, Any
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 from pathlib import Path
 from dotenv import load_dotenv
@@ -20,6 +21,8 @@ from tradingagents.utils.logging_init import get_logger
 from tradingagents.utils.logging_manager import get_logger
 logger = get_logger('agents')
 
+from .usage_ledger import UsageLedger
+
 try:
     from .mongodb_storage import MongoDBStorage
     MONGODB_AVAILABLE = True
@@ -73,8 +76,18 @@ class ConfigManager:
         self.models_file = self.config_dir / "models.json"
         self.pricing_file = self.config_dir / "pricing.json"
         self.usage_file = self.config_dir / "usage.json"
+        self.usage_ledger_file = self.config_dir / "usage.jsonl"
         self.settings_file = self.config_dir / "settings.json"
 
+        # 配置文件读取缓存：{文件路径: ((mtime_ns, size), 解析结果)}，文件变化时自动失效
+        self._file_cache: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+        self._pricing_index: Dict[Tuple[str, str], PricingConfig] = {}
+        self._pricing_index_source = None
+        self._cache_lock = threading.RLock()
+
+        # 追加写入的使用记录账本（旧版 usage.json 会被自动迁移）
+        self.usage_ledger = UsageLedger(self.usage_ledger_file, UsageRecord, legacy_file=self.usage_file)
+
         # 加载.env文件（保持向后兼容）
         self._load_env_file()
 
@@ -281,38 +294,71 @@ class ConfigManager:
             }
             self.save_settings(default_settings)
     
+    def _read_json_cached(self, file_path: Path) -> Any:
+        """
+        读取JSON配置文件，按 (mtime, size) 缓存解析结果
+
+        调用方不得修改返回值，需要修改时先复制。
+        """
+        key = str(file_path)
+        stat = os.stat(file_path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        with self._cache_lock:
+            cached = self._file_cache.get(key)
+            if cached is not None and cached[0] == signature:
+                return cached[1]
+
+            with open(file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self._file_cache[key] = (signature, data)
+            return data
+
+    def invalidate_cache(self, file_path: Optional[Path] = None):
+        """
+        使配置读取缓存失效
+
+        Args:
+            file_path: 指定文件；为 None 时清除全部缓存
+        """
+        with self._cache_lock:
+            if file_path is None:
+                self._file_cache.clear()
+            else:
+                self._file_cache.pop(str(file_path), None)
+            self._pricing_index_source = None
+
     def load_models(self) -> List[ModelConfig]:
         """加载模型配置，优先使用.env中的API密钥"""
         try:
-            with open(self.models_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                models = [ModelConfig(**item) for item in data]
-
-                # 获取设置
-                settings = self.load_settings()
-                openai_enabled = settings.get("openai_enabled", False)
-
-                # 合并.env中的API密钥（优先级更高）
-                for model in models:
-                    env_api_key = self._get_env_api_key(model.provider)
-                    if env_api_key:
-                        model.api_key = env_api_key
-                        # 如果.env中有API密钥，自动启用该模型
-                        if not model.enabled:
-                            model.enabled = True
-                    
-                    # 特殊处理OpenAI模型
-                    if model.provider.lower() == "openai":
-                        # 检查OpenAI是否在配置中启用
-                        if not openai_enabled:
-                            model.enabled = False
-                            logger.info(f"🔒 OpenAI模型已禁用: {model.model_name}")
-                        # 如果有API密钥但格式不正确，禁用模型（验证始终启用）
-                        elif model.api_key and not self.validate_openai_api_key_format(model.api_key):
-                            model.enabled = False
-                            logger.warning(f"⚠️ OpenAI模型因密钥格式不正确而禁用: {model.model_name}")
-
-                return models
+            data = self._read_json_cached(self.models_file)
+            models = [ModelConfig(**item) for item in data]
+
+            # 获取设置
+            settings = self.load_settings()
+            openai_enabled = settings.get("openai_enabled", False)
+
+            # 合并.env中的API密钥（优先级更高）
+            for model in models:
+                env_api_key = self._get_env_api_key(model.provider)
+                if env_api_key:
+                    model.api_key = env_api_key
+                    # 如果.env中有API密钥，自动启用该模型
+                    if not model.enabled:
+                        model.enabled = True
+                
+                # 特殊处理OpenAI模型
+                if model.provider.lower() == "openai":
+                    # 检查OpenAI是否在配置中启用
+                    if not openai_enabled:
+                        model.enabled = False
+                        logger.info(f"🔒 OpenAI模型已禁用: {model.model_name}")
+                    # 如果有API密钥但格式不正确，禁用模型（验证始终启用）
+                    elif model.api_key and not self.validate_openai_api_key_format(model.api_key):
+                        model.enabled = False
+                        logger.warning(f"⚠️ OpenAI模型因密钥格式不正确而禁用: {model.model_name}")
+
+            return models
         except Exception as e:
             logger.error(f"加载模型配置失败: {e}")
             return []
@@ -325,16 +371,36 @@ class ConfigManager:
                 json.dump(data, f, ensure_ascii=False, indent=2)
         except Exception as e:
             logger.error(f"保存模型配置失败: {e}")
+        finally:
+            self.invalidate_cache(self.models_file)
     
     def load_pricing(self) -> List[PricingConfig]:
         """加载定价配置"""
         try:
-            with open(self.pricing_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = self._read_json_cached(self.pricing_file)
             return [PricingConfig(**item) for item in data]
         except Exception as e:
             logger.error(f"加载定价配置失败: {e}")
             return []
+
+    def _get_pricing_index(self) -> Dict[Tuple[str, str], PricingConfig]:
+        """按 (provider, model_name) 索引的定价表，pricing.json 变化时重建"""
+        try:
+            data = self._read_json_cached(self.pricing_file)
+        except Exception as e:
+            logger.error(f"加载定价配置失败: {e}")
+            return {}
+
+        with self._cache_lock:
+            if self._pricing_index_source is not data:
+                index = {}
+                for item in data:
+                    pricing = PricingConfig(**item)
+                    # 与原线性查找一致：重复配置时以第一条为准
+                    index.setdefault((pricing.provider, pricing.model_name), pricing)
+                self._pricing_index = index
+                self._pricing_index_source = data
+            return self._pricing_index
     
     def save_pricing(self, pricing: List[PricingConfig]):
         """保存定价配置"""
@@ -344,25 +410,22 @@ class ConfigManager:
                 json.dump(data, f, ensure_ascii=False, indent=2)
         except Exception as e:
             logger.error(f"保存定价配置失败: {e}")
+        finally:
+            self.invalidate_cache(self.pricing_file)
     
-    def load_usage_records(self) -> List[UsageRecord]:
-        """加载使用记录"""
+    def load_usage_records(self, days: Optional[int] = None) -> List[UsageRecord]:
+        """加载使用记录，指定 days 时只返回最近N天的记录"""
         try:
-            if not self.usage_file.exists():
-                return []
-            with open(self.usage_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return [UsageRecord(**item) for item in data]
+            since = datetime.now() - timedelta(days=days) if days is not None else None
+            return self.usage_ledger.records(since)
         except Exception as e:
             logger.error(f"加载使用记录失败: {e}")
             return []
     
     def save_usage_records(self, records: List[UsageRecord]):
-        """保存使用记录"""
+        """保存使用记录（整体替换账本）"""
         try:
-            data = [asdict(record) for record in records]
-            with open(self.usage_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            self.usage_ledger.rewrite(records)
         except Exception as e:
             logger.error(f"保存使用记录失败: {e}")
     
@@ -391,34 +454,30 @@ class ConfigManager:
             else:
                 logger.error(f"⚠️ MongoDB保存失败，回退到JSON文件存储")
         
-        # 回退到JSON文件存储
-        records = self.load_usage_records()
-        records.append(record)
-        
-        # 限制记录数量
+        # 回退到本地账本存储（追加写入，超出上限时按批压缩）
         settings = self.load_settings()
         max_records = settings.get("max_usage_records", 10000)
-        if len(records) > max_records:
-            records = records[-max_records:]
-        
-        self.save_usage_records(records)
+        try:
+            self.usage_ledger.append(record, max_records=max_records)
+        except Exception as e:
+            logger.error(f"保存使用记录失败: {e}")
         return record
     
     def calculate_cost(self, provider: str, model_name: str, input_tokens: int, output_tokens: int) -> float:
         """计算使用成本"""
-        pricing_configs = self.load_pricing()
+        pricing_index = self._get_pricing_index()
 
-        for pricing in pricing_configs:
-            if pricing.provider == provider and pricing.model_name == model_name:
-                input_cost = (input_tokens / 1000) * pricing.input_price_per_1k
-                output_cost = (output_tokens / 1000) * pricing.output_price_per_1k
-                total_cost = input_cost + output_cost
-                return round(total_cost, 6)
+        pricing = pricing_index.get((provider, model_name))
+        if pricing is not None:
+            input_cost = (input_tokens / 1000) * pricing.input_price_per_1k
+            output_cost = (output_tokens / 1000) * pricing.output_price_per_1k
+            total_cost = input_cost + output_cost
+            return round(total_cost, 6)
 
         # 只在找不到配置时输出调试信息
         logger.warning(f"⚠️ [calculate_cost] 未找到匹配的定价配置: {provider}/{model_name}")
         logger.debug(f"⚠️ [calculate_cost] 可用的配置:")
-        for pricing in pricing_configs:
+        for pricing in pricing_index.values():
             logger.debug(f"⚠️ [calculate_cost]   - {pricing.provider}/{pricing.model_name}")
 
         return 0.0
@@ -427,8 +486,8 @@ class ConfigManager:
         """加载设置，合并.env中的配置"""
         try:
             if self.settings_file.exists():
-                with open(self.settings_file, 'r', encoding='utf-8') as f:
-                    settings = json.load(f)
+                # 复制缓存结果，下面合并.env配置时不能修改缓存
+                settings = dict(self._read_json_cached(self.settings_file))
             else:
                 # 如果设置文件不存在，创建默认设置
                 settings = {
@@ -503,6 +562,8 @@ class ConfigManager:
                 json.dump(settings, f, ensure_ascii=False, indent=2)
         except Exception as e:
             logger.error(f"保存设置失败: {e}")
+        finally:
+            self.invalidate_cache(self.settings_file)
     
     def get_enabled_models(self) -> List[ModelConfig]:
         """获取启用的模型"""
@@ -534,52 +595,14 @@ class ConfigManager:
             except Exception as e:
                 logger.error(f"⚠️ MongoDB统计获取失败，回退到JSON文件: {e}")
         
-        # 回退到JSON文件统计
-        records = self.load_usage_records()
-        
-        # 过滤最近N天的记录
-        from datetime import datetime, timedelta
+        # 回退到本地账本的内存汇总
+        return self.usage_ledger.get_statistics(days)
 
-        cutoff_date = datetime.now() - timedelta(days=days)
-        
-        recent_records = []
-        for record in records:
-            try:
-                record_date = datetime.fromisoformat(record.timestamp)
-                if record_date >= cutoff_date:
-                    recent_records.append(record)
-            except:
-                continue
-        
-        # 统计数据
-        total_cost = sum(record.cost for record in recent_records)
-        total_input_tokens = sum(record.input_tokens for record in recent_records)
-        total_output_tokens = sum(record.output_tokens for record in recent_records)
-        
-        # 按供应商统计
-        provider_stats = {}
-        for record in recent_records:
-            if record.provider not in provider_stats:
-                provider_stats[record.provider] = {
-                    "cost": 0,
-                    "input_tokens": 0,
-                    "output_tokens": 0,
-                    "requests": 0
-                }
-            provider_stats[record.provider]["cost"] += record.cost
-            provider_stats[record.provider]["input_tokens"] += record.input_tokens
-            provider_stats[record.provider]["output_tokens"] += record.output_tokens
-            provider_stats[record.provider]["requests"] += 1
-        
-        return {
-            "period_days": days,
-            "total_cost": round(total_cost, 4),
-            "total_input_tokens": total_input_tokens,
-            "total_output_tokens": total_output_tokens,
-            "total_requests": len(recent_records),
-            "provider_stats": provider_stats,
-            "records_count": len(recent_records)
-        }
+    def get_today_cost(self) -> float:
+        """获取今日总成本"""
+        if self.mongodb_storage and self.mongodb_storage.is_connected():
+            return self.get_usage_statistics(1).get("total_cost", 0.0)
+        return self.usage_ledger.get_day_cost()
     
     def get_data_dir(self) -> str:
         """获取数据目录路径"""
@@ -690,9 +713,8 @@ class TokenTracker:
         settings = self.config_manager.load_settings()
         threshold = settings.get("cost_alert_threshold", 100.0)
 
-        # 获取今日总成本
-        today_stats = self.config_manager.get_usage_statistics(1)
-        total_today = today_stats["total_cost"]
+        # 获取今日总成本（本地账本为O(1)的日汇总查询）
+        total_today = self.config_manager.get_today_cost()
 
         if total_today >= threshold:
             logger.warning(f"⚠️ 成本警告: 今日成本已达到 ¥{total_today:.4f}，超过阈值 ¥{threshold}",
@@ -700,9 +722,7 @@ class TokenTracker:
 
     def get_session_cost(self, session_id: str) -> float:
         """获取会话成本"""
-        records = self.config_manager.load_usage_records()
-        session_cost = sum(record.cost for record in records if record.session_id == session_id)
-        return session_cost
+        return self.config_manager.usage_ledger.get_session_cost(session_id)
 
     def estimate_cost(self, provider: str, model_name: str, estimated_input_tokens: int,
                      estimated_output_tokens: int) -> float:
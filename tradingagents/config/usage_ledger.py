@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Token使用记录账本
+使用追加写入的 JSONL 文件保存使用记录，并在内存中维护按天/供应商/会话的汇总，
+使成本警告检查和会话成本查询不再需要重新解析全部记录。
+"""
+
+import os
+import json
+import threading
+from dataclasses import asdict
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# 导入日志模块
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('agents')
+
+# 记录数超过 max_records 的该倍数时才压缩文件，使压缩成本均摊为 O(1)
+COMPACTION_SLACK = 1.2
+
+
+def _empty_totals() -> Dict[str, Any]:
+    return {"cost": 0.0, "input_tokens": 0, "output_tokens": 0, "requests": 0}
+
+
+def _add_to_totals(totals: Dict[str, Any], record) -> None:
+    totals["cost"] += record.cost
+    totals["input_tokens"] += record.input_tokens
+    totals["output_tokens"] += record.output_tokens
+    totals["requests"] += 1
+
+
+class UsageLedger:
+    """追加写入的使用记录账本，带内存汇总索引"""
+
+    def __init__(self, ledger_file: Path, record_factory: Callable[..., Any],
+                 legacy_file: Optional[Path] = None):
+        """
+        初始化账本
+
+        Args:
+            ledger_file: JSONL 账本文件路径
+            record_factory: 由字典构造记录对象的工厂（如 UsageRecord）
+            legacy_file: 旧版 usage.json 文件，首次使用时自动迁移
+        """
+        self.ledger_file = Path(ledger_file)
+        self.record_factory = record_factory
+        self._lock = threading.RLock()
+
+        self._records: List[Any] = []
+        self._days: Dict[str, Dict[str, Any]] = {}
+        self._sessions: Dict[str, float] = {}
+        self._offset = 0
+        self._file_id = None
+
+        if legacy_file is not None:
+            self._migrate_legacy_file(Path(legacy_file))
+
+        with self._lock:
+            self._reload()
+
+    # ------------------------------------------------------------------
+    # 写入
+    # ------------------------------------------------------------------
+    def append(self, record, max_records: Optional[int] = None) -> None:
+        """追加一条记录（单次 append 写入，不重写文件）"""
+        line = json.dumps(asdict(record), ensure_ascii=False) + "\n"
+        with self._lock:
+            self._sync()
+            with open(self.ledger_file, "a", encoding="utf-8") as f:
+                f.write(line)
+            # 读取自己（以及其他进程）新追加的行，保持内存索引与文件一致
+            self._sync()
+
+            if max_records and len(self._records) > max_records * COMPACTION_SLACK:
+                self._rewrite(self._records[-max_records:])
+
+    def rewrite(self, records: List[Any]) -> None:
+        """用给定记录整体替换账本（用于清空或裁剪）"""
+        with self._lock:
+            self._rewrite(list(records))
+
+    # ------------------------------------------------------------------
+    # 查询
+    # ------------------------------------------------------------------
+    def records(self, since: Optional[datetime] = None) -> List[Any]:
+        """返回记录列表；指定 since 时只返回该时间之后的记录"""
+        with self._lock:
+            self._sync()
+            if since is None:
+                return list(self._records)
+
+            cutoff_day = since.date().isoformat()
+            result = []
+            for day in sorted(self._days):
+                if day < cutoff_day:
+                    continue
+                day_records = self._days[day]["records"]
+                if day == cutoff_day:
+                    day_records = [r for r in day_records if self._after(r, since)]
+                result.extend(day_records)
+            return result
+
+    def get_day_cost(self, day: Optional[str] = None) -> float:
+        """某一天（默认今天）的总成本，O(1)"""
+        day = day or datetime.now().date().isoformat()
+        with self._lock:
+            self._sync()
+            bucket = self._days.get(day)
+            return bucket["totals"]["cost"] if bucket else 0.0
+
+    def get_session_cost(self, session_id: str) -> float:
+        """会话总成本，O(1)"""
+        with self._lock:
+            self._sync()
+            return self._sessions.get(session_id, 0.0)
+
+    def get_statistics(self, days: int = 30) -> Dict[str, Any]:
+        """
+        最近 N 天的统计
+
+        完整的天直接累加日汇总，只有边界当天需要逐条过滤，
+        因此耗时与天数成正比，而不是与记录总数成正比。
+        """
+        cutoff = datetime.now() - timedelta(days=days)
+        cutoff_day = cutoff.date().isoformat()
+
+        totals = _empty_totals()
+        provider_stats: Dict[str, Dict[str, Any]] = {}
+
+        with self._lock:
+            self._sync()
+            for day, bucket in self._days.items():
+                if day > cutoff_day:
+                    self._merge_totals(totals, bucket["totals"])
+                    for provider, provider_totals in bucket["providers"].items():
+                        self._merge_totals(provider_stats.setdefault(provider, _empty_totals()),
+                                           provider_totals)
+                elif day == cutoff_day:
+                    for record in bucket["records"]:
+                        if self._after(record, cutoff):
+                            _add_to_totals(totals, record)
+                            _add_to_totals(provider_stats.setdefault(record.provider, _empty_totals()),
+                                           record)
+
+        return {
+            "period_days": days,
+            "total_cost": round(totals["cost"], 4),
+            "total_input_tokens": totals["input_tokens"],
+            "total_output_tokens": totals["output_tokens"],
+            "total_requests": totals["requests"],
+            "provider_stats": provider_stats,
+            "records_count": totals["requests"],
+        }
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._sync()
+            return len(self._records)
+
+    # ------------------------------------------------------------------
+    # 内部实现
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _after(record, cutoff: datetime) -> bool:
+        try:
+            return datetime.fromisoformat(record.timestamp) >= cutoff
+        except Exception:
+            return False
+
+    @staticmethod
+    def _merge_totals(target: Dict[str, Any], source: Dict[str, Any]) -> None:
+        for key in ("cost", "input_tokens", "output_tokens", "requests"):
+            target[key] += source[key]
+
+    def _index(self, record) -> None:
+        self._records.append(record)
+
+        day = str(record.timestamp)[:10]
+        bucket = self._days.get(day)
+        if bucket is None:
+            bucket = {"totals": _empty_totals(), "providers": {}, "records": []}
+            self._days[day] = bucket
+        _add_to_totals(bucket["totals"], record)
+        _add_to_totals(bucket["providers"].setdefault(record.provider, _empty_totals()), record)
+        bucket["records"].append(record)
+
+        self._sessions[record.session_id] = self._sessions.get(record.session_id, 0.0) + record.cost
+
+    def _reset_index(self) -> None:
+        self._records = []
+        self._days = {}
+        self._sessions = {}
+        self._offset = 0
+
+    def _current_file_id(self):
+        try:
+            stat = os.stat(self.ledger_file)
+            return (stat.st_dev, stat.st_ino), stat.st_size
+        except FileNotFoundError:
+            return None, 0
+
+    def _reload(self) -> None:
+        self._reset_index()
+        self._file_id = None
+        self._sync()
+
+    def _sync(self) -> None:
+        """增量读取其他写入者追加的新行；文件被替换或截断时全量重建"""
+        file_id, size = self._current_file_id()
+        if file_id is None:
+            if self._records:
+                self._reset_index()
+            self._file_id = None
+            return
+
+        if file_id != self._file_id or size < self._offset:
+            self._reset_index()
+            self._file_id = file_id
+
+        if size == self._offset:
+            return
+
+        with open(self.ledger_file, "rb") as f:
+            f.seek(self._offset)
+            chunk = f.read(size - self._offset)
+
+        # 只消费完整的行，半行留到下次读取
+        end = chunk.rfind(b"\n")
+        if end < 0:
+            return
+        for raw_line in chunk[:end].splitlines():
+            if not raw_line.strip():
+                continue
+            try:
+                self._index(self.record_factory(**json.loads(raw_line.decode("utf-8"))))
+            except Exception as e:
+                logger.warning(f"⚠️ 跳过无法解析的使用记录: {e}")
+        self._offset += end + 1
+
+    def _rewrite(self, records: List[Any]) -> None:
+        self.ledger_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.ledger_file.with_suffix(self.ledger_file.suffix + ".tmp")
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(asdict(record), ensure_ascii=False) + "\n")
+        os.replace(tmp_file, self.ledger_file)
+        self._reload()
+
+    def _migrate_legacy_file(self, legacy_file: Path) -> None:
+        """将旧版 usage.json 一次性转换为 JSONL 账本"""
+        if self.ledger_file.exists() or not legacy_file.exists():
+            return
+        try:
+            with open(legacy_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            records = [self.record_factory(**item) for item in data]
+            with self._lock:
+                self._rewrite(records)
+            legacy_file.replace(legacy_file.with_suffix(legacy_file.suffix + ".migrated"))
+            logger.info(f"✅ 已迁移 {len(records)} 条使用记录到 {self.ledger_file.name}")
+        except Exception as e:
+            logger.error(f"❌ 迁移旧版使用记录失败: {e}")
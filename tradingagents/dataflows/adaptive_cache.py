@@ -15,6 +15,8 @@ from typing import Any, Dict, Optional, Union
 import pandas as pd
 
 from ..config.database_manager import get_database_manager
+from . import frame_serializer
+from .payload_codec import get_payload_codec
 
 class AdaptiveCacheSystem:
     """自适应缓存系统"""
@@ -37,6 +39,9 @@ class AdaptiveCacheSystem:
         self.primary_backend = self.cache_config["primary_backend"]
         self.fallback_enabled = self.cache_config["fallback_enabled"]
         
+        # Redis/MongoDB 缓存条目的压缩编解码器
+        self.codec = get_payload_codec()
+        
         self.logger.info(f"自适应缓存系统初始化 - 主要后端: {self.primary_backend}")
     
     def _get_cache_key(self, symbol: str, start_date: str = "", end_date: str = "", 
@@ -78,7 +83,7 @@ class AdaptiveCacheSystem:
             }
             
             with open(cache_file, 'wb') as f:
-                pickle.dump(cache_data, f)
+                pickle.dump(cache_data, f, protocol=pickle.HIGHEST_PROTOCOL)
             
             self.logger.debug(f"文件缓存保存成功: {cache_key}")
             return True
@@ -118,8 +123,8 @@ class AdaptiveCacheSystem:
                 'backend': 'redis'
             }
             
-            serialized_data = pickle.dumps(cache_data)
-            redis_client.setex(cache_key, ttl_seconds, serialized_data)
+            serialized_data = pickle.dumps(cache_data, protocol=pickle.HIGHEST_PROTOCOL)
+            redis_client.setex(cache_key, ttl_seconds, self.codec.encode(serialized_data))
             
             self.logger.debug(f"Redis缓存保存成功: {cache_key}")
             return True
@@ -139,7 +144,7 @@ class AdaptiveCacheSystem:
             if not serialized_data:
                 return None
             
-            cache_data = pickle.loads(serialized_data)
+            cache_data = pickle.loads(self.codec.decode(serialized_data))
             
             # 转换时间戳
             if isinstance(cache_data['timestamp'], str):
@@ -164,11 +169,11 @@ class AdaptiveCacheSystem:
             
             # 序列化数据
             if isinstance(data, pd.DataFrame):
-                serialized_data = data.to_json()
-                data_type = 'dataframe'
+                serialized_data = self.codec.encode(frame_serializer.dumps_frame(data))
+                data_type = 'dataframe_binary'
             else:
-                serialized_data = pickle.dumps(data).hex()
-                data_type = 'pickle'
+                serialized_data = self.codec.encode(pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+                data_type = 'pickle_binary'
             
             cache_doc = {
                 '_id': cache_key,
@@ -209,7 +214,12 @@ class AdaptiveCacheSystem:
                 return None
             
             # 反序列化数据
-            if doc['data_type'] == 'dataframe':
+            if doc['data_type'] == 'dataframe_binary':
+                data = frame_serializer.loads_frame(self.codec.decode(doc['data']))
+            elif doc['data_type'] == 'pickle_binary':
+                data = pickle.loads(self.codec.decode(doc['data']))
+            elif doc['data_type'] == 'dataframe':
+                # 兼容旧版JSON格式
                 data = pd.read_json(doc['data'])
             else:
                 data = pickle.loads(bytes.fromhex(doc['data']))
@@ -268,8 +278,8 @@ class AdaptiveCacheSystem:
         
         return cache_key
     
-    def load_data(self, cache_key: str) -> Optional[Any]:
-        """从缓存加载数据"""
+    def load_entry(self, cache_key: str) -> Optional[Dict]:
+        """从缓存加载有效的缓存条目（data、metadata、timestamp、backend）"""
         cache_data = None
         
         # 根据主要后端加载
@@ -298,7 +308,23 @@ class AdaptiveCacheSystem:
                 self.logger.debug(f"文件缓存已过期: {cache_key}")
                 return None
         
-        return cache_data['data']
+        return cache_data
+    
+    def load_data(self, cache_key: str) -> Optional[Any]:
+        """从缓存加载数据"""
+        cache_data = self.load_entry(cache_key)
+        return cache_data['data'] if cache_data else None
+    
+    def remaining_ttl_seconds(self, cache_data: Dict) -> float:
+        """缓存条目的剩余有效时间（秒），按条目写入时间计算"""
+        timestamp = cache_data.get('timestamp')
+        if timestamp is None:
+            return 0
+        if isinstance(timestamp, str):
+            timestamp = datetime.fromisoformat(timestamp)
+        metadata = cache_data.get('metadata') or {}
+        ttl_seconds = self._get_ttl_seconds(metadata.get('symbol', ''), metadata.get('data_type', 'stock_data'))
+        return ttl_seconds - (datetime.now() - timestamp).total_seconds()
     
     def find_cached_data(self, symbol: str, start_date: str = "", end_date: str = "", 
                         data_source: str = "default", data_type: str = "stock_data") -> Optional[str]:
@@ -321,6 +347,7 @@ class AdaptiveCacheSystem:
             'redis_available': self.db_manager.is_redis_available(),
             'file_cache_directory': str(self.cache_dir),
             'file_cache_count': len(list(self.cache_dir.glob("*.pkl"))),
+            'codec': self.codec.get_stats(),
         }
         
         # Redis统计
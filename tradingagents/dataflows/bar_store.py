@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+日线数据区间存储
+按 (数据源, 股票代码) 保存已获取的日线数据及其覆盖的日期区间并集：
+- 请求区间被已有区间覆盖时直接从存储切片返回
+- 只向数据源请求缺失的前段/后段（或中间）缺口，获取后与已有数据合并
+- 当天及之后的日期不计入覆盖区间（当日K线尚未收盘），下次请求会重新获取
+- 存储超过 bar_store_max_age_days 天后整体失效，避免复权价格或数据修正长期不一致
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .frame_serializer import save_frame, load_frame, file_extension
+
+# 导入日志模块
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('dataflows')
+
+META_SUFFIX = ".meta.json"
+
+DateRange = Tuple[date, date]
+BarFetcher = Callable[[str, str, str], Optional[pd.DataFrame]]
+
+
+def _parse_date(value) -> date:
+    return pd.Timestamp(str(value)[:10]).date()
+
+
+def _format_date(value: date) -> str:
+    return value.strftime("%Y-%m-%d")
+
+
+def _date_keys(df: pd.DataFrame, date_column: Optional[str]) -> np.ndarray:
+    """日期列（或索引）转换为 YYYYMMDD 整数数组"""
+    values = df.index if date_column is None else df[date_column]
+    dates = pd.to_datetime(values)
+    if getattr(dates, "tz", None) is not None or getattr(getattr(dates, "dt", None), "tz", None) is not None:
+        dates = dates.tz_localize(None) if date_column is None else dates.dt.tz_localize(None)
+    if date_column is not None:
+        dates = pd.DatetimeIndex(dates)
+    return (dates.year * 10000 + dates.month * 100 + dates.day).to_numpy(dtype=np.int64)
+
+
+def _date_key(value: date) -> int:
+    return value.year * 10000 + value.month * 100 + value.day
+
+
+def merge_ranges(ranges: List[DateRange]) -> List[DateRange]:
+    """合并重叠或相邻的日期区间"""
+    merged: List[DateRange] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def missing_ranges(ranges: List[DateRange], start: date, end: date) -> List[DateRange]:
+    """请求区间中未被已有区间覆盖的部分"""
+    gaps: List[DateRange] = []
+    cursor = start
+    for range_start, range_end in merge_ranges(ranges):
+        if range_end < cursor:
+            continue
+        if range_start > end:
+            break
+        if range_start > cursor:
+            gaps.append((cursor, min(end, range_start - timedelta(days=1))))
+        cursor = max(cursor, range_end + timedelta(days=1))
+        if cursor > end:
+            return gaps
+    if cursor <= end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+class _BarEntry:
+    """单个 (数据源, 股票代码) 的日线数据与覆盖区间"""
+
+    def __init__(self, bars: pd.DataFrame, date_column: Optional[str], ranges: List[DateRange], created_at: float):
+        self.bars = bars
+        self.date_column = date_column
+        self.keys = _date_keys(bars, date_column) if len(bars) else np.empty(0, dtype=np.int64)
+        self.ranges = ranges
+        self.created_at = created_at
+
+    def slice(self, start: date, end: date) -> pd.DataFrame:
+        lo = np.searchsorted(self.keys, _date_key(start), side="left")
+        hi = np.searchsorted(self.keys, _date_key(end), side="right")
+        return self.bars.iloc[lo:hi].copy()
+
+    def merge(self, new_bars: pd.DataFrame) -> "_BarEntry":
+        """合并新获取的数据，同一交易日以新数据为准"""
+        if new_bars is None or new_bars.empty:
+            return self
+        combined = pd.concat([self.bars, new_bars]) if len(self.bars) else new_bars
+        keys = _date_keys(combined, self.date_column)
+        keep = ~pd.Index(keys).duplicated(keep="last")
+        order = np.argsort(keys[keep], kind="stable")
+        combined = combined[keep].iloc[order]
+        if self.date_column is not None:
+            combined = combined.reset_index(drop=True)
+        return _BarEntry(combined, self.date_column, self.ranges, self.created_at)
+
+
+class BarStore:
+    """
+    日线数据区间存储
+
+    Args:
+        store_dir: 存储目录，默认为 data_cache_dir/bar_store
+        max_age_days: 存储的最长保留天数，超过后整体重新获取；0 表示不过期
+    """
+
+    def __init__(self, store_dir: str = None, max_age_days: Optional[float] = None):
+        if store_dir is None or max_age_days is None:
+            from .config import get_config
+            config = get_config()
+            if store_dir is None:
+                store_dir = os.path.join(config["data_cache_dir"], "bar_store")
+            if max_age_days is None:
+                max_age_days = config.get("bar_store_max_age_days", 7)
+
+        self.store_dir = Path(store_dir)
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        self.max_age_seconds = max_age_days * 86400
+
+        self._entries: Dict[Tuple[str, str], _BarEntry] = {}
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self.stats = {"hits": 0, "partial_hits": 0, "misses": 0, "gap_fetches": 0, "fetch_failures": 0}
+
+    def get_bars(self, symbol: str, source: str, start_date: str, end_date: str, fetcher: BarFetcher,
+                 date_column: Optional[str] = None, force_refresh: bool = False,
+                 today: Optional[date] = None) -> Optional[pd.DataFrame]:
+        """
+        获取日期区间内的日线数据，只向数据源请求存储中缺失的部分
+
+        Args:
+            symbol: 股票代码
+            source: 数据源名称（不同数据源的列结构不同，分开存储）
+            start_date: 开始日期 (YYYY-MM-DD)
+            end_date: 结束日期 (YYYY-MM-DD)
+            fetcher: fetcher(symbol, start_date, end_date) 返回该区间的日线DataFrame，失败返回None
+            date_column: 日期列名；为 None 时使用索引
+            force_refresh: 重新获取整个请求区间并覆盖存储中的对应数据
+            today: 当前日期（测试用）
+
+        Returns:
+            pd.DataFrame: 区间内的日线数据（按日期升序）；没有任何可用数据、或有缺口获取失败时返回None
+                （调用方改为获取整个区间，避免返回缺少部分日期的数据）
+        """
+        start, end = _parse_date(start_date), _parse_date(end_date)
+        if start > end:
+            start, end = end, start
+        today = today or date.today()
+        key = (source, symbol)
+
+        with self._lock_for(key):
+            entry = self._load_entry(key)
+            gaps = [(start, end)] if entry is None or force_refresh else missing_ranges(entry.ranges, start, end)
+
+            if not gaps:
+                self.stats["hits"] += 1
+                logger.debug(f"⚡ [日线存储] 命中: {source}/{symbol} {start_date}~{end_date}")
+                return entry.slice(start, end)
+
+            if entry is None:
+                self.stats["misses"] += 1
+                entry = _BarEntry(pd.DataFrame(), date_column, [], time.time())
+            else:
+                self.stats["partial_hits"] += 1
+
+            changed = False
+            fetch_failed = False
+            for gap_start, gap_end in gaps:
+                logger.info(f"🌐 [日线存储] 获取缺口: {source}/{symbol} {_format_date(gap_start)}~{_format_date(gap_end)}")
+                self.stats["gap_fetches"] += 1
+                try:
+                    bars = fetcher(symbol, _format_date(gap_start), _format_date(gap_end))
+                except Exception as e:
+                    logger.warning(f"⚠️ [日线存储] 获取缺口失败: {source}/{symbol} {e}")
+                    bars = None
+
+                if bars is None or (bars.empty and not self._only_weekends(gap_start, gap_end)):
+                    # 数据源失败（或在包含交易日的区间返回空数据）时不记录覆盖，下次重新获取
+                    self.stats["fetch_failures"] += 1
+                    fetch_failed = fetch_failed or bars is None
+                    continue
+
+                entry = entry.merge(bars)
+                covered_end = min(gap_end, today - timedelta(days=1))
+                if gap_start <= covered_end:
+                    entry.ranges = merge_ranges(entry.ranges + [(gap_start, covered_end)])
+                changed = True
+
+            if changed:
+                self._entries[key] = entry
+                self._save_entry(key, entry)
+
+            if fetch_failed:
+                # 已获取的缺口仍然保存，但不返回缺少部分区间的数据
+                logger.warning(f"⚠️ [日线存储] 部分缺口获取失败，不返回不完整的数据: {source}/{symbol} {start_date}~{end_date}")
+                return None
+
+            result = entry.slice(start, end)
+            return result if not result.empty or changed else None
+
+    def coverage(self, symbol: str, source: str) -> List[Tuple[str, str]]:
+        """已覆盖的日期区间"""
+        key = (source, symbol)
+        with self._lock_for(key):
+            entry = self._load_entry(key)
+            return [(_format_date(s), _format_date(e)) for s, e in entry.ranges] if entry else []
+
+    def invalidate(self, symbol: str, source: str):
+        """删除指定股票的存储数据"""
+        key = (source, symbol)
+        with self._lock_for(key):
+            self._entries.pop(key, None)
+            data_path, meta_path = self._paths(key)
+            for path in (data_path, meta_path):
+                if path.exists():
+                    path.unlink()
+
+    @staticmethod
+    def _only_weekends(start: date, end: date) -> bool:
+        """区间内是否只有周末（没有交易日，空结果是正常的）"""
+        return (end - start).days < 2 and all(
+            (start + timedelta(days=offset)).weekday() >= 5 for offset in range((end - start).days + 1)
+        )
+
+    def _lock_for(self, key) -> threading.Lock:
+        with self._locks_guard:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+    def _paths(self, key) -> Tuple[Path, Path]:
+        source, symbol = key
+        safe_symbol = re.sub(r"[^0-9A-Za-z._-]", "_", symbol)
+        directory = self.store_dir / re.sub(r"[^0-9A-Za-z._-]", "_", source)
+        return directory / f"{safe_symbol}.{file_extension()}", directory / f"{safe_symbol}{META_SUFFIX}"
+
+    def _expired(self, entry: _BarEntry) -> bool:
+        return self.max_age_seconds > 0 and time.time() - entry.created_at > self.max_age_seconds
+
+    def _load_entry(self, key) -> Optional[_BarEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._read_entry(key)
+            if entry is not None:
+                self._entries[key] = entry
+
+        if entry is not None and self._expired(entry):
+            logger.info(f"🔄 [日线存储] 数据已过期，重新获取: {key[0]}/{key[1]}")
+            self._entries.pop(key, None)
+            return None
+        return entry
+
+    def _read_entry(self, key) -> Optional[_BarEntry]:
+        data_path, meta_path = self._paths(key)
+        if not data_path.exists() or not meta_path.exists():
+            return None
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            bars = load_frame(data_path)
+            ranges = [(_parse_date(s), _parse_date(e)) for s, e in meta["ranges"]]
+            return _BarEntry(bars, meta.get("date_column"), ranges, meta["created_at"])
+        except Exception as e:
+            logger.warning(f"⚠️ [日线存储] 读取失败，重新获取: {data_path} ({e})")
+            return None
+
+    def _save_entry(self, key, entry: _BarEntry):
+        data_path, meta_path = self._paths(key)
+        try:
+            data_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = data_path.with_name(data_path.name + ".tmp")
+            save_frame(entry.bars, tmp_path)
+            os.replace(tmp_path, data_path)
+            meta = {
+                "source": key[0],
+                "symbol": key[1],
+                "date_column": entry.date_column,
+                "ranges": [[_format_date(s), _format_date(e)] for s, e in entry.ranges],
+                "rows": len(entry.bars),
+                "created_at": entry.created_at,
+                "updated_at": datetime.now().isoformat(),
+            }
+            tmp_meta = meta_path.with_name(meta_path.name + ".tmp")
+            with open(tmp_meta, "w", encoding="utf-8") as f:
+                json.dump(meta, f, ensure_ascii=False)
+            os.replace(tmp_meta, meta_path)
+        except Exception as e:
+            logger.warning(f"⚠️ [日线存储] 保存失败: {data_path} ({e})")
+
+
+# 全局存储实例
+_bar_store = None
+_bar_store_lock = threading.Lock()
+
+
+def get_bar_store() -> BarStore:
+    """获取全局日线数据区间存储实例"""
+    global _bar_store
+    if _bar_store is None:
+        with _bar_store_lock:
+            if _bar_store is None:
+                _bar_store = BarStore()
+    return _bar_store
@@ -17,6 +17,10 @@ import hashlib
 from tradingagents.utils.logging_manager import get_logger
 logger = get_logger('agents')
 
+from .cache_metadata_index import CacheMetadataIndex
+from .memory_cache import get_memory_cache
+from . import frame_serializer
+
 
 class StockDataCache:
     """股票数据缓存管理器 - 支持美股和A股数据缓存优化"""
@@ -51,6 +55,13 @@ class StockDataCache:
                         self.china_fundamentals_dir, self.metadata_dir]:
             dir_path.mkdir(exist_ok=True)
 
+        # 元数据索引（SQLite），用于按股票代码/数据类型快速查找缓存
+        self.metadata_index = CacheMetadataIndex(self.metadata_dir)
+
+        # 进程内L1缓存（全局共享，键中包含缓存目录以区分不同实例）
+        self.memory_cache = get_memory_cache()
+        self._memory_namespace = str(self.cache_dir.resolve())
+
         # 缓存配置 - 针对不同市场设置不同的TTL
         self.cache_config = {
             'us_stock_data': {
@@ -107,6 +118,47 @@ class StockDataCache:
         else:
             return 'us'
 
+    def _memory_key(self, kind: str, *parts) -> tuple:
+        """L1缓存键"""
+        return (self._memory_namespace, kind) + parts
+
+    def _ttl_seconds(self, symbol: str, data_type: str) -> float:
+        """按市场和数据类型获取缓存TTL（秒）"""
+        cache_type = f"{self._determine_market_type(symbol)}_{data_type}"
+        return self.cache_config.get(cache_type, {}).get('ttl_hours', 24) * 3600
+
+    def _remaining_ttl_seconds(self, metadata: Optional[Dict[str, Any]], max_age_hours: float = None) -> float:
+        """缓存条目的剩余有效时间（秒），L1缓存条目与下级缓存同时过期"""
+        if not metadata or 'cached_at' not in metadata:
+            return 0
+        if max_age_hours is None:
+            ttl = self._ttl_seconds(metadata.get('symbol', ''), metadata.get('data_type', 'stock_data'))
+        else:
+            ttl = max_age_hours * 3600
+        age = datetime.now() - datetime.fromisoformat(metadata['cached_at'])
+        return ttl - age.total_seconds()
+
+    def _remember_saved(self, cache_key: str, symbol: str, data: Any, metadata: Dict[str, Any]):
+        """保存后写入L1缓存，并使该股票的查找结果失效（可能有了更新的缓存）"""
+        namespace = self._memory_namespace
+        self.memory_cache.discard_where(
+            lambda key: key[0] == namespace and key[1].startswith("find") and key[2] == symbol)
+        self.memory_cache.put(self._memory_key("data", cache_key), data, self._remaining_ttl_seconds(metadata))
+
+    def _cached_find(self, kind: str, symbol: str, max_age_hours: Optional[float], find, *params) -> Optional[str]:
+        """L1缓存查找结果（缓存键），只缓存找到的结果"""
+        memory_key = self._memory_key(kind, symbol, max_age_hours, *params)
+        cache_key = self.memory_cache.get(memory_key)
+        if cache_key is not None:
+            logger.debug(f"🧠 [L1缓存] 命中查找结果: {symbol} -> {cache_key}")
+            return cache_key
+
+        cache_key = find()
+        if cache_key:
+            ttl = self._remaining_ttl_seconds(self._load_metadata(cache_key), max_age_hours)
+            self.memory_cache.put(memory_key, cache_key, ttl)
+        return cache_key
+
     def _check_provider_availability(self) -> List[str]:
         """检查可用的LLM提供商"""
         available_providers = []
@@ -216,9 +268,22 @@ class StockDataCache:
         
         with open(metadata_path, 'w', encoding='utf-8') as f:
             json.dump(metadata, f, ensure_ascii=False, indent=2)
+
+        # 同步更新索引
+        try:
+            self.metadata_index.upsert(cache_key, metadata)
+        except Exception as e:
+            logger.warning(f"⚠️ 更新缓存元数据索引失败: {e}")
     
     def _load_metadata(self, cache_key: str) -> Optional[Dict[str, Any]]:
         """加载元数据"""
+        try:
+            metadata = self.metadata_index.get(cache_key)
+            if metadata is not None:
+                return metadata
+        except Exception as e:
+            logger.warning(f"⚠️ 读取缓存元数据索引失败: {e}")
+
         metadata_path = self._get_metadata_path(cache_key)
         if not metadata_path.exists():
             return None
@@ -300,12 +365,15 @@ class StockDataCache:
                                            source=data_source,
                                            market=market_type)
 
-        # 保存数据
+        # 保存数据（DataFrame 使用二进制格式，保留 dtype 与索引）
         if isinstance(data, pd.DataFrame):
-            cache_path = self._get_cache_path("stock_data", cache_key, "csv", symbol)
+            serializer = frame_serializer.get_serializer()
+            file_format = serializer.name
+            cache_path = self._get_cache_path("stock_data", cache_key, serializer.file_extension, symbol)
             cache_path.parent.mkdir(parents=True, exist_ok=True)  # 确保目录存在
-            data.to_csv(cache_path, index=True)
+            frame_serializer.save_frame(data, cache_path, serializer.name)
         else:
+            file_format = 'txt'
             cache_path = self._get_cache_path("stock_data", cache_key, "txt", symbol)
             cache_path.parent.mkdir(parents=True, exist_ok=True)  # 确保目录存在
             with open(cache_path, 'w', encoding='utf-8') as f:
@@ -320,10 +388,11 @@ class StockDataCache:
             'end_date': end_date,
             'data_source': data_source,
             'file_path': str(cache_path),
-            'file_format': 'csv' if isinstance(data, pd.DataFrame) else 'txt',
+            'file_format': file_format,
             'content_length': len(content_to_check)
         }
         self._save_metadata(cache_key, metadata)
+        self._remember_saved(cache_key, symbol, data if isinstance(data, pd.DataFrame) else str(data), metadata)
 
         # 获取描述信息
         cache_type = f"{market_type}_stock_data"
@@ -332,8 +401,21 @@ class StockDataCache:
         return cache_key
     
     def load_stock_data(self, cache_key: str) -> Optional[Union[pd.DataFrame, str]]:
-        """从缓存加载股票数据"""
+        """从缓存加载股票数据（优先从进程内L1缓存读取）"""
+        memory_key = self._memory_key("data", cache_key)
+        data = self.memory_cache.get(memory_key)
+        if data is not None:
+            logger.debug(f"🧠 [L1缓存] 命中: {cache_key}")
+            return data
+
         metadata = self._load_metadata(cache_key)
+        data = self._load_stock_data_file(metadata)
+        if data is not None:
+            self.memory_cache.put(memory_key, data, self._remaining_ttl_seconds(metadata))
+        return data
+
+    def _load_stock_data_file(self, metadata: Optional[Dict[str, Any]]) -> Optional[Union[pd.DataFrame, str]]:
+        """读取股票数据缓存文件"""
         if not metadata:
             return None
         
@@ -342,7 +424,11 @@ class StockDataCache:
             return None
         
         try:
-            if metadata['file_format'] == 'csv':
+            file_format = metadata['file_format']
+            if file_format in frame_serializer.BINARY_FORMATS:
+                return frame_serializer.load_frame(cache_path)
+            elif file_format == 'csv':
+                # 兼容旧版CSV缓存
                 return pd.read_csv(cache_path, index_col=0)
             else:
                 with open(cache_path, 'r', encoding='utf-8') as f:
@@ -355,6 +441,27 @@ class StockDataCache:
                               end_date: str = None, data_source: str = None,
                               max_age_hours: int = None) -> Optional[str]:
         """
+        查找匹配的缓存数据 - 支持智能市场分类查找（找到的结果保存在L1缓存中）
+
+        Args:
+            symbol: 股票代码
+            start_date: 开始日期
+            end_date: 结束日期
+            data_source: 数据源
+            max_age_hours: 最大缓存时间（小时），None时使用智能配置
+
+        Returns:
+            cache_key: 如果找到有效缓存则返回缓存键，否则返回None
+        """
+        return self._cached_find(
+            "find_stock_data", symbol, max_age_hours,
+            lambda: self._find_cached_stock_data(symbol, start_date, end_date, data_source, max_age_hours),
+            start_date, end_date, data_source)
+
+    def _find_cached_stock_data(self, symbol: str, start_date: str = None,
+                                end_date: str = None, data_source: str = None,
+                                max_age_hours: int = None) -> Optional[str]:
+        """
         查找匹配的缓存数据 - 支持智能市场分类查找
 
         Args:
@@ -388,23 +495,11 @@ class StockDataCache:
             return search_key
 
         # 如果没有精确匹配，查找部分匹配（相同股票代码的其他缓存）
-        for metadata_file in self.metadata_dir.glob(f"*_meta.json"):
-            try:
-                with open(metadata_file, 'r', encoding='utf-8') as f:
-                    metadata = json.load(f)
-
-                if (metadata.get('symbol') == symbol and
-                    metadata.get('data_type') == 'stock_data' and
-                    metadata.get('market_type') == market_type and
-                    (data_source is None or metadata.get('data_source') == data_source)):
-
-                    cache_key = metadata_file.stem.replace('_meta', '')
-                    if self.is_cache_valid(cache_key, max_age_hours, symbol, 'stock_data'):
-                        desc = self.cache_config.get(f"{market_type}_stock_data", {}).get('description', '数据')
-                        logger.info(f"📋 找到部分匹配的{desc}: {symbol} -> {cache_key}")
-                        return cache_key
-            except Exception:
-                continue
+        for cache_key, _ in self.find_cache_entries(symbol, 'stock_data', market_type, data_source):
+            if self.is_cache_valid(cache_key, max_age_hours, symbol, 'stock_data'):
+                desc = self.cache_config.get(f"{market_type}_stock_data", {}).get('description', '数据')
+                logger.info(f"📋 找到部分匹配的{desc}: {symbol} -> {cache_key}")
+                return cache_key
 
         desc = self.cache_config.get(f"{market_type}_stock_data", {}).get('description', '数据')
         logger.error(f"❌ 未找到有效的{desc}缓存: {symbol}")
@@ -446,6 +541,7 @@ class StockDataCache:
             'content_length': len(news_data)
         }
         self._save_metadata(cache_key, metadata)
+        self._remember_saved(cache_key, symbol, news_data, metadata)
         
         logger.info(f"📰 新闻数据已缓存: {symbol} ({data_source}) -> {cache_key}")
         return cache_key
@@ -486,14 +582,28 @@ class StockDataCache:
             'content_length': len(fundamentals_data)
         }
         self._save_metadata(cache_key, metadata)
+        self._remember_saved(cache_key, symbol, fundamentals_data, metadata)
         
         desc = self.cache_config.get(f"{market_type}_fundamentals", {}).get('description', '基本面数据')
         logger.info(f"💼 {desc}已缓存: {symbol} ({data_source}) -> {cache_key}")
         return cache_key
     
     def load_fundamentals_data(self, cache_key: str) -> Optional[str]:
-        """从缓存加载基本面数据"""
+        """从缓存加载基本面数据（优先从进程内L1缓存读取）"""
+        memory_key = self._memory_key("data", cache_key)
+        data = self.memory_cache.get(memory_key)
+        if data is not None:
+            logger.debug(f"🧠 [L1缓存] 命中: {cache_key}")
+            return data
+
         metadata = self._load_metadata(cache_key)
+        data = self._load_fundamentals_file(metadata)
+        if data is not None:
+            self.memory_cache.put(memory_key, data, self._remaining_ttl_seconds(metadata))
+        return data
+
+    def _load_fundamentals_file(self, metadata: Optional[Dict[str, Any]]) -> Optional[str]:
+        """读取基本面数据缓存文件"""
         if not metadata:
             return None
         
@@ -511,7 +621,7 @@ class StockDataCache:
     def find_cached_fundamentals_data(self, symbol: str, data_source: str = None,
                                     max_age_hours: int = None) -> Optional[str]:
         """
-        查找匹配的基本面缓存数据
+        查找匹配的基本面缓存数据（找到的结果保存在L1缓存中）
         
         Args:
             symbol: 股票代码
@@ -521,6 +631,14 @@ class StockDataCache:
         Returns:
             cache_key: 如果找到有效缓存则返回缓存键，否则返回None
         """
+        return self._cached_find(
+            "find_fundamentals", symbol, max_age_hours,
+            lambda: self._find_cached_fundamentals_data(symbol, data_source, max_age_hours),
+            data_source)
+
+    def _find_cached_fundamentals_data(self, symbol: str, data_source: str = None,
+                                       max_age_hours: int = None) -> Optional[str]:
+        """查找匹配的基本面缓存数据"""
         market_type = self._determine_market_type(symbol)
         
         # 如果没有指定TTL，使用智能配置
@@ -529,53 +647,62 @@ class StockDataCache:
             max_age_hours = self.cache_config.get(cache_type, {}).get('ttl_hours', 24)
         
         # 查找匹配的缓存
-        for metadata_file in self.metadata_dir.glob(f"*_meta.json"):
-            try:
-                with open(metadata_file, 'r', encoding='utf-8') as f:
-                    metadata = json.load(f)
-                
-                if (metadata.get('symbol') == symbol and
-                    metadata.get('data_type') == 'fundamentals' and
-                    metadata.get('market_type') == market_type and
-                    (data_source is None or metadata.get('data_source') == data_source)):
-                    
-                    cache_key = metadata_file.stem.replace('_meta', '')
-                    if self.is_cache_valid(cache_key, max_age_hours, symbol, 'fundamentals'):
-                        desc = self.cache_config.get(f"{market_type}_fundamentals", {}).get('description', '基本面数据')
-                        logger.info(f"🎯 找到匹配的{desc}缓存: {symbol} ({data_source}) -> {cache_key}")
-                        return cache_key
-            except Exception:
-                continue
+        for cache_key, _ in self.find_cache_entries(symbol, 'fundamentals', market_type, data_source):
+            if self.is_cache_valid(cache_key, max_age_hours, symbol, 'fundamentals'):
+                desc = self.cache_config.get(f"{market_type}_fundamentals", {}).get('description', '基本面数据')
+                logger.info(f"🎯 找到匹配的{desc}缓存: {symbol} ({data_source}) -> {cache_key}")
+                return cache_key
         
         desc = self.cache_config.get(f"{market_type}_fundamentals", {}).get('description', '基本面数据')
         logger.error(f"❌ 未找到有效的{desc}缓存: {symbol} ({data_source})")
         return None
     
+    def find_cache_entries(self, symbol: str, data_type: str, market_type: str = None,
+                           data_source: str = None) -> List[tuple]:
+        """
+        通过元数据索引查找缓存条目（不检查TTL）
+
+        Args:
+            symbol: 股票代码
+            data_type: 数据类型（stock_data/news/fundamentals）
+            market_type: 市场类型（china/us），None表示不限
+            data_source: 数据源，None表示不限
+
+        Returns:
+            [(cache_key, metadata), ...]，最新缓存在前
+        """
+        try:
+            return self.metadata_index.find(symbol, data_type, market_type, data_source)
+        except Exception as e:
+            logger.warning(f"⚠️ 查询缓存元数据索引失败: {e}")
+            return []
+
     def clear_old_cache(self, max_age_days: int = 7):
         """清理过期缓存"""
         cutoff_time = datetime.now() - timedelta(days=max_age_days)
-        cleared_count = 0
+        cleared_keys = []
         
-        for metadata_file in self.metadata_dir.glob("*_meta.json"):
+        for cache_key, file_path in self.metadata_index.find_older_than(cutoff_time.isoformat()):
             try:
-                with open(metadata_file, 'r', encoding='utf-8') as f:
-                    metadata = json.load(f)
-                
-                cached_at = datetime.fromisoformat(metadata['cached_at'])
-                if cached_at < cutoff_time:
-                    # 删除数据文件
-                    data_file = Path(metadata['file_path'])
+                # 删除数据文件
+                if file_path:
+                    data_file = Path(file_path)
                     if data_file.exists():
                         data_file.unlink()
-                    
-                    # 删除元数据文件
+                
+                # 删除元数据文件
+                metadata_file = self._get_metadata_path(cache_key)
+                if metadata_file.exists():
                     metadata_file.unlink()
-                    cleared_count += 1
+                cleared_keys.append(cache_key)
                     
             except Exception as e:
                 logger.warning(f"⚠️ 清理缓存时出错: {e}")
-        
-        logger.info(f"🧹 已清理 {cleared_count} 个过期缓存文件")
+
+        self.metadata_index.delete(cleared_keys)
+        namespace = self._memory_namespace
+        self.memory_cache.discard_where(lambda key: key[0] == namespace)
+        logger.info(f"🧹 已清理 {len(cleared_keys)} 个过期缓存文件")
     
     def get_cache_stats(self) -> Dict[str, Any]:
         """获取缓存统计信息"""
@@ -588,33 +715,23 @@ class StockDataCache:
             'skipped_count': 0  # 新增：跳过的缓存数量
         }
         
-        for metadata_file in self.metadata_dir.glob("*_meta.json"):
-            try:
-                with open(metadata_file, 'r', encoding='utf-8') as f:
-                    metadata = json.load(f)
-                
-                data_type = metadata.get('data_type', 'unknown')
-                if data_type == 'stock_data':
-                    stats['stock_data_count'] += 1
-                elif data_type == 'news':
-                    stats['news_count'] += 1
-                elif data_type == 'fundamentals':
-                    stats['fundamentals_count'] += 1
-                
-                # 检查是否为跳过的缓存（没有实际文件）
-                data_file = Path(metadata.get('file_path', ''))
-                if not data_file.exists():
-                    stats['skipped_count'] += 1
-                else:
-                    # 计算文件大小
-                    stats['total_size_mb'] += data_file.stat().st_size / (1024 * 1024)
-                
-                stats['total_files'] += 1
-                
-            except Exception:
-                continue
+        # 直接汇总元数据索引，无需遍历缓存目录
+        for data_type, type_stats in self.metadata_index.stats().items():
+            if data_type == 'stock_data':
+                stats['stock_data_count'] += type_stats['entries']
+            elif data_type == 'news':
+                stats['news_count'] += type_stats['entries']
+            elif data_type == 'fundamentals':
+                stats['fundamentals_count'] += type_stats['entries']
+
+            # 没有实际文件的条目计为跳过的缓存
+            stats['skipped_count'] += type_stats['missing_files']
+            stats['total_size_mb'] += type_stats['size_bytes'] / (1024 * 1024)
+            stats['total_files'] += type_stats['entries']
         
         stats['total_size_mb'] = round(stats['total_size_mb'], 2)
+        # 进程内L1缓存：命中/未命中/淘汰统计
+        stats['memory_cache'] = self.memory_cache.get_stats()
         return stats
 
     def get_content_length_config_status(self) -> Dict[str, Any]:
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+文件缓存元数据索引
+使用单个 SQLite 文件按 (symbol, data_type, market_type, data_source) 索引缓存元数据，
+避免在缓存未命中时遍历并解析全部 *_meta.json 文件。
+"""
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# 导入日志模块
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('agents')
+
+INDEX_FILE_NAME = "cache_index.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_meta (
+    cache_key   TEXT PRIMARY KEY,
+    symbol      TEXT,
+    data_type   TEXT,
+    market_type TEXT,
+    data_source TEXT,
+    cached_at   TEXT,
+    file_path   TEXT,
+    file_size   INTEGER,
+    metadata    TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_cache_meta_lookup
+    ON cache_meta (symbol, data_type, market_type, data_source);
+CREATE INDEX IF NOT EXISTS idx_cache_meta_cached_at
+    ON cache_meta (cached_at);
+"""
+
+
+class CacheMetadataIndex:
+    """缓存元数据的 SQLite 索引"""
+
+    def __init__(self, metadata_dir: Path):
+        """
+        初始化索引
+
+        Args:
+            metadata_dir: 元数据目录，索引文件保存在该目录下；
+                          首次创建索引时会从已有的 *_meta.json 文件导入
+        """
+        self.metadata_dir = Path(metadata_dir)
+        self.index_file = self.metadata_dir / INDEX_FILE_NAME
+        self._lock = threading.RLock()
+
+        is_new = not self.index_file.exists()
+        self._conn = sqlite3.connect(str(self.index_file), check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            try:
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            except sqlite3.DatabaseError:
+                pass
+            self._conn.executescript(_SCHEMA)
+            self._conn.commit()
+
+        if is_new:
+            self.rebuild()
+
+    def upsert(self, cache_key: str, metadata: Dict[str, Any]):
+        """写入或更新一条元数据（单条事务）"""
+        file_path = metadata.get('file_path')
+        file_size = None
+        if file_path:
+            try:
+                file_size = Path(file_path).stat().st_size
+            except OSError:
+                file_size = None
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_meta "
+                "(cache_key, symbol, data_type, market_type, data_source, cached_at, file_path, file_size, metadata) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    cache_key,
+                    metadata.get('symbol'),
+                    metadata.get('data_type'),
+                    metadata.get('market_type'),
+                    metadata.get('data_source'),
+                    metadata.get('cached_at'),
+                    file_path,
+                    file_size,
+                    json.dumps(metadata, ensure_ascii=False),
+                ),
+            )
+
+    def get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """按缓存键获取元数据"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT metadata FROM cache_meta WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+        return json.loads(row['metadata']) if row else None
+
+    def find(self, symbol: str, data_type: str, market_type: Optional[str] = None,
+             data_source: Optional[str] = None) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        按条件查找缓存条目，最新缓存在前
+
+        Returns:
+            [(cache_key, metadata), ...]
+        """
+        sql = "SELECT cache_key, metadata FROM cache_meta WHERE symbol = ? AND data_type = ?"
+        params: List[Any] = [symbol, data_type]
+        if market_type is not None:
+            sql += " AND market_type = ?"
+            params.append(market_type)
+        if data_source is not None:
+            sql += " AND data_source = ?"
+            params.append(data_source)
+        sql += " ORDER BY cached_at DESC"
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [(row['cache_key'], json.loads(row['metadata'])) for row in rows]
+
+    def list_entries(self, data_type: Optional[str] = None) -> List[Tuple[str, Dict[str, Any]]]:
+        """列出全部（或指定类型的）缓存条目，最新缓存在前"""
+        sql = "SELECT cache_key, metadata FROM cache_meta"
+        params: List[Any] = []
+        if data_type is not None:
+            sql += " WHERE data_type = ?"
+            params.append(data_type)
+        sql += " ORDER BY cached_at DESC"
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [(row['cache_key'], json.loads(row['metadata'])) for row in rows]
+
+    def find_older_than(self, cutoff_iso: str) -> List[Tuple[str, Optional[str]]]:
+        """查找缓存时间早于 cutoff 的条目，返回 [(cache_key, file_path), ...]"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT cache_key, file_path FROM cache_meta WHERE cached_at < ?", (cutoff_iso,)
+            ).fetchall()
+        return [(row['cache_key'], row['file_path']) for row in rows]
+
+    def delete(self, cache_keys: List[str]):
+        """删除条目"""
+        if not cache_keys:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM cache_meta WHERE cache_key = ?", [(key,) for key in cache_keys]
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        """按数据类型汇总条目数与文件大小"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data_type, COUNT(*) AS entries, COALESCE(SUM(file_size), 0) AS size, "
+                "SUM(CASE WHEN file_size IS NULL THEN 1 ELSE 0 END) AS missing "
+                "FROM cache_meta GROUP BY data_type"
+            ).fetchall()
+        return {
+            row['data_type']: {
+                'entries': row['entries'],
+                'size_bytes': row['size'],
+                'missing_files': row['missing'],
+            }
+            for row in rows
+        }
+
+    def close(self):
+        """关闭索引连接"""
+        with self._lock:
+            self._conn.close()
+
+    def rebuild(self) -> int:
+        """从 *_meta.json 文件重建索引，返回导入的条目数"""
+        entries = []
+        for metadata_file in self.metadata_dir.glob("*_meta.json"):
+            try:
+                with open(metadata_file, 'r', encoding='utf-8') as f:
+                    entries.append((metadata_file.stem.replace('_meta', ''), json.load(f)))
+            except Exception:
+                continue
+
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM cache_meta")
+        for cache_key, metadata in entries:
+            self.upsert(cache_key, metadata)
+
+        if entries:
+            logger.info(f"🗂️ 缓存元数据索引已重建: {len(entries)} 条")
+        return len(entries)
@@ -337,6 +337,23 @@ class DataSourceManager:
             return None
     
     def get_stock_data(self, symbol: str, start_date: str = None, end_date: str = None) -> str:
+        """
+        获取股票数据的统一接口，相同参数（含当前数据源）的并发请求合并为一次获取
+
+        Args:
+            symbol: 股票代码
+            start_date: 开始日期
+            end_date: 结束日期
+
+        Returns:
+            str: 格式化的股票数据
+        """
+        from .single_flight import get_single_flight, single_flight_key
+
+        key = single_flight_key("unified_stock_data", symbol, start_date, end_date, self.current_source.value)
+        return get_single_flight().do(key, lambda: self._get_stock_data(symbol, start_date, end_date))
+
+    def _get_stock_data(self, symbol: str, start_date: str = None, end_date: str = None) -> str:
         """
         获取股票数据的统一接口
 
@@ -434,6 +451,65 @@ class DataSourceManager:
                         }, exc_info=True)
             return self._try_fallback_sources(symbol, start_date, end_date)
     
+    # 可按日线DataFrame获取的数据源及其日期列（供日线区间存储增量补齐使用）
+    BAR_DATE_COLUMNS = {
+        ChinaDataSource.TUSHARE: 'trade_date',
+        ChinaDataSource.AKSHARE: '日期',
+    }
+
+    def fetch_daily_bars(self, symbol: str, start_date: str, end_date: str,
+                         source: ChinaDataSource = None) -> Optional[pd.DataFrame]:
+        """
+        获取未复权的日线DataFrame（原始价格，不同时间获取的区间可以直接合并）
+
+        Args:
+            symbol: 股票代码
+            start_date: 开始日期
+            end_date: 结束日期
+            source: 数据源，默认为当前数据源
+
+        Returns:
+            pd.DataFrame: 日线数据；获取失败或数据源不支持时返回None
+        """
+        source = source or self.current_source
+
+        if source == ChinaDataSource.TUSHARE:
+            from .tushare_adapter import get_tushare_adapter
+            data = get_tushare_adapter().get_stock_data(symbol, start_date, end_date)
+            if not isinstance(data, pd.DataFrame):
+                return None
+            # Tushare适配器按获取区间计算前复权价格，存储原始价格，格式化时再按请求区间复权
+            if 'close_raw' in data.columns:
+                data = data.copy()
+                for column in ('open', 'high', 'low', 'close'):
+                    data[column] = data[f'{column}_raw']
+                data = data.drop(columns=['open_raw', 'high_raw', 'low_raw', 'close_raw', 'price_type'],
+                                 errors='ignore')
+            return data
+
+        if source == ChinaDataSource.AKSHARE:
+            from .akshare_utils import get_akshare_provider
+            return get_akshare_provider().get_stock_data(symbol, start_date, end_date)
+
+        return None
+
+    def format_daily_bars(self, symbol: str, data: pd.DataFrame, start_date: str, end_date: str,
+                          source: ChinaDataSource = None) -> str:
+        """把 fetch_daily_bars 获取的日线数据格式化为与 get_stock_data 相同的报告"""
+        source = source or self.current_source
+
+        if source == ChinaDataSource.TUSHARE:
+            from .tushare_adapter import get_tushare_adapter
+            adapter = get_tushare_adapter()
+            if adapter.provider is not None:
+                data = adapter.provider._calculate_forward_adjusted_prices(data)
+            return self._format_tushare_data(symbol, data, start_date, end_date, adapter)
+
+        if source == ChinaDataSource.AKSHARE:
+            return self._format_akshare_data(symbol, data, start_date, end_date)
+
+        raise ValueError(f"不支持的数据源: {source.value}")
+
     def _get_tushare_data(self, symbol: str, start_date: str, end_date: str) -> str:
         """使用Tushare获取数据 - 直接调用适配器，避免循环调用"""
         logger.debug(f"📊 [Tushare] 调用参数: symbol={symbol}, start_date={start_date}, end_date={end_date}")
@@ -456,35 +532,7 @@ class DataSourceManager:
             data = adapter.get_stock_data(symbol, start_date, end_date)
 
             if data is not None and not data.empty:
-                # 获取股票基本信息
-                stock_info = adapter.get_stock_info(symbol)
-                stock_name = stock_info.get('name', f'股票{symbol}') if stock_info else f'股票{symbol}'
-
-                # 计算最新价格和涨跌幅
-                latest_data = data.iloc[-1]
-                latest_price = latest_data.get('close', 0)
-                prev_close = data.iloc[-2].get('close', latest_price) if len(data) > 1 else latest_price
-                change = latest_price - prev_close
-                change_pct = (change / prev_close * 100) if prev_close != 0 else 0
-
-                # 格式化数据报告
-                result = f"📊 {stock_name}({symbol}) - Tushare数据\n"
-                result += f"数据期间: {start_date} 至 {end_date}\n"
-                result += f"数据条数: {len(data)}条\n\n"
-
-                result += f"💰 最新价格: ¥{latest_price:.2f}\n"
-                result += f"📈 涨跌额: {change:+.2f} ({change_pct:+.2f}%)\n\n"
-
-                # 添加统计信息
-                result += f"📊 价格统计:\n"
-                result += f"   最高价: ¥{data['high'].max():.2f}\n"
-                result += f"   最低价: ¥{data['low'].min():.2f}\n"
-                result += f"   平均价: ¥{data['close'].mean():.2f}\n"
-                # 防御性获取成交量数据
-                volume_value = self._get_volume_safely(data)
-                result += f"   成交量: {volume_value:,.0f}股\n"
-
-                return result
+                return self._format_tushare_data(symbol, data, start_date, end_date, adapter)
             else:
                 result = f"❌ 未获取到{symbol}的有效数据"
 
@@ -506,6 +554,43 @@ class DataSourceManager:
             logger.error(f"❌ [DataSourceManager详细日志] 异常堆栈: {traceback.format_exc()}")
             raise
     
+    def _format_tushare_data(self, symbol: str, data: pd.DataFrame, start_date: str, end_date: str,
+                             adapter=None) -> str:
+        """格式化Tushare日线数据报告"""
+        if adapter is None:
+            from .tushare_adapter import get_tushare_adapter
+            adapter = get_tushare_adapter()
+
+        # 获取股票基本信息
+        stock_info = adapter.get_stock_info(symbol)
+        stock_name = stock_info.get('name', f'股票{symbol}') if stock_info else f'股票{symbol}'
+
+        # 计算最新价格和涨跌幅
+        latest_data = data.iloc[-1]
+        latest_price = latest_data.get('close', 0)
+        prev_close = data.iloc[-2].get('close', latest_price) if len(data) > 1 else latest_price
+        change = latest_price - prev_close
+        change_pct = (change / prev_close * 100) if prev_close != 0 else 0
+
+        # 格式化数据报告
+        result = f"📊 {stock_name}({symbol}) - Tushare数据\n"
+        result += f"数据期间: {start_date} 至 {end_date}\n"
+        result += f"数据条数: {len(data)}条\n\n"
+
+        result += f"💰 最新价格: ¥{latest_price:.2f}\n"
+        result += f"📈 涨跌额: {change:+.2f} ({change_pct:+.2f}%)\n\n"
+
+        # 添加统计信息
+        result += f"📊 价格统计:\n"
+        result += f"   最高价: ¥{data['high'].max():.2f}\n"
+        result += f"   最低价: ¥{data['low'].min():.2f}\n"
+        result += f"   平均价: ¥{data['close'].mean():.2f}\n"
+        # 防御性获取成交量数据
+        volume_value = self._get_volume_safely(data)
+        result += f"   成交量: {volume_value:,.0f}股\n"
+
+        return result
+
     def _get_akshare_data(self, symbol: str, start_date: str, end_date: str) -> str:
         """使用AKShare获取数据"""
         logger.debug(f"📊 [AKShare] 调用参数: symbol={symbol}, start_date={start_date}, end_date={end_date}")
@@ -520,35 +605,7 @@ class DataSourceManager:
             duration = time.time() - start_time
 
             if data is not None and not data.empty:
-                result = f"股票代码: {symbol}\n"
-                result += f"数据期间: {start_date} 至 {end_date}\n"
-                result += f"数据条数: {len(data)}条\n\n"
-
-                # 显示最新3天数据，确保在各种显示环境下都能完整显示
-                display_rows = min(3, len(data))
-                result += f"最新{display_rows}天数据:\n"
-
-                # 使用pandas选项确保显示完整数据
-                with pd.option_context('display.max_rows', None,
-                                     'display.max_columns', None,
-                                     'display.width', None,
-                                     'display.max_colwidth', None):
-                    result += data.tail(display_rows).to_string(index=False)
-
-                # 如果数据超过3天，也显示一些统计信息
-                if len(data) > 3:
-                    latest_price = data.iloc[-1]['收盘'] if '收盘' in data.columns else data.iloc[-1].get('close', 'N/A')
-                    first_price = data.iloc[0]['收盘'] if '收盘' in data.columns else data.iloc[0].get('close', 'N/A')
-                    if latest_price != 'N/A' and first_price != 'N/A':
-                        try:
-                            change = float(latest_price) - float(first_price)
-                            change_pct = (change / float(first_price)) * 100
-                            result += f"\n\n📊 期间统计:\n"
-                            result += f"期间涨跌: {change:+.2f} ({change_pct:+.2f}%)\n"
-                            result += f"最高价: {data['最高'].max() if '最高' in data.columns else data.get('high', pd.Series()).max():.2f}\n"
-                            result += f"最低价: {data['最低'].min() if '最低' in data.columns else data.get('low', pd.Series()).min():.2f}"
-                        except (ValueError, TypeError):
-                            pass
+                result = self._format_akshare_data(symbol, data, start_date, end_date)
 
                 logger.debug(f"📊 [AKShare] 调用成功: 耗时={duration:.2f}s, 数据条数={len(data)}, 结果长度={len(result)}")
                 return result
@@ -562,6 +619,40 @@ class DataSourceManager:
             logger.error(f"❌ [AKShare] 调用失败: {e}, 耗时={duration:.2f}s", exc_info=True)
             return f"❌ AKShare获取{symbol}数据失败: {e}"
     
+    def _format_akshare_data(self, symbol: str, data: pd.DataFrame, start_date: str, end_date: str) -> str:
+        """格式化AKShare日线数据报告"""
+        result = f"股票代码: {symbol}\n"
+        result += f"数据期间: {start_date} 至 {end_date}\n"
+        result += f"数据条数: {len(data)}条\n\n"
+
+        # 显示最新3天数据，确保在各种显示环境下都能完整显示
+        display_rows = min(3, len(data))
+        result += f"最新{display_rows}天数据:\n"
+
+        # 使用pandas选项确保显示完整数据
+        with pd.option_context('display.max_rows', None,
+                             'display.max_columns', None,
+                             'display.width', None,
+                             'display.max_colwidth', None):
+            result += data.tail(display_rows).to_string(index=False)
+
+        # 如果数据超过3天，也显示一些统计信息
+        if len(data) > 3:
+            latest_price = data.iloc[-1]['收盘'] if '收盘' in data.columns else data.iloc[-1].get('close', 'N/A')
+            first_price = data.iloc[0]['收盘'] if '收盘' in data.columns else data.iloc[0].get('close', 'N/A')
+            if latest_price != 'N/A' and first_price != 'N/A':
+                try:
+                    change = float(latest_price) - float(first_price)
+                    change_pct = (change / float(first_price)) * 100
+                    result += f"\n\n📊 期间统计:\n"
+                    result += f"期间涨跌: {change:+.2f} ({change_pct:+.2f}%)\n"
+                    result += f"最高价: {data['最高'].max() if '最高' in data.columns else data.get('high', pd.Series()).max():.2f}\n"
+                    result += f"最低价: {data['最低'].min() if '最低' in data.columns else data.get('low', pd.Series()).min():.2f}"
+                except (ValueError, TypeError):
+                    pass
+
+        return result
+
     def _get_baostock_data(self, symbol: str, start_date: str, end_date: str) -> str:
         """使用BaoStock获取数据"""
         # 这里需要实现BaoStock的统一接口
@@ -6,6 +6,7 @@ MongoDB + Redis 数据库缓存管理器
 
 import os
 import json
+import base64
 import pickle
 import hashlib
 from datetime import datetime, timedelta
@@ -14,6 +15,8 @@ import pandas as pd
 
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger
+from . import frame_serializer
+from .payload_codec import get_payload_codec
 logger = get_logger('agents')
 
 # MongoDB
@@ -67,6 +70,7 @@ class DatabaseCacheManager:
         self.mongodb_client = None
         self.mongodb_db = None
         self.redis_client = None
+        self.codec = get_payload_codec()
         
         self._init_mongodb()
         self._init_redis()
@@ -170,6 +174,24 @@ class DatabaseCacheManager:
         cache_key = hashlib.md5(params_str.encode()).hexdigest()[:16]
         return f"{data_type}:{symbol}:{cache_key}"
     
+    @staticmethod
+    def _redis_payload(data: Any) -> Dict[str, Any]:
+        """Redis 客户端以文本方式读写，二进制数据（DataFrame、压缩数据）转为 base64"""
+        if isinstance(data, (bytes, bytearray)):
+            return {"data": base64.b64encode(data).decode('ascii'), "data_encoding": "base64"}
+        return {"data": data}
+
+    @staticmethod
+    def _from_redis_payload(data_dict: Dict[str, Any]) -> Any:
+        """还原 _redis_payload 的结果，兼容未标记 data_encoding 的旧版二进制数据"""
+        if data_dict.get("data_encoding") == "base64" or data_dict.get("data_format") == "dataframe_binary":
+            return base64.b64decode(data_dict["data"])
+        return data_dict["data"]
+
+    def _decode_stock_data(self, data: Any, data_format: str) -> Union[pd.DataFrame, str]:
+        """解压并按 data_format 还原股票数据，兼容未压缩的旧数据和旧版 dataframe_json"""
+        return decode_stock_data(data, data_format, self.codec)
+
     def save_stock_data(self, symbol: str, data: Union[pd.DataFrame, str],
                        start_date: str = None, end_date: str = None,
                        data_source: str = "unknown", market_type: str = None) -> str:
@@ -217,10 +239,10 @@ class DatabaseCacheManager:
         
         # 处理数据格式
         if isinstance(data, pd.DataFrame):
-            doc["data"] = data.to_json(orient='records', date_format='iso')
-            doc["data_format"] = "dataframe_json"
+            doc["data"] = self.codec.encode(frame_serializer.dumps_frame(data))
+            doc["data_format"] = "dataframe_binary"
         else:
-            doc["data"] = str(data)
+            doc["data"] = self.codec.encode(str(data))
             doc["data_format"] = "text"
         
         # 保存到MongoDB（持久化）
@@ -236,7 +258,7 @@ class DatabaseCacheManager:
         if self.redis_client:
             try:
                 redis_data = {
-                    "data": doc["data"],
+                    **self._redis_payload(doc["data"]),
                     "data_format": doc["data_format"],
                     "symbol": symbol,
                     "data_source": data_source,
@@ -264,10 +286,7 @@ class DatabaseCacheManager:
                     data_dict = json.loads(redis_data)
                     logger.info(f"⚡ 从Redis加载数据: {cache_key}")
                     
-                    if data_dict["data_format"] == "dataframe_json":
-                        return pd.read_json(data_dict["data"], orient='records')
-                    else:
-                        return data_dict["data"]
+                    return self._decode_stock_data(self._from_redis_payload(data_dict), data_dict["data_format"])
             except Exception as e:
                 logger.error(f"⚠️ Redis加载失败: {e}")
         
@@ -284,7 +303,7 @@ class DatabaseCacheManager:
                     if self.redis_client:
                         try:
                             redis_data = {
-                                "data": doc["data"],
+                                **self._redis_payload(doc["data"]),
                                 "data_format": doc["data_format"],
                                 "symbol": doc["symbol"],
                                 "data_source": doc["data_source"],
@@ -299,10 +318,7 @@ class DatabaseCacheManager:
                         except Exception as e:
                             logger.error(f"⚠️ Redis同步失败: {e}")
                     
-                    if doc["data_format"] == "dataframe_json":
-                        return pd.read_json(doc["data"], orient='records')
-                    else:
-                        return doc["data"]
+                    return self._decode_stock_data(doc["data"], doc["data_format"])
                         
             except Exception as e:
                 logger.error(f"⚠️ MongoDB加载失败: {e}")
@@ -373,7 +389,7 @@ class DatabaseCacheManager:
             "start_date": start_date,
             "end_date": end_date,
             "data_source": data_source,
-            "data": news_data,
+            "data": self.codec.encode(news_data),
             "created_at": datetime.utcnow(),
             "updated_at": datetime.utcnow()
         }
@@ -391,7 +407,7 @@ class DatabaseCacheManager:
         if self.redis_client:
             try:
                 redis_data = {
-                    "data": news_data,
+                    **self._redis_payload(doc["data"]),
                     "symbol": symbol,
                     "data_source": data_source,
                     "created_at": doc["created_at"].isoformat()
@@ -424,7 +440,7 @@ class DatabaseCacheManager:
             "data_type": "fundamentals_data",
             "analysis_date": analysis_date,
             "data_source": data_source,
-            "data": fundamentals_data,
+            "data": self.codec.encode(fundamentals_data),
             "created_at": datetime.utcnow(),
             "updated_at": datetime.utcnow()
         }
@@ -442,7 +458,7 @@ class DatabaseCacheManager:
         if self.redis_client:
             try:
                 redis_data = {
-                    "data": fundamentals_data,
+                    **self._redis_payload(doc["data"]),
                     "symbol": symbol,
                     "data_source": data_source,
                     "analysis_date": analysis_date,
@@ -459,11 +475,42 @@ class DatabaseCacheManager:
 
         return cache_key
 
+    def _load_text_data(self, collection_name: str, cache_key: str) -> Optional[str]:
+        """从Redis或MongoDB加载新闻/基本面文本并解压"""
+        if self.redis_client:
+            try:
+                redis_data = self.redis_client.get(cache_key)
+                if redis_data:
+                    logger.info(f"⚡ 从Redis加载数据: {cache_key}")
+                    return self.codec.decode(self._from_redis_payload(json.loads(redis_data)))
+            except Exception as e:
+                logger.error(f"⚠️ Redis加载失败: {e}")
+
+        if self.mongodb_db is not None:
+            try:
+                doc = self.mongodb_db[collection_name].find_one({"_id": cache_key})
+                if doc:
+                    logger.info(f"💾 从MongoDB加载数据: {cache_key}")
+                    return self.codec.decode(doc["data"])
+            except Exception as e:
+                logger.error(f"⚠️ MongoDB加载失败: {e}")
+
+        return None
+
+    def load_news_data(self, cache_key: str) -> Optional[str]:
+        """从Redis或MongoDB加载新闻数据"""
+        return self._load_text_data("news_data", cache_key)
+
+    def load_fundamentals_data(self, cache_key: str) -> Optional[str]:
+        """从Redis或MongoDB加载基本面数据"""
+        return self._load_text_data("fundamentals_data", cache_key)
+
     def get_cache_stats(self) -> Dict[str, Any]:
         """获取缓存统计信息"""
         stats = {
             "mongodb": {"available": self.mongodb_db is not None, "collections": {}},
-            "redis": {"available": self.redis_client is not None, "keys": 0, "memory_usage": "N/A"}
+            "redis": {"available": self.redis_client is not None, "keys": 0, "memory_usage": "N/A"},
+            "codec": self.codec.get_stats()
         }
 
         # MongoDB统计
@@ -523,6 +570,23 @@ class DatabaseCacheManager:
 
 
 # 全局数据库缓存实例
+def decode_stock_data(data: Any, data_format: Optional[str], codec=None) -> Union[pd.DataFrame, str]:
+    """
+    还原 stock_data 集合中的 data 字段（供直接读取该集合的模块使用）
+
+    Args:
+        data: 文档中的 data 字段（可能是压缩数据、序列化的DataFrame或未压缩的旧数据）
+        data_format: 文档中的 data_format 字段（text / dataframe_binary / dataframe_json）
+        codec: 编解码器，默认使用全局编解码器
+    """
+    data = (codec or get_payload_codec()).decode(data)
+    if data_format == "dataframe_binary":
+        return frame_serializer.loads_frame(data)
+    if data_format == "dataframe_json":
+        return pd.read_json(data, orient='records')
+    return data
+
+
 _db_cache_instance = None
 
 def get_db_cache() -> DatabaseCacheManager:
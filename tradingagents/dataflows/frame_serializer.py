@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+DataFrame 二进制序列化
+为缓存层提供保留 dtype、可零拷贝加载的 DataFrame 序列化格式：
+- arrow: Arrow IPC（需要 pyarrow，文件可内存映射读取）
+- pickle5: pickle 协议5 + 带外缓冲区（标准库，始终可用）
+
+序列化结果带有格式标记，反序列化时自动识别；旧的 CSV/JSON 缓存由调用方按原方式读取。
+"""
+
+import os
+import pickle
+import struct
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import pandas as pd
+
+# 导入日志模块
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('agents')
+
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    PYARROW_AVAILABLE = False
+
+MAGIC = b"TADF"
+_HEADER = struct.Struct("<4sB8s")  # magic, version, 格式名（定长8字节）
+ENVELOPE_VERSION = 1
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+
+class DataFrameSerializer(ABC):
+    """序列化器基类"""
+
+    name = ""
+    file_extension = ""
+
+    @abstractmethod
+    def dumps(self, df: pd.DataFrame) -> bytes:
+        """序列化为字节（不含格式标记）"""
+
+    @abstractmethod
+    def loads(self, payload: memoryview) -> pd.DataFrame:
+        """从 dumps 的结果反序列化"""
+
+
+class PickleSerializer(DataFrameSerializer):
+    """pickle 协议5，列数据通过带外缓冲区存放，加载时直接引用原始字节"""
+
+    name = "pickle5"
+    file_extension = "pkl5"
+
+    def dumps(self, df: pd.DataFrame) -> bytes:
+        buffers: List[pickle.PickleBuffer] = []
+        body = pickle.dumps(df, protocol=5, buffer_callback=buffers.append)
+
+        raw_buffers = [buffer.raw() for buffer in buffers]
+        parts = [struct.pack("<I", len(raw_buffers))]
+        parts.extend(struct.pack("<Q", len(raw)) for raw in raw_buffers)
+        parts.append(struct.pack("<Q", len(body)))
+        parts.append(body)
+        parts.extend(raw_buffers)
+        return b"".join(parts)
+
+    def loads(self, payload: memoryview) -> pd.DataFrame:
+        if payload.readonly:
+            # 只读缓冲区会得到只读的 numpy 数组，复制一次以保证返回的 DataFrame 可修改
+            payload = memoryview(bytearray(payload))
+        offset = 0
+        (count,) = struct.unpack_from("<I", payload, offset)
+        offset += 4
+        sizes = struct.unpack_from(f"<{count}Q", payload, offset)
+        offset += 8 * count
+        (body_size,) = struct.unpack_from("<Q", payload, offset)
+        offset += 8
+
+        body = payload[offset:offset + body_size]
+        offset += body_size
+        buffers = []
+        for size in sizes:
+            buffers.append(payload[offset:offset + size])
+            offset += size
+        return pickle.loads(body, buffers=buffers)
+
+
+class ArrowSerializer(DataFrameSerializer):
+    """Arrow IPC 文件格式，保留索引与 pandas 元数据"""
+
+    name = "arrow"
+    file_extension = "arrow"
+
+    def dumps(self, df: pd.DataFrame) -> bytes:
+        table = pa.Table.from_pandas(df, preserve_index=True)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
+    def loads(self, payload: memoryview) -> pd.DataFrame:
+        reader = pa.ipc.open_file(pa.py_buffer(payload))
+        return reader.read_all().to_pandas()
+
+
+_SERIALIZERS: Dict[str, DataFrameSerializer] = {PickleSerializer.name: PickleSerializer()}
+if PYARROW_AVAILABLE:
+    _SERIALIZERS[ArrowSerializer.name] = ArrowSerializer()
+
+# 全部二进制格式名（含当前环境缺少依赖、无法读取的格式）
+BINARY_FORMATS = (PickleSerializer.name, ArrowSerializer.name)
+
+
+def get_serializer(name: Optional[str] = None) -> DataFrameSerializer:
+    """
+    获取序列化器
+
+    Args:
+        name: 格式名；为 None 时读取环境变量 CACHE_DATAFRAME_FORMAT，
+              默认 pickle5（日线规模下加载最快）；arrow 适合跨语言读取
+    """
+    name = name or os.getenv("CACHE_DATAFRAME_FORMAT", "").strip().lower()
+    if name in _SERIALIZERS:
+        return _SERIALIZERS[name]
+    if name:
+        logger.warning(f"⚠️ 不支持的DataFrame缓存格式: {name}，使用默认格式")
+    return _SERIALIZERS[PickleSerializer.name]
+
+
+def dumps_frame(df: pd.DataFrame, format_name: Optional[str] = None) -> bytes:
+    """序列化 DataFrame，结果带格式标记"""
+    serializer = get_serializer(format_name)
+    header = _HEADER.pack(MAGIC, ENVELOPE_VERSION, serializer.name.encode("ascii"))
+    return header + serializer.dumps(df)
+
+
+def loads_frame(data: BytesLike) -> pd.DataFrame:
+    """反序列化 dumps_frame 的结果，根据格式标记选择序列化器"""
+    view = memoryview(data)
+    magic, version, raw_name = _HEADER.unpack_from(view, 0)
+    if magic != MAGIC or version != ENVELOPE_VERSION:
+        raise ValueError("不是有效的DataFrame序列化数据")
+
+    name = raw_name.rstrip(b"\x00").decode("ascii")
+    serializer = _SERIALIZERS.get(name)
+    if serializer is None:
+        raise ValueError(f"缺少反序列化 {name} 格式所需的依赖")
+    return serializer.loads(view[_HEADER.size:])
+
+
+def save_frame(df: pd.DataFrame, path: Union[str, Path], format_name: Optional[str] = None):
+    """写入文件"""
+    with open(path, "wb") as f:
+        f.write(dumps_frame(df, format_name))
+
+
+def load_frame(path: Union[str, Path]) -> pd.DataFrame:
+    """从文件读取；Arrow 格式使用内存映射避免整体复制"""
+    with open(path, "rb") as f:
+        header = f.read(_HEADER.size)
+        mapped = False
+        if PYARROW_AVAILABLE and len(header) == _HEADER.size:
+            magic, _, raw_name = _HEADER.unpack(header)
+            mapped = magic == MAGIC and raw_name.rstrip(b"\x00") == ArrowSerializer.name.encode("ascii")
+        if not mapped:
+            data = bytearray(header)
+            data.extend(f.read())
+
+    if mapped:
+        with pa.memory_map(str(path), "r") as source:
+            return loads_frame(source.read_buffer())
+    return loads_frame(data)
+
+
+def file_extension(format_name: Optional[str] = None) -> str:
+    """格式对应的文件扩展名"""
+    return get_serializer(format_name).file_extension
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+技术指标计算引擎
+一次加载价格序列，向量化计算全部所需指标，再按日期窗口切片
+
+指标定义与 stockstats 保持一致，因此 get_stock_stats_indicators_window
+的输出与逐日调用 StockstatsUtils.get_stock_stats 的结果相同。
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# 导入日志模块
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('dataflows')
+
+
+# 与 stockstats 默认参数一致
+MACD_FAST = 12
+MACD_SLOW = 26
+MACD_SIGNAL = 9
+RSI_WINDOW = 14
+BOLL_WINDOW = 20
+BOLL_K = 2
+ATR_WINDOW = 14
+VWMA_WINDOW = 14
+MFI_WINDOW = 14
+
+NOT_TRADING_DAY = "N/A: Not a trading day (weekend or holiday)"
+
+
+def _sma(series: pd.Series, window: int) -> pd.Series:
+    return series.rolling(window, min_periods=1).mean()
+
+
+def _ema(series: pd.Series, window: int) -> pd.Series:
+    return series.ewm(span=window, min_periods=1, adjust=True, ignore_na=False).mean()
+
+
+def _smma(series: pd.Series, window: int) -> pd.Series:
+    # Wilder 平滑，用于 RSI / ATR
+    return series.ewm(alpha=1.0 / window, min_periods=1, adjust=True, ignore_na=False).mean()
+
+
+class IndicatorEngine:
+    """基于单个价格序列的向量化指标引擎"""
+
+    SUPPORTED_INDICATORS = [
+        "close_50_sma", "close_200_sma", "close_10_ema",
+        "macd", "macds", "macdh",
+        "rsi",
+        "boll", "boll_ub", "boll_lb", "atr",
+        "vwma", "mfi",
+    ]
+
+    def __init__(self, data: pd.DataFrame):
+        """
+        初始化指标引擎
+
+        Args:
+            data: 包含 Date/Open/High/Low/Close/Volume 列的价格数据
+        """
+        if data is None or data.empty:
+            raise ValueError("价格数据为空，无法计算技术指标")
+
+        frame = data.copy()
+        frame.columns = [str(c).lower() for c in frame.columns]
+        if "date" not in frame.columns:
+            raise ValueError("价格数据缺少 Date 列")
+
+        # 统一为 YYYY-MM-DD 字符串索引，兼容带时区的时间戳
+        frame["date"] = frame["date"].astype(str).str[:10]
+        frame = frame.drop_duplicates(subset="date", keep="last").sort_values("date")
+        self._frame = frame.set_index("date")
+        self._computed: Dict[str, pd.Series] = {}
+
+    @classmethod
+    def from_csv(cls, path: str) -> "IndicatorEngine":
+        """从 YFin CSV 文件构建引擎"""
+        return cls(pd.read_csv(path))
+
+    @property
+    def dates(self) -> pd.Index:
+        """全部交易日（YYYY-MM-DD）"""
+        return self._frame.index
+
+    def compute(self, indicators: Iterable[str]) -> pd.DataFrame:
+        """
+        计算指定指标的完整序列
+
+        Args:
+            indicators: 指标名称列表
+
+        Returns:
+            pd.DataFrame: 以日期为索引、每个指标一列
+        """
+        names = list(dict.fromkeys(indicators))
+        for name in names:
+            self._series(name)
+        return pd.DataFrame({name: self._computed[name] for name in names})
+
+    def window(self, indicators: Iterable[str], start_date: str, end_date: str) -> pd.DataFrame:
+        """计算指标并按 [start_date, end_date] 切片（闭区间）"""
+        result = self.compute(indicators)
+        dates = result.index.values
+        lo = np.searchsorted(dates, start_date, side="left")
+        hi = np.searchsorted(dates, end_date, side="right")
+        return result.iloc[lo:hi]
+
+    def value_at(self, indicator: str, date: str):
+        """获取某一日的指标值，非交易日返回与 stockstats 相同的提示"""
+        series = self._series(indicator)
+        if date not in series.index:
+            return NOT_TRADING_DAY
+        return series.loc[date]
+
+    def _series(self, name: str) -> pd.Series:
+        if name not in self._computed:
+            self._computed[name] = self._calculate(name)
+        return self._computed[name]
+
+    def _column(self, name: str) -> pd.Series:
+        if name not in self._frame.columns:
+            raise ValueError(f"价格数据缺少 {name} 列")
+        return self._frame[name].astype(float)
+
+    def _calculate(self, name: str) -> pd.Series:
+        if name not in self.SUPPORTED_INDICATORS:
+            raise ValueError(
+                f"Indicator {name} is not supported. Please choose from: {self.SUPPORTED_INDICATORS}"
+            )
+
+        close = self._column("close")
+
+        if name.startswith("close_") and name.endswith("_sma"):
+            return _sma(close, int(name.split("_")[1]))
+        if name.startswith("close_") and name.endswith("_ema"):
+            return _ema(close, int(name.split("_")[1]))
+
+        if name == "macd":
+            return _ema(close, MACD_FAST) - _ema(close, MACD_SLOW)
+        if name == "macds":
+            return _ema(self._series("macd"), MACD_SIGNAL)
+        if name == "macdh":
+            return self._series("macd") - self._series("macds")
+
+        if name == "rsi":
+            change = close.diff().fillna(0)
+            up = _smma(change.clip(lower=0), RSI_WINDOW)
+            down = _smma(-change.clip(upper=0), RSI_WINDOW)
+            total = up + down
+            rsi = 100 * up / total.replace(0, np.nan)
+            return rsi.fillna(50.0)
+
+        if name == "boll":
+            return _sma(close, BOLL_WINDOW)
+        if name in ("boll_ub", "boll_lb"):
+            std = close.rolling(BOLL_WINDOW, min_periods=1).std()
+            offset = BOLL_K * std
+            return self._series("boll") + offset if name == "boll_ub" else self._series("boll") - offset
+
+        high = self._column("high")
+        low = self._column("low")
+
+        if name == "atr":
+            prev_close = close.shift(1).bfill()
+            true_range = pd.concat(
+                [high - low, (high - prev_close).abs(), (low - prev_close).abs()], axis=1
+            ).max(axis=1)
+            return _smma(true_range, ATR_WINDOW)
+
+        volume = self._column("volume")
+        typical_price = (high + low + close) / 3
+
+        if name == "vwma":
+            value = (typical_price * volume).rolling(VWMA_WINDOW, min_periods=1).sum()
+            total_volume = volume.rolling(VWMA_WINDOW, min_periods=1).sum()
+            return value / total_volume.replace(0, np.nan)
+
+        # mfi：与 stockstats 相同，取值范围 [0, 1]，前 MFI_WINDOW 个交易日固定为 0.5
+        raw_flow = typical_price * volume
+        delta = typical_price - typical_price.shift(1).bfill()
+        positive = raw_flow.where(delta > 0, 0.0).rolling(MFI_WINDOW, min_periods=1).sum()
+        negative = raw_flow.where(delta < 0, 0.0).rolling(MFI_WINDOW, min_periods=1).sum()
+        mfi = (positive / (positive + negative).replace(0, np.nan)).fillna(0.5)
+        mfi.iloc[:MFI_WINDOW] = 0.5
+        return mfi
+
+
+def format_indicator_window(
+    engine: IndicatorEngine,
+    indicator: str,
+    start_date: str,
+    end_date: str,
+    trading_days_only: bool = True,
+) -> str:
+    """
+    生成与旧版逐日循环一致的 "日期: 值" 文本（按日期倒序）
+
+    Args:
+        engine: 指标引擎
+        indicator: 指标名称
+        start_date: 窗口起始日期（含）
+        end_date: 窗口结束日期（含）
+        trading_days_only: True 时跳过非交易日；False 时为非交易日输出 N/A 提示
+    """
+    values = engine.window([indicator], start_date, end_date)[indicator]
+
+    if trading_days_only:
+        dates: List[str] = list(values.index)
+    else:
+        dates = [d.strftime("%Y-%m-%d") for d in pd.date_range(start_date, end_date, freq="D")]
+
+    lines = []
+    for date in reversed(dates):
+        value: Optional[object] = values.get(date, NOT_TRADING_DAY)
+        lines.append(f"{date}: {value}\n")
+    return "".join(lines)
@@ -16,6 +16,7 @@ from tradingagents.utils.logging_init import setup_dataflow_logging
 
 # 导入原有缓存系统
 from .cache_manager import StockDataCache
+from .memory_cache import get_memory_cache
 
 # 导入自适应缓存系统
 try:
@@ -31,8 +32,11 @@ class IntegratedCacheManager:
     def __init__(self, cache_dir: str = None):
         self.logger = setup_dataflow_logging()
         
-        # 初始化原有缓存系统（作为备用）
+        # 初始化原有缓存系统（作为备用，自带进程内L1缓存）
         self.legacy_cache = StockDataCache(cache_dir)
+
+        # 进程内L1缓存，位于自适应缓存（Redis/MongoDB/文件）之前
+        self.memory_cache = get_memory_cache()
         
         # 尝试初始化自适应缓存系统
         self.adaptive_cache = None
@@ -68,6 +72,29 @@ class IntegratedCacheManager:
         else:
             self.logger.info("📁 使用传统文件缓存系统")
     
+    def _adaptive_memory_key(self, cache_key: str) -> tuple:
+        """自适应缓存数据的L1缓存键"""
+        return ("adaptive", cache_key)
+
+    def _adaptive_load(self, cache_key: str) -> Optional[Any]:
+        """从L1缓存或自适应缓存加载数据，L1缓存条目与后端条目同时过期"""
+        memory_key = self._adaptive_memory_key(cache_key)
+        data = self.memory_cache.get(memory_key)
+        if data is not None:
+            return data
+        cache_data = self.adaptive_cache.load_entry(cache_key)
+        if cache_data is None:
+            return None
+        self.memory_cache.put(memory_key, cache_data['data'], self.adaptive_cache.remaining_ttl_seconds(cache_data))
+        return cache_data['data']
+
+    def _adaptive_save(self, symbol: str, data: Any, data_type: str, **kwargs) -> str:
+        """保存到自适应缓存并写入L1缓存"""
+        cache_key = self.adaptive_cache.save_data(symbol=symbol, data=data, data_type=data_type, **kwargs)
+        self.memory_cache.put(self._adaptive_memory_key(cache_key), data,
+                              self.adaptive_cache._get_ttl_seconds(symbol, data_type))
+        return cache_key
+
     def save_stock_data(self, symbol: str, data: Any, start_date: str = None, 
                        end_date: str = None, data_source: str = "default") -> str:
         """
@@ -85,7 +112,7 @@ class IntegratedCacheManager:
         """
         if self.use_adaptive:
             # 使用自适应缓存系统
-            return self.adaptive_cache.save_data(
+            return self._adaptive_save(
                 symbol=symbol,
                 data=data,
                 start_date=start_date or "",
@@ -115,7 +142,7 @@ class IntegratedCacheManager:
         """
         if self.use_adaptive:
             # 使用自适应缓存系统
-            return self.adaptive_cache.load_data(cache_key)
+            return self._adaptive_load(cache_key)
         else:
             # 使用传统缓存系统
             return self.legacy_cache.load_stock_data(cache_key)
@@ -135,14 +162,10 @@ class IntegratedCacheManager:
             缓存键或None
         """
         if self.use_adaptive:
-            # 使用自适应缓存系统
-            return self.adaptive_cache.find_cached_data(
-                symbol=symbol,
-                start_date=start_date or "",
-                end_date=end_date or "",
-                data_source=data_source,
-                data_type="stock_data"
-            )
+            # 使用自适应缓存系统：查找时加载的数据直接写入L1缓存，随后的加载不再访问后端
+            cache_key = self.adaptive_cache._get_cache_key(
+                symbol, start_date or "", end_date or "", data_source, "stock_data")
+            return cache_key if self._adaptive_load(cache_key) is not None else None
         else:
             # 使用传统缓存系统
             return self.legacy_cache.find_cached_stock_data(
@@ -155,7 +178,7 @@ class IntegratedCacheManager:
     def save_news_data(self, symbol: str, data: Any, data_source: str = "default") -> str:
         """保存新闻数据"""
         if self.use_adaptive:
-            return self.adaptive_cache.save_data(
+            return self._adaptive_save(
                 symbol=symbol,
                 data=data,
                 data_source=data_source,
@@ -167,14 +190,14 @@ class IntegratedCacheManager:
     def load_news_data(self, cache_key: str) -> Optional[Any]:
         """加载新闻数据"""
         if self.use_adaptive:
-            return self.adaptive_cache.load_data(cache_key)
+            return self._adaptive_load(cache_key)
         else:
             return self.legacy_cache.load_news_data(cache_key)
     
     def save_fundamentals_data(self, symbol: str, data: Any, data_source: str = "default") -> str:
         """保存基本面数据"""
         if self.use_adaptive:
-            return self.adaptive_cache.save_data(
+            return self._adaptive_save(
                 symbol=symbol,
                 data=data,
                 data_source=data_source,
@@ -186,7 +209,7 @@ class IntegratedCacheManager:
     def load_fundamentals_data(self, cache_key: str) -> Optional[Any]:
         """加载基本面数据"""
         if self.use_adaptive:
-            return self.adaptive_cache.load_data(cache_key)
+            return self._adaptive_load(cache_key)
         else:
             return self.legacy_cache.load_fundamentals_data(cache_key)
     
@@ -203,6 +226,7 @@ class IntegratedCacheManager:
                 "cache_system": "adaptive",
                 "adaptive_cache": adaptive_stats,
                 "legacy_cache": legacy_stats,
+                "memory_cache": self.memory_cache.get_stats(),
                 "database_available": self.db_manager.is_database_available(),
                 "mongodb_available": self.db_manager.is_mongodb_available(),
                 "redis_available": self.db_manager.is_redis_available()
@@ -213,6 +237,7 @@ class IntegratedCacheManager:
             return {
                 "cache_system": "legacy",
                 "legacy_cache": legacy_stats,
+                "memory_cache": self.memory_cache.get_stats(),
                 "database_available": False,
                 "mongodb_available": False,
                 "redis_available": False
@@ -222,6 +247,7 @@ class IntegratedCacheManager:
         """清理过期缓存"""
         if self.use_adaptive:
             self.adaptive_cache.clear_expired_cache()
+        self.memory_cache.purge_expired()
         
         # 总是清理传统缓存
         self.legacy_cache.clear_expired_cache()
@@ -62,6 +62,8 @@ except ImportError as e:
     yf = None
     YF_AVAILABLE = False
 from .config import get_config, set_config, DATA_DIR
+from .indicator_engine import IndicatorEngine, format_indicator_window
+from .price_store import get_price_store
 
 
 def get_finnhub_news(
@@ -590,15 +592,48 @@ def get_stock_stats_indicators_window(
     curr_date = datetime.strptime(curr_date, "%Y-%m-%d")
     before = curr_date - relativedelta(days=look_back_days)
 
+    # 一次加载价格序列、向量化计算指标，再按窗口切片（避免逐日重复读取CSV和重算指标）
+    try:
+        price_data = StockstatsUtils.load_price_data(
+            symbol,
+            os.path.join(DATA_DIR, "market_data", "price_data"),
+            online=online,
+        )
+        engine = IndicatorEngine(price_data)
+        ind_string = format_indicator_window(
+            engine,
+            indicator,
+            before.strftime("%Y-%m-%d"),
+            end_date,
+            trading_days_only=not online,
+        )
+    except Exception as e:
+        logger.warning(f"⚠️ 向量化指标计算失败，回退到逐日计算: {e}")
+        ind_string = _get_stock_stats_indicators_window_legacy(
+            symbol, indicator, curr_date, before, online
+        )
+
+    result_str = (
+        f"## {indicator} values from {before.strftime('%Y-%m-%d')} to {end_date}:\n\n"
+        + ind_string
+        + "\n\n"
+        + best_ind_params.get(indicator, "No description available.")
+    )
+
+    return result_str
+
+
+def _get_stock_stats_indicators_window_legacy(
+    symbol: str,
+    indicator: str,
+    curr_date: datetime,
+    before: datetime,
+    online: bool,
+) -> str:
+    """逐日调用 get_stockstats_indicator 的旧实现，仅在向量化引擎不可用时使用"""
     if not online:
         # read from YFin data
-        data = pd.read_csv(
-            os.path.join(
-                DATA_DIR,
-                f"market_data/price_data/{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-            )
-        )
-        data["Date"] = pd.to_datetime(data["Date"], utc=True)
+        data = get_price_store().read_range(_yfin_csv_path(symbol))
         dates_in_df = data["Date"].astype(str).str[:10]
 
         ind_string = ""
@@ -624,14 +659,7 @@ def get_stock_stats_indicators_window(
 
             curr_date = curr_date - relativedelta(days=1)
 
-    result_str = (
-        f"## {indicator} values from {before.strftime('%Y-%m-%d')} to {end_date}:\n\n"
-        + ind_string
-        + "\n\n"
-        + best_ind_params.get(indicator, "No description available.")
-    )
-
-    return result_str
+    return ind_string
 
 
 def get_stockstats_indicator(
@@ -663,6 +691,14 @@ def get_stockstats_indicator(
     return str(indicator_value)
 
 
+def _yfin_csv_path(symbol: str) -> str:
+    """离线 YFin 价格数据文件路径"""
+    return os.path.join(
+        DATA_DIR,
+        f"market_data/price_data/{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
+    )
+
+
 def get_YFin_data_window(
     symbol: Annotated[str, "ticker symbol of the company"],
     curr_date: Annotated[str, "Start date in yyyy-mm-dd format"],
@@ -673,25 +709,11 @@ def get_YFin_data_window(
     before = date_obj - relativedelta(days=look_back_days)
     start_date = before.strftime("%Y-%m-%d")
 
-    # read in data
-    data = pd.read_csv(
-        os.path.join(
-            DATA_DIR,
-            f"market_data/price_data/{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-        )
+    # read in data (binary-searched slice of the memory-mapped price store)
+    filtered_data = get_price_store().read_range(
+        _yfin_csv_path(symbol), start_date, curr_date
     )
 
-    # Extract just the date part for comparison
-    data["DateOnly"] = data["Date"].str[:10]
-
-    # Filter data between the start and end dates (inclusive)
-    filtered_data = data[
-        (data["DateOnly"] >= start_date) & (data["DateOnly"] <= curr_date)
-    ]
-
-    # Drop the temporary column we created
-    filtered_data = filtered_data.drop("DateOnly", axis=1)
-
     # Set pandas display options to show the full DataFrame
     with pd.option_context(
         "display.max_rows", None, "display.max_columns", None, "display.width", None
@@ -755,28 +777,15 @@ def get_YFin_data(
     end_date: Annotated[str, "End date in yyyy-mm-dd format"],
 ) -> str:
     # read in data
-    data = pd.read_csv(
-        os.path.join(
-            DATA_DIR,
-            f"market_data/price_data/{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-        )
-    )
+    series = get_price_store().load(_yfin_csv_path(symbol))
 
     if end_date > "2025-03-25":
         raise Exception(
             f"Get_YFin_Data: {end_date} is outside of the data range of 2015-01-01 to 2025-03-25"
         )
 
-    # Extract just the date part for comparison
-    data["DateOnly"] = data["Date"].str[:10]
-
     # Filter data between the start and end dates (inclusive)
-    filtered_data = data[
-        (data["DateOnly"] >= start_date) & (data["DateOnly"] <= end_date)
-    ]
-
-    # Drop the temporary column we created
-    filtered_data = filtered_data.drop("DateOnly", axis=1)
+    filtered_data = series.slice(start_date, end_date)
 
     # remove the index from the dataframe
     filtered_data = filtered_data.reset_index(drop=True)
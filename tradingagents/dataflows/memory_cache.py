@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+进程内L1缓存
+位于文件/Redis/MongoDB缓存之前的内存LRU缓存：
+- 按数据占用的字节数限制总大小，超出时淘汰最久未使用的条目
+- 每个条目有独立的过期时间（与 cache_config 中各市场的TTL一致）
+- 同一次分析中对同一股票数据的重复读取不再访问元数据和数据文件
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import pandas as pd
+
+# 导入日志模块
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('dataflows')
+
+
+def estimate_size(value: Any) -> int:
+    """估算缓存值占用的字节数"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, (str, bytes, bytearray)):
+        return sys.getsizeof(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+def _copy_value(value: Any) -> Any:
+    """DataFrame 可能被调用方原地修改，返回副本；字符串等不可变对象直接返回"""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy()
+    return value
+
+
+class MemoryCache:
+    """
+    按字节数限制大小、带过期时间的LRU缓存
+
+    Args:
+        max_bytes: 最大占用字节数
+        enabled: 是否启用；禁用时 get 总是未命中、put 不保存
+    """
+
+    def __init__(self, max_bytes: int, enabled: bool = True):
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "rejected": 0}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """获取未过期的缓存值，未命中返回None"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            value, expires_at, size = entry
+            if expires_at <= time.time():
+                self._remove(key)
+                self._stats["expirations"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+        return _copy_value(value)
+
+    def put(self, key: Hashable, value: Any, ttl_seconds: float):
+        """
+        保存缓存值
+
+        Args:
+            key: 缓存键
+            value: 缓存值（None 不保存）
+            ttl_seconds: 过期时间（秒），不大于0时不保存
+        """
+        if not self.enabled or value is None or ttl_seconds <= 0:
+            return
+        size = estimate_size(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_bytes:
+                # 单个值超过总容量时不缓存，避免清空整个缓存
+                self._stats["rejected"] += 1
+                return
+            self._entries[key] = (_copy_value(value), time.time() + ttl_seconds, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._stats["evictions"] += 1
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any],
+                    ttl: Callable[[Any], float]) -> Optional[Any]:
+        """
+        命中时返回缓存值，否则调用 loader 加载并按 ttl(value) 秒缓存
+
+        Args:
+            key: 缓存键
+            loader: 加载函数（访问下一级缓存）
+            ttl: 根据加载结果计算过期时间（秒）
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+        value = loader()
+        if value is not None:
+            self.put(key, value, ttl(value))
+        return value
+
+    def discard(self, key: Hashable):
+        """删除指定条目"""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def discard_where(self, predicate: Callable[[Hashable], bool]):
+        """删除键满足条件的所有条目"""
+        with self._lock:
+            for key in [key for key in self._entries if predicate(key)]:
+                self._remove(key)
+
+    def clear(self):
+        """清空缓存（保留统计）"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def purge_expired(self) -> int:
+        """删除所有过期条目，返回删除数量"""
+        now = time.time()
+        with self._lock:
+            expired = [key for key, (_, expires_at, _) in self._entries.items() if expires_at <= now]
+            for key in expired:
+                self._remove(key)
+            self._stats["expirations"] += len(expired)
+        return len(expired)
+
+    def _remove(self, key: Hashable):
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        缓存统计
+
+        Returns:
+            Dict: enabled、entries、size_mb、max_size_mb、hits、misses、hit_rate、
+                evictions（容量淘汰）、expirations（过期删除）、rejected（超过容量未缓存）
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["size_mb"] = round(self._bytes / (1024 * 1024), 2)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        stats["max_size_mb"] = round(self.max_bytes / (1024 * 1024), 2)
+        stats["enabled"] = self.enabled
+        return stats
+
+    def reset_stats(self):
+        """清空统计"""
+        with self._lock:
+            for name in self._stats:
+                self._stats[name] = 0
+
+
+# 全局L1缓存实例（文件缓存与自适应缓存共享）
+_memory_cache = None
+_memory_cache_lock = threading.Lock()
+
+
+def get_memory_cache() -> MemoryCache:
+    """获取全局进程内L1缓存实例"""
+    global _memory_cache
+    if _memory_cache is None:
+        with _memory_cache_lock:
+            if _memory_cache is None:
+                max_mb = float(os.getenv("MEMORY_CACHE_MAX_MB", "64"))
+                enabled = os.getenv("MEMORY_CACHE_ENABLED", "true").lower() == "true"
+                _memory_cache = MemoryCache(int(max_mb * 1024 * 1024), enabled=enabled)
+                logger.info(f"🧠 进程内L1缓存: {'启用' if enabled else '禁用'}，容量 {max_mb:.0f}MB")
+    return _memory_cache
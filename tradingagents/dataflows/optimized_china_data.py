@@ -11,6 +11,7 @@ from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 from .cache_manager import get_cache
 from .config import get_config
+from .single_flight import get_single_flight, single_flight_key
 
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger
@@ -42,6 +43,24 @@ class OptimizedChinaDataProvider:
     def get_stock_data(self, symbol: str, start_date: str, end_date: str, 
                       force_refresh: bool = False) -> str:
         """
+        获取A股数据 - 优先使用缓存，相同参数的并发请求合并为一次获取
+
+        Args:
+            symbol: 股票代码（6位数字）
+            start_date: 开始日期 (YYYY-MM-DD)
+            end_date: 结束日期 (YYYY-MM-DD)
+            force_refresh: 是否强制刷新缓存
+
+        Returns:
+            格式化的股票数据字符串
+        """
+        key = single_flight_key("china_stock_data", symbol, start_date, end_date, force_refresh)
+        return get_single_flight().do(
+            key, lambda: self._get_stock_data(symbol, start_date, end_date, force_refresh))
+
+    def _get_stock_data(self, symbol: str, start_date: str, end_date: str,
+                        force_refresh: bool = False) -> str:
+        """
         获取A股数据 - 优先使用缓存
         
         Args:
@@ -69,6 +88,12 @@ class OptimizedChinaDataProvider:
                 if cached_data:
                     logger.info(f"⚡ 从缓存加载A股数据: {symbol}")
                     return cached_data
+
+        # 从日线区间存储获取（只向数据源请求存储中缺失的日期区间）
+        if self.config.get("bar_store_enabled", True):
+            formatted_data = self._get_stock_data_from_bar_store(symbol, start_date, end_date, force_refresh)
+            if formatted_data:
+                return formatted_data
         
         # 缓存未命中，从Tushare数据接口获取
         logger.info(f"🌐 从Tushare数据接口获取数据: {symbol}")
@@ -123,7 +148,55 @@ class OptimizedChinaDataProvider:
             # 生成备用数据
             return self._generate_fallback_data(symbol, start_date, end_date, error_msg)
     
+    def _get_stock_data_from_bar_store(self, symbol: str, start_date: str, end_date: str,
+                                       force_refresh: bool = False) -> Optional[str]:
+        """
+        从日线区间存储获取A股数据，与已存储区间重叠的部分不再请求数据源
+
+        Returns:
+            格式化的股票数据字符串；当前数据源不支持或获取失败时返回None
+        """
+        try:
+            from .bar_store import get_bar_store
+            from .data_source_manager import get_data_source_manager
+
+            manager = get_data_source_manager()
+            source = manager.get_current_source()
+            date_column = manager.BAR_DATE_COLUMNS.get(source)
+            if date_column is None:
+                return None
+
+            def fetch(symbol: str, gap_start: str, gap_end: str):
+                self._wait_for_rate_limit()
+                return manager.fetch_daily_bars(symbol, gap_start, gap_end, source)
+
+            data = get_bar_store().get_bars(symbol, source.value, start_date, end_date, fetch,
+                                            date_column=date_column, force_refresh=force_refresh)
+            if data is None or data.empty:
+                return None
+
+            logger.info(f"✅ A股数据获取成功(日线存储): {symbol}")
+            return manager.format_daily_bars(symbol, data, start_date, end_date, source)
+
+        except Exception as e:
+            logger.warning(f"⚠️ 日线存储获取失败，使用统一数据源接口: {symbol} ({e})")
+            return None
+
     def get_fundamentals_data(self, symbol: str, force_refresh: bool = False) -> str:
+        """
+        获取A股基本面数据 - 优先使用缓存，相同参数的并发请求合并为一次获取
+
+        Args:
+            symbol: 股票代码
+            force_refresh: 是否强制刷新缓存
+
+        Returns:
+            格式化的基本面数据字符串
+        """
+        key = single_flight_key("china_fundamentals", symbol, force_refresh)
+        return get_single_flight().do(key, lambda: self._get_fundamentals_data(symbol, force_refresh))
+
+    def _get_fundamentals_data(self, symbol: str, force_refresh: bool = False) -> str:
         """
         获取A股基本面数据 - 优先使用缓存
         
@@ -139,22 +212,13 @@ class OptimizedChinaDataProvider:
         # 检查缓存（除非强制刷新）
         if not force_refresh:
             # 查找基本面数据缓存
-            for metadata_file in self.cache.metadata_dir.glob(f"*_meta.json"):
+            for cache_key, _ in self.cache.find_cache_entries(symbol, 'fundamentals', 'china'):
                 try:
-                    import json
-                    with open(metadata_file, 'r', encoding='utf-8') as f:
-                        metadata = json.load(f)
-                    
-                    if (metadata.get('symbol') == symbol and 
-                        metadata.get('data_type') == 'fundamentals' and
-                        metadata.get('market_type') == 'china'):
-                        
-                        cache_key = metadata_file.stem.replace('_meta', '')
-                        if self.cache.is_cache_valid(cache_key, symbol=symbol, data_type='fundamentals'):
-                            cached_data = self.cache.load_stock_data(cache_key)
-                            if cached_data:
-                                logger.info(f"⚡ 从缓存加载A股基本面数据: {symbol}")
-                                return cached_data
+                    if self.cache.is_cache_valid(cache_key, symbol=symbol, data_type='fundamentals'):
+                        cached_data = self.cache.load_stock_data(cache_key)
+                        if cached_data:
+                            logger.info(f"⚡ 从缓存加载A股基本面数据: {symbol}")
+                            return cached_data
                 except Exception:
                     continue
         
@@ -1064,21 +1128,11 @@ class OptimizedChinaDataProvider:
         """尝试获取过期的缓存数据作为备用"""
         try:
             # 查找任何相关的缓存，不考虑TTL
-            for metadata_file in self.cache.metadata_dir.glob(f"*_meta.json"):
+            for cache_key, _ in self.cache.find_cache_entries(symbol, 'stock_data', 'china'):
                 try:
-                    import json
-
-                    with open(metadata_file, 'r', encoding='utf-8') as f:
-                        metadata = json.load(f)
-                    
-                    if (metadata.get('symbol') == symbol and 
-                        metadata.get('data_type') == 'stock_data' and
-                        metadata.get('market_type') == 'china'):
-                        
-                        cache_key = metadata_file.stem.replace('_meta', '')
-                        cached_data = self.cache.load_stock_data(cache_key)
-                        if cached_data:
-                            return cached_data + "\n\n⚠️ 注意: 使用的是过期缓存数据"
+                    cached_data = self.cache.load_stock_data(cache_key)
+                    if cached_data:
+                        return cached_data + "\n\n⚠️ 注意: 使用的是过期缓存数据"
                 except Exception:
                     continue
         except Exception:
@@ -13,6 +13,7 @@ import yfinance as yf
 import pandas as pd
 from .cache_manager import get_cache
 from .config import get_config
+from .single_flight import get_single_flight, single_flight_key
 
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger
@@ -45,6 +46,24 @@ class OptimizedUSDataProvider:
     def get_stock_data(self, symbol: str, start_date: str, end_date: str, 
                       force_refresh: bool = False) -> str:
         """
+        获取美股数据 - 优先使用缓存，相同参数的并发请求合并为一次获取
+
+        Args:
+            symbol: 股票代码
+            start_date: 开始日期 (YYYY-MM-DD)
+            end_date: 结束日期 (YYYY-MM-DD)
+            force_refresh: 是否强制刷新缓存
+
+        Returns:
+            格式化的股票数据字符串
+        """
+        key = single_flight_key("us_stock_data", symbol, start_date, end_date, force_refresh)
+        return get_single_flight().do(
+            key, lambda: self._get_stock_data(symbol, start_date, end_date, force_refresh))
+
+    def _get_stock_data(self, symbol: str, start_date: str, end_date: str,
+                        force_refresh: bool = False) -> str:
+        """
         获取美股数据 - 优先使用缓存
         
         Args:
@@ -130,9 +149,8 @@ class OptimizedUSDataProvider:
                         # 备用方案：Yahoo Finance
                         logger.info(f"🔄 使用Yahoo Finance备用方案获取港股数据: {symbol}")
 
-                        self._wait_for_rate_limit()
-                        ticker = yf.Ticker(symbol)  # 港股代码保持原格式
-                        data = ticker.history(start=start_date, end=end_date)
+                        # 港股代码保持原格式
+                        data = self._get_yfinance_history(symbol, start_date, end_date, force_refresh)
 
                         if not data.empty:
                             formatted_data = self._format_stock_data(symbol, data, start_date, end_date)
@@ -143,11 +161,8 @@ class OptimizedUSDataProvider:
                 else:
                     # 美股使用Yahoo Finance
                     logger.info(f"🇺🇸 从Yahoo Finance API获取美股数据: {symbol}")
-                    self._wait_for_rate_limit()
-
                     # 获取数据
-                    ticker = yf.Ticker(symbol.upper())
-                    data = ticker.history(start=start_date, end=end_date)
+                    data = self._get_yfinance_history(symbol.upper(), start_date, end_date, force_refresh)
 
                     if data.empty:
                         error_msg = f"未找到股票 '{symbol}' 在 {start_date} 到 {end_date} 期间的数据"
@@ -179,6 +194,37 @@ class OptimizedUSDataProvider:
 
         return formatted_data
     
+    def _get_yfinance_history(self, ticker_symbol: str, start_date: str, end_date: str,
+                              force_refresh: bool = False) -> pd.DataFrame:
+        """
+        获取Yahoo Finance日线数据，启用日线区间存储时只请求存储中缺失的日期区间
+
+        与 yf.Ticker.history(start, end) 相同，结果不包含 end_date 当天
+        """
+        if not self.config.get("bar_store_enabled", True):
+            self._wait_for_rate_limit()
+            return yf.Ticker(ticker_symbol).history(start=start_date, end=end_date)
+
+        from .bar_store import get_bar_store
+
+        def fetch(symbol: str, gap_start: str, gap_end: str) -> pd.DataFrame:
+            self._wait_for_rate_limit()
+            # 存储按闭区间请求，yfinance 的 end 为开区间
+            history_end = (datetime.strptime(gap_end, '%Y-%m-%d') + timedelta(days=1)).strftime('%Y-%m-%d')
+            return yf.Ticker(symbol).history(start=gap_start, end=history_end)
+
+        last_date = (datetime.strptime(end_date, '%Y-%m-%d') - timedelta(days=1)).strftime('%Y-%m-%d')
+        if last_date < start_date:
+            return pd.DataFrame()
+
+        data = get_bar_store().get_bars(ticker_symbol, "yfinance", start_date, last_date, fetch,
+                                        force_refresh=force_refresh)
+        if data is None:
+            # 存储无法给出完整区间时直接获取整个区间
+            self._wait_for_rate_limit()
+            return yf.Ticker(ticker_symbol).history(start=start_date, end=end_date)
+        return data
+
     def _format_stock_data(self, symbol: str, data: pd.DataFrame, 
                           start_date: str, end_date: str) -> str:
         """格式化股票数据为字符串"""
@@ -244,20 +290,11 @@ class OptimizedUSDataProvider:
         """尝试获取过期的缓存数据作为备用"""
         try:
             # 查找任何相关的缓存，不考虑TTL
-            for metadata_file in self.cache.metadata_dir.glob(f"*_meta.json"):
+            for cache_key, _ in self.cache.find_cache_entries(symbol, 'stock_data', 'us'):
                 try:
-                    import json
-                    with open(metadata_file, 'r', encoding='utf-8') as f:
-                        metadata = json.load(f)
-                    
-                    if (metadata.get('symbol') == symbol and 
-                        metadata.get('data_type') == 'stock_data' and
-                        metadata.get('market_type') == 'us'):
-                        
-                        cache_key = metadata_file.stem.replace('_meta', '')
-                        cached_data = self.cache.load_stock_data(cache_key)
-                        if cached_data:
-                            return cached_data + "\n\n⚠️ 注意: 使用的是过期缓存数据"
+                    cached_data = self.cache.load_stock_data(cache_key)
+                    if cached_data:
+                        return cached_data + "\n\n⚠️ 注意: 使用的是过期缓存数据"
                 except Exception:
                     continue
         except Exception:
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+缓存数据压缩编解码
+Redis/MongoDB 缓存条目写入前压缩较大的文本报告和序列化数据：
+- zstd: 需要 zstandard（压缩率高，默认优先使用）
+- lz4: 需要 lz4（速度最快）
+- zlib: 标准库，始终可用
+
+小于阈值或压缩后没有变小的数据原样保存；压缩后的数据带有格式标记，
+解码时自动识别，未压缩的旧缓存条目原样返回。
+"""
+
+import os
+import struct
+import threading
+import time
+import zlib
+from typing import Any, Callable, Dict, Optional, Union
+
+# 导入日志模块
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('agents')
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+try:
+    import lz4.frame
+    LZ4_AVAILABLE = True
+except ImportError:
+    lz4 = None
+    LZ4_AVAILABLE = False
+
+MAGIC = b"TAPC"
+_HEADER = struct.Struct("<4sBB8s")  # magic, version, 标志位, 压缩算法名（定长8字节）
+ENVELOPE_VERSION = 1
+_FLAG_TEXT = 0x01  # 原始数据为 UTF-8 文本
+
+DEFAULT_THRESHOLD = 1024
+
+Payload = Union[str, bytes, bytearray, memoryview]
+
+
+class _Compressor:
+    """压缩算法"""
+
+    def __init__(self, name: str, compress: Callable[[bytes, int], bytes],
+                 decompress: Callable[[bytes], bytes], default_level: int):
+        self.name = name
+        self.compress = compress
+        self.decompress = decompress
+        self.default_level = default_level
+
+
+_COMPRESSORS: Dict[str, _Compressor] = {
+    "zlib": _Compressor("zlib", lambda data, level: zlib.compress(data, level), zlib.decompress, 6),
+}
+if ZSTD_AVAILABLE:
+    _COMPRESSORS["zstd"] = _Compressor(
+        "zstd",
+        lambda data, level: zstandard.ZstdCompressor(level=level).compress(data),
+        lambda data: zstandard.ZstdDecompressor().decompress(data),
+        3,
+    )
+if LZ4_AVAILABLE:
+    _COMPRESSORS["lz4"] = _Compressor(
+        "lz4",
+        lambda data, level: lz4.frame.compress(data, compression_level=level),
+        lz4.frame.decompress,
+        0,
+    )
+
+# 全部压缩算法名（含当前环境缺少依赖、无法解压的算法）
+CODEC_NAMES = ("zstd", "lz4", "zlib")
+
+
+def default_codec_name() -> str:
+    """当前环境可用的首选压缩算法"""
+    for name in CODEC_NAMES:
+        if name in _COMPRESSORS:
+            return name
+    return "zlib"
+
+
+def is_compressed(data: Any) -> bool:
+    """判断数据是否为本模块压缩后的结果"""
+    return (isinstance(data, (bytes, bytearray, memoryview))
+            and len(data) >= _HEADER.size and bytes(data[:4]) == MAGIC)
+
+
+class PayloadCodec:
+    """
+    缓存数据编解码器
+
+    Args:
+        codec: 压缩算法（zstd / lz4 / zlib / none），none 表示不压缩只解码
+        threshold: 压缩阈值（字节），小于阈值的数据原样保存
+        level: 压缩级别，默认使用各算法的默认级别
+    """
+
+    def __init__(self, codec: Optional[str] = None, threshold: int = DEFAULT_THRESHOLD,
+                 level: Optional[int] = None):
+        codec = (codec or default_codec_name()).strip().lower()
+        if codec != "none" and codec not in _COMPRESSORS:
+            fallback = default_codec_name()
+            logger.warning(f"⚠️ 不支持的缓存压缩算法: {codec}，使用 {fallback}")
+            codec = fallback
+        self.compressor = _COMPRESSORS.get(codec)
+        self.codec = codec
+        self.threshold = threshold
+        self.level = self.compressor.default_level if level is None and self.compressor else level
+        self._lock = threading.Lock()
+        self._stats = self._empty_stats()
+
+    @staticmethod
+    def _empty_stats() -> Dict[str, float]:
+        return {"encoded": 0, "compressed": 0, "raw_bytes": 0, "stored_bytes": 0,
+                "encode_seconds": 0.0, "decoded": 0, "decompressed": 0, "decode_seconds": 0.0}
+
+    def encode(self, value: Payload) -> Payload:
+        """
+        压缩数据
+
+        Args:
+            value: 文本或字节数据
+
+        Returns:
+            压缩后带格式标记的字节；未压缩时返回原值（文本仍为 str）
+        """
+        start = time.perf_counter()
+        is_text = isinstance(value, str)
+        raw = value.encode("utf-8") if is_text else bytes(value)
+
+        result = value
+        if self.compressor is not None and len(raw) >= self.threshold:
+            body = self.compressor.compress(raw, self.level)
+            if len(body) + _HEADER.size < len(raw):
+                header = _HEADER.pack(MAGIC, ENVELOPE_VERSION, _FLAG_TEXT if is_text else 0,
+                                      self.codec.encode("ascii"))
+                result = header + body
+
+        stored = len(result) if isinstance(result, (bytes, bytearray, memoryview)) else len(raw)
+        with self._lock:
+            self._stats["encoded"] += 1
+            self._stats["compressed"] += result is not value
+            self._stats["raw_bytes"] += len(raw)
+            self._stats["stored_bytes"] += stored
+            self._stats["encode_seconds"] += time.perf_counter() - start
+        return result
+
+    def decode(self, value: Any) -> Any:
+        """
+        解压数据；不是压缩数据时（旧缓存条目、小于阈值的数据）原样返回
+
+        Returns:
+            压缩前的文本或字节
+        """
+        if not is_compressed(value):
+            with self._lock:
+                self._stats["decoded"] += 1
+            return value
+
+        start = time.perf_counter()
+        view = memoryview(value)
+        magic, version, flags, raw_name = _HEADER.unpack_from(view, 0)
+        if version != ENVELOPE_VERSION:
+            raise ValueError(f"不支持的缓存压缩格式版本: {version}")
+
+        name = raw_name.rstrip(b"\x00").decode("ascii")
+        compressor = _COMPRESSORS.get(name)
+        if compressor is None:
+            raise ValueError(f"缺少解压 {name} 格式所需的依赖")
+        raw = compressor.decompress(bytes(view[_HEADER.size:]))
+        result = raw.decode("utf-8") if flags & _FLAG_TEXT else raw
+
+        with self._lock:
+            self._stats["decoded"] += 1
+            self._stats["decompressed"] += 1
+            self._stats["decode_seconds"] += time.perf_counter() - start
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        编解码统计
+
+        Returns:
+            Dict: codec、threshold、encoded/compressed（编码/实际压缩次数）、raw_bytes/stored_bytes、
+                compression_ratio（原始字节/存储字节）、encode_ms/decode_ms（累计耗时）、
+                decoded/decompressed（解码/实际解压次数）
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        stats["compression_ratio"] = (round(stats["raw_bytes"] / stats["stored_bytes"], 2)
+                                      if stats["stored_bytes"] else 1.0)
+        stats["encode_ms"] = round(stats.pop("encode_seconds") * 1000, 2)
+        stats["decode_ms"] = round(stats.pop("decode_seconds") * 1000, 2)
+        stats["codec"] = self.codec
+        stats["threshold"] = self.threshold
+        return stats
+
+    def reset_stats(self):
+        """清空统计"""
+        with self._lock:
+            self._stats = self._empty_stats()
+
+
+# 全局编解码器实例
+_payload_codec = None
+_payload_codec_lock = threading.Lock()
+
+
+def get_payload_codec() -> PayloadCodec:
+    """获取全局缓存编解码器（Redis/MongoDB 缓存共享）"""
+    global _payload_codec
+    if _payload_codec is None:
+        with _payload_codec_lock:
+            if _payload_codec is None:
+                level = os.getenv("CACHE_COMPRESSION_LEVEL", "").strip()
+                _payload_codec = PayloadCodec(
+                    codec=os.getenv("CACHE_COMPRESSION", "").strip() or None,
+                    threshold=int(os.getenv("CACHE_COMPRESSION_THRESHOLD", str(DEFAULT_THRESHOLD))),
+                    level=int(level) if level else None,
+                )
+                logger.info(f"🗜️ 缓存压缩: {_payload_codec.codec}，阈值 {_payload_codec.threshold} 字节")
+    return _payload_codec
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+价格序列列式存储
+将 YFin CSV 一次性转换为按列存放的 .npy 文件，之后通过内存映射读取，
+日期区间查询使用 int64 日期索引二分查找，返回零拷贝切片。
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# 导入日志模块
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('dataflows')
+
+STORE_FORMAT_VERSION = 1
+DATE_COLUMN = "Date"
+META_FILE = "meta.json"
+DATE_INDEX_FILE = "_date_index.npy"
+ROW_INDEX_FILE = "_row_index.npy"
+
+
+def date_to_int(date_str: str) -> int:
+    """YYYY-MM-DD（或更长的时间字符串）转换为 YYYYMMDD 整数"""
+    return int(str(date_str)[:10].replace("-", ""))
+
+
+class PriceSeries:
+    """一个标的的内存映射价格序列"""
+
+    def __init__(self, columns: Dict[str, np.ndarray], column_order: list,
+                 date_index: np.ndarray, row_index: np.ndarray):
+        self.columns = columns
+        self.column_order = column_order
+        self.date_index = date_index
+        self.row_index = row_index
+
+    def __len__(self) -> int:
+        return len(self.date_index)
+
+    def bounds(self, start_date: Optional[str] = None, end_date: Optional[str] = None):
+        """返回 [start_date, end_date] 闭区间对应的行号范围"""
+        lo = 0 if start_date is None else int(
+            np.searchsorted(self.date_index, date_to_int(start_date), side="left"))
+        hi = len(self.date_index) if end_date is None else int(
+            np.searchsorted(self.date_index, date_to_int(end_date), side="right"))
+        return lo, hi
+
+    def slice(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> pd.DataFrame:
+        """
+        按日期区间切片
+
+        返回的 DataFrame 直接引用内存映射数组（只读），索引为原 CSV 中的行号，
+        与旧版 pd.read_csv + 布尔过滤的结果一致。
+        """
+        lo, hi = self.bounds(start_date, end_date)
+        data = {name: self.columns[name][lo:hi] for name in self.column_order}
+        return pd.DataFrame(data, index=pd.Index(self.row_index[lo:hi]), copy=False)
+
+    def to_frame(self) -> pd.DataFrame:
+        """完整序列"""
+        return self.slice()
+
+
+class PriceSeriesStore:
+    """进程级价格序列存储，每个 CSV 只解析一次"""
+
+    def __init__(self, store_dir: str = None):
+        """
+        初始化价格序列存储
+
+        Args:
+            store_dir: 列式文件存放目录，默认为 data_cache_dir/price_store
+        """
+        if store_dir is None:
+            from .config import get_config
+            store_dir = os.path.join(get_config()["data_cache_dir"], "price_store")
+
+        self.store_dir = Path(store_dir)
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+
+        self._series: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_loads": 0, "conversions": 0}
+
+    def load(self, csv_path: str) -> PriceSeries:
+        """
+        获取 CSV 对应的价格序列
+
+        源文件的 mtime/size 变化时自动重新转换。
+        """
+        csv_path = os.path.abspath(csv_path)
+        stat = os.stat(csv_path)  # 文件不存在时抛出 FileNotFoundError，与 pd.read_csv 行为一致
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        cached = self._series.get(csv_path)
+        if cached is not None and cached[0] == signature:
+            self.stats["memory_hits"] += 1
+            return cached[1]
+
+        with self._lock:
+            cached = self._series.get(csv_path)
+            if cached is not None and cached[0] == signature:
+                self.stats["memory_hits"] += 1
+                return cached[1]
+
+            series_dir = self._series_dir(csv_path)
+            if not self._is_fresh(series_dir, signature):
+                self._convert(csv_path, series_dir, signature)
+
+            series = self._open(series_dir)
+            self._series[csv_path] = (signature, series)
+            self.stats["disk_loads"] += 1
+            return series
+
+    def read_range(self, csv_path: str, start_date: Optional[str] = None,
+                   end_date: Optional[str] = None) -> pd.DataFrame:
+        """读取日期区间（闭区间）内的数据"""
+        return self.load(csv_path).slice(start_date, end_date)
+
+    def invalidate(self, csv_path: str = None):
+        """清除内存中的序列（不删除磁盘文件）"""
+        with self._lock:
+            if csv_path is None:
+                self._series.clear()
+            else:
+                self._series.pop(os.path.abspath(csv_path), None)
+
+    def _series_dir(self, csv_path: str) -> Path:
+        digest = hashlib.md5(csv_path.encode("utf-8")).hexdigest()[:12]
+        return self.store_dir / f"{Path(csv_path).stem}-{digest}"
+
+    def _is_fresh(self, series_dir: Path, signature: tuple) -> bool:
+        meta_file = series_dir / META_FILE
+        if not meta_file.exists():
+            return False
+        try:
+            with open(meta_file, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            return (meta.get("version") == STORE_FORMAT_VERSION
+                    and tuple(meta.get("source_signature", ())) == signature)
+        except Exception:
+            return False
+
+    def _convert(self, csv_path: str, series_dir: Path, signature: tuple):
+        """CSV -> 每列一个 .npy 文件，写入临时目录后整体替换"""
+        data = pd.read_csv(csv_path)
+        if DATE_COLUMN not in data.columns:
+            raise ValueError(f"价格数据缺少 {DATE_COLUMN} 列: {csv_path}")
+
+        date_index = np.array([date_to_int(d) for d in data[DATE_COLUMN].astype(str)], dtype=np.int64)
+        order = np.argsort(date_index, kind="stable")
+        date_index = date_index[order]
+        row_index = np.asarray(data.index.values, dtype=np.int64)[order]
+
+        tmp_dir = series_dir.with_name(f"{series_dir.name}.tmp-{os.getpid()}-{threading.get_ident()}")
+        if tmp_dir.exists():
+            shutil.rmtree(tmp_dir)
+        tmp_dir.mkdir(parents=True)
+
+        column_files = {}
+        for i, name in enumerate(data.columns):
+            values = data[name].values[order]
+            if values.dtype == object:
+                values = values.astype(str)  # 定长 unicode，可内存映射
+            file_name = f"col_{i}.npy"
+            np.save(tmp_dir / file_name, values, allow_pickle=False)
+            column_files[name] = file_name
+
+        np.save(tmp_dir / DATE_INDEX_FILE, date_index, allow_pickle=False)
+        np.save(tmp_dir / ROW_INDEX_FILE, row_index, allow_pickle=False)
+
+        meta = {
+            "version": STORE_FORMAT_VERSION,
+            "source": csv_path,
+            "source_signature": list(signature),
+            "columns": list(data.columns),
+            "column_files": column_files,
+            "rows": int(len(data)),
+        }
+        with open(tmp_dir / META_FILE, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+
+        if series_dir.exists():
+            shutil.rmtree(series_dir)
+        os.replace(tmp_dir, series_dir)
+
+        self.stats["conversions"] += 1
+        logger.info(f"💾 价格序列已转换为列式存储: {Path(csv_path).name} ({len(data)}行)")
+
+    def _open(self, series_dir: Path) -> PriceSeries:
+        with open(series_dir / META_FILE, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+
+        columns = {
+            name: np.load(series_dir / file_name, mmap_mode="r", allow_pickle=False)
+            for name, file_name in meta["column_files"].items()
+        }
+        return PriceSeries(
+            columns=columns,
+            column_order=meta["columns"],
+            date_index=np.load(series_dir / DATE_INDEX_FILE, mmap_mode="r", allow_pickle=False),
+            row_index=np.load(series_dir / ROW_INDEX_FILE, mmap_mode="r", allow_pickle=False),
+        )
+
+
+# 全局存储实例
+_price_store = None
+
+def get_price_store() -> PriceSeriesStore:
+    """获取全局价格序列存储实例"""
+    global _price_store
+    if _price_store is None:
+        _price_store = PriceSeriesStore()
+    return _price_store
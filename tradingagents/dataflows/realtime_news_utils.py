@@ -10,7 +10,8 @@ from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 import time
 import os
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
 
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger
@@ -30,6 +31,24 @@ class NewsItem:
     relevance_score: float
 
 
+@dataclass
+class SourceTiming:
+    """单个新闻源的获取情况"""
+    source: str
+    status: str  # ok, error, timeout, skipped
+    elapsed: float = 0.0
+    count: int = 0
+    error: Optional[str] = None
+
+
+@dataclass
+class NewsFetchResult:
+    """并发获取新闻的结果"""
+    news: List[NewsItem]
+    source_timings: List[SourceTiming] = field(default_factory=list)
+    total_time: float = 0.0
+
+
 class RealtimeNewsAggregator:
     """实时新闻聚合器"""
     
@@ -42,6 +61,11 @@ class RealtimeNewsAggregator:
         self.finnhub_key = os.getenv('FINNHUB_API_KEY')
         self.alpha_vantage_key = os.getenv('ALPHA_VANTAGE_API_KEY')
         self.newsapi_key = os.getenv('NEWSAPI_KEY')
+
+        # 并发获取时限（秒）：单个新闻源时限与整体时限
+        self.source_timeout = float(os.getenv('NEWS_SOURCE_TIMEOUT', '15'))
+        self.total_timeout = float(os.getenv('NEWS_TOTAL_TIMEOUT', '20'))
+        self.last_fetch_result: Optional[NewsFetchResult] = None
         
     def get_realtime_stock_news(self, ticker: str, hours_back: int = 6, max_news: int = 10) -> List[NewsItem]:
         """
@@ -53,92 +77,117 @@ class RealtimeNewsAggregator:
             hours_back: 回溯小时数
             max_news: 最大新闻数量，默认10条
         """
-        logger.info(f"[新闻聚合器] 开始获取 {ticker} 的实时新闻，回溯时间: {hours_back}小时")
-        start_time = datetime.now()
-        all_news = []
-        
-        # 1. FinnHub实时新闻 (最高优先级)
-        logger.info(f"[新闻聚合器] 尝试从 FinnHub 获取 {ticker} 的新闻")
-        finnhub_start = datetime.now()
-        finnhub_news = self._get_finnhub_realtime_news(ticker, hours_back)
-        finnhub_time = (datetime.now() - finnhub_start).total_seconds()
-        
-        if finnhub_news:
-            logger.info(f"[新闻聚合器] 成功从 FinnHub 获取 {len(finnhub_news)} 条新闻，耗时: {finnhub_time:.2f}秒")
-        else:
-            logger.info(f"[新闻聚合器] FinnHub 未返回新闻，耗时: {finnhub_time:.2f}秒")
-            
-        all_news.extend(finnhub_news)
-        
-        # 2. Alpha Vantage新闻
-        logger.info(f"[新闻聚合器] 尝试从 Alpha Vantage 获取 {ticker} 的新闻")
-        av_start = datetime.now()
-        av_news = self._get_alpha_vantage_news(ticker, hours_back)
-        av_time = (datetime.now() - av_start).total_seconds()
-        
-        if av_news:
-            logger.info(f"[新闻聚合器] 成功从 Alpha Vantage 获取 {len(av_news)} 条新闻，耗时: {av_time:.2f}秒")
-        else:
-            logger.info(f"[新闻聚合器] Alpha Vantage 未返回新闻，耗时: {av_time:.2f}秒")
-            
-        all_news.extend(av_news)
-        
-        # 3. NewsAPI (如果配置了)
-        if self.newsapi_key:
-            logger.info(f"[新闻聚合器] 尝试从 NewsAPI 获取 {ticker} 的新闻")
-            newsapi_start = datetime.now()
-            newsapi_news = self._get_newsapi_news(ticker, hours_back)
-            newsapi_time = (datetime.now() - newsapi_start).total_seconds()
-            
-            if newsapi_news:
-                logger.info(f"[新闻聚合器] 成功从 NewsAPI 获取 {len(newsapi_news)} 条新闻，耗时: {newsapi_time:.2f}秒")
-            else:
-                logger.info(f"[新闻聚合器] NewsAPI 未返回新闻，耗时: {newsapi_time:.2f}秒")
-                
-            all_news.extend(newsapi_news)
-        else:
+        return self.fetch_news(ticker, hours_back, max_news).news
+
+    def fetch_news(self, ticker: str, hours_back: int = 6, max_news: int = 10,
+                   source_timeout: Optional[float] = None,
+                   total_timeout: Optional[float] = None) -> NewsFetchResult:
+        """
+        并发获取各新闻源并合并结果
+
+        各新闻源同时请求，按完成顺序合并；超过单源时限或总时限仍未返回的新闻源被丢弃，
+        不阻塞报告生成。
+
+        Args:
+            ticker: 股票代码
+            hours_back: 回溯小时数
+            max_news: 最大新闻数量
+            source_timeout: 单个新闻源的时限（秒），默认 self.source_timeout
+            total_timeout: 整体时限（秒），默认 self.total_timeout
+
+        Returns:
+            NewsFetchResult: 新闻列表及各新闻源耗时
+        """
+        source_timeout = self.source_timeout if source_timeout is None else source_timeout
+        total_timeout = self.total_timeout if total_timeout is None else total_timeout
+
+        logger.info(f"[新闻聚合器] 开始并发获取 {ticker} 的实时新闻，回溯时间: {hours_back}小时，"
+                    f"单源时限: {source_timeout}秒，总时限: {total_timeout}秒")
+        start = time.monotonic()
+        all_news: List[NewsItem] = []
+        timings: Dict[str, SourceTiming] = {}
+
+        sources = [
+            ("FinnHub", self._get_finnhub_realtime_news),
+            ("Alpha Vantage", self._get_alpha_vantage_news),
+            ("NewsAPI", self._get_newsapi_news),
+            ("中文财经", self._get_chinese_finance_news),
+        ]
+        if not self.newsapi_key:
             logger.info(f"[新闻聚合器] NewsAPI 密钥未配置，跳过此新闻源")
-        
-        # 4. 中文财经新闻源
-        logger.info(f"[新闻聚合器] 尝试获取 {ticker} 的中文财经新闻")
-        chinese_start = datetime.now()
-        chinese_news = self._get_chinese_finance_news(ticker, hours_back)
-        chinese_time = (datetime.now() - chinese_start).total_seconds()
-        
-        if chinese_news:
-            logger.info(f"[新闻聚合器] 成功获取 {len(chinese_news)} 条中文财经新闻，耗时: {chinese_time:.2f}秒")
-        else:
-            logger.info(f"[新闻聚合器] 未获取到中文财经新闻，耗时: {chinese_time:.2f}秒")
-            
-        all_news.extend(chinese_news)
-        
+            timings["NewsAPI"] = SourceTiming("NewsAPI", "skipped")
+            sources = [item for item in sources if item[0] != "NewsAPI"]
+
+        deadline = min(source_timeout, total_timeout)
+        executor = ThreadPoolExecutor(max_workers=len(sources), thread_name_prefix="news-source")
+        pending = {
+            executor.submit(self._timed_fetch, fetcher, ticker, hours_back): name
+            for name, fetcher in sources
+        }
+        try:
+            while pending:
+                remaining = deadline - (time.monotonic() - start)
+                if remaining <= 0:
+                    break
+                done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = pending.pop(future)
+                    items, elapsed, error = future.result()
+                    if error:
+                        timings[name] = SourceTiming(name, "error", elapsed, 0, error)
+                        logger.warning(f"[新闻聚合器] {name} 获取失败，耗时: {elapsed:.2f}秒，错误: {error}")
+                        continue
+                    timings[name] = SourceTiming(name, "ok", elapsed, len(items))
+                    all_news.extend(items)
+                    logger.info(f"[新闻聚合器] {name} 返回 {len(items)} 条新闻，耗时: {elapsed:.2f}秒")
+        finally:
+            # 超时的新闻源在后台自行结束，不再等待
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        for name in pending.values():
+            timings[name] = SourceTiming(name, "timeout", deadline)
+            logger.warning(f"[新闻聚合器] ⏰ {name} 超过 {deadline:.1f}秒 未返回，已丢弃")
+
         # 去重和排序
-        logger.info(f"[新闻聚合器] 开始对 {len(all_news)} 条新闻进行去重和排序")
-        dedup_start = datetime.now()
         unique_news = self._deduplicate_news(all_news)
         sorted_news = sorted(unique_news, key=lambda x: x.publish_time, reverse=True)
-        dedup_time = (datetime.now() - dedup_start).total_seconds()
-        
-        # 记录去重结果
         removed_count = len(all_news) - len(unique_news)
-        logger.info(f"[新闻聚合器] 新闻去重完成，移除了 {removed_count} 条重复新闻，剩余 {len(sorted_news)} 条，耗时: {dedup_time:.2f}秒")
-        
-        # 记录总体情况
-        total_time = (datetime.now() - start_time).total_seconds()
-        logger.info(f"[新闻聚合器] {ticker} 的新闻聚合完成，总共获取 {len(sorted_news)} 条新闻，总耗时: {total_time:.2f}秒")
-        
+        logger.info(f"[新闻聚合器] 新闻去重完成，移除了 {removed_count} 条重复新闻，剩余 {len(sorted_news)} 条")
+
         # 限制新闻数量为最新的max_news条
         if len(sorted_news) > max_news:
             original_count = len(sorted_news)
             sorted_news = sorted_news[:max_news]
             logger.info(f"[新闻聚合器] 📰 新闻数量限制: 从{original_count}条限制为{max_news}条最新新闻")
-        
+
+        result = NewsFetchResult(
+            news=sorted_news,
+            source_timings=[timings[name] for name in
+                            ("FinnHub", "Alpha Vantage", "NewsAPI", "中文财经") if name in timings],
+            total_time=time.monotonic() - start,
+        )
+        self.last_fetch_result = result
+
+        timing_info = ", ".join(f"{t.source}: {t.status} {t.elapsed:.2f}秒" for t in result.source_timings)
+        logger.info(f"[新闻聚合器] {ticker} 的新闻聚合完成，共 {len(sorted_news)} 条，"
+                    f"总耗时: {result.total_time:.2f}秒 ({timing_info})")
+
         # 记录一些新闻标题示例
         if sorted_news:
             sample_titles = [item.title for item in sorted_news[:3]]
             logger.info(f"[新闻聚合器] 新闻标题示例: {', '.join(sample_titles)}")
-        
-        return sorted_news
+
+        return result
+
+    @staticmethod
+    def _timed_fetch(fetcher, ticker: str, hours_back: int):
+        """在工作线程中执行单个新闻源，返回 (新闻列表, 耗时, 错误信息)"""
+        start = time.monotonic()
+        try:
+            items = fetcher(ticker, hours_back) or []
+            return items, time.monotonic() - start, None
+        except Exception as e:
+            return [], time.monotonic() - start, str(e)
     
     def _get_finnhub_realtime_news(self, ticker: str, hours_back: int) -> List[NewsItem]:
         """获取FinnHub实时新闻"""
@@ -159,7 +208,7 @@ class RealtimeNewsAggregator:
                 'token': self.finnhub_key
             }
             
-            response = requests.get(url, params=params, headers=self.headers)
+            response = requests.get(url, params=params, headers=self.headers, timeout=self.source_timeout)
             response.raise_for_status()
             
             news_data = response.json()
@@ -204,7 +253,7 @@ class RealtimeNewsAggregator:
                 'limit': 50
             }
             
-            response = requests.get(url, params=params, headers=self.headers)
+            response = requests.get(url, params=params, headers=self.headers, timeout=self.source_timeout)
             response.raise_for_status()
             
             data = response.json()
@@ -264,7 +313,7 @@ class RealtimeNewsAggregator:
                 'apiKey': self.newsapi_key
             }
             
-            response = requests.get(url, params=params, headers=self.headers)
+            response = requests.get(url, params=params, headers=self.headers, timeout=self.source_timeout)
             response.raise_for_status()
             
             data = response.json()
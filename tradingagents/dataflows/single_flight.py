@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+并发请求合并（single-flight）
+同一时刻多个线程请求相同的数据时（如开盘时批量分析同一只股票），
+只有第一个请求真正访问数据源，其余请求等待并共享它的结果（或异常），
+避免重复的API调用、限流等待和重复写入同一个缓存条目。
+"""
+
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+# 导入日志模块
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('dataflows')
+
+
+def single_flight_key(namespace: str, symbol: str, *args) -> Tuple:
+    """
+    生成请求合并键：命名空间 + 标准化的股票代码 + 其余参数
+
+    Args:
+        namespace: 请求类型，如 "china_stock_data"，统计按命名空间汇总
+        symbol: 股票代码（去除空白并转为大写）
+        *args: 影响结果的其他参数（日期、数据源、是否强制刷新等）
+    """
+    return (namespace, str(symbol).strip().upper()) + tuple(None if arg is None else str(arg) for arg in args)
+
+
+class _InFlightCall:
+    """进行中的请求"""
+
+    __slots__ = ("done", "result", "error", "owner")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.owner = threading.get_ident()
+
+
+class SingleFlight:
+    """按键合并并发的相同请求"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _InFlightCall] = {}
+        self._stats: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"calls": 0, "executions": 0, "coalesced": 0, "errors": 0}
+        )
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        执行请求；相同键的请求正在进行时等待并返回它的结果
+
+        Args:
+            key: 请求键（建议使用 single_flight_key 生成，首个元素作为统计命名空间）
+            fn: 实际获取数据的函数
+
+        Returns:
+            fn 的返回值；首个请求抛出的异常会在所有等待的请求中重新抛出
+        """
+        namespace = key[0] if isinstance(key, tuple) and key else str(key)
+
+        with self._lock:
+            stats = self._stats[namespace]
+            stats["calls"] += 1
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _InFlightCall()
+                leader = True
+            elif call.owner == threading.get_ident():
+                # 同一线程内重入相同的请求时直接执行，避免等待自己
+                call, leader = None, False
+            else:
+                stats["coalesced"] += 1
+                leader = False
+
+        if call is None:
+            return self._execute(namespace, fn)
+
+        if not leader:
+            logger.debug(f"🔗 [请求合并] 等待进行中的相同请求: {key}")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self._execute(namespace, fn)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def _execute(self, namespace: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            self._stats[namespace]["executions"] += 1
+        try:
+            return fn()
+        except BaseException:
+            with self._lock:
+                self._stats[namespace]["errors"] += 1
+            raise
+
+    def in_flight(self) -> int:
+        """当前进行中的请求数"""
+        with self._lock:
+            return len(self._calls)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        请求合并统计
+
+        Returns:
+            Dict: calls（请求数）、executions（实际执行数）、coalesced（合并的请求数）、
+                errors（执行失败数），以及按命名空间的明细 by_namespace
+        """
+        with self._lock:
+            by_namespace = {namespace: dict(stats) for namespace, stats in self._stats.items()}
+        totals = {name: sum(stats[name] for stats in by_namespace.values())
+                  for name in ("calls", "executions", "coalesced", "errors")}
+        totals["by_namespace"] = by_namespace
+        return totals
+
+    def reset_stats(self):
+        """清空统计"""
+        with self._lock:
+            self._stats.clear()
+
+
+# 全局实例
+_single_flight = None
+_single_flight_lock = threading.Lock()
+
+
+def get_single_flight() -> SingleFlight:
+    """获取全局请求合并实例（数据提供器共享）"""
+    global _single_flight
+    if _single_flight is None:
+        with _single_flight_lock:
+            if _single_flight is None:
+                _single_flight = SingleFlight()
+    return _single_flight
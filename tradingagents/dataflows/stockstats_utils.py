@@ -4,18 +4,13 @@ from stockstats import wrap
 from typing import Annotated
 import os
 from .config import get_config
+from .price_store import get_price_store
 
 
 class StockstatsUtils:
     @staticmethod
-    def get_stock_stats(
+    def load_price_data(
         symbol: Annotated[str, "ticker symbol for the company"],
-        indicator: Annotated[
-            str, "quantitative indicators based off of the stock data for the company"
-        ],
-        curr_date: Annotated[
-            str, "curr date for retrieving stock price data, YYYY-mm-dd"
-        ],
         data_dir: Annotated[
             str,
             "directory where the stock data is stored.",
@@ -24,25 +19,18 @@ class StockstatsUtils:
             bool,
             "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
         ] = False,
-    ):
-        df = None
-        data = None
-
+    ) -> pd.DataFrame:
+        """Load the full price history used for indicator calculation, with a YYYY-mm-dd Date column."""
         if not online:
-            try:
-                data = pd.read_csv(
-                    os.path.join(
-                        data_dir,
-                        f"{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-                    )
+            data = get_price_store().read_range(
+                os.path.join(
+                    data_dir,
+                    f"{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
                 )
-                df = wrap(data)
-            except FileNotFoundError:
-                raise Exception("Stockstats fail: Yahoo Finance data not fetched yet!")
+            ).reset_index(drop=True)
         else:
             # Get today's date as YYYY-mm-dd to add to cache
             today_date = pd.Timestamp.today()
-            curr_date = pd.to_datetime(curr_date)
 
             end_date = today_date
             start_date = today_date - pd.DateOffset(years=15)
@@ -60,7 +48,6 @@ class StockstatsUtils:
 
             if os.path.exists(data_file):
                 data = pd.read_csv(data_file)
-                data["Date"] = pd.to_datetime(data["Date"])
             else:
                 data = yf.download(
                     symbol,
@@ -73,9 +60,34 @@ class StockstatsUtils:
                 data = data.reset_index()
                 data.to_csv(data_file, index=False)
 
-            df = wrap(data)
-            df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
-            curr_date = curr_date.strftime("%Y-%m-%d")
+        data["Date"] = data["Date"].astype(str).str[:10]
+        return data
+
+    @staticmethod
+    def get_stock_stats(
+        symbol: Annotated[str, "ticker symbol for the company"],
+        indicator: Annotated[
+            str, "quantitative indicators based off of the stock data for the company"
+        ],
+        curr_date: Annotated[
+            str, "curr date for retrieving stock price data, YYYY-mm-dd"
+        ],
+        data_dir: Annotated[
+            str,
+            "directory where the stock data is stored.",
+        ],
+        online: Annotated[
+            bool,
+            "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
+        ] = False,
+    ):
+        try:
+            data = StockstatsUtils.load_price_data(symbol, data_dir, online=online)
+        except FileNotFoundError:
+            raise Exception("Stockstats fail: Yahoo Finance data not fetched yet!")
+
+        df = wrap(data)
+        curr_date = pd.to_datetime(curr_date).strftime("%Y-%m-%d")
 
         df[indicator]  # trigger stockstats to calculate the indicator
         matching_rows = df[df["Date"].str.startswith(curr_date)]
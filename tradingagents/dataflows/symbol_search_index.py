@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+股票代码搜索索引
+在内存中一次性构建并按计划刷新，替代每次搜索都拉取全量股票列表再线性扫描
+- 代码前缀字典树：输入 "6005" 即可命中 600519 等
+- 名称 n-gram 倒排索引：支持名称任意子串匹配（如 "茅台"）
+- 拼音首字母（可选，需要 pypinyin）：输入 "gzmt" 命中 贵州茅台
+"""
+
+import os
+import time
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+# 导入日志模块
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('agents')
+
+try:
+    from pypinyin import lazy_pinyin, Style
+    PYPINYIN_AVAILABLE = True
+except ImportError:
+    PYPINYIN_AVAILABLE = False
+
+# n-gram 长度；名称子串查询按二元组求交集后再做子串校验
+NGRAM_SIZE = 2
+
+# 匹配优先级：数值越小排序越靠前
+RANK_EXACT = 0
+RANK_CODE_PREFIX = 1
+RANK_NAME_PREFIX = 2
+RANK_SUBSTRING = 3
+RANK_PINYIN = 4
+
+
+def _ngrams(text: str, size: int = NGRAM_SIZE) -> Set[str]:
+    """文本的 n-gram 集合（短于 size 的文本返回自身）"""
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def _index_grams(text: str) -> Set[str]:
+    """建索引用的词元：单字 + n-gram，单字符查询可直接命中倒排表"""
+    return set(text) | _ngrams(text)
+
+
+def _text(value: Any) -> str:
+    """字段值转为小写文本，None/NaN 视为空"""
+    if value is None or value != value:
+        return ''
+    return str(value).strip().lower()
+
+
+def pinyin_initials(name: str) -> str:
+    """中文名称的拼音首字母（小写）；pypinyin 不可用时返回空字符串"""
+    if not PYPINYIN_AVAILABLE or not name:
+        return ''
+    try:
+        return ''.join(p[0] for p in lazy_pinyin(name, style=Style.FIRST_LETTER) if p).lower()
+    except Exception:
+        return ''
+
+
+class _PrefixTrie:
+    """前缀字典树，每个节点记录经过该前缀的记录ID（按插入顺序）"""
+
+    __slots__ = ('_root',)
+
+    def __init__(self):
+        self._root: Dict[str, Any] = {}
+
+    def insert(self, key: str, record_id: int):
+        node = self._root
+        for ch in key:
+            node = node.setdefault(ch, {})
+            ids = node.setdefault('', [])
+            if not ids or ids[-1] != record_id:
+                ids.append(record_id)
+
+    def search(self, prefix: str) -> List[int]:
+        node = self._root
+        for ch in prefix:
+            node = node.get(ch)
+            if node is None:
+                return []
+        return node.get('', [])
+
+
+class _IndexData:
+    """一次构建产生的全部索引结构，整体替换以保证查询看到一致的快照"""
+
+    __slots__ = ('records', 'codes', 'names', 'code_trie', 'pinyin_trie', 'ngram_index', 'exact')
+
+    def __init__(self):
+        self.records: List[Dict[str, Any]] = []
+        self.codes: List[List[str]] = []
+        self.names: List[str] = []
+        self.code_trie = _PrefixTrie()
+        self.pinyin_trie = _PrefixTrie()
+        self.ngram_index: Dict[str, List[int]] = {}
+        self.exact: Dict[str, List[int]] = {}
+
+
+class SymbolSearchIndex:
+    """
+    股票代码搜索索引
+
+    Args:
+        loader: 返回股票记录列表的函数，每条记录为字典
+        code_fields: 作为代码建立前缀索引的字段（如 code、ts_code、symbol）
+        name_field: 名称字段
+        refresh_interval: 刷新间隔（秒），过期后在后台重建，重建期间继续使用旧索引
+    """
+
+    def __init__(self, loader: Callable[[], Iterable[Dict[str, Any]]],
+                 code_fields: Iterable[str] = ('code',), name_field: str = 'name',
+                 refresh_interval: Optional[float] = None):
+        self.loader = loader
+        self.code_fields = tuple(code_fields)
+        self.name_field = name_field
+        if refresh_interval is None:
+            refresh_interval = float(os.getenv('SYMBOL_INDEX_REFRESH_INTERVAL', 24 * 3600))
+        self.refresh_interval = refresh_interval
+
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._built_at = 0.0
+        self._data = _IndexData()
+
+    def __len__(self) -> int:
+        return len(self._data.records)
+
+    @property
+    def built_at(self) -> float:
+        return self._built_at
+
+    def build(self, records: Optional[Iterable[Dict[str, Any]]] = None):
+        """构建索引；未传入记录时调用 loader 获取。新索引构建完成后整体替换旧索引"""
+        start = time.time()
+        if records is None:
+            records = self.loader()
+
+        data = _IndexData()
+        new_records, new_codes, new_names = data.records, data.codes, data.names
+        code_trie, pinyin_trie = data.code_trie, data.pinyin_trie
+        ngram_index, exact = data.ngram_index, data.exact
+
+        for record in records or []:
+            if not isinstance(record, dict) or 'error' in record:
+                continue
+            codes = [_text(record.get(f)) for f in self.code_fields]
+            codes = [c for i, c in enumerate(codes) if c and c not in codes[:i]]
+            name = _text(record.get(self.name_field))
+            if not codes and not name:
+                continue
+
+            record_id = len(new_records)
+            new_records.append(record)
+            new_codes.append(codes)
+            new_names.append(name)
+
+            for key in codes + ([name] if name else []):
+                exact.setdefault(key, []).append(record_id)
+            for code in codes:
+                code_trie.insert(code, record_id)
+            for gram in set().union(_index_grams(name), *(_index_grams(c) for c in codes)):
+                ngram_index.setdefault(gram, []).append(record_id)
+            initials = pinyin_initials(name)
+            if initials:
+                pinyin_trie.insert(initials, record_id)
+
+        if not new_records:
+            # 数据源暂不可用时不标记为已构建，下次搜索重试
+            logger.warning(f"⚠️ [搜索索引] 股票列表为空，索引未更新")
+            return
+
+        with self._lock:
+            self._data = data
+            self._built_at = time.time()
+
+        logger.info(f"🔎 [搜索索引] 构建完成: {len(new_records)}只股票，"
+                    f"耗时{(time.time() - start) * 1000:.0f}ms，拼音首字母: {'启用' if PYPINYIN_AVAILABLE else '未启用'}")
+
+    def _ensure_fresh(self):
+        """首次使用时同步构建；过期后在后台线程重建"""
+        if not self._built_at:
+            with self._lock:
+                need_build = not self._built_at
+            if need_build:
+                self.build()
+            return
+
+        if time.time() - self._built_at < self.refresh_interval:
+            return
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def _refresh():
+            try:
+                self.build()
+            except Exception as e:
+                logger.warning(f"⚠️ [搜索索引] 刷新失败，继续使用旧索引: {e}")
+            finally:
+                self._refreshing = False
+
+        threading.Thread(target=_refresh, name="symbol-index-refresh", daemon=True).start()
+
+    @staticmethod
+    def _substring_candidates(data: '_IndexData', keyword: str) -> List[int]:
+        """通过 n-gram 倒排索引求候选集，再做子串校验"""
+        postings = sorted((data.ngram_index.get(g, []) for g in _ngrams(keyword)), key=len)
+        if not postings or not postings[0]:
+            return []
+        candidates = set(postings[0])
+        for ids in postings[1:]:
+            candidates.intersection_update(ids)
+            if not candidates:
+                return []
+
+        return sorted(
+            rid for rid in candidates
+            if keyword in data.names[rid] or any(keyword in c for c in data.codes[rid])
+        )
+
+    def search(self, keyword: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        搜索股票
+
+        Args:
+            keyword: 代码前缀、名称片段或拼音首字母
+            limit: 最多返回的条数，None 表示不限制
+
+        Returns:
+            List[Dict]: 匹配的股票记录，按 精确匹配 > 代码前缀 > 名称前缀 > 子串 > 拼音首字母 排序
+        """
+        keyword = (keyword or '').strip().lower()
+        if not keyword:
+            return []
+        self._ensure_fresh()
+        # 取当前索引快照，后台刷新替换索引不影响本次查询
+        data = self._data
+
+        ranked: Dict[int, int] = {}
+
+        def _add(ids: Iterable[int], rank: int):
+            for rid in ids:
+                if rid not in ranked:
+                    ranked[rid] = rank
+
+        _add(data.exact.get(keyword, []), RANK_EXACT)
+        _add(data.code_trie.search(keyword), RANK_CODE_PREFIX)
+        substring_ids = self._substring_candidates(data, keyword)
+        _add((rid for rid in substring_ids if data.names[rid].startswith(keyword)), RANK_NAME_PREFIX)
+        _add(substring_ids, RANK_SUBSTRING)
+        if PYPINYIN_AVAILABLE and keyword.isascii() and keyword.isalpha():
+            _add(data.pinyin_trie.search(keyword), RANK_PINYIN)
+
+        ordered = sorted(ranked, key=lambda rid: (ranked[rid], rid))
+        if limit is not None:
+            ordered = ordered[:limit]
+        return [data.records[rid] for rid in ordered]
+
+
+_indexes: Dict[str, SymbolSearchIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_symbol_search_index(source: str, loader: Callable[[], Iterable[Dict[str, Any]]],
+                            code_fields: Iterable[str] = ('code',),
+                            name_field: str = 'name') -> SymbolSearchIndex:
+    """
+    获取指定数据源的搜索索引（进程内单例）
+
+    Args:
+        source: 数据源名称，如 'stock_api'、'tushare'
+        loader: 首次创建索引时使用的股票列表加载函数
+    """
+    index = _indexes.get(source)
+    if index is None:
+        with _indexes_lock:
+            index = _indexes.get(source)
+            if index is None:
+                index = SymbolSearchIndex(loader, code_fields=code_fields, name_field=name_field)
+                _indexes[source] = index
+    return index
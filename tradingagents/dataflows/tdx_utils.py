@@ -657,8 +657,13 @@ def get_china_stock_data(stock_code: str, start_date: str, end_date: str) -> str
                 }, sort=[("created_at", -1)])
 
                 if cached_doc and 'data' in cached_doc:
-                    logger.info(f"🗄️ 从MongoDB缓存加载数据: {stock_code}")
-                    return cached_doc['data']
+                    # 数据库缓存管理器写入的数据可能经过压缩或序列化为 DataFrame
+                    from .db_cache_manager import decode_stock_data
+                    cached_data = decode_stock_data(cached_doc['data'], cached_doc.get('data_format'))
+                    if isinstance(cached_data, str):
+                        logger.info(f"🗄️ 从MongoDB缓存加载数据: {stock_code}")
+                        return cached_data
+                    logger.debug(f"🔍 MongoDB缓存中 {stock_code} 的数据不是格式化文本，跳过")
     except Exception as e:
         logger.error(f"⚠️ 从MongoDB加载缓存失败: {e}")
 
@@ -519,6 +519,13 @@ class TushareProvider:
             logger.info(f"🔍 [股票代码追踪] 默认深圳证券交易所: '{symbol}' -> '{result}'")
             return result
     
+    def _load_stock_records(self) -> List[Dict]:
+        """股票列表转为记录列表，供搜索索引构建使用"""
+        stock_list = self.get_stock_list()
+        if not isinstance(stock_list, pd.DataFrame) or stock_list.empty:
+            return []
+        return stock_list.to_dict('records')
+
     def search_stocks(self, keyword: str) -> pd.DataFrame:
         """
         搜索股票
@@ -530,18 +537,12 @@ class TushareProvider:
             DataFrame: 搜索结果
         """
         try:
-            stock_list = self.get_stock_list()
-            
-            if stock_list.empty:
-                return pd.DataFrame()
-            
-            # 按名称和代码搜索
-            mask = (
-                stock_list['name'].str.contains(keyword, na=False) |
-                stock_list['ts_code'].str.contains(keyword, na=False)
-            )
-            
-            results = stock_list[mask]
+            from .symbol_search_index import get_symbol_search_index
+
+            # 按名称、代码和拼音首字母搜索，股票列表只在构建/刷新索引时读取
+            index = get_symbol_search_index('tushare', self._load_stock_records,
+                                            code_fields=('ts_code', 'symbol'))
+            results = pd.DataFrame(index.search(keyword))
             logger.debug(f"🔍 搜索'{keyword}'找到{len(results)}只股票")
             
             return results
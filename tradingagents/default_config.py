@@ -17,6 +17,24 @@ DEFAULT_CONFIG = {
     "max_debate_rounds": 1,
     "max_risk_discuss_rounds": 1,
     "max_recur_limit": 100,
+    # 辩论历史压缩：超出窗口的早期发言由快速模型摘要，控制多轮辩论的提示词长度
+    "debate_history_compaction": os.getenv("DEBATE_HISTORY_COMPACTION_ENABLED", "false").lower() == "true",
+    "debate_history_window": int(os.getenv("DEBATE_HISTORY_WINDOW", "2")),
+    # 分析师并行执行：各分析师作为独立分支并发运行，汇合后进入辩论阶段
+    "parallel_analysts": os.getenv("PARALLEL_ANALYSTS_ENABLED", "false").lower() == "true",
+    # 交易后反思：并发执行各组件反思及最大并发数
+    "parallel_reflection": os.getenv("PARALLEL_REFLECTION_ENABLED", "false").lower() == "true",
+    "reflection_max_workers": int(os.getenv("REFLECTION_MAX_WORKERS", "5")),
+    # 批量分析：最大并发任务数；共享LLM客户端的每秒请求数上限（0表示不限制）
+    "batch_max_workers": int(os.getenv("BATCH_MAX_WORKERS", "4")),
+    "llm_requests_per_second": float(os.getenv("LLM_REQUESTS_PER_SECOND", "0")),
+    # 完整状态日志：jsonl（逐条追加，默认）、jsonl.gz（逐条压缩追加）、json（旧格式，每次重写整个文件）
+    "state_log_format": os.getenv("STATE_LOG_FORMAT", "jsonl"),
+    # 追加式日志格式下内存中保留的最近状态条数
+    "state_log_memory_limit": int(os.getenv("STATE_LOG_MEMORY_LIMIT", "10")),
+    # 日线区间存储：按日期区间增量补齐日线数据；存储保留天数（超过后整体重新获取，0表示不过期）
+    "bar_store_enabled": os.getenv("BAR_STORE_ENABLED", "true").lower() == "true",
+    "bar_store_max_age_days": float(os.getenv("BAR_STORE_MAX_AGE_DAYS", "7")),
     # Tool settings - 从环境变量读取，提供默认值
     "online_tools": os.getenv("ONLINE_TOOLS_ENABLED", "false").lower() == "true",
     "online_news": os.getenv("ONLINE_NEWS_ENABLED", "true").lower() == "true", 
@@ -0,0 +1,295 @@
+# TradingAgents/graph/batch_propagation.py
+
+"""
+批量分析引擎
+在同一个 TradingAgentsGraph 上并发运行多个 (股票代码, 交易日) 任务：
+- 所有任务共享已编译的图、LLM客户端、记忆和数据缓存，只需初始化一次
+- 并发数有上限，可为共享的LLM客户端设置每秒请求数限制
+- 任务完成即返回结果（按完成顺序流式输出）
+- 结束后汇总吞吐量（分析次数/小时）和各阶段耗时分位数
+"""
+
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+# 导入统一日志系统
+from tradingagents.utils.logging_init import get_logger
+logger = get_logger("default")
+
+try:
+    from langchain_core.rate_limiters import InMemoryRateLimiter
+    RATE_LIMITER_AVAILABLE = True
+except ImportError:
+    RATE_LIMITER_AVAILABLE = False
+
+
+@dataclass
+class BatchJob:
+    """单个分析任务"""
+    index: int
+    ticker: str
+    trade_date: str
+
+
+@dataclass
+class BatchJobResult:
+    """单个分析任务的结果"""
+    job: BatchJob
+    status: str  # success / error
+    final_state: Optional[Dict[str, Any]] = None
+    decision: Any = None
+    error: Optional[str] = None
+    elapsed: float = 0.0
+    stage_timings: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "success"
+
+
+class _NodeTimingHandler(BaseCallbackHandler):
+    """
+    按节点的开始/结束回调记录耗时
+
+    只统计图的直接子运行（即各节点），并行分支中的节点分别从各自开始时计时；
+    同一节点在一次运行中多次执行时累加。
+    """
+
+    def __init__(self):
+        self.timings: Dict[str, float] = defaultdict(float)
+        self._graph_run_id: Optional[UUID] = None
+        self._started: Dict[UUID, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def on_chain_start(self, serialized, inputs, *, run_id: UUID, parent_run_id: Optional[UUID] = None,
+                       metadata: Optional[Dict[str, Any]] = None, **kwargs):
+        now = time.perf_counter()
+        with self._lock:
+            if parent_run_id is None:
+                self._graph_run_id = run_id
+                return
+            node_name = (metadata or {}).get("langgraph_node")
+            if parent_run_id == self._graph_run_id and node_name and not node_name.startswith("__"):
+                self._started[run_id] = (node_name, now)
+
+    def _finish(self, run_id: UUID):
+        now = time.perf_counter()
+        with self._lock:
+            started = self._started.pop(run_id, None)
+            if started is not None:
+                node_name, start = started
+                self.timings[node_name] += now - start
+
+    def on_chain_end(self, outputs, *, run_id: UUID, **kwargs):
+        self._finish(run_id)
+
+    def on_chain_error(self, error, *, run_id: UUID, **kwargs):
+        self._finish(run_id)
+
+
+def _percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """线性插值分位数（输入需已排序）"""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+class BatchPropagator:
+    """
+    多股票、多交易日批量分析
+
+    Args:
+        graph: 已初始化的 TradingAgentsGraph，所有任务共享
+        max_workers: 最大并发任务数，默认 config["batch_max_workers"]
+        requests_per_second: 共享LLM客户端的每秒请求数上限，默认 config["llm_requests_per_second"]，0 表示不限制；
+            限流器只在 run() 期间生效，结束后恢复LLM客户端原有的设置
+        log_states: 是否为每个任务写入完整状态日志
+    """
+
+    def __init__(self, graph, max_workers: Optional[int] = None,
+                 requests_per_second: Optional[float] = None, log_states: bool = True):
+        self.graph = graph
+        config = graph.config
+        self.max_workers = max(1, max_workers or config.get("batch_max_workers", 4))
+        self.log_states = log_states
+
+        if requests_per_second is None:
+            requests_per_second = config.get("llm_requests_per_second", 0)
+        self.requests_per_second = requests_per_second
+        # id(llm) -> (llm, 原有限流器)；同一客户端可能同时作为深度/快速思考模型
+        self._previous_rate_limiters: Dict[int, Tuple[Any, Any]] = {}
+
+        self._state_log_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._reset_stats()
+
+    def _install_rate_limiter(self, requests_per_second: float):
+        """为共享的LLM客户端设置同一个限流器（同一提供商的请求共用配额），并记录原有的限流器"""
+        if not RATE_LIMITER_AVAILABLE:
+            logger.warning("⚠️ [批量分析] 当前 langchain_core 不支持 rate_limiter，跳过LLM限流")
+            return
+
+        limiter = InMemoryRateLimiter(
+            requests_per_second=requests_per_second,
+            check_every_n_seconds=0.05,
+            max_bucket_size=max(1, int(requests_per_second)),
+        )
+        for attr in ("deep_thinking_llm", "quick_thinking_llm", "react_llm"):
+            llm = getattr(self.graph, attr, None)
+            if llm is None or id(llm) in self._previous_rate_limiters:
+                continue
+            previous = getattr(llm, "rate_limiter", None)
+            try:
+                llm.rate_limiter = limiter
+                self._previous_rate_limiters[id(llm)] = (llm, previous)
+            except Exception as e:
+                logger.warning(f"⚠️ [批量分析] 无法为 {attr} 设置限流器: {e}")
+        logger.info(f"🚦 [批量分析] LLM请求限流: {requests_per_second}次/秒")
+
+    def _restore_rate_limiters(self):
+        """恢复LLM客户端在批量分析前的限流器，避免影响之后的单次分析"""
+        for llm, previous in self._previous_rate_limiters.values():
+            try:
+                llm.rate_limiter = previous
+            except Exception as e:
+                logger.warning(f"⚠️ [批量分析] 无法恢复 {type(llm).__name__} 的限流器: {e}")
+        self._previous_rate_limiters = {}
+
+    def _reset_stats(self):
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+        self._job_latencies: List[float] = []
+        self._stage_latencies: Dict[str, List[float]] = defaultdict(list)
+        self._succeeded = 0
+        self._failed = 0
+
+    def _run_job(self, job: BatchJob) -> BatchJobResult:
+        """运行单个任务：通过回调记录各节点从开始到结束的耗时"""
+        graph = self.graph
+        start = time.perf_counter()
+        node_timing = _NodeTimingHandler()
+        stage_timings = node_timing.timings
+
+        try:
+            init_agent_state = graph.propagator.create_initial_state(job.ticker, job.trade_date)
+            args = graph.propagator.get_graph_args()
+            config = dict(args["config"])
+            config["callbacks"] = list(config.get("callbacks") or []) + [node_timing]
+
+            final_state = graph.graph.invoke(init_agent_state, config=config)
+
+            if self.log_states:
+                with self._state_log_lock:
+                    graph._log_state(job.trade_date, final_state, ticker=job.ticker)
+
+            decision = graph.process_signal(final_state["final_trade_decision"], job.ticker)
+            return BatchJobResult(job, "success", final_state=final_state, decision=decision,
+                                  elapsed=time.perf_counter() - start, stage_timings=dict(stage_timings))
+
+        except Exception as e:
+            logger.error(f"❌ [批量分析] {job.ticker} {job.trade_date} 分析失败: {e}")
+            return BatchJobResult(job, "error", error=str(e),
+                                  elapsed=time.perf_counter() - start, stage_timings=dict(stage_timings))
+
+    def _record(self, result: BatchJobResult):
+        with self._stats_lock:
+            self._job_latencies.append(result.elapsed)
+            for stage, seconds in result.stage_timings.items():
+                self._stage_latencies[stage].append(seconds)
+            if result.ok:
+                self._succeeded += 1
+            else:
+                self._failed += 1
+
+    def run(self, jobs: Iterable[Tuple[str, str]]) -> Iterator[BatchJobResult]:
+        """
+        并发运行任务，按完成顺序逐个返回结果
+
+        Args:
+            jobs: (股票代码, 交易日) 列表
+
+        Yields:
+            BatchJobResult: 已完成任务的结果
+        """
+        batch = [BatchJob(index, ticker, str(trade_date)) for index, (ticker, trade_date) in enumerate(jobs)]
+        self._reset_stats()
+        self._started_at = time.perf_counter()
+        logger.info(f"🚀 [批量分析] 开始: {len(batch)}个任务，并发数 {self.max_workers}")
+
+        if self.requests_per_second and self.requests_per_second > 0:
+            self._install_rate_limiter(self.requests_per_second)
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="batch-propagate")
+        try:
+            futures = [executor.submit(self._run_job, job) for job in batch]
+            for completed, future in enumerate(as_completed(futures), 1):
+                result = future.result()
+                self._record(result)
+                logger.info(f"{'✅' if result.ok else '❌'} [批量分析] [{completed}/{len(batch)}] "
+                            f"{result.job.ticker} {result.job.trade_date} 耗时: {result.elapsed:.2f}秒")
+                yield result
+        finally:
+            # 调用方提前停止迭代时取消尚未开始的任务
+            executor.shutdown(wait=True, cancel_futures=True)
+            self._restore_rate_limiters()
+            self._finished_at = time.perf_counter()
+            self.log_report()
+
+    def run_all(self, jobs: Iterable[Tuple[str, str]]) -> List[BatchJobResult]:
+        """并发运行任务，按输入顺序返回全部结果"""
+        return sorted(self.run(jobs), key=lambda result: result.job.index)
+
+    def report(self) -> Dict[str, Any]:
+        """
+        批量运行统计
+
+        Returns:
+            Dict: 任务数、成功/失败数、总耗时、吞吐量（分析次数/小时）、
+                任务与各阶段耗时分位数（秒，p50/p90/p99/max）
+        """
+        with self._stats_lock:
+            end = self._finished_at or time.perf_counter()
+            wall_time = end - self._started_at if self._started_at else 0.0
+            completed = self._succeeded + self._failed
+
+            def _summary(values):
+                ordered = sorted(values)
+                return {
+                    "count": len(ordered),
+                    "p50": _percentile(ordered, 50),
+                    "p90": _percentile(ordered, 90),
+                    "p99": _percentile(ordered, 99),
+                    "max": ordered[-1] if ordered else 0.0,
+                }
+
+            return {
+                "jobs": completed,
+                "succeeded": self._succeeded,
+                "failed": self._failed,
+                "wall_time": wall_time,
+                "throughput_per_hour": self._succeeded / wall_time * 3600 if wall_time > 0 else 0.0,
+                "job_latency": _summary(self._job_latencies),
+                "stage_latency": {stage: _summary(values) for stage, values in self._stage_latencies.items()},
+            }
+
+    def log_report(self):
+        """输出批量运行统计"""
+        report = self.report()
+        job_latency = report["job_latency"]
+        logger.info(f"📊 [批量分析] 完成 {report['jobs']}个任务（成功 {report['succeeded']}，失败 {report['failed']}），"
+                    f"总耗时 {report['wall_time']:.1f}秒，吞吐量 {report['throughput_per_hour']:.1f}次/小时")
+        logger.info(f"📊 [批量分析] 单任务耗时 p50={job_latency['p50']:.2f}秒 p90={job_latency['p90']:.2f}秒 "
+                    f"p99={job_latency['p99']:.2f}秒")
+        for stage, stats in sorted(report["stage_latency"].items(), key=lambda item: -item[1]["p50"]):
+            logger.info(f"   ⏱️ {stage}: p50={stats['p50']:.2f}秒 p90={stats['p90']:.2f}秒 "
+                        f"p99={stats['p99']:.2f}秒 (n={stats['count']})")
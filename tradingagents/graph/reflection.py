@@ -1,6 +1,7 @@
 # TradingAgents/graph/reflection.py
 
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional
 from langchain_openai import ChatOpenAI
 
 # 导入统一日志系统
@@ -8,6 +9,16 @@ from tradingagents.utils.logging_init import get_logger
 logger = get_logger("default")
 
 
+# component -> (reflection label, function extracting the decision/report from state)
+REFLECTION_COMPONENTS = {
+    "bull": ("BULL", lambda state: state["investment_debate_state"]["bull_history"]),
+    "bear": ("BEAR", lambda state: state["investment_debate_state"]["bear_history"]),
+    "trader": ("TRADER", lambda state: state["trader_investment_plan"]),
+    "invest_judge": ("INVEST JUDGE", lambda state: state["investment_debate_state"]["judge_decision"]),
+    "risk_manager": ("RISK JUDGE", lambda state: state["risk_debate_state"]["judge_decision"]),
+}
+
+
 class Reflector:
     """Handles reflection on decisions and updating memory."""
 
@@ -123,3 +134,54 @@ Adhere strictly to these instructions, and ensure your output is detailed, accur
             "RISK JUDGE", judge_decision, situation, returns_losses
         )
         risk_manager_memory.add_situations([(situation, result)])
+
+    def reflect_all(
+        self, current_state, returns_losses, memories: Dict[str, Any], max_workers: int = 5
+    ) -> Dict[str, Optional[str]]:
+        """Reflect on all components concurrently, then write the memories.
+
+        Args:
+            current_state: Final state of the propagated graph.
+            returns_losses: Realized returns used as feedback.
+            memories: component name (see REFLECTION_COMPONENTS) -> FinancialSituationMemory.
+                Components whose memory is None still get reflected but are not stored.
+            max_workers: Maximum number of concurrent LLM calls.
+
+        Returns:
+            component name -> reflection text, or None if that component failed.
+        """
+        situation = self._extract_current_situation(current_state)
+
+        def reflect(component):
+            label, extract = REFLECTION_COMPONENTS[component]
+            try:
+                return self._reflect_on_component(
+                    label, extract(current_state), situation, returns_losses
+                )
+            except Exception as e:
+                logger.error(f"❌ [反思] {label} 反思失败: {e}")
+                return None
+
+        components = [c for c in REFLECTION_COMPONENTS if c in memories]
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(components) or 1)),
+                                thread_name_prefix="reflection") as executor:
+            results = dict(zip(components, executor.map(reflect, components)))
+
+        # 所有组件共享同一市场情况文本，先统一计算一次embedding，各记忆写入时直接命中缓存
+        stored = [c for c in components if results[c] is not None and memories[c] is not None]
+        if stored:
+            try:
+                memories[stored[0]].get_embeddings([situation])
+            except Exception as e:
+                logger.warning(f"⚠️ [反思] 预计算embedding失败: {e}")
+
+        for component in stored:
+            try:
+                memories[component].add_situations([(situation, results[component])])
+            except Exception as e:
+                logger.error(f"❌ [反思] {REFLECTION_COMPONENTS[component][0]} 记忆写入失败: {e}")
+
+        failed = [c for c in components if results[c] is None]
+        logger.info(f"🧠 [反思] 完成 {len(components) - len(failed)}/{len(components)} 个组件"
+                    + (f"，失败: {failed}" if failed else ""))
+        return results
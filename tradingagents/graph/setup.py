@@ -1,5 +1,6 @@
 # TradingAgents/graph/setup.py
 
+import time
 from typing import Dict, Any
 from langchain_openai import ChatOpenAI
 from langgraph.graph import END, StateGraph, START
@@ -8,6 +9,7 @@ from langgraph.prebuilt import ToolNode
 from tradingagents.agents import *
 from tradingagents.agents.utils.agent_states import AgentState
 from tradingagents.agents.utils.agent_utils import Toolkit
+from tradingagents.agents.utils.debate_history import DebateHistoryCompactor
 
 from .conditional_logic import ConditionalLogic
 
@@ -15,6 +17,14 @@ from .conditional_logic import ConditionalLogic
 from tradingagents.utils.logging_init import get_logger
 logger = get_logger("default")
 
+# 各分析师写入的报告字段
+ANALYST_REPORT_FIELDS = {
+    "market": "market_report",
+    "social": "sentiment_report",
+    "news": "news_report",
+    "fundamentals": "fundamentals_report",
+}
+
 
 class GraphSetup:
     """Handles the setup and configuration of the agent graph."""
@@ -49,7 +59,7 @@ class GraphSetup:
         self.react_llm = react_llm
 
     def setup_graph(
-        self, selected_analysts=["market", "social", "news", "fundamentals"]
+        self, selected_analysts=["market", "social", "news", "fundamentals"], parallel_analysts=None
     ):
         """Set up and compile the agent workflow graph.
 
@@ -59,7 +69,11 @@ class GraphSetup:
                 - "social": Social media analyst
                 - "news": News analyst
                 - "fundamentals": Fundamentals analyst
+            parallel_analysts (bool): Run analysts as concurrent branches joined before
+                the debate stage. Defaults to config["parallel_analysts"].
         """
+        if parallel_analysts is None:
+            parallel_analysts = self.config.get("parallel_analysts", False)
         if len(selected_analysts) == 0:
             raise ValueError("Trading Agents Graph Setup Error: no analysts selected!")
 
@@ -136,12 +150,20 @@ class GraphSetup:
             delete_nodes["fundamentals"] = create_msg_delete()
             tool_nodes["fundamentals"] = self.tool_nodes["fundamentals"]
 
+        # 辩论历史压缩（可选）：早期发言由快速模型摘要，各辩论节点共享摘要缓存
+        history_compactor = None
+        if self.config.get("debate_history_compaction", False):
+            history_compactor = DebateHistoryCompactor(
+                self.quick_thinking_llm, window=self.config.get("debate_history_window", 2)
+            )
+            logger.info(f"🗜️ [辩论历史] 已启用压缩，保留最近{history_compactor.window}条发言原文")
+
         # Create researcher and manager nodes
         bull_researcher_node = create_bull_researcher(
-            self.quick_thinking_llm, self.bull_memory
+            self.quick_thinking_llm, self.bull_memory, history_compactor
         )
         bear_researcher_node = create_bear_researcher(
-            self.quick_thinking_llm, self.bear_memory
+            self.quick_thinking_llm, self.bear_memory, history_compactor
         )
         research_manager_node = create_research_manager(
             self.deep_thinking_llm, self.invest_judge_memory
@@ -149,9 +171,9 @@ class GraphSetup:
         trader_node = create_trader(self.quick_thinking_llm, self.trader_memory)
 
         # Create risk analysis nodes
-        risky_analyst = create_risky_debator(self.quick_thinking_llm)
-        neutral_analyst = create_neutral_debator(self.quick_thinking_llm)
-        safe_analyst = create_safe_debator(self.quick_thinking_llm)
+        risky_analyst = create_risky_debator(self.quick_thinking_llm, history_compactor)
+        neutral_analyst = create_neutral_debator(self.quick_thinking_llm, history_compactor)
+        safe_analyst = create_safe_debator(self.quick_thinking_llm, history_compactor)
         risk_manager_node = create_risk_manager(
             self.deep_thinking_llm, self.risk_manager_memory
         )
@@ -160,12 +182,22 @@ class GraphSetup:
         workflow = StateGraph(AgentState)
 
         # Add analyst nodes to the graph
-        for analyst_type, node in analyst_nodes.items():
-            workflow.add_node(f"{analyst_type.capitalize()} Analyst", node)
-            workflow.add_node(
-                f"Msg Clear {analyst_type.capitalize()}", delete_nodes[analyst_type]
-            )
-            workflow.add_node(f"tools_{analyst_type}", tool_nodes[analyst_type])
+        if parallel_analysts:
+            for analyst_type, node in analyst_nodes.items():
+                workflow.add_node(
+                    f"{analyst_type.capitalize()} Analyst",
+                    self._create_analyst_branch(
+                        analyst_type, node, delete_nodes[analyst_type], tool_nodes[analyst_type]
+                    ),
+                )
+            workflow.add_node("Msg Clear Analysts", create_msg_delete())
+        else:
+            for analyst_type, node in analyst_nodes.items():
+                workflow.add_node(f"{analyst_type.capitalize()} Analyst", node)
+                workflow.add_node(
+                    f"Msg Clear {analyst_type.capitalize()}", delete_nodes[analyst_type]
+                )
+                workflow.add_node(f"tools_{analyst_type}", tool_nodes[analyst_type])
 
         # Add other nodes
         workflow.add_node("Bull Researcher", bull_researcher_node)
@@ -178,30 +210,39 @@ class GraphSetup:
         workflow.add_node("Risk Judge", risk_manager_node)
 
         # Define edges
-        # Start with the first analyst
-        first_analyst = selected_analysts[0]
-        workflow.add_edge(START, f"{first_analyst.capitalize()} Analyst")
-
-        # Connect analysts in sequence
-        for i, analyst_type in enumerate(selected_analysts):
-            current_analyst = f"{analyst_type.capitalize()} Analyst"
-            current_tools = f"tools_{analyst_type}"
-            current_clear = f"Msg Clear {analyst_type.capitalize()}"
-
-            # Add conditional edges for current analyst
-            workflow.add_conditional_edges(
-                current_analyst,
-                getattr(self.conditional_logic, f"should_continue_{analyst_type}"),
-                [current_tools, current_clear],
-            )
-            workflow.add_edge(current_tools, current_analyst)
-
-            # Connect to next analyst or to Bull Researcher if this is the last analyst
-            if i < len(selected_analysts) - 1:
-                next_analyst = f"{selected_analysts[i+1].capitalize()} Analyst"
-                workflow.add_edge(current_clear, next_analyst)
-            else:
-                workflow.add_edge(current_clear, "Bull Researcher")
+        if parallel_analysts:
+            # 所有分析师同时从START开始，全部完成后汇合进入辩论阶段
+            logger.info(f"🔀 [并行分析] 分析师并行执行: {selected_analysts}")
+            branch_names = [f"{analyst_type.capitalize()} Analyst" for analyst_type in selected_analysts]
+            for branch in branch_names:
+                workflow.add_edge(START, branch)
+            workflow.add_edge(branch_names, "Msg Clear Analysts")
+            workflow.add_edge("Msg Clear Analysts", "Bull Researcher")
+        else:
+            # Start with the first analyst
+            first_analyst = selected_analysts[0]
+            workflow.add_edge(START, f"{first_analyst.capitalize()} Analyst")
+
+            # Connect analysts in sequence
+            for i, analyst_type in enumerate(selected_analysts):
+                current_analyst = f"{analyst_type.capitalize()} Analyst"
+                current_tools = f"tools_{analyst_type}"
+                current_clear = f"Msg Clear {analyst_type.capitalize()}"
+
+                # Add conditional edges for current analyst
+                workflow.add_conditional_edges(
+                    current_analyst,
+                    getattr(self.conditional_logic, f"should_continue_{analyst_type}"),
+                    [current_tools, current_clear],
+                )
+                workflow.add_edge(current_tools, current_analyst)
+
+                # Connect to next analyst or to Bull Researcher if this is the last analyst
+                if i < len(selected_analysts) - 1:
+                    next_analyst = f"{selected_analysts[i+1].capitalize()} Analyst"
+                    workflow.add_edge(current_clear, next_analyst)
+                else:
+                    workflow.add_edge(current_clear, "Bull Researcher")
 
         # Add remaining edges
         workflow.add_conditional_edges(
@@ -251,3 +292,36 @@ class GraphSetup:
 
         # Compile and return
         return workflow.compile()
+
+    def _create_analyst_branch(self, analyst_type, analyst_node, delete_node, tool_node):
+        """Wrap one analyst's tool loop into a subgraph node with its own message history.
+
+        The branch only writes back its report field, so concurrent branches never touch
+        the shared ``messages`` channel.
+        """
+        name = analyst_type.capitalize()
+        report_field = ANALYST_REPORT_FIELDS[analyst_type]
+
+        subgraph = StateGraph(AgentState)
+        subgraph.add_node(f"{name} Analyst", analyst_node)
+        subgraph.add_node(f"tools_{analyst_type}", tool_node)
+        subgraph.add_node(f"Msg Clear {name}", delete_node)
+        subgraph.add_edge(START, f"{name} Analyst")
+        subgraph.add_conditional_edges(
+            f"{name} Analyst",
+            getattr(self.conditional_logic, f"should_continue_{analyst_type}"),
+            [f"tools_{analyst_type}", f"Msg Clear {name}"],
+        )
+        subgraph.add_edge(f"tools_{analyst_type}", f"{name} Analyst")
+        subgraph.add_edge(f"Msg Clear {name}", END)
+        compiled = subgraph.compile()
+
+        def analyst_branch(state, config):
+            start = time.time()
+            branch_state = dict(state)
+            branch_state["messages"] = list(state["messages"])
+            result = compiled.invoke(branch_state, config)
+            logger.info(f"⏱️ [并行分析] {name} Analyst 完成，耗时: {time.time() - start:.2f}秒")
+            return {report_field: result.get(report_field, "")}
+
+        return analyst_branch
@@ -0,0 +1,183 @@
+# TradingAgents/graph/state_log.py
+
+"""
+完整状态日志
+每次 propagate 结束后记录一条完整状态。旧格式把所有交易日的状态保存在一个字典里，
+每次都重写整个 full_states_log.json，回测数百个交易日时写入量随天数平方增长。
+新格式逐条追加：
+- jsonl: 每行一条 {"date": 交易日, "state": 状态} 记录
+- jsonl.gz: 每条记录单独压缩为一个gzip成员后追加（gzip 支持多成员拼接读取）
+- json: 旧格式，每次重写整个文件
+load_state_log 可从任一格式重建旧的 {交易日: 状态} 结构
+"""
+
+import gzip
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+# 导入统一日志系统
+from tradingagents.utils.logging_init import get_logger
+logger = get_logger("default")
+
+STATE_LOG_FORMATS = {
+    "jsonl": "full_states_log.jsonl",
+    "jsonl.gz": "full_states_log.jsonl.gz",
+    "json": "full_states_log.json",
+}
+
+
+def get_state_log_directory(ticker: str) -> Path:
+    """状态日志目录（与旧版本相同）"""
+    return Path(f"eval_results/{ticker}/TradingAgentsStrategy_logs/")
+
+
+def build_state_log_entry(final_state: Dict[str, Any]) -> Dict[str, Any]:
+    """从图的最终状态中提取需要记录的字段"""
+    return {
+        "company_of_interest": final_state["company_of_interest"],
+        "trade_date": final_state["trade_date"],
+        "market_report": final_state["market_report"],
+        "sentiment_report": final_state["sentiment_report"],
+        "news_report": final_state["news_report"],
+        "fundamentals_report": final_state["fundamentals_report"],
+        "investment_debate_state": {
+            "bull_history": final_state["investment_debate_state"]["bull_history"],
+            "bear_history": final_state["investment_debate_state"]["bear_history"],
+            "history": final_state["investment_debate_state"]["history"],
+            "current_response": final_state["investment_debate_state"][
+                "current_response"
+            ],
+            "judge_decision": final_state["investment_debate_state"][
+                "judge_decision"
+            ],
+        },
+        "trader_investment_decision": final_state["trader_investment_plan"],
+        "risk_debate_state": {
+            "risky_history": final_state["risk_debate_state"]["risky_history"],
+            "safe_history": final_state["risk_debate_state"]["safe_history"],
+            "neutral_history": final_state["risk_debate_state"]["neutral_history"],
+            "history": final_state["risk_debate_state"]["history"],
+            "judge_decision": final_state["risk_debate_state"]["judge_decision"],
+        },
+        "investment_plan": final_state["investment_plan"],
+        "final_trade_decision": final_state["final_trade_decision"],
+    }
+
+
+class StateLogWriter:
+    """
+    追加式状态日志写入器
+
+    Args:
+        directory: 日志目录
+        log_format: jsonl / jsonl.gz（json 旧格式需要完整字典，由调用方自行重写）
+    """
+
+    def __init__(self, directory, log_format: str = "jsonl"):
+        if log_format not in ("jsonl", "jsonl.gz"):
+            raise ValueError(f"不支持的追加式状态日志格式: {log_format}")
+        self.directory = Path(directory)
+        self.log_format = log_format
+        self.path = self.directory / STATE_LOG_FORMATS[log_format]
+
+    def append(self, trade_date, entry: Dict[str, Any]):
+        """追加一条状态记录，只写入本条记录"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        line = json.dumps({"date": str(trade_date), "state": entry}, ensure_ascii=False) + "\n"
+
+        if self.log_format == "jsonl.gz":
+            with open(self.path, "ab") as f:
+                f.write(gzip.compress(line.encode("utf-8")))
+        else:
+            with open(self.path, "ab") as f:
+                # 上次写入被中断时补齐换行，避免与不完整的记录粘连
+                if f.tell() > 0 and not self._ends_with_newline():
+                    f.write(b"\n")
+                f.write(line.encode("utf-8"))
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, "rb") as f:
+            f.seek(-1, 2)
+            return f.read(1) == b"\n"
+
+
+def write_state_log_json(path, states: Dict[str, Any]):
+    """以旧格式写出完整的 {交易日: 状态} 字典"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(states, f, indent=4)
+
+
+def _resolve_state_log_path(path) -> Path:
+    """目录按 jsonl → jsonl.gz → json 的顺序查找日志文件"""
+    path = Path(path)
+    if not path.is_dir():
+        return path
+    for filename in STATE_LOG_FORMATS.values():
+        candidate = path / filename
+        if candidate.exists():
+            return candidate
+    raise FileNotFoundError(f"目录中没有状态日志: {path}")
+
+
+def iter_state_log(path) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    按写入顺序逐条读取状态日志，返回 (交易日, 状态)
+
+    Args:
+        path: 日志文件或日志目录；支持 jsonl、jsonl.gz 与旧版 json
+    """
+    path = _resolve_state_log_path(path)
+
+    if path.suffix == ".json":
+        with open(path, encoding="utf-8") as f:
+            yield from json.load(f).items()
+        return
+
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        try:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # 进程中断时最后一条记录可能只写入了一部分
+                    logger.warning(f"⚠️ [状态日志] 跳过无法解析的记录: {path}:{line_number}")
+                    continue
+                yield record["date"], record["state"]
+        except (EOFError, gzip.BadGzipFile) as e:
+            logger.warning(f"⚠️ [状态日志] 压缩日志末尾不完整，已读取到中断处: {path} ({e})")
+
+
+def load_state_log(path) -> Dict[str, Any]:
+    """重建旧格式的 {交易日: 状态} 字典（同一交易日多次记录时保留最后一条）"""
+    return dict(iter_state_log(path))
+
+
+def export_state_log_json(path, output: Optional[str] = None) -> Path:
+    """
+    把追加式日志转换为旧版 full_states_log.json
+
+    Args:
+        path: 日志文件或日志目录
+        output: 输出文件，默认与日志同目录的 full_states_log.json
+    """
+    source = _resolve_state_log_path(path)
+    output = Path(output) if output else source.parent / STATE_LOG_FORMATS["json"]
+    write_state_log_json(output, load_state_log(source))
+    logger.info(f"📝 [状态日志] 已导出: {source} → {output}")
+    return output
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="把追加式状态日志转换为 full_states_log.json")
+    parser.add_argument("path", help="日志文件或 eval_results/<ticker>/TradingAgentsStrategy_logs 目录")
+    parser.add_argument("-o", "--output", help="输出文件")
+    args = parser.parse_args()
+    print(export_state_log_json(args.path, args.output))
@@ -1,8 +1,10 @@
 # TradingAgents/graph/trading_graph.py
 
 import os
+import time
 from pathlib import Path
 import json
+from collections import OrderedDict
 from datetime import date
 from typing import Dict, Any, Tuple, List, Optional
 
@@ -35,6 +37,14 @@ from .setup import GraphSetup
 from .propagation import Propagator
 from .reflection import Reflector
 from .signal_processing import SignalProcessor
+from .batch_propagation import BatchPropagator
+from .state_log import (
+    STATE_LOG_FORMATS,
+    StateLogWriter,
+    build_state_log_entry,
+    get_state_log_directory,
+    write_state_log_json,
+)
 
 
 class TradingAgentsGraph:
@@ -273,7 +283,7 @@ class TradingAgentsGraph:
         # State tracking
         self.curr_state = None
         self.ticker = None
-        self.log_states_dict = {}  # date to full state dict
+        self.log_states_dict = OrderedDict()  # (ticker, date) to full state dict (recent entries only unless state_log_format is json)
 
         # Set up the graph
         self.graph = self.graph_setup.setup_graph(selected_analysts)
@@ -383,6 +393,8 @@ class TradingAgentsGraph:
         logger.debug(f"🔍 [GRAPH DEBUG] 初始状态中的trade_date: '{init_agent_state.get('trade_date', 'NOT_FOUND')}'")
         args = self.propagator.get_graph_args()
 
+        mode = "并行" if self.config.get("parallel_analysts", False) else "串行"
+        graph_start = time.time()
         if self.debug:
             # Debug mode with tracing
             trace = []
@@ -397,6 +409,7 @@ class TradingAgentsGraph:
         else:
             # Standard mode without tracing
             final_state = self.graph.invoke(init_agent_state, **args)
+        logger.info(f"⏱️ [分析流程] {company_name} 分析完成（分析师{mode}模式），耗时: {time.time() - graph_start:.2f}秒")
 
         # Store current state for reflection
         self.curr_state = final_state
@@ -407,50 +420,65 @@ class TradingAgentsGraph:
         # Return decision and processed signal
         return final_state, self.process_signal(final_state["final_trade_decision"], company_name)
 
-    def _log_state(self, trade_date, final_state):
-        """Log the final state to a JSON file."""
-        self.log_states_dict[str(trade_date)] = {
-            "company_of_interest": final_state["company_of_interest"],
-            "trade_date": final_state["trade_date"],
-            "market_report": final_state["market_report"],
-            "sentiment_report": final_state["sentiment_report"],
-            "news_report": final_state["news_report"],
-            "fundamentals_report": final_state["fundamentals_report"],
-            "investment_debate_state": {
-                "bull_history": final_state["investment_debate_state"]["bull_history"],
-                "bear_history": final_state["investment_debate_state"]["bear_history"],
-                "history": final_state["investment_debate_state"]["history"],
-                "current_response": final_state["investment_debate_state"][
-                    "current_response"
-                ],
-                "judge_decision": final_state["investment_debate_state"][
-                    "judge_decision"
-                ],
-            },
-            "trader_investment_decision": final_state["trader_investment_plan"],
-            "risk_debate_state": {
-                "risky_history": final_state["risk_debate_state"]["risky_history"],
-                "safe_history": final_state["risk_debate_state"]["safe_history"],
-                "neutral_history": final_state["risk_debate_state"]["neutral_history"],
-                "history": final_state["risk_debate_state"]["history"],
-                "judge_decision": final_state["risk_debate_state"]["judge_decision"],
-            },
-            "investment_plan": final_state["investment_plan"],
-            "final_trade_decision": final_state["final_trade_decision"],
-        }
+    def _log_state(self, trade_date, final_state, ticker=None):
+        """Log the final state to the full states log.
+
+        jsonl / jsonl.gz 格式只追加本次记录，内存中仅保留最近 state_log_memory_limit 条；
+        json 为旧格式，保留全部状态并重写该股票的整个文件。
+        内存中的状态按 (股票代码, 交易日) 保存，批量分析时各股票的日志互不覆盖。
+        """
+        entry = build_state_log_entry(final_state)
+        log_format = self.config.get("state_log_format", "jsonl")
+        ticker = ticker or self.ticker
+        directory = get_state_log_directory(ticker)
+
+        key = (ticker, str(trade_date))
+        self.log_states_dict[key] = entry
+
+        if log_format == "json":
+            ticker_states = {date: state for (state_ticker, date), state in self.log_states_dict.items()
+                             if state_ticker == ticker}
+            write_state_log_json(directory / STATE_LOG_FORMATS["json"], ticker_states)
+            return
+
+        StateLogWriter(directory, log_format).append(trade_date, entry)
+        self.log_states_dict.move_to_end(key)
+        memory_limit = max(0, self.config.get("state_log_memory_limit", 10))
+        while len(self.log_states_dict) > memory_limit:
+            self.log_states_dict.popitem(last=False)
+
+    def propagate_batch(self, jobs, max_workers=None, requests_per_second=None):
+        """Run the graph for many (company_name, trade_date) jobs concurrently.
+
+        所有任务共享本实例的图、LLM客户端和缓存，按完成顺序逐个返回 BatchJobResult；
+        迭代结束后输出吞吐量与各阶段耗时分位数。
+        """
+        return BatchPropagator(self, max_workers, requests_per_second).run(jobs)
 
-        # Save to file
-        directory = Path(f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/")
-        directory.mkdir(parents=True, exist_ok=True)
+    def reflect_and_remember(self, returns_losses, concurrent=None):
+        """Reflect on decisions and update memory based on returns.
 
-        with open(
-            f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/full_states_log.json",
-            "w",
-        ) as f:
-            json.dump(self.log_states_dict, f, indent=4)
+        Args:
+            returns_losses: Realized returns used as feedback.
+            concurrent: Run the five reflections concurrently with per-component failure
+                isolation. Defaults to config["parallel_reflection"].
+        """
+        if concurrent is None:
+            concurrent = self.config.get("parallel_reflection", False)
+        if concurrent:
+            return self.reflector.reflect_all(
+                self.curr_state,
+                returns_losses,
+                {
+                    "bull": self.bull_memory,
+                    "bear": self.bear_memory,
+                    "trader": self.trader_memory,
+                    "invest_judge": self.invest_judge_memory,
+                    "risk_manager": self.risk_manager_memory,
+                },
+                max_workers=self.config.get("reflection_max_workers", 5),
+            )
 
-    def reflect_and_remember(self, returns_losses):
-        """Reflect on decisions and update memory based on returns."""
         self.reflector.reflect_bull_researcher(
             self.curr_state, returns_losses, self.bull_memory
         )
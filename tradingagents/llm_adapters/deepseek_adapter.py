@@ -99,6 +99,7 @@ class ChatDeepSeek(ChatOpenAI):
             # 提取token使用量
             input_tokens = 0
             output_tokens = 0
+            cached_tokens = 0
             
             # 尝试从响应中提取token使用量
             if hasattr(result, 'llm_output') and result.llm_output:
@@ -106,6 +107,8 @@ class ChatDeepSeek(ChatOpenAI):
                 if token_usage:
                     input_tokens = token_usage.get('prompt_tokens', 0)
                     output_tokens = token_usage.get('completion_tokens', 0)
+                    # DeepSeek 硬盘缓存命中的输入token数
+                    cached_tokens = token_usage.get('prompt_cache_hit_tokens', 0) or 0
             
             # 如果没有获取到token使用量，进行估算
             if input_tokens == 0 and output_tokens == 0:
@@ -113,7 +116,7 @@ class ChatDeepSeek(ChatOpenAI):
                 output_tokens = self._estimate_output_tokens(result)
                 logger.debug(f"🔍 [DeepSeek] 使用估算token: 输入={input_tokens}, 输出={output_tokens}")
             else:
-                logger.info(f"📊 [DeepSeek] 实际token使用: 输入={input_tokens}, 输出={output_tokens}")
+                logger.info(f"📊 [DeepSeek] 实际token使用: 输入={input_tokens}, 缓存命中={cached_tokens}, 输出={output_tokens}")
             
             # 记录token使用量
             if TOKEN_TRACKING_ENABLED and (input_tokens > 0 or output_tokens > 0):
@@ -145,7 +148,7 @@ class ChatDeepSeek(ChatOpenAI):
                         logger_manager.log_token_usage(
                             logger, "deepseek", self.model_name,
                             input_tokens, output_tokens, usage_record.cost,
-                            session_id
+                            session_id, cached_tokens=cached_tokens
                         )
                     else:
                         logger.warning(f"⚠️ [DeepSeek] 未创建使用记录")
@@ -136,6 +136,7 @@ class OpenAICompatibleBase(ChatOpenAI):
             
             input_tokens = token_usage.get('prompt_tokens', 0)
             output_tokens = token_usage.get('completion_tokens', 0)
+            cached_tokens = self._extract_cached_tokens(token_usage)
             
             if input_tokens > 0 or output_tokens > 0:
                 # 生成会话ID
@@ -165,9 +166,22 @@ class OpenAICompatibleBase(ChatOpenAI):
                 logger_manager.log_token_usage(
                     logger, self.provider_name, self.model_name,
                     input_tokens, output_tokens, cost,
-                    session_id
+                    session_id, cached_tokens=cached_tokens
                 )
 
+    @staticmethod
+    def _extract_cached_tokens(token_usage: Dict) -> int:
+        """
+        提取提示词缓存命中的输入token数
+        - DeepSeek: prompt_cache_hit_tokens
+        - OpenAI / 阿里百炼 / 兼容接口: prompt_tokens_details.cached_tokens
+        """
+        cached_tokens = token_usage.get('prompt_cache_hit_tokens')
+        if cached_tokens is None:
+            details = token_usage.get('prompt_tokens_details') or {}
+            cached_tokens = details.get('cached_tokens') if isinstance(details, dict) else None
+        return int(cached_tokens or 0)
+
 
 class ChatDeepSeekOpenAI(OpenAICompatibleBase):
     """DeepSeek OpenAI兼容适配器"""
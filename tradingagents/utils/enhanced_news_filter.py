@@ -18,7 +18,15 @@ logger = logging.getLogger(__name__)
 class EnhancedNewsFilter(NewsRelevanceFilter):
     """增强新闻过滤器，集成本地模型和多种过滤策略"""
     
-    def __init__(self, stock_code: str, company_name: str, use_semantic: bool = True, use_local_model: bool = False):
+    # 综合评分权重
+    SCORE_WEIGHTS = {
+        'rule': 0.4,      # 规则过滤权重40%
+        'semantic': 0.35,  # 语义相似度权重35%
+        'classification': 0.25  # 分类模型权重25%
+    }
+    
+    def __init__(self, stock_code: str, company_name: str, use_semantic: bool = True, use_local_model: bool = False,
+                 batch_size: int = 32):
         """
         初始化增强过滤器
         
@@ -27,14 +35,17 @@ class EnhancedNewsFilter(NewsRelevanceFilter):
             company_name: 公司名称
             use_semantic: 是否使用语义相似度过滤
             use_local_model: 是否使用本地分类模型
+            batch_size: 语义模型编码与分类模型推理的批大小
         """
         super().__init__(stock_code, company_name)
         self.use_semantic = use_semantic
         self.use_local_model = use_local_model
+        self.batch_size = batch_size
         
         # 语义模型相关
         self.sentence_model = None
         self.company_embedding = None
+        self.company_embedding_normalized = None
         
         # 本地分类模型相关
         self.classification_model = None
@@ -70,6 +81,7 @@ class EnhancedNewsFilter(NewsRelevanceFilter):
                 ]
                 
                 self.company_embedding = self.sentence_model.encode(company_texts)
+                self.company_embedding_normalized = self._normalize_rows(self.company_embedding)
                 logger.info(f"[增强过滤器] ✅ 语义模型加载成功: {model_name}")
                 
             except ImportError:
@@ -106,101 +118,120 @@ class EnhancedNewsFilter(NewsRelevanceFilter):
             logger.error(f"[增强过滤器] 本地分类模型初始化失败: {e}")
             self.use_local_model = False
     
-    def calculate_semantic_similarity(self, title: str, content: str) -> float:
+    @staticmethod
+    def _normalize_rows(matrix) -> np.ndarray:
+        """按行归一化为单位向量（零向量保持为零）"""
+        matrix = np.asarray(matrix, dtype=np.float32)
+        if matrix.ndim == 1:
+            matrix = matrix.reshape(1, -1)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms == 0, 1, norms)
+    
+    @staticmethod
+    def _semantic_texts(titles: List[str], contents: List[str]) -> List[str]:
+        """组合标题和内容的前200字符"""
+        return [f"{title} {content[:200]}" for title, content in zip(titles, contents)]
+    
+    def _classification_texts(self, titles: List[str], contents: List[str]) -> List[str]:
+        """构建分类文本，添加公司信息作为上下文"""
+        return [f"关于{self.company_name}({self.stock_code})的新闻: {title} {content[:300]}"
+                for title, content in zip(titles, contents)]
+    
+    def calculate_semantic_similarities(self, texts: List[str]) -> np.ndarray:
         """
-        计算语义相似度评分
+        批量计算语义相似度评分：一次编码全部文本，与公司embedding矩阵做一次矩阵乘法
         
         Args:
-            title: 新闻标题
-            content: 新闻内容
+            texts: 待评分文本列表
             
         Returns:
-            float: 语义相似度评分 (0-100)
+            np.ndarray: 语义相似度评分 (0-100)
         """
-        if not self.use_semantic or self.sentence_model is None:
-            return 0
+        if not texts or not self.use_semantic or self.sentence_model is None:
+            return np.zeros(len(texts))
         
         try:
-            # 组合标题和内容的前200字符
-            text = f"{title} {content[:200]}"
-            
-            # 计算文本embedding
-            text_embedding = self.sentence_model.encode([text])
-            
-            # 计算与公司相关文本的相似度
-            similarities = []
-            for company_emb in self.company_embedding:
-                similarity = np.dot(text_embedding[0], company_emb) / (
-                    np.linalg.norm(text_embedding[0]) * np.linalg.norm(company_emb)
-                )
-                similarities.append(similarity)
-            
-            # 取最高相似度
-            max_similarity = max(similarities)
-            
-            # 转换为0-100评分
-            semantic_score = max(0, min(100, max_similarity * 100))
+            text_embeddings = self.sentence_model.encode(texts, batch_size=self.batch_size)
+            similarities = self._normalize_rows(text_embeddings) @ self.company_embedding_normalized.T
             
-            logger.debug(f"[增强过滤器] 语义相似度评分: {semantic_score:.1f}")
-            return semantic_score
+            # 取与各公司相关文本的最高相似度，转换为0-100评分
+            return np.clip(similarities.max(axis=1) * 100, 0, 100).astype(float)
             
         except Exception as e:
             logger.error(f"[增强过滤器] 语义相似度计算失败: {e}")
-            return 0
+            return np.zeros(len(texts))
     
-    def classify_news_relevance(self, title: str, content: str) -> float:
+    def calculate_semantic_similarity(self, title: str, content: str) -> float:
         """
-        使用本地模型分类新闻相关性
+        计算语义相似度评分
         
         Args:
             title: 新闻标题
             content: 新闻内容
             
         Returns:
-            float: 分类相关性评分 (0-100)
+            float: 语义相似度评分 (0-100)
+        """
+        semantic_score = float(self.calculate_semantic_similarities(self._semantic_texts([title], [content]))[0])
+        logger.debug(f"[增强过滤器] 语义相似度评分: {semantic_score:.1f}")
+        return semantic_score
+    
+    def classify_news_relevance_batch(self, texts: List[str]) -> np.ndarray:
         """
-        if not self.use_local_model or self.classification_model is None:
-            return 0
+        批量使用本地模型分类新闻相关性，每批文本一次前向推理
+        
+        Args:
+            texts: 分类文本列表
+            
+        Returns:
+            np.ndarray: 分类相关性评分 (0-100)
+        """
+        if not texts or not self.use_local_model or self.classification_model is None:
+            return np.zeros(len(texts))
         
         try:
             import torch
             
-            # 构建分类文本
-            text = f"{title} {content[:300]}"
-            
-            # 添加公司信息作为上下文
-            context_text = f"关于{self.company_name}({self.stock_code})的新闻: {text}"
-            
-            # 分词和编码
-            inputs = self.tokenizer(
-                context_text,
-                return_tensors="pt",
-                truncation=True,
-                padding=True,
-                max_length=512
-            )
-            
-            # 模型推理
-            with torch.no_grad():
-                outputs = self.classification_model(**inputs)
-                logits = outputs.logits
+            scores = []
+            for start in range(0, len(texts), self.batch_size):
+                inputs = self.tokenizer(
+                    texts[start:start + self.batch_size],
+                    return_tensors="pt",
+                    truncation=True,
+                    padding=True,
+                    max_length=512
+                )
                 
-                # 使用softmax获取概率分布
-                probabilities = torch.softmax(logits, dim=-1)
+                with torch.no_grad():
+                    logits = self.classification_model(**inputs).logits
+                    probabilities = torch.softmax(logits, dim=-1)
                 
                 # 假设第一个类别是"相关"，第二个是"不相关"
                 # 这里需要根据具体模型调整
-                relevance_prob = probabilities[0][0].item()  # 相关性概率
-                
-                # 转换为0-100评分
-                classification_score = relevance_prob * 100
-                
-                logger.debug(f"[增强过滤器] 分类模型评分: {classification_score:.1f}")
-                return classification_score
-                
+                scores.append(probabilities[:, 0].cpu().numpy() * 100)
+            
+            return np.concatenate(scores).astype(float)
+            
         except Exception as e:
             logger.error(f"[增强过滤器] 本地模型分类失败: {e}")
-            return 0
+            return np.zeros(len(texts))
+    
+    def classify_news_relevance(self, title: str, content: str) -> float:
+        """
+        使用本地模型分类新闻相关性
+        
+        Args:
+            title: 新闻标题
+            content: 新闻内容
+            
+        Returns:
+            float: 分类相关性评分 (0-100)
+        """
+        classification_score = float(
+            self.classify_news_relevance_batch(self._classification_texts([title], [content]))[0]
+        )
+        logger.debug(f"[增强过滤器] 分类模型评分: {classification_score:.1f}")
+        return classification_score
     
     def calculate_enhanced_relevance_score(self, title: str, content: str) -> Dict[str, float]:
         """
@@ -234,11 +265,7 @@ class EnhancedNewsFilter(NewsRelevanceFilter):
             scores['classification_score'] = 0
         
         # 4. 综合评分（加权平均）
-        weights = {
-            'rule': 0.4,      # 规则过滤权重40%
-            'semantic': 0.35,  # 语义相似度权重35%
-            'classification': 0.25  # 分类模型权重25%
-        }
+        weights = self.SCORE_WEIGHTS
         
         final_score = (
             weights['rule'] * rule_score +
@@ -270,27 +297,32 @@ class EnhancedNewsFilter(NewsRelevanceFilter):
         
         logger.info(f"[增强过滤器] 开始增强过滤，原始数量: {len(news_df)}条，最低评分阈值: {min_score}")
         
-        filtered_news = []
+        # 批量计算各项评分
+        titles, contents = self.get_text_columns(news_df)
+        title_list, content_list = titles.tolist(), contents.tolist()
         
-        for idx, row in news_df.iterrows():
-            title = row.get('新闻标题', row.get('标题', ''))
-            content = row.get('新闻内容', row.get('内容', ''))
-            
-            # 计算增强评分
-            scores = self.calculate_enhanced_relevance_score(title, content)
-            
-            if scores['final_score'] >= min_score:
-                row_dict = row.to_dict()
-                row_dict.update(scores)  # 添加所有评分信息
-                filtered_news.append(row_dict)
-                
-                logger.debug(f"[增强过滤器] 保留新闻 (综合评分: {scores['final_score']:.1f}): {title[:50]}...")
-            else:
-                logger.debug(f"[增强过滤器] 过滤新闻 (综合评分: {scores['final_score']:.1f}): {title[:50]}...")
+        rule_scores = self.calculate_relevance_scores(titles, contents)
+        semantic_scores = (self.calculate_semantic_similarities(self._semantic_texts(title_list, content_list))
+                           if self.use_semantic else np.zeros(len(news_df)))
+        classification_scores = (self.classify_news_relevance_batch(self._classification_texts(title_list, content_list))
+                                 if self.use_local_model else np.zeros(len(news_df)))
+        
+        # 综合评分（加权平均）
+        weights = self.SCORE_WEIGHTS
+        final_scores = (
+            weights['rule'] * rule_scores +
+            weights['semantic'] * semantic_scores +
+            weights['classification'] * classification_scores
+        )
+        keep = final_scores >= min_score
         
         # 创建过滤后的DataFrame
-        if filtered_news:
-            filtered_df = pd.DataFrame(filtered_news)
+        if keep.any():
+            filtered_df = news_df[keep].reset_index(drop=True)
+            filtered_df['rule_score'] = rule_scores[keep]
+            filtered_df['semantic_score'] = semantic_scores[keep]
+            filtered_df['classification_score'] = classification_scores[keep]
+            filtered_df['final_score'] = final_scores[keep]
             # 按综合评分排序
             filtered_df = filtered_df.sort_values('final_score', ascending=False)
             logger.info(f"[增强过滤器] 增强过滤完成，保留 {len(filtered_df)}条 新闻")
@@ -301,7 +333,8 @@ class EnhancedNewsFilter(NewsRelevanceFilter):
         return filtered_df
 
 
-def create_enhanced_news_filter(ticker: str, use_semantic: bool = True, use_local_model: bool = False) -> EnhancedNewsFilter:
+def create_enhanced_news_filter(ticker: str, use_semantic: bool = True, use_local_model: bool = False,
+                                batch_size: int = 32) -> EnhancedNewsFilter:
     """
     创建增强新闻过滤器的便捷函数
     
@@ -309,12 +342,13 @@ def create_enhanced_news_filter(ticker: str, use_semantic: bool = True, use_loca
         ticker: 股票代码
         use_semantic: 是否使用语义相似度过滤
         use_local_model: 是否使用本地分类模型
+        batch_size: 模型推理的批大小
         
     Returns:
         EnhancedNewsFilter: 配置好的增强过滤器实例
     """
     company_name = get_company_name(ticker)
-    return EnhancedNewsFilter(ticker, company_name, use_semantic, use_local_model)
+    return EnhancedNewsFilter(ticker, company_name, use_semantic, use_local_model, batch_size)
 
 
 # 使用示例
@@ -4,10 +4,13 @@
 提供项目级别的日志配置和管理功能
 """
 
+import atexit
 import logging
 import logging.handlers
 import os
+import queue
 import sys
+import threading
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, Optional, Union
@@ -33,11 +36,20 @@ class ColoredFormatter(logging.Formatter):
     }
     
     def format(self, record):
-        # 添加颜色
-        if hasattr(record, 'levelname') and record.levelname in self.COLORS:
-            record.levelname = f"{self.COLORS[record.levelname]}{record.levelname}{self.COLORS['RESET']}"
-        
-        return super().format(record)
+        # 添加颜色（格式化后恢复，避免颜色代码写入共享同一记录的文件处理器）
+        levelname = getattr(record, 'levelname', None)
+        if levelname in self.COLORS:
+            record.levelname = f"{self.COLORS[levelname]}{levelname}{self.COLORS['RESET']}"
+        try:
+            return super().format(record)
+        finally:
+            record.levelname = levelname
+
+
+# LogRecord 的标准属性，其余属性视为通过 extra 传入的结构化字段
+_STANDARD_RECORD_ATTRS = frozenset(
+    logging.LogRecord('', 0, '', 0, '', (), None).__dict__
+) | {'message', 'asctime', 'taskName'}
 
 
 class StructuredFormatter(logging.Formatter):
@@ -54,24 +66,46 @@ class StructuredFormatter(logging.Formatter):
             'line': record.lineno
         }
         
-        # 添加额外字段
-        if hasattr(record, 'session_id'):
-            log_entry['session_id'] = record.session_id
-        if hasattr(record, 'analysis_type'):
-            log_entry['analysis_type'] = record.analysis_type
-        if hasattr(record, 'stock_symbol'):
-            log_entry['stock_symbol'] = record.stock_symbol
-        if hasattr(record, 'cost'):
-            log_entry['cost'] = record.cost
-        if hasattr(record, 'tokens'):
-            log_entry['tokens'] = record.tokens
+        # 添加额外字段：只在结构化处理器实际输出时才序列化（异步模式下在后台线程完成）
+        for key, value in record.__dict__.items():
+            if key not in _STANDARD_RECORD_ATTRS and key not in log_entry:
+                log_entry[key] = value
             
-        return json.dumps(log_entry, ensure_ascii=False)
+        return json.dumps(log_entry, ensure_ascii=False, default=str)
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    有界队列日志处理器
+    队列满时按溢出策略处理：
+    - drop：丢弃 INFO 及以下级别的新日志并计数，WARNING 及以上仍阻塞写入，保证错误不丢失
+    - block：所有日志阻塞等待队列空位
+    """
+
+    def __init__(self, log_queue: queue.Queue, overflow: str = 'drop'):
+        super().__init__(log_queue)
+        self.overflow = overflow
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def enqueue(self, record):
+        if self.overflow == 'block' or record.levelno >= logging.WARNING:
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
 
 
 class TradingAgentsLogger:
     """TradingAgents统一日志管理器"""
     
+    # 当前生效的异步日志监听器（重新初始化日志系统时先停止旧的监听器）
+    _active_listener: Optional[logging.handlers.QueueListener] = None
+    _active_queue_handler: Optional[BoundedQueueHandler] = None
+
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         self.config = config or self._load_default_config()
         self.loggers: Dict[str, logging.Logger] = {}
@@ -125,6 +159,11 @@ class TradingAgentsLogger:
             'docker': {
                 'enabled': os.getenv('DOCKER_CONTAINER', 'false').lower() == 'true',
                 'stdout_only': True  # Docker环境只输出到stdout
+            },
+            'async': {
+                'enabled': False,  # 默认关闭，可通过 TRADINGAGENTS_LOG_ASYNC 启用
+                'queue_size': 10000,
+                'overflow': 'drop'
             }
         }
 
@@ -170,6 +209,7 @@ class TradingAgentsLogger:
                 'enabled': is_docker,
                 'stdout_only': logging_config.get('docker', {}).get('stdout_only', True)
             },
+            'async': logging_config.get('async', {}),
             'performance': logging_config.get('performance', {}),
             'security': logging_config.get('security', {}),
             'business': logging_config.get('business', {})
@@ -187,20 +227,73 @@ class TradingAgentsLogger:
         root_logger.setLevel(getattr(logging, self.config['level']))
         
         # 清除现有处理器
+        self._stop_async_listener()
         root_logger.handlers.clear()
         
-        # 添加处理器
-        self._add_console_handler(root_logger)
+        # 创建处理器
+        handlers = []
+        self._add_console_handler(handlers)
         
         if not self.config['docker']['enabled'] or not self.config['docker']['stdout_only']:
-            self._add_file_handler(root_logger)
+            self._add_file_handler(handlers)
             if self.config['handlers']['structured']['enabled']:
-                self._add_structured_handler(root_logger)
+                self._add_structured_handler(handlers)
+        
+        # 异步模式：调用线程只把日志放入队列，格式化和写文件在后台监听线程完成
+        async_config = self._get_async_config()
+        if async_config['enabled'] and handlers:
+            self._start_async_listener(root_logger, handlers, async_config)
+        else:
+            for handler in handlers:
+                root_logger.addHandler(handler)
         
         # 配置特定日志器
         self._configure_specific_loggers()
+
+    def _get_async_config(self) -> Dict[str, Any]:
+        """异步日志配置，环境变量优先于配置文件"""
+        async_config = self.config.get('async') or {}
+        enabled = os.getenv('TRADINGAGENTS_LOG_ASYNC')
+        return {
+            'enabled': (enabled.lower() == 'true') if enabled else bool(async_config.get('enabled', False)),
+            'queue_size': int(os.getenv('TRADINGAGENTS_LOG_QUEUE_SIZE', async_config.get('queue_size', 10000))),
+            'overflow': os.getenv('TRADINGAGENTS_LOG_OVERFLOW', async_config.get('overflow', 'drop')).lower(),
+        }
+
+    def _start_async_listener(self, root_logger: logging.Logger, handlers: list, async_config: Dict[str, Any]):
+        """在根日志器上挂载队列处理器，并启动后台监听线程分发到实际处理器"""
+        log_queue = queue.Queue(maxsize=async_config['queue_size'])
+        queue_handler = BoundedQueueHandler(log_queue, overflow=async_config['overflow'])
+        listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        listener.start()
+        root_logger.addHandler(queue_handler)
+
+        TradingAgentsLogger._active_listener = listener
+        TradingAgentsLogger._active_queue_handler = queue_handler
+
+    @classmethod
+    def _stop_async_listener(cls):
+        """停止异步监听线程，处理完队列中剩余的日志并关闭处理器"""
+        listener, queue_handler = cls._active_listener, cls._active_queue_handler
+        if listener is None:
+            return
+        cls._active_listener = None
+        cls._active_queue_handler = None
+
+        logging.getLogger().removeHandler(queue_handler)
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+        if queue_handler.dropped:
+            _bootstrap_logger.warning(f"⚠️ 异步日志队列已满，共丢弃 {queue_handler.dropped} 条日志")
+
+    @property
+    def dropped_records(self) -> int:
+        """异步模式下因队列已满被丢弃的日志条数"""
+        queue_handler = TradingAgentsLogger._active_queue_handler
+        return queue_handler.dropped if queue_handler else 0
     
-    def _add_console_handler(self, logger: logging.Logger):
+    def _add_console_handler(self, handlers: list):
         """添加控制台处理器"""
         if not self.config['handlers']['console']['enabled']:
             return
@@ -216,9 +309,9 @@ class TradingAgentsLogger:
             formatter = logging.Formatter(self.config['format']['console'])
         
         console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
+        handlers.append(console_handler)
     
-    def _add_file_handler(self, logger: logging.Logger):
+    def _add_file_handler(self, handlers: list):
         """添加文件处理器"""
         if not self.config['handlers']['file']['enabled']:
             return
@@ -242,9 +335,9 @@ class TradingAgentsLogger:
         
         formatter = logging.Formatter(self.config['format']['file'])
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
     
-    def _add_structured_handler(self, logger: logging.Logger):
+    def _add_structured_handler(self, handlers: list):
         """添加结构化日志处理器"""
         log_dir = Path(self.config['handlers']['structured']['directory'])
         log_file = log_dir / 'tradingagents_structured.log'
@@ -261,7 +354,7 @@ class TradingAgentsLogger:
         
         formatter = StructuredFormatter()
         structured_handler.setFormatter(formatter)
-        logger.addHandler(structured_handler)
+        handlers.append(structured_handler)
     
     def _configure_specific_loggers(self):
         """配置特定的日志器"""
@@ -371,14 +464,18 @@ class TradingAgentsLogger:
         )
     
     def log_token_usage(self, logger: logging.Logger, provider: str, model: str, 
-                       input_tokens: int, output_tokens: int, cost: float, session_id: str):
-        """记录Token使用"""
+                       input_tokens: int, output_tokens: int, cost: float, session_id: str,
+                       cached_tokens: int = 0):
+        """记录Token使用（cached_tokens 为提示词缓存命中的输入token数）"""
+        cache_info = ""
+        if cached_tokens and input_tokens:
+            cache_info = f", 缓存命中={cached_tokens}({cached_tokens / input_tokens:.0%})"
         logger.info(
-            f"📊 Token使用 - {provider}/{model}: 输入={input_tokens}, 输出={output_tokens}, 成本=¥{cost:.6f}",
+            f"📊 Token使用 - {provider}/{model}: 输入={input_tokens}{cache_info}, 输出={output_tokens}, 成本=¥{cost:.6f}",
             extra={
                 'provider': provider,
                 'model': model,
-                'tokens': {'input': input_tokens, 'output': output_tokens},
+                'tokens': {'input': input_tokens, 'output': output_tokens, 'cached': cached_tokens},
                 'cost': cost,
                 'session_id': session_id,
                 'event_type': 'token_usage'
@@ -389,6 +486,9 @@ class TradingAgentsLogger:
 # 全局日志管理器实例
 _logger_manager: Optional[TradingAgentsLogger] = None
 
+# 进程退出时处理完异步队列中剩余的日志
+atexit.register(TradingAgentsLogger._stop_async_listener)
+
 
 def get_logger_manager() -> TradingAgentsLogger:
     """获取全局日志管理器实例"""
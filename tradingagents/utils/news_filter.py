@@ -3,14 +3,88 @@
 用于过滤与特定股票/公司不相关的新闻，提高新闻分析质量
 """
 
+import numpy as np
 import pandas as pd
 import re
-from typing import List, Dict, Tuple
+from functools import lru_cache
+from typing import List, Dict, Tuple, Iterable, FrozenSet
 from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
 
+
+class KeywordMatcher:
+    """
+    多关键词匹配器
+    所有关键词编译为一个正则，一次扫描返回文本中出现的全部关键词（含相互重叠、相互包含的关键词）
+    """
+    
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = tuple(dict.fromkeys(keyword for keyword in keywords if keyword))
+        # 长关键词优先，同一位置总是匹配最长的关键词
+        ordered = sorted(self.keywords, key=len, reverse=True)
+        self._pattern = re.compile('|'.join(map(re.escape, ordered))) if ordered else None
+        # 被匹配到的关键词包含的其他关键词
+        self._implied = {
+            keyword: frozenset(other for other in self.keywords if other in keyword)
+            for keyword in self.keywords
+        }
+        # 从某关键词内部开始、延伸到其后的其他关键词：不重叠扫描时会被该关键词的匹配遮挡，
+        # 只在该关键词被匹配到时单独检查
+        self._hidden = {}
+        for keyword in self.keywords:
+            hidden = tuple(
+                other for other in self.keywords
+                if other != keyword and any(len(other) > len(keyword) - offset and other.startswith(keyword[offset:])
+                                            for offset in range(1, len(keyword)))
+            )
+            if hidden:
+                self._hidden[keyword] = hidden
+    
+    def find(self, text: str) -> FrozenSet[str]:
+        """返回文本中出现的全部关键词"""
+        if not text or self._pattern is None:
+            return frozenset()
+        
+        found = set()
+        for keyword in set(self._pattern.findall(text)):
+            found |= self._implied[keyword]
+            for other in self._hidden.get(keyword, ()):
+                if other not in found and other in text:
+                    found |= self._implied[other]
+        return frozenset(found)
+
+
+class _KeywordRules:
+    """关键词评分规则：一次匹配标题和内容，按关键词所在位置计分"""
+    
+    def __init__(self, strong_keywords: Tuple[str, ...], include_keywords: Tuple[str, ...],
+                 exclude_keywords: Tuple[str, ...]):
+        self.title_points: Dict[str, int] = {}
+        self.content_points: Dict[str, int] = {}
+        for keywords, title_points, content_points in ((strong_keywords, 30, 15),
+                                                        (include_keywords, 15, 8),
+                                                        (exclude_keywords, -40, -20)):
+            for keyword in keywords:
+                self.title_points[keyword] = self.title_points.get(keyword, 0) + title_points
+                self.content_points[keyword] = self.content_points.get(keyword, 0) + content_points
+        self.exclude_keywords = frozenset(exclude_keywords)
+        self.matcher = KeywordMatcher(self.title_points)
+    
+    def score(self, title_hits: FrozenSet[str], content_hits: FrozenSet[str]) -> int:
+        """标题中出现按标题分计，仅内容中出现按内容分计"""
+        return (sum(self.title_points[keyword] for keyword in title_hits) +
+                sum(self.content_points[keyword] for keyword in content_hits - title_hits))
+
+
+@lru_cache(maxsize=32)
+def _compile_keyword_rules(strong_keywords: Tuple[str, ...], include_keywords: Tuple[str, ...],
+                           exclude_keywords: Tuple[str, ...]) -> _KeywordRules:
+    """按关键词集合缓存编译结果，同一股票（及使用相同关键词的过滤器）的多次过滤复用"""
+    return _KeywordRules(strong_keywords, include_keywords, exclude_keywords)
+
+
 class NewsRelevanceFilter:
     """基于规则的新闻相关性过滤器"""
     
@@ -48,6 +122,11 @@ class NewsRelevanceFilter:
             '资产重组', '借壳上市', '退市', '摘帽', 'ST'
         ]
     
+    def _get_keyword_rules(self) -> _KeywordRules:
+        """获取当前关键词列表对应的编译结果（关键词列表被修改后自动重新编译）"""
+        return _compile_keyword_rules(tuple(self.strong_keywords), tuple(self.include_keywords),
+                                      tuple(self.exclude_keywords))
+    
     def calculate_relevance_score(self, title: str, content: str) -> float:
         """
         计算新闻相关性评分
@@ -79,48 +158,27 @@ class NewsRelevanceFilter:
             score += 20  # 内容中出现股票代码，中等分
             logger.debug(f"[过滤器] 内容包含股票代码 '{self.stock_code}': +20分")
             
-        # 3. 强相关关键词检查
-        strong_matches = []
-        for keyword in self.strong_keywords:
-            if keyword in title_lower:
-                score += 30
-                strong_matches.append(keyword)
-            elif keyword in content_lower:
-                score += 15
-                strong_matches.append(keyword)
-        
-        if strong_matches:
-            logger.debug(f"[过滤器] 强相关关键词匹配: {strong_matches}")
-            
-        # 4. 包含关键词检查
-        include_matches = []
-        for keyword in self.include_keywords:
-            if keyword in title_lower:
-                score += 15
-                include_matches.append(keyword)
-            elif keyword in content_lower:
-                score += 8
-                include_matches.append(keyword)
-        
-        if include_matches:
-            logger.debug(f"[过滤器] 相关关键词匹配: {include_matches[:3]}...")  # 只显示前3个
-            
-        # 5. 排除关键词检查（减分）
-        exclude_matches = []
-        for keyword in self.exclude_keywords:
-            if keyword in title_lower:
-                score -= 40  # 标题中出现排除词，大幅减分
-                exclude_matches.append(keyword)
-            elif keyword in content_lower:
-                score -= 20  # 内容中出现排除词，中等减分
-                exclude_matches.append(keyword)
+        # 3-5. 强相关、相关、排除关键词（一次扫描匹配全部关键词）
+        rules = self._get_keyword_rules()
+        title_hits = rules.matcher.find(title_lower)
+        content_hits = rules.matcher.find(content_lower)
+        score += rules.score(title_hits, content_hits)
         
-        if exclude_matches:
-            logger.debug(f"[过滤器] 排除关键词匹配: {exclude_matches[:3]}...")
+        if logger.isEnabledFor(logging.DEBUG):
+            all_hits = title_hits | content_hits
+            strong_matches = [keyword for keyword in self.strong_keywords if keyword in all_hits]
+            include_matches = [keyword for keyword in self.include_keywords if keyword in all_hits]
+            exclude_matches = [keyword for keyword in self.exclude_keywords if keyword in all_hits]
+            if strong_matches:
+                logger.debug(f"[过滤器] 强相关关键词匹配: {strong_matches}")
+            if include_matches:
+                logger.debug(f"[过滤器] 相关关键词匹配: {include_matches[:3]}...")  # 只显示前3个
+            if exclude_matches:
+                logger.debug(f"[过滤器] 排除关键词匹配: {exclude_matches[:3]}...")
             
         # 6. 特殊规则：如果标题完全不包含公司信息但包含排除词，严重减分
         if (self.company_name not in title and self.stock_code not in title and 
-            any(keyword in title_lower for keyword in self.exclude_keywords)):
+            not rules.exclude_keywords.isdisjoint(title_hits)):
             score -= 30
             logger.debug(f"[过滤器] 标题无公司信息但含排除词: -30分")
         
@@ -131,6 +189,54 @@ class NewsRelevanceFilter:
         
         return final_score
     
+    @staticmethod
+    def get_text_columns(news_df: pd.DataFrame) -> Tuple[pd.Series, pd.Series]:
+        """取出标题和内容列（兼容 新闻标题/标题、新闻内容/内容 两种列名），缺失值视为空字符串"""
+        def _column(names):
+            for name in names:
+                if name in news_df.columns:
+                    return news_df[name].fillna('').astype(str)
+            return pd.Series('', index=news_df.index)
+
+        return _column(('新闻标题', '标题')), _column(('新闻内容', '内容'))
+
+    def calculate_relevance_scores(self, titles: pd.Series, contents: pd.Series) -> np.ndarray:
+        """
+        批量计算新闻相关性评分（与 calculate_relevance_score 规则一致，按关键词对整列向量化匹配）
+
+        Args:
+            titles: 新闻标题列
+            contents: 新闻内容列
+
+        Returns:
+            np.ndarray: 相关性评分 (0-100)
+        """
+        rules = self._get_keyword_rules()
+        find = rules.matcher.find
+
+        def _contains(series: pd.Series, keyword: str) -> np.ndarray:
+            return series.str.contains(keyword, regex=False).to_numpy(dtype=bool)
+
+        # 1-2. 公司名称和股票代码（区分大小写，与单条评分一致）
+        company_in_title = _contains(titles, self.company_name)
+        code_in_title = _contains(titles, self.stock_code)
+        score = (np.where(company_in_title, 50, np.where(_contains(contents, self.company_name), 25, 0)) +
+                 np.where(code_in_title, 40, np.where(_contains(contents, self.stock_code), 20, 0)))
+
+        # 3-5. 强相关、相关、排除关键词：每条标题和内容各扫描一次
+        keyword_scores = np.empty(len(titles), dtype=np.int64)
+        exclude_in_title = np.empty(len(titles), dtype=bool)
+        for i, (title, content) in enumerate(zip(titles.str.lower(), contents.str.lower())):
+            title_hits = find(title)
+            keyword_scores[i] = rules.score(title_hits, find(content))
+            exclude_in_title[i] = not rules.exclude_keywords.isdisjoint(title_hits)
+        score = score + keyword_scores
+
+        # 6. 标题不包含公司信息但包含排除词
+        score = score - np.where(~company_in_title & ~code_in_title & exclude_in_title, 30, 0)
+
+        return np.clip(score, 0, 100).astype(float)
+
     def filter_news(self, news_df: pd.DataFrame, min_score: float = 30) -> pd.DataFrame:
         """
         过滤新闻DataFrame
@@ -148,27 +254,15 @@ class NewsRelevanceFilter:
         
         logger.info(f"[过滤器] 开始过滤新闻，原始数量: {len(news_df)}条，最低评分阈值: {min_score}")
         
-        filtered_news = []
-        
-        for idx, row in news_df.iterrows():
-            title = row.get('新闻标题', row.get('标题', ''))
-            content = row.get('新闻内容', row.get('内容', ''))
-            
-            # 计算相关性评分
-            score = self.calculate_relevance_score(title, content)
-            
-            if score >= min_score:
-                row_dict = row.to_dict()
-                row_dict['relevance_score'] = score
-                filtered_news.append(row_dict)
-                
-                logger.debug(f"[过滤器] 保留新闻 (评分: {score:.1f}): {title[:50]}...")
-            else:
-                logger.debug(f"[过滤器] 过滤新闻 (评分: {score:.1f}): {title[:50]}...")
-        
+        # 批量计算相关性评分
+        titles, contents = self.get_text_columns(news_df)
+        scores = self.calculate_relevance_scores(titles, contents)
+        keep = scores >= min_score
+
         # 创建过滤后的DataFrame
-        if filtered_news:
-            filtered_df = pd.DataFrame(filtered_news)
+        if keep.any():
+            filtered_df = news_df[keep].reset_index(drop=True)
+            filtered_df['relevance_score'] = scores[keep]
             # 按相关性评分排序
             filtered_df = filtered_df.sort_values('relevance_score', ascending=False)
             logger.info(f"[过滤器] 过滤完成，保留 {len(filtered_df)}条 新闻")
@@ -17,6 +17,29 @@ except ImportError:
 logger = get_logger('web')
 
 
+def _resolve_a_share_symbol(keyword: str) -> str:
+    """按名称/拼音首字母查找A股代码；唯一或精确匹配时返回代码，否则显示候选并原样返回"""
+    try:
+        from tradingagents.api.stock_api import search_stocks
+
+        matches = [m for m in search_stocks(keyword) if 'error' not in m]
+    except Exception as e:
+        logger.debug(f"🔍 [FORM DEBUG] 股票搜索不可用: {e}")
+        return keyword
+
+    if not matches:
+        return keyword
+
+    best = matches[0]
+    if best.get('code') and (len(matches) == 1 or str(best.get('name', '')).lower() == keyword.lower()):
+        st.caption(f"🔎 已匹配: {best.get('name', '')} ({best['code']})")
+        return str(best['code'])
+
+    candidates = ", ".join(f"{m.get('name', '')}({m.get('code', '')})" for m in matches[:5])
+    st.caption(f"🔎 匹配到多只股票，请输入代码: {candidates}")
+    return keyword
+
+
 def render_analysis_form():
     """渲染股票分析表单"""
 
@@ -93,6 +116,10 @@ def render_analysis_form():
                 ).strip()
 
                 logger.debug(f"🔍 [FORM DEBUG] A股text_input返回值: '{stock_symbol}'")
+
+                # 输入的是名称或拼音首字母时，通过搜索索引解析为股票代码
+                if stock_symbol and not stock_symbol.isdigit():
+                    stock_symbol = _resolve_a_share_symbol(stock_symbol)
             
             # 分析日期
             analysis_date = st.date_input(
@@ -15,9 +15,11 @@ from pathlib import Path
 import hashlib
 import logging
 
-# MongoDB相关导入
+from web.utils.analysis_history_index import get_analysis_history_index
+
+# MongoDB相关导入（使用进程内共享的报告管理器，避免每次渲染新建连接；未连接时查询前按退避间隔重连）
 try:
-    from web.utils.mongodb_report_manager import MongoDBReportManager
+    from web.utils.mongodb_report_manager import mongodb_report_manager
     MONGODB_AVAILABLE = True
     print("✅ MongoDB模块导入成功")
 except ImportError as e:
@@ -122,213 +124,112 @@ def get_analysis_tags(analysis_id):
     tags = load_tags()
     return tags.get(analysis_id, [])
 
-def load_analysis_results(start_date=None, end_date=None, stock_symbol=None, analyst_type=None,
-                         limit=100, search_text=None, tags_filter=None, favorites_only=False):
-    """加载分析结果 - 优先从MongoDB加载"""
-    all_results = []
-    favorites = load_favorites() if favorites_only else []
+def _history_id_filter(favorites_only=False, tags_filter=None, tags_data=None):
+    """将收藏、标签过滤（保存在本地JSON中）转换为分析ID集合，None 表示不限制"""
+    analysis_ids = None
+    if favorites_only:
+        analysis_ids = set(load_favorites())
+    if tags_filter:
+        tagged_ids = {analysis_id for analysis_id, tags in (tags_data or {}).items()
+                      if any(tag in tags for tag in tags_filter)}
+        analysis_ids = tagged_ids if analysis_ids is None else analysis_ids & tagged_ids
+    return analysis_ids
+
+def query_analysis_history(start_date=None, end_date=None, stock_symbol=None, analyst_type=None,
+                           search_text=None, tags_filter=None, favorites_only=False,
+                           page_size=50, cursor=None):
+    """
+    分页查询分析历史 - 优先从MongoDB查询，不可用时使用文件系统摘要索引
+
+    过滤在数据源中执行，列表项不包含报告正文（展开详情时由 load_result_details 加载）
+
+    Returns:
+        Dict: items、next_cursor（传入 cursor 获取下一页，None 表示没有更多数据）
+    """
     tags_data = load_tags()
-    mongodb_loaded = False
-
-    # 优先从MongoDB加载数据
-    if MONGODB_AVAILABLE:
-        try:
-            print("🔍 [数据加载] 从MongoDB加载分析结果")
-            mongodb_manager = MongoDBReportManager()
-            mongodb_results = mongodb_manager.get_all_reports()
-            print(f"🔍 [数据加载] MongoDB返回 {len(mongodb_results)} 个结果")
-
-            for mongo_result in mongodb_results:
-                # 转换MongoDB结果格式
-                result = {
-                    'analysis_id': mongo_result.get('analysis_id', ''),
-                    'timestamp': mongo_result.get('timestamp', 0),
-                    'stock_symbol': mongo_result.get('stock_symbol', ''),
-                    'analysts': mongo_result.get('analysts', []),
-                    'research_depth': mongo_result.get('research_depth', 1),
-                    'status': mongo_result.get('status', 'completed'),
-                    'summary': mongo_result.get('summary', ''),
-                    'performance': mongo_result.get('performance', {}),
-                    'tags': tags_data.get(mongo_result.get('analysis_id', ''), []),
-                    'is_favorite': mongo_result.get('analysis_id', '') in favorites,
-                    'reports': mongo_result.get('reports', {}),
-                    'source': 'mongodb'  # 标记数据来源
-                }
-                all_results.append(result)
+    favorites = set(load_favorites())
+    analysis_ids = _history_id_filter(favorites_only, tags_filter, tags_data)
+    if analysis_ids is not None and not analysis_ids:
+        return {'items': [], 'next_cursor': None}
 
-            mongodb_loaded = True
-            print(f"✅ 从MongoDB加载了 {len(mongodb_results)} 个分析结果")
+    filters = dict(start_date=start_date, end_date=end_date, stock_symbol=stock_symbol,
+                   analyst_type=analyst_type, search_text=search_text, analysis_ids=analysis_ids,
+                   page_size=page_size, cursor=cursor)
 
-        except Exception as e:
-            print(f"❌ MongoDB加载失败: {e}")
-            logger.error(f"MongoDB加载失败: {e}")
-            mongodb_loaded = False
+    if MONGODB_AVAILABLE and mongodb_report_manager.ensure_connected():
+        page = mongodb_report_manager.query_history(**filters)
     else:
-        print("⚠️ MongoDB不可用，将使用文件系统数据")
-
-    # 只有在MongoDB加载失败或不可用时才从文件系统加载
-    if not mongodb_loaded:
-        print("🔄 [备用数据源] 从文件系统加载分析结果")
-
-        # 首先尝试从Web界面的保存位置读取
-        web_results_dir = get_analysis_results_dir()
-        for result_file in web_results_dir.glob("*.json"):
-            if result_file.name in ['favorites.json', 'tags.json']:
-                continue
-
-            try:
-                with open(result_file, 'r', encoding='utf-8') as f:
-                    result = json.load(f)
+        page = get_analysis_history_index().query(**filters)
 
-                    # 添加标签信息
-                    result['tags'] = tags_data.get(result.get('analysis_id', ''), [])
-                    result['is_favorite'] = result.get('analysis_id', '') in favorites
-                    result['source'] = 'file_system'  # 标记数据来源
+    for result in page['items']:
+        result['tags'] = tags_data.get(result.get('analysis_id', ''), [])
+        result['is_favorite'] = result.get('analysis_id', '') in favorites
+    return page
 
-                    all_results.append(result)
-            except Exception as e:
-                st.warning(f"读取分析结果文件 {result_file.name} 失败: {e}")
-
-        # 然后从实际的分析结果保存位置读取
-        project_results_dir = Path(__file__).parent.parent.parent / "data" / "analysis_results" / "detailed"
-
-        if project_results_dir.exists():
-            # 遍历股票代码目录
-            for stock_dir in project_results_dir.iterdir():
-                if not stock_dir.is_dir():
-                    continue
-
-                stock_code = stock_dir.name
-
-                # 遍历日期目录
-                for date_dir in stock_dir.iterdir():
-                    if not date_dir.is_dir():
-                        continue
+def load_analysis_results(start_date=None, end_date=None, stock_symbol=None, analyst_type=None,
+                         limit=100, search_text=None, tags_filter=None, favorites_only=False):
+    """加载分析结果列表（不含报告正文），按时间倒序，最多 limit 条"""
+    page = query_analysis_history(start_date, end_date, stock_symbol, analyst_type, search_text,
+                                  tags_filter, favorites_only, page_size=limit)
+    logger.debug(f"📋 加载了 {len(page['items'])} 个分析结果")
+    return page['items']
+
+# 分析历史页面每次加载的条数，更多结果通过游标继续加载
+HISTORY_PAGE_SIZE = 200
+_HISTORY_STATE_KEY = 'analysis_history_pages'
+
+def load_history_pages(filters, page_size=HISTORY_PAGE_SIZE):
+    """
+    返回页面中已加载的分析历史（保存在 session_state 中），过滤条件变化时从第一页重新加载
+
+    Args:
+        filters: query_analysis_history 的过滤参数
+
+    Returns:
+        Dict: items（已加载的全部条目）、next_cursor（None 表示没有更多数据）
+    """
+    signature = json.dumps(filters, sort_keys=True, default=str)
+    pages = st.session_state.get(_HISTORY_STATE_KEY)
+    if not pages or pages['signature'] != signature:
+        page = query_analysis_history(**filters, page_size=page_size)
+        pages = {'signature': signature, 'items': page['items'], 'next_cursor': page['next_cursor']}
+        st.session_state[_HISTORY_STATE_KEY] = pages
+    else:
+        # 已加载的条目可能在之后被收藏或打标签，每次渲染时同步
+        tags_data = load_tags()
+        favorites = set(load_favorites())
+        for result in pages['items']:
+            result['tags'] = tags_data.get(result.get('analysis_id', ''), [])
+            result['is_favorite'] = result.get('analysis_id', '') in favorites
+    return pages
+
+def load_more_history(filters, page_size=HISTORY_PAGE_SIZE):
+    """按游标加载下一页并追加到已加载的分析历史"""
+    pages = st.session_state.get(_HISTORY_STATE_KEY)
+    if not pages or not pages['next_cursor']:
+        return
+    page = query_analysis_history(**filters, page_size=page_size, cursor=pages['next_cursor'])
+    pages['items'].extend(page['items'])
+    pages['next_cursor'] = page['next_cursor']
 
-                    date_str = date_dir.name
-                    reports_dir = date_dir / "reports"
+def reset_history_pages():
+    """清空已加载的分析历史，下次渲染时重新查询"""
+    st.session_state.pop(_HISTORY_STATE_KEY, None)
 
-                    if not reports_dir.exists():
-                        continue
+def load_result_details(result):
+    """按需加载分析结果的报告正文（reports / full_data），结果会写回 result"""
+    if result.get('reports') or result.get('full_data'):
+        return result
 
-                    # 读取所有报告文件
-                    reports = {}
-                    summary_content = ""
-
-                    for report_file in reports_dir.glob("*.md"):
-                        try:
-                            with open(report_file, 'r', encoding='utf-8') as f:
-                                content = f.read()
-                                report_name = report_file.stem
-                                reports[report_name] = content
-
-                                # 如果是最终决策报告，提取摘要
-                                if report_name == "final_trade_decision":
-                                    # 提取前200个字符作为摘要
-                                    summary_content = content[:200].replace('#', '').replace('*', '').strip()
-                                    if len(content) > 200:
-                                        summary_content += "..."
-
-                        except Exception as e:
-                            continue
-
-                    if reports:
-                        # 解析日期
-                        try:
-                            analysis_date = datetime.strptime(date_str, '%Y-%m-%d')
-                            timestamp = analysis_date.timestamp()
-                        except:
-                            timestamp = datetime.now().timestamp()
-
-                        # 创建分析结果条目
-                        analysis_id = f"{stock_code}_{date_str}_{int(timestamp)}"
-
-                        # 尝试从元数据文件中读取真实的研究深度和分析师信息
-                        research_depth = 1
-                        analysts = ['market', 'fundamentals', 'trader']  # 默认值
-
-                        metadata_file = date_dir / "analysis_metadata.json"
-                        if metadata_file.exists():
-                            try:
-                                with open(metadata_file, 'r', encoding='utf-8') as f:
-                                    metadata = json.load(f)
-                                    research_depth = metadata.get('research_depth', 1)
-                                    analysts = metadata.get('analysts', analysts)
-                            except Exception as e:
-                                # 如果读取元数据失败，使用推断逻辑
-                                if len(reports) >= 5:
-                                    research_depth = 3
-                                elif len(reports) >= 3:
-                                    research_depth = 2
-                        else:
-                            # 如果没有元数据文件，使用推断逻辑
-                            if len(reports) >= 5:
-                                research_depth = 3
-                            elif len(reports) >= 3:
-                                research_depth = 2
-
-                        result = {
-                            'analysis_id': analysis_id,
-                            'timestamp': timestamp,
-                            'stock_symbol': stock_code,
-                            'analysts': analysts,
-                            'research_depth': research_depth,
-                            'status': 'completed',
-                            'summary': summary_content,
-                            'performance': {},
-                            'tags': tags_data.get(analysis_id, []),
-                            'is_favorite': analysis_id in favorites,
-                            'reports': reports,  # 保存所有报告内容
-                            'source': 'file_system'  # 标记数据来源
-                        }
-
-                        all_results.append(result)
-
-        print(f"🔄 [备用数据源] 从文件系统加载了 {len(all_results)} 个分析结果")
-    
-    # 过滤结果
-    filtered_results = []
-    for result in all_results:
-        # 收藏过滤
-        if favorites_only and not result.get('is_favorite', False):
-            continue
-            
-        # 时间过滤
-        if start_date or end_date:
-            result_time = safe_timestamp_to_datetime(result.get('timestamp', 0))
-            if start_date and result_time.date() < start_date:
-                continue
-            if end_date and result_time.date() > end_date:
-                continue
-        
-        # 股票代码过滤
-        if stock_symbol and stock_symbol.upper() not in result.get('stock_symbol', '').upper():
-            continue
-        
-        # 分析师类型过滤
-        if analyst_type and analyst_type not in result.get('analysts', []):
-            continue
-            
-        # 文本搜索过滤
-        if search_text:
-            search_text = search_text.lower()
-            searchable_text = f"{result.get('stock_symbol', '')} {result.get('summary', '')} {' '.join(result.get('analysts', []))}".lower()
-            if search_text not in searchable_text:
-                continue
-                
-        # 标签过滤
-        if tags_filter:
-            result_tags = result.get('tags', [])
-            if not any(tag in result_tags for tag in tags_filter):
-                continue
-        
-        filtered_results.append(result)
-    
-    # 按时间倒序排列 - 使用安全的时间戳转换函数确保类型一致
-    filtered_results.sort(key=lambda x: safe_timestamp_to_datetime(x.get('timestamp', 0)), reverse=True)
-    
-    # 限制数量
-    return filtered_results[:limit]
+    try:
+        if result.get('source') == 'mongodb':
+            if MONGODB_AVAILABLE and mongodb_report_manager.ensure_connected():
+                result['reports'] = mongodb_report_manager.get_report_contents(result.get('analysis_id', ''))
+        elif result.get('report_path'):
+            result.update(get_analysis_history_index().load_details(result['report_path']))
+    except Exception as e:
+        logger.error(f"加载分析报告内容失败: {e}")
+    return result
 
 def render_analysis_results():
     """渲染分析结果管理界面"""
@@ -400,27 +301,30 @@ def render_analysis_results():
         else:
             selected_tags = []
     
-    # 加载分析结果
-    results = load_analysis_results(
+    # 加载分析结果（分页保存在 session_state 中，"加载更多" 按游标获取下一页）
+    filters = dict(
         start_date=start_date,
         end_date=end_date,
         stock_symbol=stock_filter if stock_filter else None,
         analyst_type=analyst_filter,
-        limit=200,
         search_text=search_text if search_text else None,
         tags_filter=selected_tags if selected_tags else None,
         favorites_only=favorites_only
     )
+    pages = load_history_pages(filters)
+    results = pages['items']
+    has_more = pages['next_cursor'] is not None
     
     if not results:
         st.warning("📭 未找到符合条件的分析结果")
+        st.button("🔄 刷新", on_click=reset_history_pages)
         return
     
     # 显示统计概览
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("📊 总分析数", len(results))
+        st.metric("📊 总分析数", f"{len(results)}+" if has_more else len(results))
     
     with col2:
         unique_stocks = len(set(result.get('stock_symbol', 'unknown') for result in results))
@@ -435,6 +339,16 @@ def render_analysis_results():
         favorites_count = sum(1 for result in results if result.get('is_favorite', False))
         st.metric("⭐ 收藏数", favorites_count)
     
+    # 已加载条数、加载更多与刷新
+    col1, col2, col3 = st.columns([3, 1, 1])
+    with col1:
+        st.caption(f"已加载 {len(results)} 条分析结果" + ("，还有更多结果" if has_more else ""))
+    with col2:
+        if has_more:
+            st.button("⬇️ 加载更多", on_click=load_more_history, args=(filters,))
+    with col3:
+        st.button("🔄 刷新", on_click=reset_history_pages)
+    
     # 保留需要的功能按钮，移除不需要的功能
     tab1, tab2, tab3 = st.tabs([
         "📋 结果列表", "📈 统计图表", "📊 详细分析"
@@ -955,6 +869,8 @@ def render_results_export(results: List[Dict[str, Any]]):
             
             else:  # 完整数据
                 if export_format == "JSON":
+                    for result in results:
+                        load_result_details(result)
                     json_data = json.dumps(results, ensure_ascii=False, indent=2)
                     
                     st.download_button(
@@ -1240,6 +1156,7 @@ def render_detailed_analysis(results: List[Dict[str, Any]]):
 def render_detailed_analysis_content(selected_result):
     """渲染详细分析结果内容"""
     st.subheader("📊 完整分析数据")
+    load_result_details(selected_result)
 
     # 检查是否有报告数据（支持文件系统和MongoDB）
     if 'reports' in selected_result and selected_result['reports']:
@@ -1620,7 +1537,7 @@ def save_analysis_result(analysis_id: str, stock_symbol: str, analysts: List[str
         if MONGODB_AVAILABLE:
             try:
                 print(f"💾 [MongoDB保存] 开始保存分析结果: {analysis_id}")
-                mongodb_manager = MongoDBReportManager()
+                mongodb_manager = mongodb_report_manager
 
                 # 使用标准的save_analysis_report方法，确保数据结构一致
                 analysis_results = {
@@ -1696,6 +1613,7 @@ def show_expanded_detail(result):
     with st.container():
         st.markdown("---")
         st.markdown("### 📊 详细分析报告")
+        load_result_details(result)
 
         # 检查是否有报告数据
         if 'reports' not in result or not result['reports']:
@@ -7,7 +7,8 @@
 import streamlit as st
 import time
 from typing import Optional, Dict, Any
-from web.utils.async_progress_tracker import get_progress_by_id, format_time
+from web.utils.async_progress_tracker import get_progress_by_id, format_time, wait_for_progress_update
+from web.utils.progress_channel import get_progress_broadcaster
 
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger
@@ -31,6 +32,7 @@ class AsyncProgressDisplay:
         
         # 初始化状态
         self.last_update = 0
+        self.last_version = 0
         self.is_completed = False
         
         logger.info(f"📊 [异步显示] 初始化: {analysis_id}, 刷新间隔: {refresh_interval}s")
@@ -44,6 +46,7 @@ class AsyncProgressDisplay:
             return not self.is_completed
         
         # 获取进度数据
+        self.last_version = get_progress_broadcaster().version(self.analysis_id)
         progress_data = get_progress_by_id(self.analysis_id)
         
         if not progress_data:
@@ -159,6 +162,21 @@ class AsyncProgressDisplay:
             logger.error(f"📊 [异步显示] 渲染失败: {e}")
             self.status_text.error(f"❌ 显示更新失败: {str(e)}")
 
+# 两次自动刷新之间的最短间隔（秒），避免进度密集更新时频繁重绘页面
+MIN_PUSH_REFRESH_INTERVAL = 0.5
+
+
+def _wait_for_progress_push(analysis_id: str, timeout: float = 3.0):
+    """等待进度推送：收到新进度立即返回，否则最多等待 timeout 秒后兜底刷新"""
+    version_key = f"progress_push_version_{analysis_id}"
+    start = time.time()
+    version, _ = wait_for_progress_update(analysis_id, st.session_state.get(version_key, 0), timeout)
+    st.session_state[version_key] = version
+
+    elapsed = time.time() - start
+    if elapsed < MIN_PUSH_REFRESH_INTERVAL:
+        time.sleep(MIN_PUSH_REFRESH_INTERVAL - elapsed)
+
 def create_async_progress_display(container, analysis_id: str, refresh_interval: float = 1.0) -> AsyncProgressDisplay:
     """创建异步进度显示组件"""
     return AsyncProgressDisplay(container, analysis_id, refresh_interval)
@@ -184,8 +202,8 @@ def auto_refresh_progress(display: AsyncProgressDisplay, max_duration: float = 1
             # 分析完成或失败，停止刷新
             break
         
-        # 等待刷新间隔
-        time.sleep(display.refresh_interval)
+        # 等待新进度推送，最多等待一个刷新间隔
+        wait_for_progress_update(display.analysis_id, display.last_version, display.refresh_interval)
     
     logger.info(f"📊 [异步显示] 自动刷新结束: {display.analysis_id}")
 
@@ -293,8 +311,7 @@ def streamlit_auto_refresh_progress(analysis_id: str, refresh_interval: int = 2)
             default_value = st.session_state.get(auto_refresh_key, True)  # 默认为True
             auto_refresh = st.checkbox("🔄 自动刷新", value=default_value, key=auto_refresh_key)
             if auto_refresh and status == 'running':  # 只在运行时自动刷新
-                import time
-                time.sleep(3)  # 等待3秒
+                _wait_for_progress_push(analysis_id)  # 有新进度立即刷新，最多等待3秒
                 st.rerun()
             elif auto_refresh and status in ['completed', 'failed']:
                 # 分析完成后自动关闭自动刷新
@@ -429,8 +446,7 @@ def display_static_progress(analysis_id: str) -> bool:
                 default_value = st.session_state.get(auto_refresh_key, True)  # 默认为True
                 auto_refresh = st.checkbox("🔄 自动刷新", value=default_value, key=auto_refresh_key)
                 if auto_refresh and status == 'running':  # 只在运行时自动刷新
-                    import time
-                    time.sleep(3)  # 等待3秒
+                    _wait_for_progress_push(analysis_id)  # 有新进度立即刷新，最多等待3秒
                     st.rerun()
                 elif auto_refresh and status in ['completed', 'failed']:
                     # 分析完成后自动关闭自动刷新
@@ -489,8 +505,7 @@ def display_static_progress_with_controls(analysis_id: str, show_refresh_control
                 default_value = st.session_state.get(auto_refresh_key, True)  # 默认为True
                 auto_refresh = st.checkbox("🔄 自动刷新", value=default_value, key=auto_refresh_key)
                 if auto_refresh and status == 'running':  # 只在运行时自动刷新
-                    import time
-                    time.sleep(3)  # 等待3秒
+                    _wait_for_progress_push(analysis_id)  # 有新进度立即刷新，最多等待3秒
                     st.rerun()
                 elif auto_refresh and status in ['completed', 'failed']:
                     # 分析完成后自动关闭自动刷新
@@ -598,8 +613,7 @@ def display_static_progress_with_controls(analysis_id: str, show_refresh_control
             default_value = st.session_state.get(auto_refresh_key, True)  # 默认为True
             auto_refresh = st.checkbox("🔄 自动刷新", value=default_value, key=auto_refresh_key)
             if auto_refresh and status == 'running':  # 只在运行时自动刷新
-                import time
-                time.sleep(3)  # 等待3秒
+                _wait_for_progress_push(analysis_id)  # 有新进度立即刷新，最多等待3秒
                 st.rerun()
             elif auto_refresh and status in ['completed', 'failed']:
                 # 分析完成后自动关闭自动刷新
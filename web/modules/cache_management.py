@@ -120,6 +120,33 @@ def main():
                 value=f"{stats['fundamentals_count']}个",
                 help="缓存的基本面数据文件数量"
             )
+
+            # 进程内L1缓存
+            memory_stats = stats.get('memory_cache')
+            if memory_stats:
+                st.markdown("**🧠 进程内L1缓存**" + ("" if memory_stats['enabled'] else "（已禁用）"))
+                l1_col1, l1_col2, l1_col3 = st.columns(3)
+
+                with l1_col1:
+                    st.metric(
+                        label="命中率",
+                        value=f"{memory_stats['hit_rate']:.1%}",
+                        help=f"命中 {memory_stats['hits']} 次，未命中 {memory_stats['misses']} 次"
+                    )
+
+                with l1_col2:
+                    st.metric(
+                        label="内存占用",
+                        value=f"{memory_stats['size_mb']} / {memory_stats['max_size_mb']} MB",
+                        help=f"当前缓存 {memory_stats['entries']} 个条目"
+                    )
+
+                with l1_col3:
+                    st.metric(
+                        label="淘汰次数",
+                        value=memory_stats['evictions'],
+                        help=f"超出容量淘汰的条目数；过期删除 {memory_stats['expirations']} 个"
+                    )
             
         except Exception as e:
             st.error(f"获取缓存统计失败: {e}")
@@ -256,18 +283,15 @@ def main():
     
     # 显示缓存文件列表
     try:
-        metadata_files = list(cache.metadata_dir.glob("*_meta.json"))
+        # 通过元数据索引列出缓存条目，无需逐个读取元数据文件
+        metadata_entries = cache.metadata_index.list_entries(data_type)
         
-        if metadata_files:
-            import json
+        if metadata_entries:
             from datetime import datetime
             
             cache_items = []
-            for metadata_file in metadata_files:
+            for _, metadata in metadata_entries:
                 try:
-                    with open(metadata_file, 'r', encoding='utf-8') as f:
-                        metadata = json.load(f)
-                    
                     if metadata.get('data_type') == data_type:
                         cached_at = datetime.fromisoformat(metadata['cached_at'])
                         cache_items.append({
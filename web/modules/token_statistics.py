@@ -367,21 +367,8 @@ def render_detailed_records_table(records: List[UsageRecord]):
 def load_detailed_records(days: int) -> List[UsageRecord]:
     """加载详细记录"""
     try:
-        all_records = config_manager.load_usage_records()
-        
-        # 过滤时间范围
-        cutoff_date = datetime.now() - timedelta(days=days)
-        filtered_records = []
-        
-        for record in all_records:
-            try:
-                record_date = datetime.fromisoformat(record.timestamp)
-                if record_date >= cutoff_date:
-                    filtered_records.append(record)
-            except:
-                continue
-        
-        return filtered_records
+        # 账本按天索引，直接返回时间范围内的记录
+        return config_manager.load_usage_records(days)
     except Exception as e:
         st.error(f"加载记录失败: {e}")
         return []
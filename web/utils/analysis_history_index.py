@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+分析历史摘要索引（MongoDB不可用时的文件系统数据源）
+- 为 data/analysis_results/detailed/<股票>/<日期>/reports 和 Web 保存的结果JSON维护摘要索引
+- 刷新时只对文件做 stat，只有新增或变化的条目才重新读取（最终决策报告摘要与元数据）
+- 列表查询只返回摘要字段，报告正文在展开详情时按 report_path 读取
+"""
+
+import os
+import json
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+# 导入日志模块
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('web')
+
+INDEX_VERSION = 1
+
+_PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+
+def _timestamp_date(timestamp_value: Any) -> date:
+    if isinstance(timestamp_value, datetime):
+        return timestamp_value.date()
+    try:
+        return datetime.fromtimestamp(float(timestamp_value)).date()
+    except (TypeError, ValueError, OSError):
+        return datetime.now().date()
+
+
+def _sort_timestamp(timestamp_value: Any) -> float:
+    if isinstance(timestamp_value, datetime):
+        return timestamp_value.timestamp()
+    try:
+        return float(timestamp_value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def matches_history_filters(entry: Dict[str, Any], start_date: Optional[date] = None,
+                            end_date: Optional[date] = None, stock_symbol: Optional[str] = None,
+                            analyst_type: Optional[str] = None, search_text: Optional[str] = None,
+                            analysis_ids: Optional[Iterable[str]] = None) -> bool:
+    """按与 MongoDB 查询相同的规则过滤摘要条目"""
+    if analysis_ids is not None and entry.get('analysis_id', '') not in analysis_ids:
+        return False
+    if start_date or end_date:
+        entry_date = _timestamp_date(entry.get('timestamp', 0))
+        if start_date and entry_date < start_date:
+            return False
+        if end_date and entry_date > end_date:
+            return False
+    if stock_symbol and stock_symbol.strip().upper() not in entry.get('stock_symbol', '').upper():
+        return False
+    if analyst_type and analyst_type not in entry.get('analysts', []):
+        return False
+    if search_text:
+        searchable_text = f"{entry.get('stock_symbol', '')} {entry.get('summary', '')} {' '.join(entry.get('analysts', []))}"
+        if search_text.strip().lower() not in searchable_text.lower():
+            return False
+    return True
+
+
+class AnalysisHistoryIndex:
+    """
+    文件系统分析历史的摘要索引
+
+    Args:
+        detailed_dir: 详细报告目录（<股票>/<日期>/reports/*.md）
+        web_results_dir: Web界面保存的结果JSON目录
+        index_file: 索引文件路径
+    """
+
+    # 与分析结果JSON放在同一目录、但不是分析结果的文件
+    _NON_RESULT_FILES = {'favorites.json', 'tags.json'}
+
+    def __init__(self, detailed_dir: Path, web_results_dir: Optional[Path] = None,
+                 index_file: Optional[Path] = None):
+        self.detailed_dir = Path(detailed_dir)
+        self.web_results_dir = Path(web_results_dir) if web_results_dir else None
+        self.index_file = Path(index_file) if index_file else self.detailed_dir.parent / "history_index.json"
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = self._load_index()
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        if not self.index_file.exists():
+            return {}
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == INDEX_VERSION:
+                return data.get('entries', {})
+        except Exception as e:
+            logger.warning(f"⚠️ 分析历史索引读取失败，将重新建立: {e}")
+        return {}
+
+    def _save_index(self):
+        self.index_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = self.index_file.with_suffix('.tmp')
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump({'version': INDEX_VERSION, 'entries': self._entries}, f, ensure_ascii=False)
+        os.replace(temp_file, self.index_file)
+
+    def _scan(self) -> Dict[str, str]:
+        """列出当前所有条目及其签名（只做 stat，不读取文件内容）"""
+        signatures = {}
+
+        if self.detailed_dir.exists():
+            for stock_dir in self.detailed_dir.iterdir():
+                if not stock_dir.is_dir():
+                    continue
+                for date_dir in stock_dir.iterdir():
+                    reports_dir = date_dir / "reports"
+                    if not reports_dir.is_dir():
+                        continue
+                    stats = [report_file.stat() for report_file in reports_dir.glob("*.md")]
+                    if not stats:
+                        continue
+                    metadata_file = date_dir / "analysis_metadata.json"
+                    metadata_mtime = metadata_file.stat().st_mtime_ns if metadata_file.exists() else 0
+                    signature = (f"{len(stats)}:{max(s.st_mtime_ns for s in stats)}:"
+                                 f"{sum(s.st_size for s in stats)}:{metadata_mtime}")
+                    signatures[f"detailed/{stock_dir.name}/{date_dir.name}"] = signature
+
+        if self.web_results_dir and self.web_results_dir.exists():
+            for result_file in self.web_results_dir.glob("*.json"):
+                if result_file.name in self._NON_RESULT_FILES:
+                    continue
+                stat = result_file.stat()
+                signatures[f"web/{result_file.name}"] = f"{stat.st_mtime_ns}:{stat.st_size}"
+
+        return signatures
+
+    def _resolve(self, report_path: str) -> Path:
+        kind, _, relative = report_path.partition('/')
+        base = self.detailed_dir if kind == 'detailed' else self.web_results_dir
+        return base / relative
+
+    def _build_detailed_entry(self, report_path: str) -> Optional[Dict[str, Any]]:
+        """读取最终决策报告开头和元数据，生成摘要条目"""
+        date_dir = self._resolve(report_path)
+        stock_code, date_str = date_dir.parent.name, date_dir.name
+        report_names = sorted(report_file.stem for report_file in (date_dir / "reports").glob("*.md"))
+        if not report_names:
+            return None
+
+        summary_content = ""
+        if "final_trade_decision" in report_names:
+            with open(date_dir / "reports" / "final_trade_decision.md", 'r', encoding='utf-8') as f:
+                content = f.read(201)
+            # 提取前200个字符作为摘要
+            summary_content = content[:200].replace('#', '').replace('*', '').strip()
+            if len(content) > 200:
+                summary_content += "..."
+
+        try:
+            timestamp = datetime.strptime(date_str, '%Y-%m-%d').timestamp()
+        except ValueError:
+            timestamp = datetime.now().timestamp()
+
+        # 没有元数据时按报告数量推断研究深度
+        research_depth = 3 if len(report_names) >= 5 else 2 if len(report_names) >= 3 else 1
+        analysts = ['market', 'fundamentals', 'trader']  # 默认值
+        metadata_file = date_dir / "analysis_metadata.json"
+        if metadata_file.exists():
+            try:
+                with open(metadata_file, 'r', encoding='utf-8') as f:
+                    metadata = json.load(f)
+                research_depth = metadata.get('research_depth', 1)
+                analysts = metadata.get('analysts', analysts)
+            except Exception:
+                pass
+
+        return {
+            'analysis_id': f"{stock_code}_{date_str}_{int(timestamp)}",
+            'timestamp': timestamp,
+            'stock_symbol': stock_code,
+            'analysts': analysts,
+            'research_depth': research_depth,
+            'status': 'completed',
+            'summary': summary_content,
+            'performance': {},
+            'report_count': len(report_names),
+        }
+
+    def _build_web_entry(self, report_path: str) -> Optional[Dict[str, Any]]:
+        """Web界面保存的结果JSON：只保留列表字段"""
+        with open(self._resolve(report_path), 'r', encoding='utf-8') as f:
+            result = json.load(f)
+        return {
+            'analysis_id': result.get('analysis_id', ''),
+            'timestamp': result.get('timestamp', 0),
+            'stock_symbol': result.get('stock_symbol', ''),
+            'analysts': result.get('analysts', []),
+            'research_depth': result.get('research_depth', 1),
+            'status': result.get('status', 'completed'),
+            'summary': result.get('summary', ''),
+            'performance': result.get('performance', {}),
+            'report_count': len(result.get('reports') or {}),
+        }
+
+    def refresh(self) -> Dict[str, int]:
+        """
+        同步索引与文件系统，只重新读取新增或变化的条目
+
+        Returns:
+            Dict: total、updated、removed
+        """
+        with self._lock:
+            signatures = self._scan()
+            removed = [path for path in self._entries if path not in signatures]
+            for path in removed:
+                del self._entries[path]
+
+            updated = 0
+            for path, signature in signatures.items():
+                cached = self._entries.get(path)
+                if cached and cached.get('signature') == signature:
+                    continue
+                try:
+                    build = self._build_detailed_entry if path.startswith('detailed/') else self._build_web_entry
+                    entry = build(path)
+                except Exception as e:
+                    logger.warning(f"⚠️ 读取分析结果失败 {path}: {e}")
+                    entry = None
+                if entry is None:
+                    self._entries.pop(path, None)
+                    continue
+                entry['signature'] = signature
+                self._entries[path] = entry
+                updated += 1
+
+            if updated or removed:
+                try:
+                    self._save_index()
+                except Exception as e:
+                    logger.warning(f"⚠️ 分析历史索引保存失败: {e}")
+                logger.debug(f"📇 分析历史索引更新: {updated} 个条目更新，{len(removed)} 个条目删除")
+
+            return {'total': len(self._entries), 'updated': updated, 'removed': len(removed)}
+
+    def query(self, start_date: Optional[date] = None, end_date: Optional[date] = None,
+              stock_symbol: Optional[str] = None, analyst_type: Optional[str] = None,
+              search_text: Optional[str] = None, analysis_ids: Optional[Iterable[str]] = None,
+              page_size: int = 50, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """
+        分页查询（参数与 MongoDBReportManager.query_history 一致）
+
+        Returns:
+            Dict: items（摘要条目，report_path 用于按需加载正文）、next_cursor
+        """
+        self.refresh()
+        if analysis_ids is not None:
+            analysis_ids = set(analysis_ids)
+
+        with self._lock:
+            items = []
+            for path, entry in self._entries.items():
+                if matches_history_filters(entry, start_date, end_date, stock_symbol,
+                                           analyst_type, search_text, analysis_ids):
+                    item = {key: value for key, value in entry.items() if key != 'signature'}
+                    item['report_path'] = path
+                    item['source'] = 'file_system'
+                    items.append(item)
+
+        items.sort(key=lambda item: (_sort_timestamp(item.get('timestamp', 0)), item['analysis_id']), reverse=True)
+        offset = int(cursor) if cursor else 0
+        page = items[offset:offset + page_size]
+        next_cursor = str(offset + page_size) if offset + page_size < len(items) else None
+        return {'items': page, 'next_cursor': next_cursor}
+
+    def load_details(self, report_path: str) -> Dict[str, Any]:
+        """
+        读取条目的完整内容
+
+        Returns:
+            Dict: 详细报告目录返回 reports；结果JSON返回其中的 reports / full_data
+        """
+        path = self._resolve(report_path)
+        if report_path.startswith('detailed/'):
+            reports = {}
+            for report_file in sorted((path / "reports").glob("*.md")):
+                with open(report_file, 'r', encoding='utf-8') as f:
+                    reports[report_file.stem] = f.read()
+            return {'reports': reports}
+
+        with open(path, 'r', encoding='utf-8') as f:
+            result = json.load(f)
+        return {key: result[key] for key in ('reports', 'full_data') if result.get(key)}
+
+
+# 全局索引实例
+_history_index = None
+_history_index_lock = threading.Lock()
+
+
+def get_analysis_history_index() -> AnalysisHistoryIndex:
+    """获取全局分析历史索引（项目 data/analysis_results/detailed 与 web/data/analysis_results）"""
+    global _history_index
+    if _history_index is None:
+        with _history_index_lock:
+            if _history_index is None:
+                _history_index = AnalysisHistoryIndex(
+                    detailed_dir=_PROJECT_ROOT / "data" / "analysis_results" / "detailed",
+                    web_results_dir=_PROJECT_ROOT / "web" / "data" / "analysis_results",
+                )
+    return _history_index
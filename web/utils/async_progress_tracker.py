@@ -1,13 +1,13 @@
 #!/usr/bin/env python3
 """
 异步进度跟踪器
-支持Redis和文件两种存储方式，前端定时轮询获取进度
+支持Redis和文件两种存储方式，进度更新通过进度通道推送给前端
 """
 
 import json
 import time
 import os
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime
 import threading
 from pathlib import Path
@@ -16,6 +16,8 @@ from pathlib import Path
 from tradingagents.utils.logging_manager import get_logger
 logger = get_logger('async_progress')
 
+from .progress_channel import get_redis_client, get_progress_broadcaster, redis_enabled
+
 def safe_serialize(obj):
     """安全序列化对象，处理不可序列化的类型"""
     # 特殊处理LangChain消息对象
@@ -143,49 +145,16 @@ class AsyncProgressTracker:
             print(f"❌ [进度集成] 跟踪器注册异常: {e}")
     
     def _init_redis(self) -> bool:
-        """初始化Redis连接"""
-        try:
-            # 首先检查REDIS_ENABLED环境变量
-            redis_enabled_raw = os.getenv('REDIS_ENABLED', 'false')
-            redis_enabled = redis_enabled_raw.lower()
-            logger.info(f"🔍 [Redis检查] REDIS_ENABLED原值='{redis_enabled_raw}' -> 处理后='{redis_enabled}'")
-
-            if redis_enabled != 'true':
-                logger.info(f"📊 [异步进度] Redis已禁用，使用文件存储")
-                return False
-
-            import redis
-
-            # 从环境变量获取Redis配置
-            redis_host = os.getenv('REDIS_HOST', 'localhost')
-            redis_port = int(os.getenv('REDIS_PORT', 6379))
-            redis_password = os.getenv('REDIS_PASSWORD', None)
-            redis_db = int(os.getenv('REDIS_DB', 0))
-
-            # 创建Redis连接
-            if redis_password:
-                self.redis_client = redis.Redis(
-                    host=redis_host,
-                    port=redis_port,
-                    password=redis_password,
-                    db=redis_db,
-                    decode_responses=True
-                )
-            else:
-                self.redis_client = redis.Redis(
-                    host=redis_host,
-                    port=redis_port,
-                    db=redis_db,
-                    decode_responses=True
-                )
-
-            # 测试连接
-            self.redis_client.ping()
-            logger.info(f"📊 [异步进度] Redis连接成功: {redis_host}:{redis_port}")
-            return True
-        except Exception as e:
-            logger.warning(f"📊 [异步进度] Redis连接失败，使用文件存储: {e}")
+        """初始化Redis连接（使用进程级共享连接池）"""
+        if not redis_enabled():
+            logger.info(f"📊 [异步进度] Redis已禁用，使用文件存储")
             return False
+
+        self.redis_client = get_redis_client()
+        if self.redis_client is None:
+            logger.warning(f"📊 [异步进度] Redis连接失败，使用文件存储")
+            return False
+        return True
     
     def _generate_dynamic_steps(self) -> List[Dict]:
         """根据分析师数量和研究深度动态生成分析步骤"""
@@ -513,6 +482,7 @@ class AsyncProgressTracker:
                 safe_data = safe_serialize(self.progress_data)
                 data_json = json.dumps(safe_data, ensure_ascii=False)
                 self.redis_client.setex(key, 3600, data_json)  # 1小时过期
+                get_progress_broadcaster().publish(self.analysis_id, safe_data, data_json)
 
                 logger.info(f"📊 [Redis写入] {self.analysis_id} -> {status} | {current_step_name} | {progress_pct:.1f}%")
                 logger.debug(f"📊 [Redis详情] 键: {key}, 数据大小: {len(data_json)} 字节")
@@ -521,6 +491,7 @@ class AsyncProgressTracker:
                 safe_data = safe_serialize(self.progress_data)
                 with open(self.progress_file, 'w', encoding='utf-8') as f:
                     json.dump(safe_data, f, ensure_ascii=False, indent=2)
+                get_progress_broadcaster().publish(self.analysis_id, safe_data)
 
                 logger.info(f"📊 [文件写入] {self.analysis_id} -> {status} | {current_step_name} | {progress_pct:.1f}%")
                 logger.debug(f"📊 [文件详情] 路径: {self.progress_file}")
@@ -603,37 +574,10 @@ class AsyncProgressTracker:
 def get_progress_by_id(analysis_id: str) -> Optional[Dict[str, Any]]:
     """根据分析ID获取进度"""
     try:
-        # 检查REDIS_ENABLED环境变量
-        redis_enabled = os.getenv('REDIS_ENABLED', 'false').lower() == 'true'
-
-        # 如果Redis启用，先尝试Redis
-        if redis_enabled:
+        # 如果Redis启用，先尝试Redis（共享连接池）
+        redis_client = get_redis_client()
+        if redis_client is not None:
             try:
-                import redis
-
-                # 从环境变量获取Redis配置
-                redis_host = os.getenv('REDIS_HOST', 'localhost')
-                redis_port = int(os.getenv('REDIS_PORT', 6379))
-                redis_password = os.getenv('REDIS_PASSWORD', None)
-                redis_db = int(os.getenv('REDIS_DB', 0))
-
-                # 创建Redis连接
-                if redis_password:
-                    redis_client = redis.Redis(
-                        host=redis_host,
-                        port=redis_port,
-                        password=redis_password,
-                        db=redis_db,
-                        decode_responses=True
-                    )
-                else:
-                    redis_client = redis.Redis(
-                        host=redis_host,
-                        port=redis_port,
-                        db=redis_db,
-                        decode_responses=True
-                    )
-
                 key = f"progress:{analysis_id}"
                 data = redis_client.get(key)
                 if data:
@@ -652,6 +596,25 @@ def get_progress_by_id(analysis_id: str) -> Optional[Dict[str, Any]]:
         logger.error(f"📊 [异步进度] 获取进度失败: {analysis_id}, 错误: {e}")
         return None
 
+
+def wait_for_progress_update(analysis_id: str, since_version: int = 0,
+                             timeout: float = 3.0) -> Tuple[int, Optional[Dict[str, Any]]]:
+    """
+    等待分析进度更新（推送模式）
+
+    进度写入时会立即唤醒等待方；超时未收到更新时返回 (当前版本号, None)，
+    调用方可以此作为兜底轮询间隔。
+
+    Args:
+        analysis_id: 分析ID
+        since_version: 上次看到的版本号
+        timeout: 最长等待时间（秒）
+
+    Returns:
+        (版本号, 进度数据)
+    """
+    return get_progress_broadcaster().wait_for_update(analysis_id, since_version, timeout)
+
 def format_time(seconds: float) -> str:
     """格式化时间显示"""
     if seconds < 60:
@@ -667,49 +630,20 @@ def format_time(seconds: float) -> str:
 def get_latest_analysis_id() -> Optional[str]:
     """获取最新的分析ID"""
     try:
-        # 检查REDIS_ENABLED环境变量
-        redis_enabled = os.getenv('REDIS_ENABLED', 'false').lower() == 'true'
-
-        # 如果Redis启用，先尝试从Redis获取
-        if redis_enabled:
+        # 如果Redis启用，先尝试从Redis获取（共享连接池）
+        redis_client = get_redis_client()
+        if redis_client is not None:
             try:
-                import redis
-
-                # 从环境变量获取Redis配置
-                redis_host = os.getenv('REDIS_HOST', 'localhost')
-                redis_port = int(os.getenv('REDIS_PORT', 6379))
-                redis_password = os.getenv('REDIS_PASSWORD', None)
-                redis_db = int(os.getenv('REDIS_DB', 0))
-
-                # 创建Redis连接
-                if redis_password:
-                    redis_client = redis.Redis(
-                        host=redis_host,
-                        port=redis_port,
-                        password=redis_password,
-                        db=redis_db,
-                        decode_responses=True
-                    )
-                else:
-                    redis_client = redis.Redis(
-                        host=redis_host,
-                        port=redis_port,
-                        db=redis_db,
-                        decode_responses=True
-                    )
-
-                # 获取所有progress键
-                keys = redis_client.keys("progress:*")
+                # 获取所有progress键（SCAN避免阻塞Redis），批量读取数据
+                keys = list(redis_client.scan_iter(match="progress:*", count=500))
                 if not keys:
                     return None
 
-                # 获取每个键的数据，找到最新的
                 latest_time = 0
                 latest_id = None
 
-                for key in keys:
+                for key, data in zip(keys, redis_client.mget(keys)):
                     try:
-                        data = redis_client.get(key)
                         if data:
                             progress_data = json.loads(data)
                             last_update = progress_data.get('last_update', 0)
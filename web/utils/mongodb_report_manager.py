@@ -5,9 +5,13 @@ MongoDB报告管理器
 """
 
 import os
+import re
+import json
+import base64
 import logging
-from datetime import datetime
-from typing import Dict, List, Optional, Any
+import threading
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional, Any, Iterable
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -15,12 +19,79 @@ logger = logging.getLogger(__name__)
 try:
     from pymongo import MongoClient
     from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
+    from bson import ObjectId
     MONGODB_AVAILABLE = True
 except ImportError:
     MONGODB_AVAILABLE = False
     logger.warning("pymongo未安装，MongoDB功能不可用")
 
 
+# 连接失败后的重连退避间隔（秒），每次失败翻倍
+RECONNECT_MIN_DELAY = 5
+RECONNECT_MAX_DELAY = 300
+
+
+# 历史列表需要的字段（不包含报告正文 reports）
+LIST_PROJECTION = {
+    "analysis_id": 1, "stock_symbol": 1, "analysis_date": 1, "timestamp": 1, "status": 1,
+    "summary": 1, "analysts": 1, "research_depth": 1, "performance": 1,
+}
+
+
+def _encode_cursor(timestamp_value: Any, doc_id: Any) -> str:
+    """将最后一条记录的 (timestamp, _id) 编码为分页游标"""
+    if isinstance(timestamp_value, datetime):
+        value = {"t": "date", "v": timestamp_value.isoformat()}
+    else:
+        value = {"t": "num", "v": timestamp_value}
+    value["id"] = str(doc_id)
+    return base64.urlsafe_b64encode(json.dumps(value).encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> Dict[str, Any]:
+    value = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    timestamp_value = datetime.fromisoformat(value["v"]) if value["t"] == "date" else value["v"]
+    doc_id = ObjectId(value["id"]) if ObjectId.is_valid(value["id"]) else value["id"]
+    return {"timestamp": timestamp_value, "_id": doc_id}
+
+
+def build_history_query(start_date: Optional[date] = None, end_date: Optional[date] = None,
+                        stock_symbol: Optional[str] = None, analyst_type: Optional[str] = None,
+                        search_text: Optional[str] = None,
+                        analysis_ids: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """
+    构建历史记录查询条件，过滤规则与文件系统摘要索引一致
+
+    Args:
+        start_date/end_date: 分析日期范围（含两端）
+        stock_symbol: 股票代码（不区分大小写的部分匹配）
+        analyst_type: 分析师类型
+        search_text: 在股票代码、摘要和分析师中搜索的关键词
+        analysis_ids: 限定的分析ID（收藏、标签过滤由调用方转换为ID集合）
+    """
+    conditions = []
+    if start_date or end_date:
+        time_range = {}
+        if start_date:
+            time_range["$gte"] = datetime.combine(start_date, time.min)
+        if end_date:
+            time_range["$lt"] = datetime.combine(end_date + timedelta(days=1), time.min)
+        conditions.append({"timestamp": time_range})
+    if stock_symbol:
+        conditions.append({"stock_symbol": {"$regex": re.escape(stock_symbol.strip()), "$options": "i"}})
+    if analyst_type:
+        conditions.append({"analysts": analyst_type})
+    if search_text:
+        pattern = {"$regex": re.escape(search_text.strip()), "$options": "i"}
+        conditions.append({"$or": [{"stock_symbol": pattern}, {"summary": pattern}, {"analysts": pattern}]})
+    if analysis_ids is not None:
+        conditions.append({"analysis_id": {"$in": list(analysis_ids)}})
+
+    if not conditions:
+        return {}
+    return conditions[0] if len(conditions) == 1 else {"$and": conditions}
+
+
 class MongoDBReportManager:
     """MongoDB报告管理器"""
     
@@ -29,10 +100,42 @@ class MongoDBReportManager:
         self.db = None
         self.collection = None
         self.connected = False
+        self._reconnect_lock = threading.Lock()
+        self._retry_delay = RECONNECT_MIN_DELAY
+        self._next_retry_at = datetime.now() + timedelta(seconds=self._retry_delay)
         
         if MONGODB_AVAILABLE:
             self._connect()
     
+    def ensure_connected(self) -> bool:
+        """
+        未连接时按退避间隔重试连接（启动时MongoDB不可用、之后恢复的情况）
+
+        Returns:
+            bool: 当前是否已连接
+        """
+        if self.connected or not MONGODB_AVAILABLE:
+            return self.connected
+        # 其他线程正在重试时直接返回，不阻塞页面渲染
+        if not self._reconnect_lock.acquire(blocking=False):
+            return False
+        try:
+            if self.connected or datetime.now() < self._next_retry_at:
+                return self.connected
+            if self.client is not None:
+                self.client.close()
+                self.client = None
+            self._connect()
+            if self.connected:
+                self._retry_delay = RECONNECT_MIN_DELAY
+            else:
+                self._retry_delay = min(self._retry_delay * 2, RECONNECT_MAX_DELAY)
+                logger.info(f"🔄 MongoDB将在 {self._retry_delay} 秒后重试连接")
+            self._next_retry_at = datetime.now() + timedelta(seconds=self._retry_delay)
+            return self.connected
+        finally:
+            self._reconnect_lock.release()
+    
     def _connect(self):
         """连接到MongoDB"""
         try:
@@ -100,6 +203,9 @@ class MongoDBReportManager:
             # 创建单字段索引
             self.collection.create_index("analysis_id")
             self.collection.create_index("status")
+
+            # 历史列表按时间倒序分页
+            self.collection.create_index([("timestamp", -1), ("_id", -1)])
             
             logger.info("✅ MongoDB索引创建成功")
             
@@ -180,34 +286,8 @@ class MongoDBReportManager:
             
             results = []
             for doc in cursor:
-                # 处理timestamp字段，兼容不同的数据类型
-                timestamp_value = doc.get("timestamp")
-                if hasattr(timestamp_value, 'timestamp'):
-                    # datetime对象
-                    timestamp = timestamp_value.timestamp()
-                elif isinstance(timestamp_value, (int, float)):
-                    # 已经是时间戳
-                    timestamp = float(timestamp_value)
-                else:
-                    # 其他情况，使用当前时间
-                    from datetime import datetime
-                    timestamp = datetime.now().timestamp()
-                
-                # 转换为Web应用期望的格式
-                result = {
-                    "analysis_id": doc["analysis_id"],
-                    "timestamp": timestamp,
-                    "stock_symbol": doc["stock_symbol"],
-                    "analysts": doc.get("analysts", []),
-                    "research_depth": doc.get("research_depth", 0),
-                    "status": doc.get("status", "completed"),
-                    "summary": doc.get("summary", ""),
-                    "performance": {},
-                    "tags": [],
-                    "is_favorite": False,
-                    "reports": doc.get("reports", {}),
-                    "source": "mongodb"
-                }
+                result = self._to_web_result(doc)
+                result["reports"] = doc.get("reports", {})
                 results.append(result)
             
             logger.info(f"✅ 从MongoDB获取到 {len(results)} 个分析报告")
@@ -217,6 +297,90 @@ class MongoDBReportManager:
             logger.error(f"❌ 从MongoDB获取分析报告失败: {e}")
             return []
     
+    @staticmethod
+    def _to_web_result(doc: Dict[str, Any]) -> Dict[str, Any]:
+        """将MongoDB文档转换为Web应用期望的格式（不含报告正文）"""
+        # 处理timestamp字段，兼容不同的数据类型
+        timestamp_value = doc.get("timestamp")
+        if hasattr(timestamp_value, 'timestamp'):
+            # datetime对象
+            timestamp = timestamp_value.timestamp()
+        elif isinstance(timestamp_value, (int, float)):
+            # 已经是时间戳
+            timestamp = float(timestamp_value)
+        else:
+            # 其他情况，使用当前时间
+            timestamp = datetime.now().timestamp()
+
+        return {
+            "analysis_id": doc.get("analysis_id", ""),
+            "timestamp": timestamp,
+            "stock_symbol": doc.get("stock_symbol", ""),
+            "analysts": doc.get("analysts", []),
+            "research_depth": doc.get("research_depth", 0),
+            "status": doc.get("status", "completed"),
+            "summary": doc.get("summary", ""),
+            "performance": doc.get("performance") or {},
+            "tags": [],
+            "is_favorite": False,
+            "source": "mongodb"
+        }
+
+    def query_history(self, start_date: Optional[date] = None, end_date: Optional[date] = None,
+                      stock_symbol: Optional[str] = None, analyst_type: Optional[str] = None,
+                      search_text: Optional[str] = None, analysis_ids: Optional[Iterable[str]] = None,
+                      page_size: int = 50, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """
+        分页查询分析历史（过滤在MongoDB中执行，只返回列表字段，不含报告正文）
+
+        Args:
+            过滤参数见 build_history_query
+            page_size: 每页条数
+            cursor: 上一页返回的 next_cursor，None 表示第一页
+
+        Returns:
+            Dict: items（列表项）、next_cursor（没有更多数据时为 None）
+        """
+        if not self.connected:
+            return {"items": [], "next_cursor": None}
+
+        query = build_history_query(start_date, end_date, stock_symbol, analyst_type, search_text, analysis_ids)
+        if cursor:
+            # 按 (timestamp, _id) 倒序的键集分页，翻页时不受新插入记录影响
+            last = _decode_cursor(cursor)
+            after_last = {"$or": [
+                {"timestamp": {"$lt": last["timestamp"]}},
+                {"timestamp": last["timestamp"], "_id": {"$lt": last["_id"]}},
+            ]}
+            query = {"$and": [query, after_last]} if query else after_last
+
+        try:
+            docs = list(self.collection.find(query, LIST_PROJECTION)
+                        .sort([("timestamp", -1), ("_id", -1)])
+                        .limit(page_size + 1))
+        except Exception as e:
+            logger.error(f"❌ 查询分析历史失败: {e}")
+            return {"items": [], "next_cursor": None}
+
+        next_cursor = None
+        if len(docs) > page_size:
+            docs = docs[:page_size]
+            next_cursor = _encode_cursor(docs[-1].get("timestamp"), docs[-1]["_id"])
+
+        return {"items": [self._to_web_result(doc) for doc in docs], "next_cursor": next_cursor}
+
+    def get_report_contents(self, analysis_id: str) -> Dict[str, str]:
+        """只读取单个分析的报告正文（展开详情时按需加载）"""
+        if not self.connected:
+            return {}
+
+        try:
+            doc = self.collection.find_one({"analysis_id": analysis_id}, {"reports": 1, "_id": 0})
+            return (doc or {}).get("reports") or {}
+        except Exception as e:
+            logger.error(f"❌ 从MongoDB获取报告内容失败: {e}")
+            return {}
+
     def get_report_by_id(self, analysis_id: str) -> Optional[Dict[str, Any]]:
         """根据ID获取单个分析报告"""
         if not self.connected:
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+进度通道
+- 进程级共享的Redis连接池，供进度写入方与所有读取方复用，避免每次轮询重新建立连接
+- 进度推送：写入方发布更新，显示端阻塞等待新进度而不是固定间隔轮询
+  Redis启用时通过 pub/sub 跨进程推送，同时始终在进程内广播
+- 进程内只保留未结束和刚结束的分析的进度，记录数有上限
+"""
+
+import os
+import json
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# 导入日志模块
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('async_progress')
+
+PROGRESS_CHANNEL_PREFIX = "progress_updates:"
+
+# Redis连接失败后的重试冷却时间（秒），避免每次轮询都尝试重连
+_REDIS_RETRY_INTERVAL = 30
+
+# 分析结束（completed / failed）后进度在进程内保留的时间（秒），供等待方读取最终状态
+FINISHED_RETENTION_SECONDS = 300
+# 进程内最多记录的分析数，超出时移除最久未更新的记录
+MAX_TRACKED_ANALYSES = 1000
+_FINISHED_STATUSES = ('completed', 'failed')
+
+_redis_lock = threading.Lock()
+_redis_client = None
+_redis_failed_at = 0.0
+
+
+def redis_enabled() -> bool:
+    """是否启用Redis"""
+    return os.getenv('REDIS_ENABLED', 'false').lower() == 'true'
+
+
+def get_redis_client():
+    """
+    获取共享连接池上的Redis客户端
+
+    Returns:
+        redis.Redis 或 None（Redis未启用或不可用）
+    """
+    global _redis_client, _redis_failed_at
+
+    if not redis_enabled():
+        return None
+    if _redis_client is not None:
+        return _redis_client
+    if time.time() - _redis_failed_at < _REDIS_RETRY_INTERVAL:
+        return None
+
+    with _redis_lock:
+        if _redis_client is not None:
+            return _redis_client
+        try:
+            import redis
+
+            pool = redis.ConnectionPool(
+                host=os.getenv('REDIS_HOST', 'localhost'),
+                port=int(os.getenv('REDIS_PORT', 6379)),
+                password=os.getenv('REDIS_PASSWORD', None) or None,
+                db=int(os.getenv('REDIS_DB', 0)),
+                decode_responses=True,
+                max_connections=int(os.getenv('REDIS_MAX_CONNECTIONS', 50)),
+            )
+            client = redis.Redis(connection_pool=pool)
+            client.ping()
+            _redis_client = client
+            logger.info(f"📊 [进度通道] Redis连接池已创建")
+        except Exception as e:
+            _redis_failed_at = time.time()
+            logger.warning(f"📊 [进度通道] Redis不可用，使用文件存储: {e}")
+    return _redis_client
+
+
+class ProgressBroadcaster:
+    """
+    进程内进度广播，按分析ID记录最新进度和版本号
+
+    Args:
+        finished_retention: 分析结束后保留进度的时间（秒）
+        max_entries: 最多记录的分析数
+    """
+
+    def __init__(self, finished_retention: float = FINISHED_RETENTION_SECONDS,
+                 max_entries: int = MAX_TRACKED_ANALYSES):
+        self.finished_retention = finished_retention
+        self.max_entries = max_entries
+        self._condition = threading.Condition()
+        self._latest: "OrderedDict[str, Tuple[int, Dict[str, Any]]]" = OrderedDict()
+        self._finished_at: Dict[str, float] = {}
+        self._subscriber: Optional[threading.Thread] = None
+
+    def publish(self, analysis_id: str, data: Dict[str, Any], data_json: Optional[str] = None):
+        """发布进度：进程内广播，Redis可用时同时发布到频道"""
+        self._notify(analysis_id, data)
+
+        if data_json is not None:
+            client = get_redis_client()
+            if client is not None:
+                try:
+                    client.publish(f"{PROGRESS_CHANNEL_PREFIX}{analysis_id}", data_json)
+                except Exception as e:
+                    logger.debug(f"📊 [进度通道] Redis发布失败: {e}")
+
+    def _notify(self, analysis_id: str, data: Dict[str, Any]):
+        with self._condition:
+            version = self._latest.get(analysis_id, (0, None))[0] + 1
+            self._latest[analysis_id] = (version, data)
+            self._latest.move_to_end(analysis_id)
+            if data.get('status') in _FINISHED_STATUSES:
+                self._finished_at.setdefault(analysis_id, time.monotonic())
+            else:
+                self._finished_at.pop(analysis_id, None)
+            self._prune()
+            self._condition.notify_all()
+
+    def _prune(self):
+        """移除结束超过保留时间的分析，以及超出数量上限时最久未更新的分析（需持有锁）"""
+        now = time.monotonic()
+        for analysis_id, finished_at in list(self._finished_at.items()):
+            if now - finished_at >= self.finished_retention:
+                del self._finished_at[analysis_id]
+                self._latest.pop(analysis_id, None)
+        while len(self._latest) > self.max_entries:
+            analysis_id, _ = self._latest.popitem(last=False)
+            self._finished_at.pop(analysis_id, None)
+
+    def version(self, analysis_id: str) -> int:
+        """当前已知的进度版本号"""
+        with self._condition:
+            return self._latest.get(analysis_id, (0, None))[0]
+
+    def wait_for_update(self, analysis_id: str, since_version: int,
+                        timeout: float) -> Tuple[int, Optional[Dict[str, Any]]]:
+        """
+        等待版本号大于 since_version 的进度
+
+        Returns:
+            (版本号, 进度数据)；超时返回 (当前版本号, None)
+        """
+        self._ensure_subscriber()
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                version, data = self._latest.get(analysis_id, (0, None))
+                if version > since_version:
+                    return version, data
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return version, None
+                self._condition.wait(remaining)
+
+    def _ensure_subscriber(self):
+        """Redis可用时启动后台订阅线程，把其他进程发布的进度转为进程内广播"""
+        if self._subscriber is not None and self._subscriber.is_alive():
+            return
+        client = get_redis_client()
+        if client is None:
+            return
+        with self._condition:
+            if self._subscriber is not None and self._subscriber.is_alive():
+                return
+            self._subscriber = threading.Thread(
+                target=self._subscribe_loop, args=(client,), name="progress-subscriber", daemon=True
+            )
+            self._subscriber.start()
+
+    def _subscribe_loop(self, client):
+        try:
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            pubsub.psubscribe(f"{PROGRESS_CHANNEL_PREFIX}*")
+            logger.info(f"📊 [进度通道] 已订阅Redis进度频道")
+            for message in pubsub.listen():
+                try:
+                    analysis_id = message['channel'][len(PROGRESS_CHANNEL_PREFIX):]
+                    data = json.loads(message['data'])
+                    with self._condition:
+                        current = self._latest.get(analysis_id, (0, None))[1]
+                    # 本进程发布的进度已经广播过，跳过重复通知
+                    if current is None or current.get('last_update') != data.get('last_update'):
+                        self._notify(analysis_id, data)
+                except Exception:
+                    continue
+        except Exception as e:
+            logger.warning(f"📊 [进度通道] Redis订阅中断: {e}")
+
+
+_broadcaster = ProgressBroadcaster()
+
+
+def get_progress_broadcaster() -> ProgressBroadcaster:
+    """获取进程级进度广播实例"""
+    return _broadcaster